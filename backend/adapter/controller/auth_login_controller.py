@@ -1,4 +1,5 @@
 from typing import Dict, Union
+from domain.services.password_hash_domain_service import PasswordHashBusyError
 from usecase.auth_login import (
     LoginUserUseCase,
     LoginUserInput,
@@ -10,11 +11,14 @@ class LoginUserController:
     def __init__(self, uc: LoginUserUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: LoginUserInput
     ) -> Dict[str, Union[int, LoginUserOutput, Dict[str, str]]]:
         try:
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
+            if isinstance(err, PasswordHashBusyError):
+                # パスワード検証の実行枠が埋まっている（過負荷）
+                return {"status": 503, "data": {"error": str(err)}}
             if err:
                 # ユースケースからのエラー（例：認証失敗）
                 return {"status": 401, "data": {"error": str(err)}}
@@ -1,5 +1,6 @@
 from typing import Dict, Union
 
+from domain.services.password_hash_domain_service import PasswordHashBusyError
 from usecase.auth_signup import (
     CreateUserUseCase,
     CreateUserInput,
@@ -11,11 +12,14 @@ class CreateUserController:
     def __init__(self, uc: CreateUserUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: CreateUserInput
     ) -> Dict[str, Union[int, CreateUserOutput, Dict[str, str]]]:
         try:
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
+            if isinstance(err, PasswordHashBusyError):
+                # パスワードハッシュの実行枠が埋まっている（過負荷）
+                return {"status": 503, "data": {"error": str(err)}}
             if err:
                 return {"status": 400, "data": {"error": str(err)}}
             return {"status": 201, "data": output}
@@ -10,11 +10,11 @@ class CreateAgentController:
     def __init__(self, uc: CreateAgentUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: CreateAgentInput
     ) -> Dict[str, Union[int, CreateAgentOutput, Dict[str, str]]]:
         try:
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             if err:
                 # トークン検証エラーやその他のユースケースエラー
                 return {"status": 401, "data": {"error": str(err)}}
@@ -3,6 +3,7 @@ from usecase.create_finetuning_job import (
     CreateFinetuningJobUseCase,
     CreateFinetuningJobInput,
     CreateFinetuningJobOutput,
+    TrainingFileReceiveError,
 )
 
 
@@ -10,23 +11,26 @@ class CreateFinetuningJobController:
     def __init__(self, uc: CreateFinetuningJobUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: CreateFinetuningJobInput # ★ 忠実に Input DTO を引数とする ★
     ) -> Dict[str, Union[int, CreateFinetuningJobOutput, Dict[str, str]]]:
         try:
             # ユースケースの実行
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 認証エラー(PermissionError)は 401、その他のロジックエラー(ValueError)は 400
                 status_code = 401
                 if isinstance(err, ValueError):
                     status_code = 400
+                elif isinstance(err, TrainingFileReceiveError):
+                    # ローカルディスクへの退避の失敗はサーバー側のエラー
+                    status_code = 500
                 
                 return {"status": status_code, "data": {"error": str(err)}}
             
-            # 成功 (ジョブ作成/キューイングは 201 Created を使用)
-            return {"status": 201, "data": output}
+            # 成功 (ファイル転送とキュー投入はバックグラウンドで続くため 202 Accepted を使用)
+            return {"status": 202, "data": output}
             
         except Exception as e:
             # 予期せぬサーバーエラー
@@ -10,12 +10,12 @@ class CreateFinetuningJobDeploymentController:
     def __init__(self, uc: CreateFinetuningJobDeploymentUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: CreateFinetuningJobDeploymentInput # ★ Input DTO を引数とする
     ) -> Dict[str, Union[int, CreateFinetuningJobDeploymentOutput, Dict[str, str]]]:
         try:
             # ユースケースの実行
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 認証エラー(PermissionError)は 401、その他のロジックエラー(ValueError)は 400
@@ -0,0 +1,41 @@
+from typing import Dict, Union
+from domain.entities.upload_session import UploadSessionNotFoundError, UploadSessionConflictError
+from usecase.finalize_upload_session import (
+    FinalizeUploadSessionUseCase,
+    FinalizeUploadSessionInput,
+)
+from usecase.create_finetuning_job import CreateFinetuningJobOutput
+
+
+class FinalizeUploadSessionController:
+    def __init__(self, uc: FinalizeUploadSessionUseCase):
+        self.uc = uc
+
+    async def execute(
+        self, input_data: FinalizeUploadSessionInput
+    ) -> Dict[str, Union[int, CreateFinetuningJobOutput, Dict[str, str]]]:
+        try:
+            # ユースケースの実行
+            output, err = await self.uc.execute(input_data)
+
+            if err:
+                # セッションが無い・期限切れは 404、順序や状態の不一致は 409 (クライアントはオフセットを問い合わせて再開する)、
+                # 所有者でない場合は 403、入力値の誤り (サイズ・チェックサム) は 400、その他の認証エラーは 401
+                status_code = 401
+                if isinstance(err, UploadSessionNotFoundError) or "not found" in str(err).lower():
+                    status_code = 404
+                elif isinstance(err, UploadSessionConflictError):
+                    status_code = 409
+                elif isinstance(err, PermissionError):
+                    status_code = 403
+                elif isinstance(err, ValueError):
+                    status_code = 400
+
+                return {"status": status_code, "data": {"error": str(err)}}
+
+            # 成功 (ファイルの確定とキュー投入はバックグラウンドで続くため 202 Accepted を使用)
+            return {"status": 202, "data": output}
+
+        except Exception as e:
+            # 予期せぬサーバーエラー
+            return {"status": 500, "data": {"error": f"An unexpected error occurred: {e}"}}
@@ -1,4 +1,6 @@
-from typing import Dict, Union, Any, List
+from typing import Dict, Union, Any, List, Optional
+
+from domain.value_objects.page import InvalidPageCursorError, DEFAULT_PAGE_LIMIT
 
 # ユースケース層の依存関係をインポート
 # ★★★ 修正: 参照するユースケースを GetAgentDeployments に変更 ★★★
@@ -19,8 +21,13 @@ class GetAgentDeploymentsController:
         """
         self.uc = uc
 
-    def execute(
-        self, token: str, agent_id: int 
+    async def execute(
+        self,
+        token: str,
+        agent_id: int,
+        limit: int = DEFAULT_PAGE_LIMIT,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
     ) -> Dict[str, Union[int, GetAgentDeploymentsOutput, Dict[str, str]]]: # ★ Outputクラス名を修正
         """
         リクエストデータ（トークンとagent_id）をユースケースのInputに変換し、実行結果をHTTP形式で返す。
@@ -28,20 +35,25 @@ class GetAgentDeploymentsController:
         Args:
             token: ユーザーを認証するためのトークン文字列。
             agent_id: 対象のAgent ID。
+            limit: 1ページあたりの件数。
+            after: 前ページの next_cursor (先頭ページは None)。
+            status: デプロイメントのステータスで絞り込む場合に指定。
             
         Returns:
             Dict: HTTPステータスコードと結果データ（Output DTOまたはエラーメッセージ）を含む辞書。
         """
         # 1. Input DTOの生成
         # ★ 修正: Input DTOクラス名を修正 ★
-        input_data = GetAgentDeploymentsInput(token=token, agent_id=agent_id)
+        input_data = GetAgentDeploymentsInput(
+            token=token, agent_id=agent_id, limit=limit, after=after, status=status
+        )
         
         try:
             # 2. ユースケースの実行
             output: GetAgentDeploymentsOutput # ★ Outputクラス名を修正
             err: Exception | None
             
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 3. エラー処理
@@ -50,7 +62,9 @@ class GetAgentDeploymentsController:
                 status_code = 401
                 
                 # エラーメッセージに基づいて、より詳細なエラーコードを設定するロジックは省略
-                if "not found" in str(err).lower():
+                if isinstance(err, InvalidPageCursorError):
+                    status_code = 400
+                elif "not found" in str(err).lower():
                     status_code = 404
                 elif "permission" in str(err).lower():
                     status_code = 403
@@ -1,4 +1,6 @@
-from typing import Dict, Union, Any, List
+from typing import Dict, Union, Any, List, Optional
+
+from domain.value_objects.page import InvalidPageCursorError, DEFAULT_PAGE_LIMIT
 
 # ユースケース層の依存関係をインポート
 from usecase.get_agent_finetuning_jobs import (
@@ -18,8 +20,13 @@ class GetAgentFinetuningJobsController: # ★ クラス名を修正
         """
         self.uc = uc
 
-    def execute(
-        self, token: str, agent_id: int # ★ 修正: agent_id を引数に追加
+    async def execute(
+        self,
+        token: str,
+        agent_id: int, # ★ 修正: agent_id を引数に追加
+        limit: int = DEFAULT_PAGE_LIMIT,
+        after: Optional[str] = None,
+        status: Optional[str] = None,
     ) -> Dict[str, Union[int, GetAgentFinetuningJobsOutput, Dict[str, str]]]: # ★ Outputクラス名を修正
         """
         リクエストデータ（トークンとagent_id）をユースケースのInputに変換し、実行結果をHTTP形式で返す。
@@ -27,20 +34,25 @@ class GetAgentFinetuningJobsController: # ★ クラス名を修正
         Args:
             token: ユーザーを認証するためのトークン文字列。
             agent_id: 対象のAgent ID。
+            limit: 1ページあたりの件数。
+            after: 前ページの next_cursor (先頭ページは None)。
+            status: ジョブのステータスで絞り込む場合に指定。
             
         Returns:
             Dict: HTTPステータスコードと結果データ（Output DTOまたはエラーメッセージ）を含む辞書。
         """
         # 1. Input DTOの生成
         # ★ 修正: agent_id を Input DTO に渡す ★
-        input_data = GetAgentFinetuningJobsInput(token=token, agent_id=agent_id)
+        input_data = GetAgentFinetuningJobsInput(
+            token=token, agent_id=agent_id, limit=limit, after=after, status=status
+        )
         
         try:
             # 2. ユースケースの実行
             output: GetAgentFinetuningJobsOutput # ★ クラス名を修正
             err: Exception | None
             
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 3. エラー処理
@@ -50,7 +62,9 @@ class GetAgentFinetuningJobsController: # ★ クラス名を修正
                 
                 # エラーメッセージに基づいて、より詳細なエラーコードを設定するロジック（例：トークン、authなど）は省略し、
                 # 汎用的な認証エラーとして401を使用
-                if "not found" in str(err).lower():
+                if isinstance(err, InvalidPageCursorError):
+                    status_code = 400
+                elif "not found" in str(err).lower():
                     status_code = 404
                 elif "permission" in str(err).lower():
                     status_code = 403
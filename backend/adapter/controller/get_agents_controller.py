@@ -2,6 +2,7 @@ from typing import Dict, Union, Any
 
 # ユースケース層の依存関係をインポート
 # GetUserAgents から GetAgents に修正
+from domain.value_objects.page import InvalidPageCursorError
 from usecase.get_agents import (
     GetAgentsUseCase,
     GetAgentsInput,
@@ -22,7 +23,7 @@ class GetAgentsController:
         self.uc = uc
 
     # token引数を削除し、input_data (GetAgentsInput) を直接受け取るように修正
-    def execute(
+    async def execute(
         self, input_data: GetAgentsInput
     ) -> Dict[str, Union[int, GetAgentsOutput, Dict[str, str]]]:
         """
@@ -34,7 +35,7 @@ class GetAgentsController:
 
         try:
             # 2. ユースケースの実行
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 3. エラー処理 (DBエラーなど)
@@ -44,6 +45,8 @@ class GetAgentsController:
                 # エラーメッセージに基づいてステータスコードを判断
                 if "not found" in str(err).lower():
                     status_code = 404
+                elif isinstance(err, InvalidPageCursorError):
+                    status_code = 400
                 # 全件取得に認証エラーは発生しないため、認証ロジックは削除
                 
                 return {"status": status_code, "data": {"error": str(err)}}
@@ -1,7 +1,15 @@
-from typing import Dict, Union, Any, List
-from fastapi.responses import StreamingResponse, JSONResponse
+from typing import BinaryIO, Dict, Union, Any, List, Iterator, Mapping, Optional, Tuple
+from email.utils import formatdate, parsedate_to_datetime
+from dataclasses import replace
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse, Response
+from starlette.background import BackgroundTask
+from urllib.parse import quote
+import hashlib
 import os
 
+from domain.value_objects.binary_stream import BinaryStream
+from domain.value_objects.file_info import FileInfo
+
 # ユースケース層の依存関係
 from usecase.get_image_stream import (
     GetImageStreamUseCase,
@@ -10,23 +18,119 @@ from usecase.get_image_stream import (
 )
 
 
+# ストレージから1回に読み出して送信するサイズ (1リクエストあたりのメモリ使用量はこの程度に収まる)
+STREAM_CHUNK_SIZE = 256 * 1024
+
+
+def _validators(info: FileInfo) -> Tuple[str, str]:
+    """ETag と Last-Modified を生成する (FileResponse と同じ形式。配信経路によらず同じファイルなら同じ値)"""
+    etag_base = f"{info.modified_at}-{info.size}"
+    etag = f'"{hashlib.md5(etag_base.encode(), usedforsecurity=False).hexdigest()}"'
+    return etag, formatdate(info.modified_at, usegmt=True)
+
+
+def _is_not_modified(headers: Mapping[str, str], info: FileInfo, etag: str) -> bool:
+    """If-None-Match (優先) / If-Modified-Since を評価し、304 を返せるかどうかを判定する"""
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        # If-None-Match の比較は弱い比較 (W/ の有無は問わない)
+        return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(info.modified_at) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def _parse_range(headers: Mapping[str, str], info: FileInfo, etag: str, last_modified: str) -> Optional[Tuple[int, int]]:
+    """
+    Range ヘッダーを解析し、送信する範囲 [start, end) を返す。範囲指定なし・無視する場合は None。
+    単一範囲のみ対応し、複数範囲は全体を返す (RFC 9110 上、Range は無視してよい)。
+    満たせない範囲は ValueError。
+    """
+    http_range = headers.get("range")
+    if not http_range:
+        return None
+    # If-Range が現在のファイルと一致しない場合は、範囲ではなく全体を返す
+    if_range = headers.get("if-range")
+    if if_range is not None and if_range not in (etag, last_modified):
+        return None
+    units, _, spec = http_range.partition("=")
+    if units.strip().lower() != "bytes" or "," in spec:
+        return None
+    start_str, _, end_str = spec.strip().partition("-")
+    try:
+        if start_str:
+            start = int(start_str)
+            end = min(int(end_str) + 1, info.size) if end_str else info.size
+        else:
+            # 末尾からのバイト数指定 (bytes=-500)
+            start = max(info.size - int(end_str), 0)
+            end = info.size
+    except ValueError:
+        return None
+    if start >= info.size or start >= end:
+        raise ValueError("Range not satisfiable")
+    return start, end
+
+
+def _iter_stream(stream: BinaryStream, start: int, end: int) -> Iterator[bytes]:
+    """stream の [start, end) を STREAM_CHUNK_SIZE ずつ読み出す (全体をメモリに載せない)"""
+    try:
+        stream.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            chunk = stream.read(min(STREAM_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        stream.close()
+
+
+def _open_local_file(path: str) -> BinaryIO:
+    """
+    キャッシュ上のファイルを開く。開いた後はキャッシュの追い出しでファイルが削除されても、閉じるまで最後まで読み出せる。
+    ファイルが既に無い場合は FileNotFoundError。
+    """
+    return open(path, "rb")
+
+
+def _descriptor_path(local_file: BinaryIO) -> Optional[str]:
+    """
+    開いたファイルをパスとして参照する /proc/self/fd/<fd> (Linux)。削除された後も同じファイルを開ける。
+    /proc が無い環境では None。
+    """
+    path = f"/proc/self/fd/{local_file.fileno()}"
+    return path if os.path.exists(path) else None
+
+
 class GetImageStreamController:
     """
     画像ストリーム取得リクエストを処理し、ユースケースに委譲するコントローラ。
-    Output DTO から StreamingResponse を構築する責務を持つ。
+    Output DTO から FileResponse / StreamingResponse を構築する責務を持つ。
+    キャッシュ上の画像 (追い出しで削除されうる) は取得直後に開き、開いたファイルから送信する
+    (開く前に削除されていた場合は1回だけ取得し直す。送信中に削除されても途中で切れない)。
+    どちらの経路も Content-Length・Accept-Ranges・Last-Modified・ETag を返し、
+    条件付き GET (If-None-Match / If-Modified-Since → 304) と単一範囲の Range リクエスト (206) に対応する。
     """
     def __init__(self, uc: GetImageStreamUseCase):
         """依存性注入によりユースケースインスタンスを受け取る。"""
         self.uc = uc
 
     def execute(
-        self, relative_path: str
-    ) -> Union[StreamingResponse, JSONResponse]:
+        self, relative_path: str, headers: Optional[Mapping[str, str]] = None
+    ) -> Union[FileResponse, StreamingResponse, JSONResponse, Response]:
         """
         リクエストデータ（相対パス）をユースケースに渡し、StreamingResponseを生成して返す。
         
         Args:
             relative_path: VPSの可視化ベースディレクトリに対する相対パス。
+            headers: リクエストヘッダー (Range・If-None-Match・If-Modified-Since・If-Range を参照する)。
             
         Returns:
             Union[StreamingResponse, JSONResponse]: 成功時は StreamingResponse、失敗時は JSONResponse。
@@ -40,6 +144,16 @@ class GetImageStreamController:
             err: Exception | None
             
             output, err = self.uc.execute(input_data)
+            local_file: Optional[BinaryIO] = None
+            if not err and output.file_path and output.evictable:
+                try:
+                    local_file = _open_local_file(output.file_path)
+                except FileNotFoundError:
+                    # 取得してから開くまでの間に、他のリクエストの取得による追い出しで削除された。
+                    # 取得し直すのは1回だけ (再び削除された場合は 500)
+                    output, err = self.uc.execute(input_data)
+                    if not err and output.file_path and output.evictable:
+                        local_file = _open_local_file(output.file_path)
             
             if err:
                 # 3. エラー処理 (404/500)
@@ -53,26 +167,100 @@ class GetImageStreamController:
                 # JSONResponseを返す
                 return JSONResponse({"error": str(err)}, status_code=status_code)
             
+            headers = headers or {}
+
+            # 4a. ローカルファイルは FileResponse で直接送信する
+            # (サーバーが対応していれば pathsend/sendfile によりカーネル内で転送され、Python 側でバッファしない。
+            # Range・If-Range は FileResponse が処理する)
+            if output.file_path:
+                response = self._file_response(output, headers, local_file)
+                if response is not None:
+                    return response
+                # /proc が無い環境では、開いたキャッシュ上のファイルをストリームとして送信する
+                stat_result = os.fstat(local_file.fileno())
+                output = replace(
+                    output, file_path=None, stream=local_file,
+                    info=FileInfo(size=stat_result.st_size, modified_at=stat_result.st_mtime),
+                )
+
             # 4. 成功レスポンス (StreamingResponseの構築)
-            # Output DTOのstream (BinaryStream/BytesIO) を直接渡す。
-            # stream は close() メソッドを持っているため、StreamingResponse が自動で閉じます。
-            
-            # 念のためストリームポインタを先頭に戻す
-            if output.stream:
-                output.stream.seek(0)
-            else:
+            # Output DTOのstream (BinaryStream) から必要な範囲だけを少しずつ読み出して送信する。
+            if not output.stream or not output.info:
                  # streamがNoneの場合は404
                  return JSONResponse({"error": "Image stream is empty or null."}, status_code=404)
 
+            stream, info = output.stream, output.info
+            etag, last_modified = _validators(info)
+            response_headers = {
+                # ブラウザで画像をインライン表示させる
+                "Content-Disposition": f"inline; filename*=utf-8''{quote(output.filename)}",
+                "Accept-Ranges": "bytes",
+                "ETag": etag,
+                "Last-Modified": last_modified,
+            }
+
+            # 条件付き GET: 変更がなければ本文を読まずに 304
+            if _is_not_modified(headers, info, etag):
+                stream.close()
+                return Response(status_code=304, headers={"ETag": etag, "Last-Modified": last_modified})
+
+            try:
+                byte_range = _parse_range(headers, info, etag, last_modified)
+            except ValueError:
+                stream.close()
+                return Response(status_code=416, headers={"Content-Range": f"bytes */{info.size}"})
+
+            status_code = 200
+            start, end = 0, info.size
+            if byte_range:
+                start, end = byte_range
+                status_code = 206
+                response_headers["Content-Range"] = f"bytes {start}-{end - 1}/{info.size}"
+            response_headers["Content-Length"] = str(end - start)
+
+            # ジェネレータの終了時に閉じるが、クライアントの切断で反復が途中で止まった場合に備え、
+            # レスポンス終了後にも閉じる (close は何度呼んでもよい)
             return StreamingResponse(
-                output.stream,
+                _iter_stream(stream, start, end),
+                status_code=status_code,
                 media_type=output.mime_type,
-                headers={
-                    # ブラウザで画像をインライン表示させる
-                    "Content-Disposition": f"inline; filename={output.filename}"
-                }
+                headers=response_headers,
+                background=BackgroundTask(stream.close),
             )
             
         except Exception as e:
             # 5. 予期せぬサーバーエラー処理 (500 Internal Server Error)
-            return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
\ No newline at end of file
+            return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+
+    @staticmethod
+    def _file_response(
+        output: GetImageStreamOutput, headers: Mapping[str, str], local_file: Optional[BinaryIO]
+    ) -> Optional[Union[FileResponse, Response]]:
+        """
+        ローカルファイルの FileResponse (または 304) を返す。local_file (開いたキャッシュ上のファイル) がある場合は
+        /proc/self/fd 経由で同じファイルを送信し、送信後に閉じる。/proc が無い場合は None (ストリームで送信する)。
+        """
+        path = output.file_path
+        if local_file is not None:
+            path = _descriptor_path(local_file)
+            if path is None:
+                return None
+            stat_result = os.fstat(local_file.fileno())
+        else:
+            stat_result = os.stat(path)
+        file_info = FileInfo(size=stat_result.st_size, modified_at=stat_result.st_mtime)
+        etag, last_modified = _validators(file_info)
+        if _is_not_modified(headers, file_info, etag):
+            if local_file is not None:
+                local_file.close()
+            return Response(status_code=304, headers={"ETag": etag, "Last-Modified": last_modified})
+        return FileResponse(
+            path,
+            media_type=output.mime_type,
+            content_disposition_type="inline",
+            filename=output.filename,
+            stat_result=stat_result,
+            headers={"ETag": etag, "Last-Modified": last_modified},
+            # 送信を終えてから (クライアントの切断時も) 開いたファイルを閉じる
+            background=BackgroundTask(local_file.close) if local_file is not None else None,
+        )
\ No newline at end of file
@@ -0,0 +1,37 @@
+from typing import Dict, Union, Optional
+
+# ユースケース層の依存関係をインポート
+from usecase.get_resource_version import (
+    GetResourceVersionUseCase,
+    GetResourceVersionInput,
+    GetResourceVersionOutput,
+)
+
+
+class GetResourceVersionController:
+    """
+    条件付き GET のためにリソースの版を取得するコントローラ。
+    """
+    def __init__(self, uc: GetResourceVersionUseCase):
+        self.uc = uc
+
+    async def execute(
+        self, token: str, resource: str, resource_id: int, status: Optional[str] = None
+    ) -> Dict[str, Union[int, GetResourceVersionOutput, Dict[str, str]]]:
+        input_data = GetResourceVersionInput(
+            token=token, resource=resource, resource_id=resource_id, status=status
+        )
+        try:
+            output, err = await self.uc.execute(input_data)
+
+            if err:
+                # 認証エラー(PermissionError)は 401、その他のロジックエラー(ValueError)は 400
+                status_code = 401
+                if isinstance(err, ValueError):
+                    status_code = 400
+                return {"status": status_code, "data": {"error": str(err)}}
+
+            return {"status": 200, "data": output}
+
+        except Exception as e:
+            return {"status": 500, "data": {"error": f"An unexpected error occurred: {e}"}}
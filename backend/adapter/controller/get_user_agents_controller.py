@@ -18,7 +18,7 @@ class GetUserAgentsController:
         """
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, token: str
     ) -> Dict[str, Union[int, GetUserAgentsOutput, Dict[str, str]]]:
         """
@@ -38,7 +38,7 @@ class GetUserAgentsController:
             output: GetUserAgentsOutput
             err: Exception | None
             
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 3. エラー処理 (トークン無効、ユーザー不在、リポジトリエラーなど)
@@ -9,12 +9,12 @@ class GetUserController:
     def __init__(self, uc: GetUserUseCase):
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, input_data: GetUserInput
     ) -> Dict[str, Union[int, Dict[str, Any], Dict[str, str]]]:
         try:
             # ユースケースを実行して、結果(output)とエラー(err)を取得
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
 
             # エラーがあれば、ステータス401とエラーメッセージを返す
             if err:
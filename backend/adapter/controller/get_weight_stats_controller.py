@@ -0,0 +1,57 @@
+from typing import Dict, Union
+
+# ユースケース層の依存関係をインポート
+from usecase.get_weight_stats import (
+    GetFinetuningJobWeightStatsUseCase,
+    GetFinetuningJobWeightStatsInput,
+    GetFinetuningJobWeightStatsOutput,
+)
+
+
+class GetWeightStatsController:
+    """
+    特定のジョブの重み変化の統計取得リクエストを処理し、ユースケースに委譲するコントローラ。
+    """
+    def __init__(self, uc: GetFinetuningJobWeightStatsUseCase):
+        """
+        依存性注入によりユースケースインスタンスを受け取る。
+        """
+        self.uc = uc
+
+    async def execute(
+        self, token: str, job_id: int, include_tensors: bool = True
+    ) -> Dict[str, Union[int, GetFinetuningJobWeightStatsOutput, Dict[str, str]]]:
+        """
+        リクエストデータをユースケースのInputに変換し、実行結果をHTTP形式で返す。
+
+        Args:
+            token: ユーザーを認証するためのトークン文字列。
+            job_id: 取得したいジョブのID。
+            include_tensors: テンソルごとの統計を含めるか。
+
+        Returns:
+            Dict: HTTPステータスコードと結果データ（Output DTOまたはエラーメッセージ）を含む辞書。
+        """
+        input_data = GetFinetuningJobWeightStatsInput(token=token, job_id=job_id, include_tensors=include_tensors)
+
+        try:
+            output, err = await self.uc.execute(input_data)
+
+            if err:
+                status_code = 500 # デフォルトはサーバーエラー
+
+                err_str = str(err).lower()
+
+                if "not found" in err_str:
+                    status_code = 404
+                elif "permission" in err_str or "auth" in err_str:
+                    status_code = 403 # 権限または認証エラー
+                elif "token" in err_str:
+                    status_code = 401 # トークンエラー
+
+                return {"status": status_code, "data": {"error": str(err)}}
+
+            return {"status": 200, "data": output}
+
+        except Exception as e:
+            return {"status": 500, "data": {"error": f"An unexpected server error occurred: {e}"}}
@@ -19,7 +19,7 @@ class GetWeightVisualizationsController:
         """
         self.uc = uc
 
-    def execute(
+    async def execute(
         self, token: str, job_id: int
     ) -> Dict[str, Union[int, GetFinetuningJobVisualizationOutput, Dict[str, str]]]:
         """
@@ -40,7 +40,7 @@ class GetWeightVisualizationsController:
             output: GetFinetuningJobVisualizationOutput
             err: Exception | None
             
-            output, err = self.uc.execute(input_data)
+            output, err = await self.uc.execute(input_data)
             
             if err:
                 # 3. エラー処理
@@ -16,7 +16,7 @@ class CreateFinetuningJobPresenterImpl(CreateFinetuningJobPresenter):
             agent_id=job.agent_id.value,
             status=job.status,
             created_at=job.created_at,
-            message=f"Job {job.id.value} successfully queued and will be processed soon."
+            message=f"Job {job.id.value} accepted. The training file is being uploaded; poll the job status until it becomes queued."
         )
 
 
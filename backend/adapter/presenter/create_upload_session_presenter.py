@@ -0,0 +1,31 @@
+from usecase.create_upload_session import (
+    CreateUploadSessionPresenter,
+    CreateUploadSessionOutput,
+)
+from domain.entities.upload_session import UploadSession
+
+
+class CreateUploadSessionPresenterImpl(CreateUploadSessionPresenter):
+    def output(self, session: UploadSession) -> CreateUploadSessionOutput:
+        """
+        UploadSessionドメインオブジェクトを CreateUploadSessionOutput DTO に変換して返す。
+        """
+        return CreateUploadSessionOutput(
+            upload_id=session.id,
+            agent_id=session.agent_id.value,
+            filename=session.filename,
+            total_size=session.total_size,
+            chunk_size=session.chunk_size,
+            total_chunks=session.total_chunks,
+            received_size=session.received_size,
+            next_chunk=session.next_chunk,
+            status=session.status,
+            expires_at=session.expires_at,
+        )
+
+
+def new_create_upload_session_presenter() -> CreateUploadSessionPresenter:
+    """
+    CreateUploadSessionPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return CreateUploadSessionPresenterImpl()
@@ -0,0 +1,24 @@
+from usecase.finalize_upload_session import FinalizeUploadSessionPresenter
+from usecase.create_finetuning_job import CreateFinetuningJobOutput
+from domain.entities.finetuning_job import FinetuningJob
+
+
+class FinalizeUploadSessionPresenterImpl(FinalizeUploadSessionPresenter):
+    def output(self, job: FinetuningJob) -> CreateFinetuningJobOutput:
+        """
+        分割アップロードから作成した FinetuningJob を CreateFinetuningJobOutput DTO に変換して返す。
+        """
+        return CreateFinetuningJobOutput(
+            id=job.id.value,
+            agent_id=job.agent_id.value,
+            status=job.status,
+            created_at=job.created_at,
+            message=f"Job {job.id.value} accepted. The uploaded file is being verified; poll the job status until it becomes queued."
+        )
+
+
+def new_finalize_upload_session_presenter() -> FinalizeUploadSessionPresenter:
+    """
+    FinalizeUploadSessionPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return FinalizeUploadSessionPresenterImpl()
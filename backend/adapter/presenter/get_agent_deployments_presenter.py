@@ -11,7 +11,7 @@ from domain.entities.deployment import Deployment
 
 
 class GetAgentDeploymentsPresenterImpl(GetAgentDeploymentsPresenter):
-    def output(self, deployments: List[Deployment]) -> GetAgentDeploymentsOutput:
+    def output(self, deployments: List[Deployment], next_cursor: Optional[str] = None) -> GetAgentDeploymentsOutput:
         """
         Deploymentドメインオブジェクトのリストを GetAgentDeploymentsOutput DTO に変換して返す。
         """
@@ -28,7 +28,8 @@ class GetAgentDeploymentsPresenterImpl(GetAgentDeploymentsPresenter):
 
         # 最終的な Output DTO に格納して返す
         return GetAgentDeploymentsOutput(
-            deployments=deployment_list_items
+            deployments=deployment_list_items,
+            next_cursor=next_cursor,
         )
 
 
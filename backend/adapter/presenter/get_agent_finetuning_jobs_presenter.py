@@ -11,7 +11,7 @@ from domain.entities.finetuning_job import FinetuningJob
 
 
 class GetAgentFinetuningJobsPresenterImpl(GetAgentFinetuningJobsPresenter): # ★ クラス名を修正
-    def output(self, jobs: List[FinetuningJob]) -> GetAgentFinetuningJobsOutput: # ★ クラス名を修正
+    def output(self, jobs: List[FinetuningJob], next_cursor: Optional[str] = None) -> GetAgentFinetuningJobsOutput: # ★ クラス名を修正
         """
         FinetuningJobドメインオブジェクトのリストを GetAgentFinetuningJobsOutput DTO に変換して返す。
         """
@@ -25,13 +25,17 @@ class GetAgentFinetuningJobsPresenterImpl(GetAgentFinetuningJobsPresenter): # 
                 created_at=job.created_at.isoformat(),
                 finished_at=job.finished_at.isoformat() if job.finished_at else None,
                 error_message=job.error_message,
+                training_file_hash=job.training_file_hash,
+                cache_hit=job.cache_hit,
+                reused_from_job_id=job.reused_from_job_id.value if job.reused_from_job_id else None,
             )
             for job in jobs
         ]
 
         # 最終的な Output DTO に格納して返す
         return GetAgentFinetuningJobsOutput( # ★ クラス名を修正
-            jobs=job_list_items
+            jobs=job_list_items,
+            next_cursor=next_cursor,
         )
 
 
@@ -14,7 +14,7 @@ class GetAgentsPresenterImpl(GetAgentsPresenter):
     全エージェント取得ユースケース (GetAgentsUseCase) のPresenter具体的な実装。
     AgentドメインオブジェクトのリストをGetAgentsOutput DTOに変換する。
     """
-    def output(self, agents: List[Agent]) -> GetAgentsOutput:
+    def output(self, agents: List[Agent], next_cursor: Optional[str] = None) -> GetAgentsOutput:
         """
         Agentドメインオブジェクトのリストを GetAgentsOutput DTO に変換して返す。
         """
@@ -33,7 +33,8 @@ class GetAgentsPresenterImpl(GetAgentsPresenter):
 
         # 最終的な Output DTO に格納して返す
         return GetAgentsOutput(
-            agents=agent_list_items
+            agents=agent_list_items,
+            next_cursor=next_cursor,
         )
 
 
@@ -0,0 +1,26 @@
+from typing import Optional
+
+# ユースケース層の依存関係をインポート
+from usecase.get_resource_version import (
+    GetResourceVersionPresenter,
+    GetResourceVersionOutput,
+)
+# ドメイン層の依存関係をインポート
+from domain.entities.resource_version import ResourceVersion
+
+
+class GetResourceVersionPresenterImpl(GetResourceVersionPresenter):
+    def output(self, version: Optional[ResourceVersion]) -> GetResourceVersionOutput:
+        """
+        ResourceVersion を GetResourceVersionOutput DTO に変換して返す。
+        """
+        return GetResourceVersionOutput(
+            version=version.value if version is not None else None
+        )
+
+
+def new_get_resource_version_presenter() -> GetResourceVersionPresenter:
+    """
+    GetResourceVersionPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return GetResourceVersionPresenterImpl()
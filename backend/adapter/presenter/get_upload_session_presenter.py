@@ -0,0 +1,32 @@
+from usecase.get_upload_session import (
+    GetUploadSessionPresenter,
+    GetUploadSessionOutput,
+)
+from domain.entities.upload_session import UploadSession
+
+
+class GetUploadSessionPresenterImpl(GetUploadSessionPresenter):
+    def output(self, session: UploadSession) -> GetUploadSessionOutput:
+        """
+        UploadSessionドメインオブジェクトを GetUploadSessionOutput DTO に変換して返す。
+        """
+        return GetUploadSessionOutput(
+            upload_id=session.id,
+            agent_id=session.agent_id.value,
+            filename=session.filename,
+            total_size=session.total_size,
+            chunk_size=session.chunk_size,
+            total_chunks=session.total_chunks,
+            received_size=session.received_size,
+            next_chunk=session.next_chunk,
+            status=session.status,
+            expires_at=session.expires_at,
+            job_id=session.job_id.value if session.job_id else None,
+        )
+
+
+def new_get_upload_session_presenter() -> GetUploadSessionPresenter:
+    """
+    GetUploadSessionPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return GetUploadSessionPresenterImpl()
@@ -0,0 +1,62 @@
+from typing import List
+
+# ユースケース層の依存関係（Output DTOとPresenterインターフェース）
+from usecase.get_weight_stats import (
+    GetFinetuningJobWeightStatsPresenter,
+    GetFinetuningJobWeightStatsOutput,
+    LayerWeightChangeOutput,
+    TensorWeightChangeOutput,
+    WeightChangeMetricsOutput,
+)
+# ドメイン層の依存関係（値オブジェクト）
+from domain.value_objects.weight_change_stats import WeightChangeMetrics, WeightChangeStats
+
+
+def _metrics_output(metrics: WeightChangeMetrics) -> WeightChangeMetricsOutput:
+    return WeightChangeMetricsOutput(
+        numel=metrics.numel,
+        l2_delta=metrics.l2_delta,
+        l2_before=metrics.l2_before,
+        relative_change=metrics.relative_change,
+        cosine_similarity=metrics.cosine_similarity,
+        abs_delta_p50=metrics.abs_delta_p50,
+        abs_delta_p90=metrics.abs_delta_p90,
+        abs_delta_p99=metrics.abs_delta_p99,
+        max_abs_delta=metrics.max_abs_delta,
+        sparsity=metrics.sparsity,
+    )
+
+
+class GetFinetuningJobWeightStatsPresenterImpl(GetFinetuningJobWeightStatsPresenter):
+    def output(self, job_id: int, stats: WeightChangeStats, include_tensors: bool) -> GetFinetuningJobWeightStatsOutput:
+        """
+        WeightChangeStats 値オブジェクトをOutput DTOに変換して返す。
+        include_tensors が False の場合はテンソルごとの統計を省く (一覧表示用に応答を小さくする)。
+        """
+        layers_output: List[LayerWeightChangeOutput] = []
+        for layer_vo in stats.layers:
+            tensors_output = [
+                TensorWeightChangeOutput(name=tensor_vo.name, metrics=_metrics_output(tensor_vo.metrics))
+                for tensor_vo in layer_vo.tensors
+            ] if include_tensors else []
+            layers_output.append(
+                LayerWeightChangeOutput(
+                    layer_name=layer_vo.layer_name,
+                    metrics=_metrics_output(layer_vo.metrics),
+                    tensors=tensors_output,
+                )
+            )
+
+        return GetFinetuningJobWeightStatsOutput(
+            job_id=job_id,
+            sparsity_tolerance=stats.sparsity_tolerance,
+            model=_metrics_output(stats.model),
+            layers=layers_output,
+        )
+
+
+def new_get_finetuning_job_weight_stats_presenter() -> GetFinetuningJobWeightStatsPresenter:
+    """
+    GetFinetuningJobWeightStatsPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return GetFinetuningJobWeightStatsPresenterImpl()
@@ -1,8 +1,9 @@
 import abc
-from typing import List
+from typing import List, Sequence
 
 # ユースケース層の依存関係（Output DTOとPresenterインターフェース）
 from usecase.get_weight_visualizations import (
+    ColorRangeOutput,
     GetFinetuningJobVisualizationPresenter, 
     GetFinetuningJobVisualizationOutput, 
     LayerVisualizationOutput,
@@ -13,24 +14,34 @@ from domain.entities.weight_visualization import WeightVisualization
 from domain.value_objects.visualization_details import LayerVisualization, WeightDetail
 
 
-# ★★★ 新規追加: パス変換ヘルパー関数 ★★★
-def _extract_relative_path(absolute_path: str) -> str:
+# 以前の既定の保存先。この接頭辞で保存済みの可視化データも相対パスに変換する
+LEGACY_VISUALS_BASE_DIR = "/home/ubuntu/visualizations"
+
+
+def _extract_relative_path(absolute_path: str, base_dirs: Sequence[str]) -> str:
     """
-    VPSの絶対パスから、FastAPIプロキシ用の相対パスを抽出する。
+    保存先の絶対パスから、FastAPIプロキシ (/v1/visuals/) 用の相対パス (例: 'job_1/layer0/xxx_delta.png') を抽出する。
+    base_dirs のうち先頭が一致したものを取り除く。
     """
-    # このベースパスは、VPS上の画像保存ルートディレクトリと一致している必要があります
-    BASE_PATH = "/home/ubuntu/visualizations/"
-    
-    if absolute_path.startswith(BASE_PATH):
-        # BASE_PATHの長さを使って、それ以降の相対パス部分を抽出
-        return absolute_path[len(BASE_PATH):]
-        
+    normalized = absolute_path.replace("\\", "/")
+    for base_dir in base_dirs:
+        prefix = base_dir.replace("\\", "/").rstrip("/") + "/"
+        if prefix != "/" and normalized.startswith(prefix):
+            return normalized[len(prefix):]
+
     # 予期せぬパス形式の場合、安全のためにそのまま返すか、エラーをログに記録すべき
     # 今回はそのまま返しますが、理想的にはこの時点でパス形式が統一されているべき
     return absolute_path
 
 
 class GetFinetuningJobVisualizationPresenterImpl(GetFinetuningJobVisualizationPresenter):
+    def __init__(self, visuals_base_dir: str):
+        """
+        visuals_base_dir は worker が可視化画像を保存したベースディレクトリ
+        (VPS_VISUALS_DIR、STORAGE_BACKEND=local の場合は LOCAL_STORAGE_ROOT 直下の visualizations)。
+        """
+        self.base_dirs = [visuals_base_dir, LEGACY_VISUALS_BASE_DIR]
+
     def output(self, visualization: WeightVisualization) -> GetFinetuningJobVisualizationOutput:
         """
         WeightVisualizationエンティティをOutput DTOに変換して返す。
@@ -49,9 +60,19 @@ class GetFinetuningJobVisualizationPresenterImpl(GetFinetuningJobVisualizationPr
                 weights_output.append(
                     WeightVisualizationDetail(
                         name=weight_vo.name,
-                        before_url=_extract_relative_path(weight_vo.before_url), # 変換
-                        after_url=_extract_relative_path(weight_vo.after_url),   # 変換
-                        delta_url=_extract_relative_path(weight_vo.delta_url),   # 変換
+                        before_url=_extract_relative_path(weight_vo.before_url, self.base_dirs), # 変換
+                        after_url=_extract_relative_path(weight_vo.after_url, self.base_dirs),   # 変換
+                        delta_url=_extract_relative_path(weight_vo.delta_url, self.base_dirs),   # 変換
+                        color_ranges={
+                            image_type: ColorRangeOutput(
+                                vmin=color.vmin,
+                                vmax=color.vmax,
+                                cmap=color.cmap,
+                                # 凡例が無い場合は空のまま (相対パスに変換しない)
+                                legend_url=_extract_relative_path(color.legend_url, self.base_dirs) if color.legend_url else "",
+                            )
+                            for image_type, color in weight_vo.color_ranges.items()
+                        },
                     )
                 )
             
@@ -69,8 +90,8 @@ class GetFinetuningJobVisualizationPresenterImpl(GetFinetuningJobVisualizationPr
         )
 
 
-def new_get_finetuning_job_visualization_presenter() -> GetFinetuningJobVisualizationPresenter:
+def new_get_finetuning_job_visualization_presenter(visuals_base_dir: str) -> GetFinetuningJobVisualizationPresenter:
     """
     GetFinetuningJobVisualizationPresenterImpl のインスタンスを生成するファクトリ関数。
     """
-    return GetFinetuningJobVisualizationPresenterImpl()
\ No newline at end of file
+    return GetFinetuningJobVisualizationPresenterImpl(visuals_base_dir)
\ No newline at end of file
@@ -0,0 +1,28 @@
+from usecase.upload_chunk import (
+    UploadChunkPresenter,
+    UploadChunkOutput,
+)
+from domain.entities.upload_session import UploadSession
+
+
+class UploadChunkPresenterImpl(UploadChunkPresenter):
+    def output(self, session: UploadSession) -> UploadChunkOutput:
+        """
+        チャンク受信後の UploadSession を UploadChunkOutput DTO に変換して返す。
+        """
+        return UploadChunkOutput(
+            upload_id=session.id,
+            total_size=session.total_size,
+            chunk_size=session.chunk_size,
+            total_chunks=session.total_chunks,
+            received_size=session.received_size,
+            next_chunk=session.next_chunk,
+            is_complete=session.is_complete,
+        )
+
+
+def new_upload_chunk_presenter() -> UploadChunkPresenter:
+    """
+    UploadChunkPresenterImpl のインスタンスを生成するファクトリ関数。
+    """
+    return UploadChunkPresenterImpl()
@@ -0,0 +1,39 @@
+"""Add composite indexes for keyset pagination
+
+Revision ID: 936df8933438
+Revises: 4489416a7c21
+Create Date: 2026-10-17 10:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '936df8933438'
+down_revision: Union[str, Sequence[str], None] = '4489416a7c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # エージェントごとのジョブ一覧 (created_at DESC, id DESC) のキーセットページング用
+    op.create_index('ix_finetuning_jobs_agent_id_created_at', 'finetuning_jobs', ['agent_id', 'created_at'], unique=False)
+    # ステータス絞り込み + 作成日時順 (ワーカーの queued ジョブ取得もこの索引を使う)
+    op.create_index('ix_finetuning_jobs_status_created_at', 'finetuning_jobs', ['status', 'created_at'], unique=False)
+
+    # 先頭列が同じ単一列索引は複合索引で代替できるため削除する
+    # (agent_id の外部キー制約は ix_finetuning_jobs_agent_id_created_at が満たす)
+    op.drop_index(op.f('ix_finetuning_jobs_agent_id'), table_name='finetuning_jobs')
+    op.drop_index(op.f('ix_finetuning_jobs_status'), table_name='finetuning_jobs')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_index(op.f('ix_finetuning_jobs_status'), 'finetuning_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_finetuning_jobs_agent_id'), 'finetuning_jobs', ['agent_id'], unique=False)
+    op.drop_index('ix_finetuning_jobs_status_created_at', table_name='finetuning_jobs')
+    op.drop_index('ix_finetuning_jobs_agent_id_created_at', table_name='finetuning_jobs')
@@ -0,0 +1,43 @@
+"""Add updated_at row-version columns for conditional GET
+
+Revision ID: b7e2c41d9a05
+Revises: 936df8933438
+Create Date: 2026-10-17 11:03:48.215370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7e2c41d9a05'
+down_revision: Union[str, Sequence[str], None] = '936df8933438'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# 行が変更されるたびに MySQL 側で自動更新される行バージョン (マイクロ秒精度)
+_TABLES = ['agents', 'finetuning_jobs', 'weight_visualizations', 'deployments', 'deployment_methods']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in _TABLES:
+        op.add_column(
+            table,
+            sa.Column(
+                'updated_at',
+                mysql.DATETIME(fsp=6),
+                nullable=False,
+                server_default=sa.text('CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)'),
+            ),
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in reversed(_TABLES):
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,43 @@
+"""Add training file content hash and trained-artifact reuse columns
+
+Revision ID: c4d8e2f1a7b3
+Revises: b7e2c41d9a05
+Create Date: 2026-10-17 13:42:10.518204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d8e2f1a7b3'
+down_revision: Union[str, Sequence[str], None] = 'b7e2c41d9a05'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 訓練データの SHA-256 (アップロード時に計算し、VPS 上のブロブ名にも使う)
+    op.add_column('finetuning_jobs', sa.Column('training_file_hash', sa.CHAR(64), nullable=True))
+    # (訓練データのハッシュ, ベースモデル, ハイパーパラメータ) から求めた成果物キー (ワーカーが設定する)
+    op.add_column('finetuning_jobs', sa.Column('artifact_key', sa.CHAR(64), nullable=True))
+    # 成果物を再利用した場合の再利用元ジョブ (キャッシュヒット)
+    op.add_column('finetuning_jobs', sa.Column('reused_from_job_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_finetuning_jobs_reused_from_job_id', 'finetuning_jobs', 'finetuning_jobs',
+        ['reused_from_job_id'], ['id'], ondelete='SET NULL',
+    )
+    # 同じ成果物キーで完了済みのジョブを探す
+    op.create_index('ix_finetuning_jobs_artifact_key_status', 'finetuning_jobs', ['artifact_key', 'status'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_finetuning_jobs_artifact_key_status', table_name='finetuning_jobs')
+    op.drop_constraint('fk_finetuning_jobs_reused_from_job_id', 'finetuning_jobs', type_='foreignkey')
+    op.drop_column('finetuning_jobs', 'reused_from_job_id')
+    op.drop_column('finetuning_jobs', 'artifact_key')
+    op.drop_column('finetuning_jobs', 'training_file_hash')
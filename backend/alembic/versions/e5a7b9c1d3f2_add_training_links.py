@@ -0,0 +1,41 @@
+"""Add training_links table with ingest-time training file statistics
+
+Revision ID: e5a7b9c1d3f2
+Revises: d91f3a6c5e20
+Create Date: 2026-10-17 17:02:18.553120
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5a7b9c1d3f2'
+down_revision: Union[str, Sequence[str], None] = 'd91f3a6c5e20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('training_links',
+    sa.Column('job_id', sa.Integer(), nullable=False),
+    sa.Column('data_url', sa.String(length=512), nullable=True),
+    sa.Column('file_name', sa.String(length=255), nullable=True),
+    sa.Column('record_count', sa.Integer(), nullable=True),
+    sa.Column('file_size', sa.String(length=32), nullable=True),
+    sa.Column('file_mode', sa.String(length=32), nullable=True),
+    sa.Column('invalid_record_count', sa.Integer(), nullable=True),
+    sa.Column('methods', mysql.MEDIUMTEXT(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=False),
+    sa.ForeignKeyConstraint(['job_id'], ['finetuning_jobs.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('job_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('training_links')
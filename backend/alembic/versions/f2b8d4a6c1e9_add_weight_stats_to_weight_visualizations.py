@@ -0,0 +1,31 @@
+"""Add numeric weight-change statistics to weight_visualizations
+
+Revision ID: f2b8d4a6c1e9
+Revises: e5a7b9c1d3f2
+Create Date: 2026-10-17 18:05:37.214890
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import mysql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2b8d4a6c1e9'
+down_revision: Union[str, Sequence[str], None] = 'e5a7b9c1d3f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 重み変化の統計 (テンソル・レイヤーごとの差分の L2 ノルム・相対変化・コサイン類似度・パーセンタイル・スパース性)。
+    # 可視化と同じ処理でワーカーが集計する。統計を集計していない既存のジョブは NULL
+    op.add_column('weight_visualizations', sa.Column('weight_stats', mysql.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('weight_visualizations', 'weight_stats')
@@ -0,0 +1,65 @@
+"""
+API プロセスのコールドスタート時間を計測するベンチマーク。
+
+毎回新しい Python プロセスを起動し、以下を計測する (uvicorn ワーカー1つの起動に相当)。
+  import   : main モジュールのインポート (ルーター・DI コンテナの構築を含む)
+  ready    : lifespan 起動 (全リソースの生成を含む) から /health の最初の応答まで
+  warm_up  : /health/ready?warm=true の応答まで (起動時に生成できなかったリソースの再試行分)
+
+実行例 (backend ディレクトリで、DB / VPS / Celery の環境変数を設定した状態で):
+    python -m benchmarks.bench_cold_start --runs 10
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# 子プロセスで実行するスクリプト。結果は最終行に JSON で出力する
+# (TestClient 自体のインポートは計測対象外にする)
+_CHILD = r"""
+import json, time
+from fastapi.testclient import TestClient
+t0 = time.perf_counter()
+import main
+t1 = time.perf_counter()
+with TestClient(main.app) as client:
+    client.get("/health")
+    t2 = time.perf_counter()
+    ready = client.get("/health/ready", params={"warm": "true"}).json()
+    t3 = time.perf_counter()
+print(json.dumps({
+    "import": (t1 - t0) * 1000,
+    "ready": (t2 - t1) * 1000,
+    "warm_up": (t3 - t2) * 1000,
+    "failed": ready.get("failed", []),
+}))
+"""
+
+
+def _run_once() -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", _CHILD], capture_output=True, text=True, check=True
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="API cold-start benchmark")
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    results = [_run_once() for _ in range(args.runs)]
+    for key in ("import", "ready", "warm_up"):
+        values = [r[key] for r in results]
+        print(
+            f"{key:<8} median={statistics.median(values):8.1f}ms  "
+            f"min={min(values):8.1f}ms  max={max(values):8.1f}ms"
+        )
+    failed = sorted({name for r in results for name in r["failed"]})
+    if failed:
+        print(f"NOTE: failed to initialize (check environment variables): {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+JSON レスポンス生成の旧経路と新経路を比較するマイクロベンチマーク。
+
+旧経路: dataclasses.asdict -> datetime の再帰変換 -> JSONResponse (標準 json)
+新経路: dataclass をそのまま FastJSONResponse (orjson) に渡して1パスで直列化
+
+大きなジョブ一覧と可視化ペイロードで、1レスポンスあたりの生成時間を表示する。
+
+実行例 (backend ディレクトリで):
+    python -m benchmarks.bench_json_response --jobs 200 2000 --layers 50 --repeat 50
+"""
+import argparse
+import time
+from dataclasses import asdict, dataclass, is_dataclass
+from datetime import datetime, timedelta
+from typing import Any, Callable, List, Optional
+
+from fastapi.responses import JSONResponse
+
+from infrastructure.router.responses import FastJSONResponse
+from usecase.get_agent_finetuning_jobs import (
+    FinetuningJobListItem,
+    GetAgentFinetuningJobsOutput,
+)
+from usecase.get_weight_visualizations import (
+    GetFinetuningJobVisualizationOutput,
+    LayerVisualizationOutput,
+    WeightVisualizationDetail,
+)
+
+
+@dataclass
+class _JobWithDatetime:
+    """datetime をそのまま持つ出力 (再帰変換のコストを見るため)"""
+    id: int
+    agent_id: int
+    status: str
+    created_at: datetime
+    finished_at: Optional[datetime]
+
+
+@dataclass
+class _JobListWithDatetime:
+    jobs: List[_JobWithDatetime]
+    next_cursor: Optional[str] = None
+
+
+def _legacy_render(data: Any) -> bytes:
+    """変更前の handle_response と同じ処理"""
+    if is_dataclass(data):
+        data = asdict(data)
+
+        def convert_datetime_to_str(obj):
+            if isinstance(obj, datetime):
+                return obj.isoformat()
+            if isinstance(obj, dict):
+                return {k: convert_datetime_to_str(v) for k, v in obj.items()}
+            if isinstance(obj, list):
+                return [convert_datetime_to_str(v) for v in obj]
+            return obj
+
+        data = convert_datetime_to_str(data)
+    return JSONResponse(content=data).body
+
+
+def _fast_render(data: Any) -> bytes:
+    return FastJSONResponse(content=data).body
+
+
+def _job_list(n: int) -> GetAgentFinetuningJobsOutput:
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    return GetAgentFinetuningJobsOutput(
+        jobs=[
+            FinetuningJobListItem(
+                id=i,
+                agent_id=1,
+                status="completed",
+                training_file_path=f"/srv/agenthub/training/job_{i}/train.jsonl",
+                created_at=(base + timedelta(minutes=i)).isoformat(),
+                finished_at=(base + timedelta(minutes=i + 30)).isoformat(),
+                error_message=None,
+            )
+            for i in range(n)
+        ],
+        next_cursor="eyJpZCI6MX0",
+    )
+
+
+def _job_list_with_datetime(n: int) -> _JobListWithDatetime:
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    return _JobListWithDatetime(
+        jobs=[
+            _JobWithDatetime(
+                id=i,
+                agent_id=1,
+                status="completed",
+                created_at=base + timedelta(minutes=i),
+                finished_at=base + timedelta(minutes=i + 30),
+            )
+            for i in range(n)
+        ]
+    )
+
+
+def _visualization(layers: int, weights_per_layer: int = 4) -> GetFinetuningJobVisualizationOutput:
+    return GetFinetuningJobVisualizationOutput(
+        job_id=1,
+        layers=[
+            LayerVisualizationOutput(
+                layer_name=f"model.layers.{l}",
+                weights=[
+                    WeightVisualizationDetail(
+                        name=f"w{w}",
+                        before_url=f"/v1/visuals/1/layer{l}/w{w}_before.png",
+                        after_url=f"/v1/visuals/1/layer{l}/w{w}_after.png",
+                        delta_url=f"/v1/visuals/1/layer{l}/w{w}_delta.png",
+                    )
+                    for w in range(weights_per_layer)
+                ],
+            )
+            for l in range(layers)
+        ],
+    )
+
+
+def _measure(func: Callable[[Any], bytes], payload: Any, repeat: int) -> float:
+    func(payload)  # ウォームアップ
+    started = time.perf_counter()
+    for _ in range(repeat):
+        func(payload)
+    return (time.perf_counter() - started) / repeat * 1000.0
+
+
+def _compare(label: str, payload: Any, repeat: int) -> None:
+    legacy = _measure(_legacy_render, payload, repeat)
+    fast = _measure(_fast_render, payload, repeat)
+    size = len(_fast_render(payload))
+    print(
+        f"{label:<28} bytes={size:>9}  legacy={legacy:8.3f}ms  "
+        f"fast={fast:8.3f}ms  speedup={legacy / fast if fast > 0 else 0.0:6.1f}x"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="JSON response serialization benchmark")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[200, 2000])
+    parser.add_argument("--layers", type=int, nargs="+", default=[50, 500])
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+
+    for n in args.jobs:
+        _compare(f"jobs={n}", _job_list(n), args.repeat)
+        _compare(f"jobs(datetime)={n}", _job_list_with_datetime(n), args.repeat)
+    for n in args.layers:
+        _compare(f"visualization layers={n}", _visualization(n), args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+bcrypt のコストごとのログイン検証スループット (logins/sec) を計測するベンチマーク。
+
+BcryptPasswordHashDomainServiceImpl を実際のログインと同じ経路 (verify) で呼び出し、
+同時実行数を上限以上に積んだ場合に何件がアドミッション制御で弾かれるかも表示する。
+
+実行例 (backend ディレクトリで):
+    python -m benchmarks.bench_password_hash --rounds 10 11 12 13 --workers 2 --requests 64
+"""
+import argparse
+import asyncio
+import time
+
+from passlib.context import CryptContext
+
+from domain.services.password_hash_domain_service import PasswordHashBusyError
+from infrastructure.domain.services.password_hash_domain_service_impl import (
+    BcryptPasswordHashDomainServiceImpl,
+)
+
+
+async def _run_one_cost(rounds: int, workers: int, max_pending: int, requests: int, concurrency: int) -> None:
+    password = "benchmark-password"
+    password_hash = CryptContext(schemes=["bcrypt"], bcrypt__rounds=rounds).hash(password)
+    hasher = BcryptPasswordHashDomainServiceImpl(rounds=rounds, max_workers=workers, max_pending=max_pending)
+
+    # プロセス起動コストを計測から除外するためのウォームアップ
+    await asyncio.gather(*(hasher.verify(password, password_hash) for _ in range(workers)))
+
+    accepted = 0
+    rejected = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one_login() -> None:
+        nonlocal accepted, rejected
+        async with semaphore:
+            try:
+                ok = await hasher.verify(password, password_hash)
+                assert ok
+                accepted += 1
+            except PasswordHashBusyError:
+                rejected += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_login() for _ in range(requests)))
+    elapsed = time.perf_counter() - started
+    hasher.shutdown()
+
+    per_sec = accepted / elapsed if elapsed > 0 else 0.0
+    print(
+        f"rounds={rounds:>2}  accepted={accepted:>4}  rejected(503)={rejected:>4}  "
+        f"elapsed={elapsed:7.2f}s  logins/sec={per_sec:8.1f}  "
+        f"ms/login/worker={1000.0 * elapsed * workers / max(accepted, 1):7.1f}"
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="bcrypt login throughput benchmark")
+    parser.add_argument("--rounds", type=int, nargs="+", default=[10, 11, 12, 13])
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--max-pending", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32, help="同時に投げるログイン数")
+    args = parser.parse_args()
+
+    print(f"workers={args.workers} max_pending={args.max_pending} concurrency={args.concurrency}")
+    for rounds in args.rounds:
+        await _run_one_cost(rounds, args.workers, args.max_pending, args.requests, args.concurrency)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
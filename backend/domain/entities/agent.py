@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from ..value_objects.id import ID
+from ..value_objects.page import Page, PageRequest
 
 
 @dataclass
@@ -16,42 +17,49 @@ class Agent:
 
 class AgentRepository(abc.ABC):
     @abc.abstractmethod
-    def create(self, agent: Agent) -> Agent:
+    async def create(self, agent: Agent) -> Agent:
         """
         エージェントを作成して返す
         """
         pass
 
     @abc.abstractmethod
-    def find_by_id(self, agent_id: "ID") -> Optional[Agent]:
+    async def find_by_id(self, agent_id: "ID") -> Optional[Agent]:
         """
         IDからエージェントを検索する
         """
         pass
 
     @abc.abstractmethod
-    def list_by_user_id(self, user_id: "ID") -> list[Agent]:
+    async def list_by_user_id(self, user_id: "ID") -> list[Agent]:
         """
         指定ユーザーのエージェント一覧を取得する
         """
         pass
 
     @abc.abstractmethod
-    def find_all(self) -> list[Agent]:
+    async def find_all(self) -> list[Agent]:
         """
         すべてのエージェントを取得する
         """
         pass
 
     @abc.abstractmethod
-    def update(self, agent: Agent) -> None:
+    async def find_page(self, page: PageRequest) -> Page[Agent]:
+        """
+        すべてのエージェントを ID 昇順でキーセットページングして取得する
+        """
+        pass
+
+    @abc.abstractmethod
+    async def update(self, agent: Agent) -> None:
         """
         エージェント情報を更新する
         """
         pass
 
     @abc.abstractmethod
-    def delete(self, agent_id: "ID") -> None:
+    async def delete(self, agent_id: "ID") -> None:
         """
         IDでエージェントを削除する
         """
@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Optional
 
 from ..value_objects.id import ID
+from ..value_objects.page import Page, PageRequest
 
 
 @dataclass
@@ -15,35 +16,45 @@ class Deployment:
 
 class DeploymentRepository(abc.ABC):
     @abc.abstractmethod
-    def create(self, deployment: Deployment) -> Deployment:
+    async def create(self, deployment: Deployment) -> Deployment:
         """
         デプロイメントを作成して返す
         """
         pass
 
     @abc.abstractmethod
-    def find_by_id(self, deployment_id: "ID") -> Optional[Deployment]:
+    async def find_by_id(self, deployment_id: "ID") -> Optional[Deployment]:
         """
         IDからデプロイメントを取得する
         """
         pass
 
     @abc.abstractmethod
-    def list_by_agent(self, agent_id: "ID") -> list[Deployment]:
+    async def list_by_agent(self, agent_id: "ID") -> list[Deployment]:
         """
         指定エージェントに関連するデプロイメント一覧を取得する
         """
         pass
 
     @abc.abstractmethod
-    def find_by_job_id(self, job_id: "ID") -> Optional[Deployment]: # list[Deployment] から変更
+    async def list_page_by_agent(
+        self, agent_id: "ID", page: PageRequest, status: Optional[str] = None
+    ) -> Page[Deployment]:
+        """
+        指定エージェントに関連するデプロイメントを ID 降順でキーセットページングして取得する。
+        status を指定した場合はそのステータスのデプロイメントのみを返す。
+        """
+        pass
+
+    @abc.abstractmethod
+    async def find_by_job_id(self, job_id: "ID") -> Optional[Deployment]: # list[Deployment] から変更
         """
         job_id に紐づくデプロイメントを（1件）検索する
         """
         pass
 
     @abc.abstractmethod
-    def delete(self, deployment_id: "ID") -> None:
+    async def delete(self, deployment_id: "ID") -> None:
         """
         デプロイメントを削除する
         """
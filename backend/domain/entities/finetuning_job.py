@@ -3,6 +3,7 @@ from dataclasses import dataclass
 from typing import Optional, List
 
 from domain.value_objects.id import ID
+from domain.value_objects.page import Page, PageRequest
 from datetime import datetime
 
 
@@ -19,60 +20,87 @@ class FinetuningJob:
     created_at: datetime
     finished_at: Optional[datetime]
     error_message: Optional[str]
+    # 訓練データの SHA-256 (同一内容のアップロード・学習の重複排除に使う)
+    training_file_hash: Optional[str] = None
+    # 学習済み成果物を再利用した場合の再利用元ジョブ ID (None なら実際に学習した)
+    reused_from_job_id: Optional[ID] = None
+
+    @property
+    def cache_hit(self) -> bool:
+        """学習済み成果物を再利用して完了したかどうか"""
+        return self.reused_from_job_id is not None
 
 
 class FinetuningJobRepository(abc.ABC):
     @abc.abstractmethod
-    def create_job(self, job: FinetuningJob) -> FinetuningJob:
+    async def create_job(self, job: FinetuningJob) -> FinetuningJob:
         """
         ファインチューニングジョブを作成して返す
         """
         pass
 
     @abc.abstractmethod
-    def find_by_id(self, job_id: "ID") -> Optional[FinetuningJob]:
+    async def find_by_id(self, job_id: "ID") -> Optional[FinetuningJob]:
         """
         ジョブIDからジョブを取得する
         """
         pass
         
     @abc.abstractmethod
-    def is_any_running(self) -> bool:
+    async def is_any_running(self) -> bool:
         """
         status='running' のジョブがDBに存在するか確認する（ワーカー排他制御用）
         """
         pass
 
     @abc.abstractmethod
-    def find_next_queued(self) -> Optional[FinetuningJob]:
+    async def find_next_queued(self) -> Optional[FinetuningJob]:
         """
         最も古い 'queued' 状態のジョブを一つ取得する（ワーカーキュー処理用）
         """
         pass
 
     @abc.abstractmethod
-    def list_by_agent(self, agent_id: "ID") -> list[FinetuningJob]:
+    async def list_by_agent(self, agent_id: "ID") -> list[FinetuningJob]:
         """
         指定エージェントに紐づくジョブ一覧を取得する
         """
         pass
+
+    @abc.abstractmethod
+    async def list_page_by_agent(
+        self, agent_id: "ID", page: PageRequest, status: Optional[str] = None
+    ) -> Page[FinetuningJob]:
+        """
+        指定エージェントに紐づくジョブを作成日時の降順でキーセットページングして取得する。
+        status を指定した場合はそのステータスのジョブのみを返す。
+        """
+        pass
     
     @abc.abstractmethod
-    def list_all_by_user(self, user_id: "ID") -> List[FinetuningJob]:
+    async def list_all_by_user(self, user_id: "ID") -> List[FinetuningJob]:
         """
         特定のユーザーが所有する全てのエージェントに紐づくジョブ一覧を取得する。
         """
         pass
 
     @abc.abstractmethod
-    def update_job(self, job: FinetuningJob) -> FinetuningJob:
+    async def update_job(self, job: FinetuningJob) -> FinetuningJob:
         """
         FinetuningJobエンティティの状態をDBに更新する
         """
         pass
 
     @abc.abstractmethod
-    def delete(self, job_id: "ID") -> None:
+    async def fail_stale_uploading(self, created_before: datetime, error_message: str) -> int:
+        """
+        created_before より前に作成され 'uploading' のまま残っているジョブを 'failed' にし、件数を返す。
+        (転送中にプロセスが停止したジョブを、起動時に後始末するために使う)
+        """
+        pass
+
+    @abc.abstractmethod
+    async def delete(self, job_id: "ID") -> None:
         """
         ジョブを削除する
         """
@@ -87,6 +115,8 @@ def NewFinetuningJob(
     created_at: datetime,
     finished_at: Optional[datetime],
     error_message: Optional[str],
+    training_file_hash: Optional[str] = None,
+    reused_from_job_id: Optional[int] = None,
 ) -> FinetuningJob:
     """
     FinetuningJobエンティティを生成するファクトリ関数
@@ -99,4 +129,6 @@ def NewFinetuningJob(
         created_at=created_at,
         finished_at=finished_at,
         error_message=error_message,
+        training_file_hash=training_file_hash,
+        reused_from_job_id=ID(reused_from_job_id) if reused_from_job_id is not None else None,
     )
\ No newline at end of file
@@ -28,28 +28,28 @@ class DeploymentMethodsRepository(abc.ABC):
     DeploymentMethodsエンティティの永続化を管理するリポジトリ（I/F）
     """
     @abc.abstractmethod
-    def find_by_deployment_id(self, deployment_id: ID) -> Optional[DeploymentMethods]:
+    async def find_by_deployment_id(self, deployment_id: ID) -> Optional[DeploymentMethods]:
         """
         デプロイメントIDからメソッドの集合を取得する
         """
         pass
     
     @abc.abstractmethod
-    def find_by_id(self, id: ID) -> Optional[DeploymentMethods]:
+    async def find_by_id(self, id: ID) -> Optional[DeploymentMethods]:
         """
         このエンティティ自体のIDから取得する
         """
         pass
 
     @abc.abstractmethod
-    def save(self, deployment_methods: DeploymentMethods) -> DeploymentMethods:
+    async def save(self, deployment_methods: DeploymentMethods) -> DeploymentMethods:
         """
         メソッドの集合を保存（作成または更新）する
         """
         pass
 
     @abc.abstractmethod
-    def delete_by_deployment_id(self, deployment_id: ID) -> None:
+    async def delete_by_deployment_id(self, deployment_id: ID) -> None:
         """
         デプロイメントIDに紐づくメソッドの集合を削除する
         """
@@ -0,0 +1,39 @@
+import abc
+from dataclasses import dataclass
+from typing import Optional
+
+from ..value_objects.id import ID
+from .agent import Agent
+from .deployment import Deployment
+from .finetuning_job import FinetuningJob
+
+
+@dataclass
+class OwnershipChain:
+    """
+    デプロイメント → ジョブ → エージェント → ユーザー という所有関係を
+    1つにまとめた読み取り専用のエンティティ。
+    権限チェックに必要な行をまとめて保持し、ユースケースでの往復を減らす。
+    """
+    job: FinetuningJob
+    agent: Agent
+    deployment: Optional[Deployment]  # ジョブにデプロイメントが無い場合は None
+    is_owner: bool  # 問い合わせたユーザーがエージェントの所有者かどうか
+
+
+class OwnershipRepository(abc.ABC):
+    @abc.abstractmethod
+    async def resolve_by_job_id(self, job_id: "ID", user_id: "ID") -> Optional[OwnershipChain]:
+        """
+        ジョブIDから所有関係（ジョブ・エージェント・デプロイメント）を1回の問い合わせで取得する。
+        ジョブが存在しない場合は None を返す。
+        """
+        pass
+
+    @abc.abstractmethod
+    async def resolve_by_deployment_id(self, deployment_id: "ID", user_id: "ID") -> Optional[OwnershipChain]:
+        """
+        デプロイメントIDから所有関係（デプロイメント・ジョブ・エージェント）を1回の問い合わせで取得する。
+        デプロイメントが存在しない場合は None を返す。
+        """
+        pass
@@ -0,0 +1,42 @@
+import abc
+from dataclasses import dataclass
+from typing import Optional
+
+from ..value_objects.id import ID
+
+
+@dataclass(frozen=True)
+class ResourceVersion:
+    """
+    読み取り系リソースの「版」を表す読み取り専用のエンティティ。
+    各テーブルの updated_at (行バージョン) と件数から組み立てた不透明な文字列で、
+    内容が変わると必ず値が変わる。条件付き GET (ETag) の判定に使う。
+    """
+    value: str
+
+
+class ResourceVersionRepository(abc.ABC):
+    """
+    一覧・詳細の本体を読まずに、所有者チェックと版の取得だけを1回の問い合わせで行うリポジトリ。
+    いずれのメソッドも、リソースが存在しない・所有者でない場合は None を返す。
+    """
+
+    @abc.abstractmethod
+    async def agent_jobs_version(self, agent_id: "ID", user_id: "ID", status: Optional[str] = None) -> Optional[ResourceVersion]:
+        """エージェントに紐づくファインチューニングジョブ一覧の版"""
+        pass
+
+    @abc.abstractmethod
+    async def agent_deployments_version(self, agent_id: "ID", user_id: "ID", status: Optional[str] = None) -> Optional[ResourceVersion]:
+        """エージェントに紐づくデプロイメント一覧の版"""
+        pass
+
+    @abc.abstractmethod
+    async def job_visualizations_version(self, job_id: "ID", user_id: "ID") -> Optional[ResourceVersion]:
+        """ジョブの重み可視化データの版"""
+        pass
+
+    @abc.abstractmethod
+    async def job_methods_version(self, job_id: "ID", user_id: "ID") -> Optional[ResourceVersion]:
+        """ジョブ (のデプロイメント) に設定されたメソッド一覧の版"""
+        pass
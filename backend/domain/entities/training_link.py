@@ -1,6 +1,6 @@
 import abc
 from dataclasses import dataclass
-from typing import Optional
+from typing import List, Optional
 
 from ..value_objects.id import ID
 
@@ -12,25 +12,29 @@ class TrainingLink:
     file_name: Optional[str]
     record_count: Optional[int]
     file_size: Optional[str]
+    # アップロード時の集計結果 (TrainingFileStats)。ワーカーはこれを使い、ファイルを再走査しない
+    file_mode: Optional[str] = None
+    invalid_record_count: Optional[int] = None
+    methods: Optional[List[str]] = None
 
 
 class TrainingDataRepository(abc.ABC):
     @abc.abstractmethod
-    def create(self, link: TrainingLink) -> TrainingLink:
+    async def create(self, link: TrainingLink) -> TrainingLink:
         """
-        学習データリンクを作成して返す
+        学習データリンクを作成して返す (同じジョブのリンクが既にあれば上書きする)
         """
         pass
 
     @abc.abstractmethod
-    def find_by_job(self, job_id: "ID") -> Optional[TrainingLink]:
+    async def find_by_job(self, job_id: "ID") -> Optional[TrainingLink]:
         """
         ジョブIDから学習データリンクを取得する
         """
         pass
 
     @abc.abstractmethod
-    def update(self, link: TrainingLink) -> None:
+    async def update(self, link: TrainingLink) -> None:
         """
         学習データリンクのメタ情報を更新する
         """
@@ -43,6 +47,9 @@ def NewTrainingLink(
     file_name: Optional[str],
     record_count: Optional[int],
     file_size: Optional[str],
+    file_mode: Optional[str] = None,
+    invalid_record_count: Optional[int] = None,
+    methods: Optional[List[str]] = None,
 ) -> TrainingLink:
     return TrainingLink(
         job_id=ID(job_id),
@@ -50,4 +57,7 @@ def NewTrainingLink(
         file_name=file_name,
         record_count=record_count,
         file_size=file_size,
+        file_mode=file_mode,
+        invalid_record_count=invalid_record_count,
+        methods=methods,
     )
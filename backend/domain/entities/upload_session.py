@@ -0,0 +1,114 @@
+import abc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from domain.value_objects.id import ID
+
+
+# アップロードセッションのステータス
+UPLOAD_SESSION_OPEN = "open"            # チャンクを受付中
+UPLOAD_SESSION_FINALIZED = "finalized"  # 全チャンク受信済み。ジョブを作成した
+UPLOAD_SESSION_EXPIRED = "expired"      # 期限切れ。途中のファイルは削除済み
+
+
+class UploadSessionNotFoundError(LookupError):
+    """セッションが存在しない、または期限切れの場合のエラー"""
+    pass
+
+
+class UploadSessionConflictError(ValueError):
+    """チャンクの順序やセッションの状態が要求と合わない場合のエラー (クライアントはオフセットを問い合わせて再開する)"""
+    pass
+
+
+@dataclass
+class UploadSession:
+    """
+    再開可能な分割アップロードのセッション。
+    クライアントは chunk_size ごとに番号付きのチャンクを送り、途中で切断されても
+    received_size (受信済みのバイト数) から再開できる。チャンクは受信順にストレージ上の一時ファイルへ書き込まれる。
+    """
+    id: str  # ランダムな32桁の16進文字列 (推測されないよう連番は使わない)
+    user_id: ID
+    agent_id: ID
+    filename: str
+    total_size: int
+    chunk_size: int
+    received_size: int
+    status: str
+    created_at: datetime
+    expires_at: datetime
+    # finalize 時に作成したジョブ
+    job_id: Optional[ID] = None
+
+    @property
+    def total_chunks(self) -> int:
+        return max(1, -(-self.total_size // self.chunk_size))
+
+    @property
+    def next_chunk(self) -> int:
+        """次に送るべきチャンク番号 (全て受信済みなら total_chunks)"""
+        if self.is_complete:
+            return self.total_chunks
+        return self.received_size // self.chunk_size
+
+    @property
+    def is_complete(self) -> bool:
+        return self.received_size >= self.total_size
+
+    def is_expired(self, now: datetime) -> bool:
+        return self.status == UPLOAD_SESSION_EXPIRED or (self.status == UPLOAD_SESSION_OPEN and now >= self.expires_at)
+
+    def chunk_range(self, index: int) -> tuple[int, int]:
+        """チャンク番号に対応する (開始オフセット, 期待するサイズ)"""
+        if index < 0 or index >= self.total_chunks:
+            raise ValueError(f"Chunk index {index} is out of range (0..{self.total_chunks - 1}).")
+        offset = index * self.chunk_size
+        return offset, min(self.chunk_size, self.total_size - offset)
+
+
+class UploadSessionRepository(abc.ABC):
+    @abc.abstractmethod
+    async def create(self, session: UploadSession) -> UploadSession:
+        """
+        アップロードセッションを作成して返す
+        """
+        pass
+
+    @abc.abstractmethod
+    async def find_by_id(self, session_id: str) -> Optional[UploadSession]:
+        """
+        セッションIDからセッションを取得する
+        """
+        pass
+
+    @abc.abstractmethod
+    async def advance(self, session_id: str, expected_received_size: int, new_received_size: int) -> bool:
+        """
+        受信済みサイズを expected_received_size から new_received_size に進める (楽観的ロック)。
+        他のリクエストが先に進めていた場合は更新せず False を返す。
+        """
+        pass
+
+    @abc.abstractmethod
+    async def finalize(self, session_id: str, job_id: "ID") -> bool:
+        """
+        'open' のセッションを 'finalized' にしてジョブを紐づける。
+        既に finalize されていた場合は False を返す (二重にジョブを作らない)。
+        """
+        pass
+
+    @abc.abstractmethod
+    async def list_expired(self, now: datetime, limit: int) -> List[UploadSession]:
+        """
+        期限切れの 'open' セッションを取得する (一時ファイルの削除用)
+        """
+        pass
+
+    @abc.abstractmethod
+    async def mark_expired(self, session_id: str) -> None:
+        """
+        セッションを 'expired' にする
+        """
+        pass
@@ -18,56 +18,56 @@ class User:
 
 class UserRepository(abc.ABC):
     @abc.abstractmethod
-    def create(self, user: User) -> User:
+    async def create(self, user: User) -> User:
         """
         ユーザーを新規作成し、作成されたUserを返す
         """
         pass
 
     @abc.abstractmethod
-    def find_by_id(self, user_id: "ID") -> Optional[User]:
+    async def find_by_id(self, user_id: "ID") -> Optional[User]:
         """
         IDからユーザーを検索する
         """
         pass
 
     @abc.abstractmethod
-    def find_by_username(self, username: str) -> Optional[User]:
+    async def find_by_username(self, username: str) -> Optional[User]:
         """
         ユーザー名からユーザーを検索する
         """
         pass
 
     @abc.abstractmethod
-    def find_by_email(self, email: "Email") -> Optional[User]:
+    async def find_by_email(self, email: "Email") -> Optional[User]:
         """
         Emailからユーザーを検索する
         """
         pass
 
     @abc.abstractmethod
-    def find_all(self) -> list[User]:
+    async def find_all(self) -> list[User]:
         """
         すべてのユーザーを取得する
         """
         pass
 
     @abc.abstractmethod
-    def update(self, user: User) -> None:
+    async def update(self, user: User) -> None:
         """
         ユーザー情報を更新する
         """
         pass
 
     @abc.abstractmethod
-    def delete(self, user_id: "ID") -> None:
+    async def delete(self, user_id: "ID") -> None:
         """
         IDでユーザーを削除する
         """
         pass
 
     @abc.abstractmethod
-    def delete_all(self) -> None:
+    async def delete_all(self) -> None:
         """
         すべてのユーザーを削除する
         """
@@ -4,7 +4,8 @@ from typing import List, Optional, Any
 
 # 依存関係
 from domain.value_objects.id import ID
-from domain.value_objects.visualization_details import LayerVisualization, WeightDetail # 作成した値オブジェクトをインポート
+from domain.value_objects.visualization_details import LayerVisualization, WeightDetail, parse_color_ranges # 作成した値オブジェクトをインポート
+from domain.value_objects.weight_change_stats import WeightChangeStats
 
 @dataclass
 class WeightVisualization:
@@ -16,17 +17,22 @@ class WeightVisualization:
 class WeightVisualizationRepository(abc.ABC):
     """WeightVisualizationエンティティの永続化を抽象化するリポジトリインターフェース (CRUD)。"""
     @abc.abstractmethod
-    def save(self, visualization: "WeightVisualization") -> "WeightVisualization":
+    async def save(self, visualization: "WeightVisualization") -> "WeightVisualization":
         """可視化データを新規保存または更新する (Create / Update)。"""
         pass
 
     @abc.abstractmethod
-    def find_by_job_id(self, job_id: ID) -> Optional["WeightVisualization"]:
+    async def find_by_job_id(self, job_id: ID) -> Optional["WeightVisualization"]:
         """ジョブIDから可視化データを取得する (Read)。"""
         pass
 
     @abc.abstractmethod
-    def delete_by_job_id(self, job_id: ID) -> None:
+    async def find_stats_by_job_id(self, job_id: ID) -> Optional[WeightChangeStats]:
+        """ジョブIDから重み変化の統計だけを取得する (画像のパス一覧は読まない)。"""
+        pass
+
+    @abc.abstractmethod
+    async def delete_by_job_id(self, job_id: ID) -> None:
         """ジョブIDに紐づく可視化データを削除する (Delete)。"""
         pass
 
@@ -49,7 +55,8 @@ def NewWeightVisualization(
                 name=weight_dict.get("name", ""),
                 before_url=weight_dict.get("before_url", ""),
                 after_url=weight_dict.get("after_url", ""),
-                delta_url=weight_dict.get("delta_url", "")
+                delta_url=weight_dict.get("delta_url", ""),
+                color_ranges=parse_color_ranges(weight_dict.get("color_ranges")),
             )
             weights.append(weight_detail)
         
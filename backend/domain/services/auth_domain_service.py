@@ -4,14 +4,14 @@ from ..value_objects.email import Email  # Email値オブジェクトを参照
 
 class AuthDomainService(abc.ABC):
     @abc.abstractmethod
-    def login(self, email: Email, password: str) -> str:
+    async def login(self, email: Email, password: str) -> str:
         """
         ユーザーを認証してJWTトークンを返す
         """
         pass
 
     @abc.abstractmethod
-    def verify_token(self, token: str) -> User:
+    async def verify_token(self, token: str) -> User:
         """
         JWTトークンを検証して、対応するUserを返す
         """
@@ -0,0 +1,17 @@
+from typing import Awaitable, Callable, Protocol
+
+
+class BackgroundTaskDomainService(Protocol):
+    """
+    HTTP レスポンスを返した後も処理を継続するバックグラウンドタスクの実行を抽象化するドメインサービスインターフェース。
+    具体的な実行方式 (イベントループ上のタスク等) はインフラ層に委譲される。
+    """
+    def submit(self, name: str, task: Callable[[], Awaitable[None]]) -> None:
+        """
+        タスクを登録し、完了を待たずに戻る。
+
+        Args:
+            name: ログ・監視用のタスク名 (例: "finetuning-upload-12")。
+            task: 引数なしで呼び出すとコルーチンを返す関数。例外はタスク側で処理すること。
+        """
+        ...
@@ -1,5 +1,7 @@
 import abc
-from typing import Protocol, Optional
+from typing import Protocol, Optional, Tuple
+
+from domain.value_objects.training_file_stats import TrainingFileStats
 
 from domain.value_objects.file_data import UploadedFileStream 
 
@@ -11,10 +13,11 @@ class FileStorageDomainService(Protocol):
     def save_training_file(self, uploaded_file: UploadedFileStream, unique_id: str) -> str:
         """
         訓練データとしてアップロードされたファイルストリームを保存し、ワーカーがアクセスできるパスを返す。
+        内容のハッシュで保存するため、同じ内容のファイルは同じパスになる (再アップロードは行わない)。
 
         Args:
             uploaded_file: 抽象ファイルストリームオブジェクト。
-            unique_id: ファイル名の一意性を確保するためのID（例: Agent ID）。
+            unique_id: 呼び出し元を識別するID（例: Job ID。ログ用）。
 
         Returns:
             str: 永続化されたファイルの絶対パス。
@@ -32,4 +35,35 @@ class FileStorageDomainService(Protocol):
         Returns:
             str: 永続化されたモデルファイルの絶対パス。
         """
-        ...
\ No newline at end of file
+        ...
+
+    # --- 再開可能な分割アップロード ---
+
+    def create_upload(self, upload_id: str) -> None:
+        """
+        分割アップロード用の空の一時ファイルを作成する。
+        """
+        ...
+
+    def write_upload_chunk(self, upload_id: str, offset: int, data: bytes) -> None:
+        """
+        チャンクを一時ファイルの offset の位置に書き込む。
+        同じチャンクを再送しても同じ位置に上書きされるだけなので、再試行は安全。
+        """
+        ...
+
+    def commit_upload(self, upload_id: str, filename: str) -> Tuple[str, str, TrainingFileStats]:
+        """
+        受信が完了した一時ファイルを1回読み、SHA-256 の計算と訓練データの検証・集計を行ってから
+        ブロブとして確定する (save_training_file と同じパス。同じ内容のブロブが既にあれば一時ファイルを削除する)。
+
+        Returns:
+            Tuple[str, str, TrainingFileStats]: (ワーカーがアクセスできる絶対パス, SHA-256, 統計)
+        """
+        ...
+
+    def discard_upload(self, upload_id: str) -> None:
+        """
+        分割アップロードの一時ファイルを削除する (期限切れ・中断時)。存在しなくてもエラーにしない。
+        """
+        ...
@@ -1,27 +1,52 @@
 import abc
-from typing import Protocol, Tuple
+from typing import Optional, Protocol, Tuple
 import os
 import mimetypes
 
 # 抽象化されたストリーム型をインポート (backend/domain/value_objects/binary_stream.py で定義されたもの)
 from domain.value_objects.binary_stream import BinaryStream 
+from domain.value_objects.file_info import FileInfo
 
 class FileStreamDomainService(Protocol):
     """
     リモートの永続ストレージから、特定のファイルをバイナリストリームとして取得し、
     HTTP配信に利用する責務を持つドメインサービスインターフェース。
     """
-    def get_file_stream_by_path(self, relative_path: str) -> Tuple[BinaryStream, str]:
+    def get_file_stream_by_path(self, relative_path: str) -> Tuple[BinaryStream, str, FileInfo]:
         """
         ファイルパスを受け取り、ファイルの中身をBinaryStreamとして返す。
+        ストリームはファイル全体をメモリに読み込まず、read() のたびにストレージから読み出す
+        (seek で任意の位置から読めるので、Range リクエストにも使える)。呼び出し側が close() すること。
         
         Args:
             relative_path: VPSの可視化ベースディレクトリに対する相対パス (例: 'job_ID/layer0/image.png')。
             
         Returns:
-            Tuple[BinaryStream, str]: ファイルのストリームと、推測されたMIMEタイプ (例: 'image/png')。
+            Tuple[BinaryStream, str, FileInfo]: ファイルのストリームと、推測されたMIMEタイプ (例: 'image/png')、
+            サイズと最終更新時刻。
             
         Raises:
             Exception: ファイルが見つからない場合や接続エラーが発生した場合。
         """
-        ...
\ No newline at end of file
+        ...
+
+    def get_local_file_path(self, relative_path: str) -> Optional[str]:
+        """
+        ファイルがこのプロセスから直接読めるローカルディスク上にある場合、その絶対パスを返す。
+        パスを返せる場合、配信側はストリームを経由せずファイルを直接送信できる
+        (サーバーが対応していれば pathsend/sendfile。local_file_is_cache が True の場合は開いたファイルから送信する)。
+
+        Returns:
+            Optional[str]: ローカルファイルの絶対パス。リモートストレージの場合は None。
+
+        Raises:
+            Exception: ローカルストレージでファイルが見つからない場合。
+        """
+        ...
+
+    def local_file_is_cache(self) -> bool:
+        """
+        get_local_file_path が返すパスが、リモートのファイルをキャッシュしたローカルの複製かどうか。
+        複製は他のリクエストの取得による追い出しで削除されうるため、配信側は開いてから送信する必要がある。
+        """
+        ...
@@ -0,0 +1,36 @@
+import abc
+
+
+class PasswordHashBusyError(Exception):
+    """パスワードハッシュ処理の実行枠が埋まっており、受け付けられない場合のエラー"""
+    pass
+
+
+class PasswordHashDomainService(abc.ABC):
+    """
+    パスワードのハッシュ化・検証を行うドメインサービスインターフェース。
+    ユースケースや認証サービスは具体的なハッシュアルゴリズム（bcrypt など）に依存しない。
+    """
+
+    @abc.abstractmethod
+    async def hash(self, password: str) -> str:
+        """
+        平文パスワードをハッシュ化して返す。
+        実行枠が埋まっている場合は PasswordHashBusyError を送出する。
+        """
+        pass
+
+    @abc.abstractmethod
+    async def verify(self, password: str, password_hash: str) -> bool:
+        """
+        平文パスワードとハッシュが一致するか検証する。
+        実行枠が埋まっている場合は PasswordHashBusyError を送出する。
+        """
+        pass
+
+    @abc.abstractmethod
+    def needs_rehash(self, password_hash: str) -> bool:
+        """
+        既存ハッシュが現在の設定（コストなど）と異なり、再ハッシュが必要かどうかを返す。
+        """
+        pass
@@ -0,0 +1,30 @@
+from typing import Optional, Protocol
+
+
+class VisualizationRenderDomainService(Protocol):
+    """
+    事前に描画されていない可視化画像 (ヒートマップ) を、ジョブが保存した重み (weights.npz) から
+    表示時に描画する責務を持つドメインサービスインターフェース。
+    """
+    def render_image(self, relative_path: str) -> Optional[str]:
+        """
+        画像の相対パス (例: 'job_ID/layer0/<重み名>_delta.png') に対応するヒートマップを描画し、
+        ローカルディスク上の PNG ファイルの絶対パスを返す (一度描画した画像は再利用する)。
+        拡大表示用のタイルピラミッド (Deep Zoom) の記述子 '<重み名>_delta.dzi' と
+        タイル '<重み名>_delta_files/<レベル>/<列>_<行>.png' も同じように返す。
+
+        Returns:
+            Optional[str]: 描画した PNG のパス。可視化画像のパスでない・ジョブに重みが保存されていない・
+            重みが見つからない場合は None。
+
+        Raises:
+            Exception: 重みの取得や描画に失敗した場合。
+        """
+        ...
+
+    def is_render_only(self, relative_path: str) -> bool:
+        """
+        ストレージには保存されず、表示時の描画でのみ得られるパス (タイルピラミッドの記述子・タイル) かどうか。
+        True の場合、呼び出し側はストレージを探さずに render_image を呼ぶ。
+        """
+        ...
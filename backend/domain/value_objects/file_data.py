@@ -3,6 +3,8 @@
 import abc
 from typing import BinaryIO, Optional
 
+from domain.value_objects.training_file_stats import TrainingFileStats
+
 class UploadedFileStream(abc.ABC):
     """
     ファイルアップロードデータを抽象的に表現するドメイン層のインターフェース。
@@ -34,4 +36,27 @@ class UploadedFileStream(abc.ABC):
         （FastAPIの UploadFile.read() に対応）
         """
         pass
-    # ★★★ 修正箇所ここまで ★★★
\ No newline at end of file
+    # ★★★ 修正箇所ここまで ★★★
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """
+        ファイル内容の SHA-256 (16進文字列)。受信時に計算済みの実装のみ値を返し、
+        未計算の場合は None (必要な側が file_stream から計算する)。
+        """
+        return None
+
+    @property
+    def training_stats(self) -> Optional[TrainingFileStats]:
+        """
+        受信時に集計した訓練データの統計 (形式の検証結果・レコード数・メソッド一覧)。
+        集計していない実装は None。
+        """
+        return None
+
+    def close(self) -> None:
+        """
+        ストリームが保持する一時ファイル等を解放する。
+        リクエスト終了後もファイルを参照する実装 (ディスクへのスプール等) が上書きする。
+        """
+        pass
@@ -0,0 +1,12 @@
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """
+    配信するファイルのメタデータ。
+    HTTP の Content-Length・Last-Modified・ETag (条件付き GET / Range の検証子) の生成に使う。
+    """
+    size: int
+    # 最終更新時刻 (UNIX 時間・秒)
+    modified_at: float
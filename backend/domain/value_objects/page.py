@@ -0,0 +1,39 @@
+from dataclasses import dataclass
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 1ページあたりの件数の既定値と上限
+DEFAULT_PAGE_LIMIT = 50
+MAX_PAGE_LIMIT = 200
+
+
+class InvalidPageCursorError(ValueError):
+    """ページングカーソルが不正（改ざん・形式違い）な場合のエラー"""
+    pass
+
+
+@dataclass(frozen=True)
+class PageRequest:
+    """
+    キーセット（カーソル）ページングの要求を表す値オブジェクト。
+    after には前ページの next_cursor をそのまま渡す（中身はリポジトリ実装が解釈する）。
+    """
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: Optional[str] = None
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.limit, int):
+            raise TypeError(f"PageRequest.limit must be int, got {type(self.limit).__name__}")
+        if self.limit < 1 or self.limit > MAX_PAGE_LIMIT:
+            raise ValueError(f"limit must be between 1 and {MAX_PAGE_LIMIT}")
+
+
+@dataclass
+class Page(Generic[T]):
+    """
+    キーセットページングの結果。
+    next_cursor が None の場合は最終ページ。
+    """
+    items: List[T]
+    next_cursor: Optional[str] = None
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from typing import List, Optional, Set
+
+
+# 訓練データの形式 (ワーカーはこれに応じて学習するかどうかを決める)
+TRAINING_FILE_MODE_EMPTY = "empty"                          # 空ファイル: 学習せずベースモデルを使う
+TRAINING_FILE_MODE_METHOD_DEFINITION = "method_definition"  # タブを含まない: 1行1メソッドの定義のみ
+TRAINING_FILE_MODE_TRAINING = "training"                    # タブ区切りの triplet (Anchor, Positive, Negative[, ...])
+
+# メソッド一覧を保存する上限 (超えた場合は保存せず、ワーカーがファイルから抽出する)
+MAX_STORED_METHODS = 10000
+
+
+@dataclass(frozen=True)
+class TrainingFileStats:
+    """
+    アップロード時に1パスで集計した訓練データの統計。
+    record_count は有効な triplet 行 (タブを2つ以上含む行) の数、
+    methods は Positive/Negative 列 (method_definition の場合は各行) のユニークなメソッド名。
+    """
+    file_size: int
+    file_mode: str
+    record_count: int
+    invalid_record_count: int
+    methods: Optional[List[str]]
+    # 形式の誤り (UTF-8 として読めない等)。None なら有効
+    error: Optional[str] = None
+
+    @property
+    def is_valid(self) -> bool:
+        return self.error is None
+
+
+class TrainingFileAnalyzer:
+    """
+    訓練データをストリームのまま検証・集計する。
+    ファイルをディスクへ書き込む (またはハッシュを計算する) ループから feed() を呼び、最後に finish() で結果を得る。
+    判定基準はワーカーの従来の判定 (空 / タブなし / タブ2つ以上の行数) と同じ。
+    """
+
+    def __init__(self) -> None:
+        self._size = 0
+        self._consumed = 0
+        self._pending = b""
+        self._has_content = False
+        self._has_tab = False
+        # 最後の非空白文字より後ろにタブがあるか (後に内容が続けば、ファイル全体の strip 後もタブが残る)
+        self._tab_pending = False
+        self._record_count = 0
+        self._invalid_record_count = 0
+        self._methods: Set[str] = set()
+        self._definition_methods: Set[str] = set()
+        self._error: Optional[str] = None
+
+    def feed(self, chunk: bytes) -> None:
+        self._size += len(chunk)
+        if self._error is not None:
+            return
+        data = self._pending + chunk
+        cut = data.rfind(b"\n")
+        if cut < 0:
+            self._pending = data
+            return
+        self._pending = data[cut + 1:]
+        self._consume(data[:cut + 1])
+
+    def finish(self) -> TrainingFileStats:
+        if self._error is None and self._pending:
+            self._consume(self._pending)
+        self._pending = b""
+
+        if not self._has_content:
+            mode = TRAINING_FILE_MODE_EMPTY
+            methods: Set[str] = set()
+        elif not self._has_tab:
+            mode = TRAINING_FILE_MODE_METHOD_DEFINITION
+            methods = self._definition_methods
+        else:
+            mode = TRAINING_FILE_MODE_TRAINING
+            methods = self._methods
+
+        return TrainingFileStats(
+            file_size=self._size,
+            file_mode=mode,
+            record_count=self._record_count if mode == TRAINING_FILE_MODE_TRAINING else 0,
+            invalid_record_count=self._invalid_record_count if mode == TRAINING_FILE_MODE_TRAINING else 0,
+            methods=sorted(methods) if len(methods) <= MAX_STORED_METHODS else None,
+            error=self._error,
+        )
+
+    def _consume(self, block: bytes) -> None:
+        # 行単位ではなくブロック単位でデコードする (行ごとの decode より速い)
+        try:
+            text = block.decode("utf-8")
+        except UnicodeDecodeError as e:
+            self._error = f"Training file is not valid UTF-8 (byte offset {self._consumed + e.start})."
+            return
+        finally:
+            self._consumed += len(block)
+        for line in text.split("\n"):
+            stripped = line.strip()
+            if not stripped:
+                if "\t" in line:
+                    self._tab_pending = True
+                continue
+            # 「タブを含むか」はワーカーと同じくファイル全体を strip した内容で判定する
+            # (行頭・行末の空白にあるタブも、前後に内容があれば数える)
+            leading = line[:len(line) - len(line.lstrip())]
+            if "\t" in stripped or (self._has_content and (self._tab_pending or "\t" in leading)):
+                self._has_tab = True
+            self._tab_pending = "\t" in line[len(line.rstrip()):]
+            self._has_content = True
+            parts = stripped.split("\t")
+            if len(parts) >= 3:
+                self._record_count += 1
+            else:
+                self._invalid_record_count += 1
+            # 上限を超えたメソッド一覧は保存しないので、それ以上は集めない (メモリを抑える)
+            if len(self._methods) <= MAX_STORED_METHODS:
+                # 抽出対象は Positive (2列目) と Negative (3列目) のみ
+                if len(parts) > 1 and parts[1]:
+                    self._methods.add(parts[1].strip())
+                if len(parts) > 2 and parts[2]:
+                    self._methods.add(parts[2].strip())
+            if len(self._definition_methods) <= MAX_STORED_METHODS:
+                self._definition_methods.add(stripped)
+
+
+def format_file_size(size: int) -> str:
+    """バイト数を表示用の文字列 (例: '12.3 MB') に変換する"""
+    value = float(size)
+    for unit in ("B", "KB", "MB", "GB"):
+        if value < 1024 or unit == "GB":
+            return f"{int(value)} {unit}" if unit == "B" else f"{value:.1f} {unit}"
+        value /= 1024
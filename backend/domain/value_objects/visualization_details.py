@@ -1,17 +1,47 @@
 import abc
 from dataclasses import dataclass, field
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
+
+@dataclass(frozen=True) # 値オブジェクトは不変
+class ColorRange:
+    """ヒートマップの色範囲 (画像に描かない値の目盛り) と、カラーマップの凡例画像のURL"""
+    vmin: float
+    vmax: float
+    cmap: str
+    legend_url: str = ""
 
 @dataclass(frozen=True) # 値オブジェクトは不変
 class WeightDetail:
-    """単一の重みに関する可視化詳細（画像URL）"""
+    """単一の重みに関する可視化詳細（画像URLと、画像の種類 (before / after / delta) ごとの色範囲）"""
     name: str
     before_url: str
     after_url: str
     delta_url: str
+    color_ranges: Dict[str, ColorRange] = field(default_factory=dict)
 
 @dataclass(frozen=True) # 値オブジェクトは不変
 class LayerVisualization:
     """単一のレイヤーに関する可視化情報"""
     layer_name: str
     weights: List[WeightDetail]
+
+
+def parse_color_ranges(data: Any) -> Dict[str, ColorRange]:
+    """
+    ワーカーが保存した重みごとの色範囲 (layers_data の color_ranges) を値オブジェクトに変換する。
+    記録されていない (以前の可視化) 場合や値が欠けている画像の種類は含めない。
+    """
+    if not isinstance(data, dict):
+        return {}
+    ranges = {}
+    for image_type, color in data.items():
+        try:
+            ranges[image_type] = ColorRange(
+                vmin=float(color["vmin"]),
+                vmax=float(color["vmax"]),
+                cmap=str(color.get("cmap", "")),
+                legend_url=str(color.get("legend_url") or ""),
+            )
+        except (TypeError, KeyError, ValueError, AttributeError):
+            continue
+    return ranges
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+
+# ワーカー (weight_stats.py) が書き出す統計の形式の版。これと異なる版は読まない
+WEIGHT_STATS_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True) # 値オブジェクトは不変
+class WeightChangeMetrics:
+    """
+    ファインチューニング前後の重みの変化の大きさ (テンソル・レイヤー・モデル全体で共通)。
+    比率やパーセンタイルは求められない場合 (要素数 0・変化前のノルム 0) に None。
+    """
+    numel: int
+    l2_delta: Optional[float]           # 差分の L2 ノルム ||after - before||
+    l2_before: Optional[float]          # 変化前の L2 ノルム
+    relative_change: Optional[float]    # l2_delta / l2_before
+    cosine_similarity: Optional[float]  # 変化前と変化後のコサイン類似度
+    abs_delta_p50: Optional[float]      # |差分| のパーセンタイル (レイヤー・モデル全体は近似値)
+    abs_delta_p90: Optional[float]
+    abs_delta_p99: Optional[float]
+    max_abs_delta: Optional[float]
+    sparsity: Optional[float]           # ほとんど変化していない要素の割合
+
+@dataclass(frozen=True) # 値オブジェクトは不変
+class TensorWeightChange:
+    """単一のテンソル (重み) の変化"""
+    name: str
+    metrics: WeightChangeMetrics
+
+@dataclass(frozen=True) # 値オブジェクトは不変
+class LayerWeightChange:
+    """単一のレイヤーの変化 (レイヤー内のテンソルを合わせたもの)"""
+    layer_name: str
+    metrics: WeightChangeMetrics
+    tensors: List[TensorWeightChange]
+
+@dataclass(frozen=True) # 値オブジェクトは不変
+class WeightChangeStats:
+    """ジョブの重み変化の統計全体"""
+    sparsity_tolerance: float
+    model: WeightChangeMetrics
+    layers: List[LayerWeightChange]
+
+
+def _optional_float(value: Any) -> Optional[float]:
+    return float(value) if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def _parse_metrics(data: Dict[str, Any]) -> WeightChangeMetrics:
+    return WeightChangeMetrics(
+        numel=int(data.get("numel") or 0),
+        l2_delta=_optional_float(data.get("l2_delta")),
+        l2_before=_optional_float(data.get("l2_before")),
+        relative_change=_optional_float(data.get("relative_change")),
+        cosine_similarity=_optional_float(data.get("cosine_similarity")),
+        abs_delta_p50=_optional_float(data.get("abs_delta_p50")),
+        abs_delta_p90=_optional_float(data.get("abs_delta_p90")),
+        abs_delta_p99=_optional_float(data.get("abs_delta_p99")),
+        max_abs_delta=_optional_float(data.get("max_abs_delta")),
+        sparsity=_optional_float(data.get("sparsity")),
+    )
+
+
+def parse_weight_change_stats(data: Any) -> Optional[WeightChangeStats]:
+    """
+    ワーカーが保存した統計 (weight_visualizations.weight_stats の JSON) を値オブジェクトに変換する。
+    統計が無い・形式の版が異なる場合は None。
+    """
+    if not isinstance(data, dict) or data.get("format") != WEIGHT_STATS_FORMAT_VERSION:
+        return None
+    layers = []
+    for layer_dict in data.get("layers", []):
+        tensors = [
+            TensorWeightChange(name=tensor_dict.get("name", ""), metrics=_parse_metrics(tensor_dict))
+            for tensor_dict in layer_dict.get("tensors", [])
+        ]
+        layers.append(LayerWeightChange(
+            layer_name=layer_dict.get("layer_name", ""),
+            metrics=_parse_metrics(layer_dict),
+            tensors=tensors,
+        ))
+    return WeightChangeStats(
+        sparsity_tolerance=float(data.get("sparsity_tolerance") or 0.0),
+        model=_parse_metrics(data.get("model") or {}),
+        layers=layers,
+    )
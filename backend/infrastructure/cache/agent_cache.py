@@ -0,0 +1,356 @@
+import asyncio
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from domain.entities.agent import Agent, AgentRepository, NewAgent
+from domain.value_objects.id import ID
+from domain.value_objects.page import Page, PageRequest
+
+
+# キーの形式を変えた場合はここを上げる (デプロイ中に新旧のワーカーが混在しても衝突しない)
+_KEY_SCHEMA_VERSION = 1
+
+# 世代番号の取得とエントリの取得を1往復で行う Lua スクリプト
+_LOOKUP_SCRIPT = """
+local gen = redis.call('GET', KEYS[1]) or '0'
+return {gen, redis.call('GET', ARGV[1] .. gen .. ':' .. ARGV[2])}
+"""
+
+
+class CachedAgentRepository(AgentRepository):
+    """
+    AgentRepository の読み取り (find_by_id / list_by_user_id / find_all / find_page) を
+    キャッシュするリードスルーのデコレータ。書き込みはそのまま内側のリポジトリに委譲する。
+
+    - キーは「スキーマ版 + 世代番号 + 問い合わせ内容」で構成する。
+      create / update / delete のたびに世代番号を上げることで、既存のエントリをまとめて無効化する
+      (古い世代のエントリは読まれなくなり TTL で消える。読み込み中に更新が入っても古い世代に書かれるだけ)。
+    - 同じキーへの同時ミスは1回の DB 問い合わせにまとめる (プロセス内はシングルフライト、
+      ワーカー間は Redis の短命ロックで1ワーカーだけが DB を読み、他はその結果を待つ)。
+    - redis_url 未指定時、または Redis 障害時はプロセス内の LRU + TTL キャッシュで動作する。
+      障害中に行った無効化は、Redis 復旧時に世代番号を上げて反映する。
+    """
+
+    def __init__(
+        self,
+        inner: AgentRepository,
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "agenthub:agents:",
+        lock_timeout: float = 2.0,
+        redis_retry_seconds: float = 5.0,
+    ):
+        self.inner = inner
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = f"{key_prefix}v{_KEY_SCHEMA_VERSION}:"
+        self.lock_timeout = lock_timeout
+        self.redis_retry_seconds = redis_retry_seconds
+
+        # ローカル層: "世代:問い合わせ" -> (失効時刻(epoch秒), 値)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._local_generation = 0
+        # シングルフライト: キー -> DB 読み込み中のタスク
+        self._inflight: Dict[str, "asyncio.Task[Any]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self.coalesced = 0
+        self.invalidations = 0
+
+        self._redis = None
+        self._lookup_script = None
+        # Redis 障害時は一定時間ローカル層のみを使う
+        self._redis_down_until = 0.0
+        # 障害中に無効化を取りこぼした場合は復旧時に世代番号を上げる
+        self._redis_generation_dirty = False
+        if redis_url:
+            # redis は任意依存。未インストールの場合はローカル層のみで動作する
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+                self._lookup_script = self._redis.register_script(_LOOKUP_SCRIPT)
+                print(f"INFO: Agent cache uses Redis at {redis_url}")
+            except ImportError:
+                print("ERROR: redis package is not installed. Agent cache runs in-process only.")
+
+    # --- 読み取り (キャッシュ対象) ---
+    async def find_by_id(self, agent_id: "ID") -> Optional[Agent]:
+        return await self._read_through(
+            f"id:{agent_id.value}",
+            lambda: self.inner.find_by_id(agent_id),
+            lambda agent: self._encode_agent(agent) if agent is not None else None,
+            lambda data: self._decode_agent(data) if data is not None else None,
+        )
+
+    async def list_by_user_id(self, user_id: "ID") -> List[Agent]:
+        return await self._read_through(
+            f"user:{user_id.value}",
+            lambda: self.inner.list_by_user_id(user_id),
+            lambda agents: [self._encode_agent(a) for a in agents],
+            lambda data: [self._decode_agent(d) for d in data],
+        )
+
+    async def find_all(self) -> List[Agent]:
+        return await self._read_through(
+            "all",
+            self.inner.find_all,
+            lambda agents: [self._encode_agent(a) for a in agents],
+            lambda data: [self._decode_agent(d) for d in data],
+        )
+
+    async def find_page(self, page: PageRequest) -> Page[Agent]:
+        # 不正なカーソルは内側のリポジトリで InvalidPageCursorError になり、キャッシュされない
+        return await self._read_through(
+            f"page:{page.limit}:{page.after or ''}",
+            lambda: self.inner.find_page(page),
+            lambda p: {"items": [self._encode_agent(a) for a in p.items], "next_cursor": p.next_cursor},
+            lambda data: Page(items=[self._decode_agent(d) for d in data["items"]], next_cursor=data["next_cursor"]),
+        )
+
+    # --- 書き込み (委譲した後に無効化する) ---
+    async def create(self, agent: Agent) -> Agent:
+        created = await self.inner.create(agent)
+        await self.invalidate()
+        return created
+
+    async def update(self, agent: Agent) -> None:
+        await self.inner.update(agent)
+        await self.invalidate()
+
+    async def delete(self, agent_id: "ID") -> None:
+        await self.inner.delete(agent_id)
+        await self.invalidate()
+
+    # --- 公開API ---
+    async def invalidate(self) -> None:
+        """世代番号を上げて、全エントリを無効化する"""
+        self.invalidations += 1
+        self._local_generation += 1
+        self._entries.clear()
+
+        if self._redis is not None:
+            try:
+                await self._redis.incr(self._generation_key())
+            except Exception as e:
+                self._mark_redis_down(e)
+                self._redis_generation_dirty = True
+
+    def stats(self) -> Dict[str, Any]:
+        """ヒット/ミス等のカウンタを返す"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "coalesced": self.coalesced,
+            "invalidations": self.invalidations,
+            "redis_available": self._redis is not None and time.time() >= self._redis_down_until,
+        }
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    # --- リードスルー本体 ---
+    async def _read_through(
+        self,
+        query: str,
+        loader: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any],
+        decode: Callable[[Any], Any],
+    ) -> Any:
+        if await self._redis_available():
+            try:
+                generation, raw = await self._redis_lookup(query)
+            except Exception as e:
+                self._mark_redis_down(e)
+            else:
+                if raw is not None:
+                    self.hits += 1
+                    self.redis_hits += 1
+                    return decode(json.loads(raw))
+                self.misses += 1
+                entry_key = self._entry_key(generation, query)
+                data = await self._single_flight(
+                    entry_key, lambda: self._load_with_redis_lock(entry_key, loader, encode)
+                )
+                return decode(data)
+
+        # ローカル層 (Redis 未設定・障害時)
+        local_key = f"{self._local_generation}:{query}"
+        now = time.time()
+        entry = self._entries.get(local_key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > now:
+                self._entries.move_to_end(local_key)
+                self.hits += 1
+                return value
+            del self._entries[local_key]
+
+        self.misses += 1
+        value = await self._single_flight(f"local:{local_key}", loader)
+        self._store_local(local_key, value)
+        return value
+
+    async def _single_flight(self, key: str, load: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        同じキーの読み込みを1つのタスクにまとめる。
+        呼び出し元がキャンセルされても読み込み自体は継続し、待っている他のリクエストに結果を渡す。
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(load())
+            self._inflight[key] = task
+            task.add_done_callback(lambda t, k=key: self._on_load_done(k, t))
+        else:
+            self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _on_load_done(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # 待っている呼び出し元が全てキャンセルされた場合に例外が未回収のまま残らないようにする
+        if not task.cancelled():
+            task.exception()
+
+    async def _load_with_redis_lock(
+        self,
+        entry_key: str,
+        loader: Callable[[], Awaitable[Any]],
+        encode: Callable[[Any], Any],
+    ) -> Any:
+        """
+        ワーカー間のスタンピード対策。ロックを取れたワーカーだけが DB を読んで Redis に書き込み、
+        取れなかったワーカーは lock_timeout までエントリが書き込まれるのを待つ。
+        戻り値は JSON 化可能な形式 (encode 済み)。
+        """
+        lock_key = f"{entry_key}:lock"
+        try:
+            acquired = await self._redis.set(lock_key, "1", nx=True, px=int(self.lock_timeout * 1000))
+        except Exception as e:
+            self._mark_redis_down(e)
+            return encode(await loader())
+
+        if not acquired:
+            deadline = time.monotonic() + self.lock_timeout
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                try:
+                    raw = await self._redis.get(entry_key)
+                except Exception as e:
+                    self._mark_redis_down(e)
+                    break
+                if raw is not None:
+                    self.coalesced += 1
+                    return json.loads(raw)
+            # 待ちきれない場合は自分で読む
+            return encode(await loader())
+
+        try:
+            # ロック取得までの間に他のワーカーが書き込みを終えている場合はそれを使う
+            try:
+                raw = await self._redis.get(entry_key)
+            except Exception as e:
+                self._mark_redis_down(e)
+                raw = None
+            if raw is not None:
+                self.coalesced += 1
+                return json.loads(raw)
+
+            data = encode(await loader())
+            try:
+                await self._redis.set(entry_key, json.dumps(data), px=int(self.ttl_seconds * 1000))
+            except Exception as e:
+                self._mark_redis_down(e)
+            return data
+        finally:
+            try:
+                await self._redis.delete(lock_key)
+            except Exception:
+                pass
+
+    # --- Redis 層 ---
+    async def _redis_available(self) -> bool:
+        if self._redis is None or time.time() < self._redis_down_until:
+            return False
+        if self._redis_generation_dirty:
+            # 障害中の書き込みで取りこぼした無効化を反映してから使う
+            try:
+                await self._redis.incr(self._generation_key())
+            except Exception as e:
+                self._mark_redis_down(e)
+                return False
+            self._redis_generation_dirty = False
+        return True
+
+    async def _redis_lookup(self, query: str) -> Tuple[str, Optional[bytes]]:
+        result = await self._lookup_script(keys=[self._generation_key()], args=[self.key_prefix, query])
+        generation = result[0].decode() if isinstance(result[0], bytes) else str(result[0])
+        raw = result[1] if len(result) > 1 else None
+        return generation, raw
+
+    def _mark_redis_down(self, error: Exception) -> None:
+        self.redis_errors += 1
+        self._redis_down_until = time.time() + self.redis_retry_seconds
+        print(f"ERROR: Agent cache Redis error, falling back to in-process cache for {self.redis_retry_seconds}s: {error}")
+
+    # --- ローカル層 ---
+    def _store_local(self, key: str, value: Any) -> None:
+        if not key.startswith(f"{self._local_generation}:"):
+            # 読み込み中に無効化された場合は古い値を載せない
+            return
+        self._entries[key] = (time.time() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    # --- ユーティリティ ---
+    @staticmethod
+    def _encode_agent(agent: Agent) -> Dict[str, Any]:
+        return {
+            "id": agent.id.value,
+            "user_id": agent.user_id.value,
+            "owner": agent.owner,
+            "name": agent.name,
+            "description": agent.description,
+        }
+
+    @staticmethod
+    def _decode_agent(data: Dict[str, Any]) -> Agent:
+        return NewAgent(
+            id=data["id"],
+            user_id=data["user_id"],
+            owner=data["owner"],
+            name=data["name"],
+            description=data["description"],
+        )
+
+    def _generation_key(self) -> str:
+        return f"{self.key_prefix}gen"
+
+    def _entry_key(self, generation: str, query: str) -> str:
+        # _LOOKUP_SCRIPT と同じ形式
+        return f"{self.key_prefix}{generation}:{query}"
+
+
+def NewCachedAgentRepositoryFromEnv(inner: AgentRepository) -> CachedAgentRepository:
+    """
+    環境変数から CachedAgentRepository を生成するファクトリ関数。
+
+    AGENT_CACHE_SIZE=1024         # ローカル層の最大エントリ数
+    AGENT_CACHE_TTL=60            # 秒。無効化を取りこぼした場合でもこの時間で最新になる
+    AGENT_CACHE_REDIS_URL=redis://redis:6379/2   # 任意。未設定ならローカル層のみ
+    """
+    max_entries = int(os.getenv("AGENT_CACHE_SIZE", "1024"))
+    ttl_seconds = float(os.getenv("AGENT_CACHE_TTL", "60"))
+    redis_url = os.getenv("AGENT_CACHE_REDIS_URL") or None
+    return CachedAgentRepository(inner, max_entries=max_entries, ttl_seconds=ttl_seconds, redis_url=redis_url)
@@ -0,0 +1,206 @@
+import hashlib
+import os
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from typing import BinaryIO, Callable, Dict, Optional
+
+
+# fill の型: 書き込み先を受け取り、元ファイルの更新時刻 (UNIX 時間) を返す (None ならキャッシュへの書き込み時刻のまま)
+FillFunc = Callable[[BinaryIO], Optional[float]]
+
+
+class _Fill:
+    """同じキーへの同時ミスを1回の取得にまとめるための待ち合わせ"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.path: Optional[str] = None
+        self.error: Optional[BaseException] = None
+
+
+class ImageDiskCache:
+    """
+    ストレージ (SFTP) から取得した可視化画像をローカルディスクに保持する、合計サイズ上限付きの LRU キャッシュ。
+    可視化画像はジョブ完了後に変わらないため、失効は容量による追い出しのみ。
+
+    - ヒット時はキャッシュ上のファイルパスを返し、呼び出し側はそのままディスクから送信する。
+    - 同じキーへの同時ミスは1回の取得にまとめる (シングルフライト。後続は先行の完了を待つ)。
+    - 取得は一時ファイルに書いてからリネームするので、書き込み途中のファイルを返すことはない。
+    - キャッシュ上のファイルには元ファイルの更新時刻を付ける (配信時の Last-Modified・ETag が取得し直しても変わらない)。
+    - 再起動時は既存のファイルを取得順 (ctime) に読み込み、容量の上限を守る。
+    呼び出しはワーカースレッドから行う前提 (取得はブロッキングI/O)。
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int, fill_timeout: float = 60.0):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.fill_timeout = fill_timeout
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        # キャッシュファイル名 -> サイズ (先頭ほど古い)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._inflight: Dict[str, _Fill] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.fill_errors = 0
+        self.evictions = 0
+        self.evicted_bytes = 0
+
+        self._load_existing()
+
+    def get_or_fill(self, key: str, fill: FillFunc) -> str:
+        """
+        key に対応するキャッシュファイルのパスを返す。無ければ fill(書き込み先) で取得してから返す。
+        fill が更新時刻を返した場合は、キャッシュ上のファイルの更新時刻をそれに合わせる。
+        fill の例外 (FileNotFoundError 等) はそのまま送出し、失敗した結果はキャッシュしない。
+        """
+        name = self._entry_name(key)
+        with self._lock:
+            if name in self._entries:
+                path = self._entry_path(name)
+                if os.path.exists(path):
+                    self._entries.move_to_end(name)
+                    self.hits += 1
+                    return path
+                # 外部から削除されていた場合は取得し直す
+                self._total_bytes -= self._entries.pop(name)
+            pending = self._inflight.get(name)
+            if pending is None:
+                pending = _Fill()
+                self._inflight[name] = pending
+                self.misses += 1
+                leader = True
+            else:
+                self.coalesced += 1
+                leader = False
+
+        if not leader:
+            if not pending.done.wait(self.fill_timeout):
+                raise TimeoutError(f"Timed out waiting for cache fill of {key}")
+            if pending.error is not None:
+                raise pending.error
+            return pending.path
+
+        try:
+            pending.path = self._fill(name, fill)
+            return pending.path
+        except BaseException as e:
+            pending.error = e
+            with self._lock:
+                self.fill_errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(name, None)
+            pending.done.set()
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット/ミス/追い出し等のカウンタと現在の使用量を返す"""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "fill_errors": self.fill_errors,
+                "evictions": self.evictions,
+                "evicted_bytes": self.evicted_bytes,
+                "in_flight": len(self._inflight),
+            }
+
+    # --- 内部処理 ---
+
+    def _fill(self, name: str, fill: FillFunc) -> str:
+        path = self._entry_path(name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        try:
+            with open(temp_path, "wb") as f:
+                modified_at = fill(f)
+            if modified_at is not None:
+                os.utime(temp_path, (modified_at, modified_at))
+            os.replace(temp_path, path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        size = os.path.getsize(path)
+        with self._lock:
+            self._entries[name] = size
+            self._total_bytes += size
+            self._evict_locked(keep=name)
+        return path
+
+    def _evict_locked(self, keep: Optional[str] = None) -> None:
+        """上限を超えている間、古いものから削除する (直前に追加したエントリは残す)"""
+        while self._total_bytes > self.max_bytes and self._entries:
+            name, size = next(iter(self._entries.items()))
+            if name == keep:
+                break
+            del self._entries[name]
+            self._total_bytes -= size
+            self.evictions += 1
+            self.evicted_bytes += size
+            try:
+                os.unlink(self._entry_path(name))
+            except FileNotFoundError:
+                pass
+            except OSError as e:
+                print(f"WARN: Failed to evict cached image {name}: {e}")
+
+    def _load_existing(self) -> None:
+        found = []
+        for root, _, files in os.walk(self.cache_dir):
+            for filename in files:
+                path = os.path.join(root, filename)
+                try:
+                    if ".tmp-" in filename:
+                        # 取得途中で終了したプロセスの一時ファイル
+                        os.unlink(path)
+                        continue
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                # mtime は元ファイルの更新時刻なので、キャッシュへ書き込んだ時刻 (ctime) の順に並べる
+                found.append((st.st_ctime, filename, st.st_size))
+        for _, filename, size in sorted(found):
+            self._entries[filename] = size
+            self._total_bytes += size
+        self._evict_locked()
+        if found:
+            print(f"INFO: Image cache loaded {len(self._entries)} file(s) ({self._total_bytes} bytes) from {self.cache_dir}")
+
+    @staticmethod
+    def _entry_name(key: str) -> str:
+        # キー (相対パス) はファイル名に使わずハッシュにする (../ などをディスク上のパスに持ち込まない)
+        suffix = os.path.splitext(key)[1].lower()
+        if not suffix.replace(".", "").isalnum():
+            suffix = ""
+        return hashlib.sha256(key.encode("utf-8")).hexdigest() + suffix
+
+    def _entry_path(self, name: str) -> str:
+        return os.path.join(self.cache_dir, name[:2], name)
+
+
+def NewImageDiskCacheFromEnv() -> Optional[ImageDiskCache]:
+    """
+    環境変数から ImageDiskCache を生成するファクトリ関数。0 を指定した場合はキャッシュしない (None)。
+
+    IMAGE_CACHE_DIR=/var/cache/agenthub/images   # 既定: <一時ディレクトリ>/agenthub-image-cache
+    IMAGE_CACHE_MAX_BYTES=1073741824             # 既定: 1GiB
+    """
+    max_bytes = int(os.getenv("IMAGE_CACHE_MAX_BYTES") or 1024 * 1024 * 1024)
+    if max_bytes <= 0:
+        return None
+    cache_dir = os.getenv("IMAGE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "agenthub-image-cache")
+    return ImageDiskCache(cache_dir, max_bytes)
@@ -0,0 +1,240 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from domain.entities.user import User
+from domain.value_objects.email import Email
+from domain.value_objects.id import ID
+
+
+class PrincipalCache:
+    """
+    検証済み JWT から復元したユーザー（プリンシパル）をキャッシュする LRU + TTL キャッシュ。
+
+    - キーはトークンの SHA-256 ダイジェスト（トークン本体は保持しない）
+    - 有効期限は min(TTL, トークンの exp) で、期限切れトークンがヒットすることはない
+    - password_hash はキャッシュに載せない（認可判定には不要なため）
+    - redis_url を指定すると Redis を2段目として使い、複数の uvicorn ワーカー間で共有する
+      (他ワーカーのローカル層は TTL 経過までしか古い値を保持しない)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: float = 300.0,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "agenthub:principal:",
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.key_prefix = key_prefix
+
+        # ダイジェスト -> (失効時刻(epoch秒), User)
+        self._entries: "OrderedDict[str, Tuple[float, User]]" = OrderedDict()
+        # ユーザーID -> ダイジェスト集合（ユーザー単位の無効化用）
+        self._user_index: Dict[int, Set[str]] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.redis_hits = 0
+        self.redis_errors = 0
+        self.invalidations = 0
+
+        self._redis = None
+        if redis_url:
+            # redis は任意依存。未インストールの場合はローカル層のみで動作する
+            try:
+                import redis.asyncio as aioredis
+                self._redis = aioredis.from_url(redis_url)
+                print(f"INFO: Principal cache uses Redis tier at {redis_url}")
+            except ImportError:
+                print("ERROR: redis package is not installed. Principal cache runs in-process only.")
+
+    # --- 公開API ---
+    async def get(self, token: str) -> Optional[User]:
+        digest = self._digest(token)
+        now = time.time()
+
+        entry = self._entries.get(digest)
+        if entry is not None:
+            expires_at, user = entry
+            if expires_at > now:
+                self._entries.move_to_end(digest)
+                self.hits += 1
+                return user
+            self._drop(digest)
+
+        if self._redis is not None:
+            user, expires_at = await self._redis_get(digest)
+            if user is not None and expires_at > now:
+                self._store_local(digest, user, expires_at)
+                self.hits += 1
+                self.redis_hits += 1
+                return user
+
+        self.misses += 1
+        return None
+
+    async def set(self, token: str, user: User, token_exp: Optional[float]) -> None:
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        if token_exp is not None:
+            expires_at = min(expires_at, float(token_exp))
+        if expires_at <= now:
+            return
+
+        principal = self._strip_secret(user)
+        digest = self._digest(token)
+        self._store_local(digest, principal, expires_at)
+
+        if self._redis is not None:
+            await self._redis_set(digest, principal, expires_at)
+
+    async def invalidate_user(self, user_id: "ID") -> None:
+        """指定ユーザーに紐づく全エントリを破棄する（ユーザー更新・削除時に呼ばれる）"""
+        self.invalidations += 1
+        for digest in list(self._user_index.get(user_id.value, ())):
+            self._drop(digest)
+
+        if self._redis is not None:
+            index_key = self._user_index_key(user_id.value)
+            try:
+                digests = await self._redis.smembers(index_key)
+                keys = [self._entry_key(d.decode() if isinstance(d, bytes) else d) for d in digests]
+                await self._redis.delete(index_key, *keys)
+            except Exception as e:
+                self.redis_errors += 1
+                print(f"ERROR: Failed to invalidate principal cache in Redis for user {user_id.value}: {e}")
+
+    async def clear(self) -> None:
+        """全エントリを破棄する（全ユーザー削除時など）"""
+        self.invalidations += 1
+        self._entries.clear()
+        self._user_index.clear()
+
+        if self._redis is not None:
+            try:
+                async for key in self._redis.scan_iter(match=f"{self.key_prefix}*"):
+                    await self._redis.delete(key)
+            except Exception as e:
+                self.redis_errors += 1
+                print(f"ERROR: Failed to clear principal cache in Redis: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """ヒット/ミス等のカウンタを返す"""
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "redis_hits": self.redis_hits,
+            "redis_errors": self.redis_errors,
+            "invalidations": self.invalidations,
+        }
+
+    async def close(self) -> None:
+        if self._redis is not None:
+            await self._redis.aclose()
+
+    # --- ローカル層 ---
+    def _store_local(self, digest: str, user: User, expires_at: float) -> None:
+        if digest in self._entries:
+            self._drop(digest)
+        self._entries[digest] = (expires_at, user)
+        self._user_index.setdefault(user.id.value, set()).add(digest)
+
+        while len(self._entries) > self.max_entries:
+            oldest, _ = next(iter(self._entries.items()))
+            self._drop(oldest)
+
+    def _drop(self, digest: str) -> None:
+        entry = self._entries.pop(digest, None)
+        if entry is None:
+            return
+        user_id = entry[1].id.value
+        digests = self._user_index.get(user_id)
+        if digests is not None:
+            digests.discard(digest)
+            if not digests:
+                del self._user_index[user_id]
+
+    # --- Redis 層 (障害時はミス扱いにして認証自体は継続する) ---
+    async def _redis_get(self, digest: str) -> Tuple[Optional[User], float]:
+        try:
+            raw = await self._redis.get(self._entry_key(digest))
+        except Exception as e:
+            self.redis_errors += 1
+            print(f"ERROR: Failed to read principal cache from Redis: {e}")
+            return None, 0.0
+        if raw is None:
+            return None, 0.0
+
+        data = json.loads(raw)
+        user = User(
+            id=ID(data["id"]),
+            username=data["username"],
+            name=data["name"],
+            email=Email(data["email"]),
+            avatar_url=data["avatar_url"],
+            password_hash="",
+        )
+        return user, float(data["expires_at"])
+
+    async def _redis_set(self, digest: str, user: User, expires_at: float) -> None:
+        payload = json.dumps({
+            "id": user.id.value,
+            "username": user.username,
+            "name": user.name,
+            "email": user.email.value,
+            "avatar_url": user.avatar_url,
+            "expires_at": expires_at,
+        })
+        ttl_ms = max(1, int((expires_at - time.time()) * 1000))
+        index_key = self._user_index_key(user.id.value)
+        try:
+            pipe = self._redis.pipeline()
+            pipe.set(self._entry_key(digest), payload, px=ttl_ms)
+            pipe.sadd(index_key, digest)
+            pipe.pexpire(index_key, int(self.ttl_seconds * 1000) + ttl_ms)
+            await pipe.execute()
+        except Exception as e:
+            self.redis_errors += 1
+            print(f"ERROR: Failed to write principal cache to Redis: {e}")
+
+    # --- ユーティリティ ---
+    @staticmethod
+    def _digest(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _strip_secret(user: User) -> User:
+        return User(
+            id=user.id,
+            username=user.username,
+            name=user.name,
+            email=user.email,
+            avatar_url=user.avatar_url,
+            password_hash="",
+        )
+
+    def _entry_key(self, digest: str) -> str:
+        return f"{self.key_prefix}{digest}"
+
+    def _user_index_key(self, user_id: int) -> str:
+        return f"{self.key_prefix}user:{user_id}"
+
+
+def NewPrincipalCacheFromEnv() -> PrincipalCache:
+    """
+    環境変数から PrincipalCache を生成するファクトリ関数。
+
+    AUTH_PRINCIPAL_CACHE_SIZE=10000       # ローカル層の最大エントリ数 (0 で無効)
+    AUTH_PRINCIPAL_CACHE_TTL=300          # 秒。トークンの exp を超えることはない
+    AUTH_PRINCIPAL_CACHE_REDIS_URL=redis://redis:6379/1   # 任意。未設定ならローカル層のみ
+    """
+    max_entries = int(os.getenv("AUTH_PRINCIPAL_CACHE_SIZE", "10000"))
+    ttl_seconds = float(os.getenv("AUTH_PRINCIPAL_CACHE_TTL", "300"))
+    redis_url = os.getenv("AUTH_PRINCIPAL_CACHE_REDIS_URL") or None
+    return PrincipalCache(max_entries=max_entries, ttl_seconds=ttl_seconds, redis_url=redis_url)
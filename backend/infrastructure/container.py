@@ -0,0 +1,419 @@
+import asyncio
+import inspect
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generic, List, Optional, TypeVar
+
+# ドメイン層のインターフェース (軽量なのでそのままインポートする)
+from domain.entities.deployment import DeploymentRepository
+from domain.entities.finetuning_job import FinetuningJobRepository
+from domain.entities.methods import DeploymentMethodsRepository
+from domain.entities.ownership import OwnershipRepository
+from domain.entities.resource_version import ResourceVersionRepository
+from domain.entities.training_link import TrainingDataRepository
+from domain.entities.upload_session import UploadSessionRepository
+from domain.entities.user import UserRepository
+from domain.entities.weight_visualization import WeightVisualizationRepository
+from domain.services.auth_domain_service import AuthDomainService
+from domain.services.background_task_domain_service import BackgroundTaskDomainService
+from domain.services.deployment_test_domain_service import DeploymentTestDomainService
+from domain.services.file_storage_domain_service import FileStorageDomainService
+from domain.services.get_image_stream_domain_service import FileStreamDomainService
+from domain.services.job_method_finder_domain_service import JobMethodFinderDomainService
+from domain.services.job_queue_domain_service import JobQueueDomainService
+from domain.services.password_hash_domain_service import PasswordHashDomainService
+from domain.services.system_time_domain_service import SystemTimeDomainService
+from domain.services.visualization_render_domain_service import VisualizationRenderDomainService
+
+if TYPE_CHECKING:
+    from infrastructure.cache.agent_cache import CachedAgentRepository
+    from infrastructure.cache.principal_cache import PrincipalCache
+    from infrastructure.database.mysql.config import MySQLConfig
+    from infrastructure.storage.upload_spool import UploadSpool
+
+
+T = TypeVar("T")
+
+
+def _on_event_loop() -> bool:
+    """現在のスレッドでイベントループが実行中かどうか"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class ResourceUnavailableError(Exception):
+    """リソースが未生成 (起動時の生成に失敗し、再試行中) のため利用できない"""
+    pass
+
+
+class LazyResource(Generic[T]):
+    """
+    プロセス内で共有されるリソース1つ分。lifespan でワーカースレッドから生成する (AppContainer.warm_up)。
+    生成に失敗した場合は例外をそのまま送出し、次回アクセス時に再度生成を試みる
+    (例: VPS の鍵が無い場合でも、SFTP を使わないルートは影響を受けない)。
+    生成処理 (プール・Redis への接続、鍵の読み込み等) はブロッキングのため、イベントループ上では実行しない。
+    イベントループから未生成のリソースを参照した場合は、生成をワーカースレッドで始めて ResourceUnavailableError を送出する。
+    """
+
+    def __init__(self, name: str, factory: Callable[[], T], closer: Optional[Callable[[T], Any]] = None):
+        self.name = name
+        self._factory = factory
+        self._closer = closer
+        self._instance: Optional[T] = None
+        # SFTP の取得などワーカースレッドから参照される場合があるためスレッドロックで保護する
+        self._lock = threading.Lock()
+        self.init_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+        # イベントループから始めた再生成が実行中かどうか (同時に1つだけ実行する)
+        self._retrying = False
+
+    @property
+    def warm(self) -> bool:
+        return self._instance is not None
+
+    def get(self) -> T:
+        instance = self._instance
+        if instance is not None:
+            return instance
+        if _on_event_loop():
+            self._retry_in_background()
+            raise ResourceUnavailableError(f"{self.name} is not available: {self.last_error or 'initializing'}")
+        return self._create()
+
+    def _create(self) -> T:
+        with self._lock:
+            if self._instance is None:
+                started = time.perf_counter()
+                try:
+                    self._instance = self._factory()
+                except Exception as e:
+                    self.last_error = str(e)
+                    print(f"ERROR: Failed to initialize {self.name}: {e}")
+                    raise
+                self.init_seconds = time.perf_counter() - started
+                self.last_error = None
+                print(f"INFO: Initialized {self.name} in {self.init_seconds * 1000:.1f}ms")
+            return self._instance
+
+    def _retry_in_background(self) -> None:
+        with self._lock:
+            if self._retrying:
+                return
+            self._retrying = True
+        threading.Thread(target=self._retry, name=f"init-{self.name}", daemon=True).start()
+
+    def _retry(self) -> None:
+        try:
+            self._create()
+        except Exception:
+            # エラーは _create が last_error に記録している
+            pass
+        finally:
+            self._retrying = False
+
+    async def close(self) -> None:
+        instance, self._instance = self._instance, None
+        if instance is None or self._closer is None:
+            return
+        try:
+            result = self._closer(instance)
+            if inspect.isawaitable(result):
+                await result
+        except Exception as e:
+            print(f"ERROR: Failed to close {self.name}: {e}")
+
+
+class AppContainer:
+    """
+    アプリケーション全体の依存関係を保持する DI コンテナ。
+
+    重いリソース (DB プール・SFTP 鍵・Celery クライアント・HTTP クライアント等) は
+    インポート時には生成せず、実装モジュールのインポートも生成時まで遅延させる (インポートのコストを抑える)。
+    FastAPI の lifespan で生成し、warm_up() をワーカースレッドで実行して全リソースを生成してからリクエストを受け付ける。
+    シャットダウン時に aclose() で生成済みのものだけを閉じる。
+    """
+
+    def __init__(self):
+        self._resources: List[LazyResource] = []
+
+        self._db_config = self._register("db_config", self._create_db_config)
+        self._visuals_base_dir = self._register("visuals_base_dir", self._create_visuals_base_dir)
+        self._principal_cache = self._register("principal_cache", self._create_principal_cache, lambda c: c.close())
+        self._password_hasher = self._register("password_hasher", self._create_password_hasher, lambda h: h.shutdown())
+        self._user_repo = self._register("user_repo", self._create_user_repo)
+        self._agent_repo = self._register("agent_repo", self._create_agent_repo, lambda r: r.close())
+        self._finetuning_job_repo = self._register("finetuning_job_repo", self._create_finetuning_job_repo)
+        self._weight_visualization_repo = self._register("weight_visualization_repo", self._create_weight_visualization_repo)
+        self._deployment_repo = self._register("deployment_repo", self._create_deployment_repo)
+        self._methods_repo = self._register("methods_repo", self._create_methods_repo)
+        self._resource_version_repo = self._register("resource_version_repo", self._create_resource_version_repo)
+        self._upload_session_repo = self._register("upload_session_repo", self._create_upload_session_repo)
+        self._training_data_repo = self._register("training_data_repo", self._create_training_data_repo)
+        self._auth_service = self._register("auth_service", self._create_auth_service)
+        self._system_time_service = self._register("system_time_service", self._create_system_time_service)
+        self._file_storage_service = self._register("file_storage_service", self._create_file_storage_service)
+        self._file_stream_service = self._register("file_stream_service", self._create_file_stream_service)
+        self._visualization_render_service = self._register("visualization_render_service", self._create_visualization_render_service)
+        self._job_queue_service = self._register("job_queue_service", self._create_job_queue_service, lambda q: q.close())
+        self._job_method_finder_service = self._register("job_method_finder_service", self._create_job_method_finder_service)
+        self._http_client = self._register("http_client", self._create_http_client, lambda c: c.aclose())
+        self._test_inference_service = self._register("test_inference_service", self._create_test_inference_service)
+        self._upload_spool = self._register("upload_spool", self._create_upload_spool)
+        # 実行中のバックグラウンドタスクは DB・SFTP・キューを使うため、最後に登録して最初に閉じる (完了を待つ)
+        self._background_task_service = self._register("background_task_service", self._create_background_task_service, lambda s: s.close())
+
+    def _register(self, name: str, factory: Callable[[], T], closer: Optional[Callable[[T], Any]] = None) -> LazyResource[T]:
+        resource = LazyResource(name, factory, closer)
+        self._resources.append(resource)
+        return resource
+
+    # --- 生成処理 (実装モジュールはここで初めてインポートする) ---
+
+    def _create_db_config(self) -> "MySQLConfig":
+        from infrastructure.database.mysql.config import NewMySQLConfigFromEnv
+        return NewMySQLConfigFromEnv()
+
+    def _create_visuals_base_dir(self) -> str:
+        from infrastructure.storage.local_file_storage import GetVisualsBaseDirFromEnv
+        return GetVisualsBaseDirFromEnv()
+
+    def _create_principal_cache(self) -> "PrincipalCache":
+        from infrastructure.cache.principal_cache import NewPrincipalCacheFromEnv
+        return NewPrincipalCacheFromEnv()
+
+    def _create_password_hasher(self) -> PasswordHashDomainService:
+        from infrastructure.domain.services.password_hash_domain_service_impl import NewPasswordHashDomainServiceFromEnv
+        return NewPasswordHashDomainServiceFromEnv()
+
+    def _create_user_repo(self) -> UserRepository:
+        from infrastructure.database.mysql.user_repository import MySQLUserRepository
+        # ユーザー更新・削除時にプリンシパルキャッシュを無効化する
+        return MySQLUserRepository(self.db_config, self.principal_cache)
+
+    def _create_agent_repo(self) -> "CachedAgentRepository":
+        from infrastructure.database.mysql.agent_repository import MySQLAgentRepository
+        from infrastructure.cache.agent_cache import NewCachedAgentRepositoryFromEnv
+        # 読み取りは Redis (障害時はプロセス内 LRU) のリードスルーキャッシュを経由する
+        return NewCachedAgentRepositoryFromEnv(MySQLAgentRepository(self.db_config))
+
+    def _create_finetuning_job_repo(self) -> FinetuningJobRepository:
+        from infrastructure.database.mysql.finetuning_job_repository import MySQLFinetuningJobRepository
+        return MySQLFinetuningJobRepository(self.db_config)
+
+    def _create_weight_visualization_repo(self) -> WeightVisualizationRepository:
+        from infrastructure.database.mysql.weight_visualization_repository import MySQLWeightVisualizationRepository
+        return MySQLWeightVisualizationRepository(self.db_config)
+
+    def _create_deployment_repo(self) -> DeploymentRepository:
+        from infrastructure.database.mysql.deployment_repository import MySQLDeploymentRepository
+        return MySQLDeploymentRepository(self.db_config)
+
+    def _create_methods_repo(self) -> DeploymentMethodsRepository:
+        from infrastructure.database.mysql.methods_repository import MySQLMethodsRepository
+        return MySQLMethodsRepository(self.db_config)
+
+    def _create_resource_version_repo(self) -> ResourceVersionRepository:
+        from infrastructure.database.mysql.resource_version_repository import MySQLResourceVersionRepository
+        return MySQLResourceVersionRepository(self.db_config)
+
+    def _create_upload_session_repo(self) -> UploadSessionRepository:
+        from infrastructure.database.mysql.upload_session_repository import MySQLUploadSessionRepository
+        return MySQLUploadSessionRepository(self.db_config)
+
+    def _create_training_data_repo(self) -> TrainingDataRepository:
+        from infrastructure.database.mysql.training_data_repository import MySQLTrainingDataRepository
+        return MySQLTrainingDataRepository(self.db_config)
+
+    def _create_auth_service(self) -> AuthDomainService:
+        from infrastructure.domain.services.auth_domain_service_impl import NewAuthDomainService
+        return NewAuthDomainService(self.user_repo, self.password_hasher, self.principal_cache)
+
+    def _create_system_time_service(self) -> SystemTimeDomainService:
+        from infrastructure.domain.services.system_time_domain_service_impl import NewSystemTimeDomainService
+        return NewSystemTimeDomainService()
+
+    def _create_file_storage_service(self) -> FileStorageDomainService:
+        from infrastructure.domain.services.file_storage_domain_service_impl import NewFileStorageDomainService
+        return NewFileStorageDomainService()
+
+    def _create_file_stream_service(self) -> FileStreamDomainService:
+        from infrastructure.domain.services.get_image_stream_domain_service_impl import NewFileStreamDomainService
+        return NewFileStreamDomainService()
+
+    def _create_visualization_render_service(self) -> VisualizationRenderDomainService:
+        from infrastructure.domain.services.visualization_render_domain_service_impl import NewVisualizationRenderDomainService
+        return NewVisualizationRenderDomainService(self.file_stream_service)
+
+    def _create_job_queue_service(self) -> JobQueueDomainService:
+        from infrastructure.domain.services.job_queue_domain_service_impl import NewJobQueueDomainService
+        return NewJobQueueDomainService()
+
+    def _create_job_method_finder_service(self) -> JobMethodFinderDomainService:
+        from infrastructure.domain.services.job_method_finder_domain_service_impl import JobMethodFinderDomainServiceImpl
+        return JobMethodFinderDomainServiceImpl(timeout=5)
+
+    def _create_http_client(self):
+        import httpx
+        return httpx.AsyncClient(timeout=15.0)
+
+    def _create_test_inference_service(self) -> DeploymentTestDomainService:
+        from infrastructure.domain.services.deployment_test_domain_service_impl import DeploymentTestDomainServiceImpl
+        return DeploymentTestDomainServiceImpl(client=self._http_client.get())
+
+    def _create_upload_spool(self) -> "UploadSpool":
+        from infrastructure.storage.upload_spool import NewUploadSpoolFromEnv
+        return NewUploadSpoolFromEnv()
+
+    def _create_background_task_service(self) -> BackgroundTaskDomainService:
+        from infrastructure.domain.services.background_task_domain_service_impl import NewBackgroundTaskDomainService
+        return NewBackgroundTaskDomainService()
+
+    # --- 公開プロパティ ---
+
+    @property
+    def db_config(self) -> "MySQLConfig":
+        return self._db_config.get()
+
+    @property
+    def visuals_base_dir(self) -> str:
+        return self._visuals_base_dir.get()
+
+    @property
+    def principal_cache(self) -> "PrincipalCache":
+        return self._principal_cache.get()
+
+    @property
+    def password_hasher(self) -> PasswordHashDomainService:
+        return self._password_hasher.get()
+
+    @property
+    def user_repo(self) -> UserRepository:
+        return self._user_repo.get()
+
+    @property
+    def agent_repo(self) -> "CachedAgentRepository":
+        return self._agent_repo.get()
+
+    @property
+    def finetuning_job_repo(self) -> FinetuningJobRepository:
+        return self._finetuning_job_repo.get()
+
+    @property
+    def weight_visualization_repo(self) -> WeightVisualizationRepository:
+        return self._weight_visualization_repo.get()
+
+    @property
+    def deployment_repo(self) -> DeploymentRepository:
+        return self._deployment_repo.get()
+
+    @property
+    def methods_repo(self) -> DeploymentMethodsRepository:
+        return self._methods_repo.get()
+
+    @property
+    def resource_version_repo(self) -> ResourceVersionRepository:
+        return self._resource_version_repo.get()
+
+    @property
+    def upload_session_repo(self) -> UploadSessionRepository:
+        return self._upload_session_repo.get()
+
+    @property
+    def training_data_repo(self) -> TrainingDataRepository:
+        return self._training_data_repo.get()
+
+    @property
+    def auth_service(self) -> AuthDomainService:
+        return self._auth_service.get()
+
+    @property
+    def system_time_service(self) -> SystemTimeDomainService:
+        return self._system_time_service.get()
+
+    @property
+    def file_storage_service(self) -> FileStorageDomainService:
+        return self._file_storage_service.get()
+
+    @property
+    def file_stream_service(self) -> FileStreamDomainService:
+        return self._file_stream_service.get()
+
+    @property
+    def visualization_render_service(self) -> VisualizationRenderDomainService:
+        return self._visualization_render_service.get()
+
+    @property
+    def job_queue_service(self) -> JobQueueDomainService:
+        return self._job_queue_service.get()
+
+    @property
+    def job_method_finder_service(self) -> JobMethodFinderDomainService:
+        return self._job_method_finder_service.get()
+
+    @property
+    def test_inference_service(self) -> DeploymentTestDomainService:
+        return self._test_inference_service.get()
+
+    @property
+    def upload_spool(self) -> "UploadSpool":
+        return self._upload_spool.get()
+
+    @property
+    def background_task_service(self) -> BackgroundTaskDomainService:
+        return self._background_task_service.get()
+
+    def new_ownership_repo(self) -> OwnershipRepository:
+        """
+        MySQLOwnershipRepository はリクエストスコープのキャッシュを持つため、共有せずリクエストごとに生成する。
+        """
+        from infrastructure.database.mysql.ownership_repository import MySQLOwnershipRepository
+        return MySQLOwnershipRepository(self.db_config)
+
+    # --- 状態確認・ライフサイクル ---
+
+    def warm_up(self) -> None:
+        """全リソースを生成する (失敗したものは status() の error に記録される)"""
+        for resource in self._resources:
+            try:
+                resource.get()
+            except Exception:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        """各リソースが生成済み (warm) かどうか・生成に要した時間・直近のエラーを返す"""
+        resources: Dict[str, Any] = {}
+        for resource in self._resources:
+            resources[resource.name] = {
+                "warm": resource.warm,
+                "init_ms": round(resource.init_seconds * 1000, 1) if resource.init_seconds is not None else None,
+                "error": resource.last_error,
+            }
+
+        # DB プールは最初のクエリ実行時に接続されるため、設定の有無とは別に報告する
+        mysql_pool_open = False
+        if self._db_config.warm:
+            from infrastructure.database.mysql.pool import GetSharedMySQLPool
+            mysql_pool_open = GetSharedMySQLPool(self.db_config).is_open
+        resources["mysql_pool"] = {"warm": mysql_pool_open, "init_ms": None, "error": None}
+        return resources
+
+    async def aclose(self) -> None:
+        """生成済みのリソースを登録順の逆に閉じ、最後に共有 DB プール・SFTP プールを閉じる"""
+        db_used = self._db_config.warm
+        sftp_used = self._file_storage_service.warm or self._file_stream_service.warm
+        for resource in reversed(self._resources):
+            await resource.close()
+        if sftp_used:
+            from infrastructure.storage.sftp_pool import close_shared_sftp_pools
+            close_shared_sftp_pools()
+        if db_used:
+            from infrastructure.database.mysql.pool import close_shared_mysql_pools
+            await close_shared_mysql_pools()
+
+
+def NewAppContainer() -> AppContainer:
+    """AppContainer のファクトリ関数"""
+    return AppContainer()
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, BigInteger
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Text, BigInteger, Index, text, CHAR
 from sqlalchemy.dialects import mysql # JSON 型のインポート用
 from sqlalchemy.orm import declarative_base, relationship
 from typing import Optional
@@ -7,6 +7,19 @@ from typing import Optional
 # 全モデル共通の親クラス
 Base = declarative_base()
 
+
+def _updated_at_column() -> Column:
+    """
+    行バージョン用の updated_at 列。
+    行が変更されるたびに MySQL が自動更新するため、アプリ側で値を書き込む必要はない。
+    条件付き GET (ETag) の計算に使う。
+    """
+    return Column(
+        mysql.DATETIME(fsp=6),
+        nullable=False,
+        server_default=text("CURRENT_TIMESTAMP(6) ON UPDATE CURRENT_TIMESTAMP(6)"),
+    )
+
 # ----------------- User テーブル定義 -----------------
 class User(Base):
     __tablename__ = "users"
@@ -51,6 +64,9 @@ class Agent(Base):
     # ドメインモデルの `description: Optional[str]` に対応
     description = Column(String(1000), nullable=True)
 
+    # 行バージョン
+    updated_at = _updated_at_column()
+
     # User モデルへのリレーションシップを定義
     user = relationship("User", back_populates="agents")
     
@@ -61,18 +77,25 @@ class Agent(Base):
 # ----------------- FinetuningJob テーブル定義 -----------------
 class FinetuningJob(Base):
     __tablename__ = "finetuning_jobs"
+    __table_args__ = (
+        # キーセットページング用の複合索引 (agent_id / status の単一列索引を兼ねる)
+        Index("ix_finetuning_jobs_agent_id_created_at", "agent_id", "created_at"),
+        Index("ix_finetuning_jobs_status_created_at", "status", "created_at"),
+        # 同じ成果物キーで完了済みのジョブを探す (学習済み成果物の再利用)
+        Index("ix_finetuning_jobs_artifact_key_status", "artifact_key", "status"),
+    )
 
     # ドメインモデルの `id: ID` (int) に対応
     id = Column(Integer, primary_key=True, autoincrement=True)
 
     # ドメインモデルの `agent_id: ID` (int) に対応
-    agent_id = Column(Integer, ForeignKey("agents.id"), nullable=False, index=True)
+    agent_id = Column(Integer, ForeignKey("agents.id"), nullable=False)
 
     # ドメインモデルの `training_file_path: str` に対応
     training_file_path = Column(String(512), nullable=False)
     
     # ドメインモデルの `status: str` に対応
-    status = Column(String(50), nullable=False, index=True)
+    status = Column(String(50), nullable=False)
     
     # ドメインモデルの `created_at: datetime` に対応
     created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow) 
@@ -82,6 +105,22 @@ class FinetuningJob(Base):
 
     # ドメインモデルの `error_message: Optional[str]` に対応
     error_message = Column(Text, nullable=True)
+
+    # ドメインモデルの `training_file_hash: Optional[str]` に対応 (訓練データの SHA-256)
+    training_file_hash = Column(CHAR(64), nullable=True)
+
+    # (訓練データのハッシュ, ベースモデル, ハイパーパラメータ) から求めた成果物キー (ワーカーが設定する)
+    artifact_key = Column(CHAR(64), nullable=True)
+
+    # ドメインモデルの `reused_from_job_id: Optional[ID]` に対応 (成果物を再利用した場合の再利用元)
+    reused_from_job_id = Column(
+        Integer,
+        ForeignKey("finetuning_jobs.id", ondelete="SET NULL", name="fk_finetuning_jobs_reused_from_job_id"),
+        nullable=True,
+    )
+
+    # 行バージョン
+    updated_at = _updated_at_column()
     
     # Agent モデルへのリレーションシップを定義
     agent = relationship("Agent", back_populates="finetuning_jobs")
@@ -101,6 +140,13 @@ class WeightVisualization(Base):
     # MySQL 5.7+ または MariaDB 10.2+ では JSON 型が推奨される
     layers_data = Column(mysql.JSON, nullable=False)
 
+    # 重み変化の統計 (テンソル・レイヤーごとの差分の L2 ノルム・相対変化・コサイン類似度・パーセンタイル・スパース性)
+    # 統計を集計していないジョブでは NULL
+    weight_stats = Column(mysql.JSON, nullable=True)
+
+    # 行バージョン
+    updated_at = _updated_at_column()
+
     # FinetuningJob モデルへのリレーションシップを定義 (オプション)
     job = relationship("FinetuningJob", backref="visualization", uselist=False)
 
@@ -127,6 +173,9 @@ class Deployment(Base):
     # (例: "http://118.9.7.134:1721/job45")
     endpoint = Column(String(512), nullable=True)
 
+    # 行バージョン
+    updated_at = _updated_at_column()
+
     # FinetuningJob へのリレーションシップ (Deployment.job で job にアクセス可)
     job = relationship("FinetuningJob", backref="deployment", uselist=False)
 
@@ -147,7 +196,71 @@ class DeploymentMethods(Base):
     # (例: ["Optimize the route", "Provide safety and emergency support"])
     methods = Column(mysql.JSON, nullable=False)
 
+    # 行バージョン
+    updated_at = _updated_at_column()
+
     # Deployment へのリレーションシップ (DeploymentMethods.deployment で deployment にアクセス可)
     deployment = relationship("Deployment", backref="methods_config", uselist=False)
 
-# ★★★ END: 4 NEW DEPLOYMENT APIs (ここまで追加) ★★★
\ No newline at end of file
+# ★★★ END: 4 NEW DEPLOYMENT APIs (ここまで追加) ★★★
+
+# ----------------- UploadSession テーブル定義 -----------------
+class UploadSession(Base):
+    """
+    再開可能な分割アップロードのセッション。
+    チャンクの中身はストレージ上の一時ファイルにあり、このテーブルは受信済みサイズなどの進捗のみを持つ。
+    """
+    __tablename__ = "upload_sessions"
+
+    __table_args__ = (
+        # 期限切れセッションの掃除用
+        Index("ix_upload_sessions_status_expires_at", "status", "expires_at"),
+    )
+
+    # ドメインモデルの `id: str` (ランダムな32桁の16進文字列) に対応
+    id = Column(CHAR(32), primary_key=True)
+
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+    agent_id = Column(Integer, ForeignKey("agents.id", ondelete="CASCADE"), nullable=False)
+
+    filename = Column(String(255), nullable=False)
+    total_size = Column(BigInteger, nullable=False)
+    chunk_size = Column(Integer, nullable=False)
+    # 先頭から連続して受信済みのバイト数 (再開位置)
+    received_size = Column(BigInteger, nullable=False, default=0)
+
+    # 'open' / 'finalized' / 'expired'
+    status = Column(String(20), nullable=False)
+
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    # finalize 時に作成したジョブ
+    job_id = Column(Integer, ForeignKey("finetuning_jobs.id", ondelete="SET NULL"), nullable=True)
+
+
+# ----------------- TrainingLink テーブル定義 -----------------
+class TrainingLink(Base):
+    """
+    ジョブの訓練データと、アップロード時に1パスで集計した統計。
+    ワーカーは学習するかどうかの判定とメソッド一覧の生成にこの値を使う。
+    """
+    __tablename__ = "training_links"
+
+    # ドメインモデルの `job_id: ID` に対応 (ジョブ1件につき1行)
+    job_id = Column(Integer, ForeignKey("finetuning_jobs.id", ondelete="CASCADE"), primary_key=True)
+
+    data_url = Column(String(512), nullable=True)
+    file_name = Column(String(255), nullable=True)
+    record_count = Column(Integer, nullable=True)
+    # 表示用のサイズ (例: '12.3 MB')
+    file_size = Column(String(32), nullable=True)
+
+    # 'empty' / 'method_definition' / 'training'
+    file_mode = Column(String(32), nullable=True)
+    invalid_record_count = Column(Integer, nullable=True)
+    # ユニークなメソッド名 (改行区切り)。多すぎる場合は NULL
+    methods = Column(mysql.MEDIUMTEXT, nullable=True)
+
+    # リポジトリは生の SQL で書き込むため、DB 側の既定値も持たせる
+    created_at = Column(DateTime, nullable=False, default=datetime.datetime.utcnow, server_default=text("CURRENT_TIMESTAMP"))
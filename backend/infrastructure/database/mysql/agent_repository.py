@@ -1,11 +1,14 @@
-import mysql.connector
-from mysql.connector import pooling
+import aiomysql
 from typing import Optional, List
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 
 from domain.entities.agent import Agent, NewAgent, AgentRepository
 from domain.value_objects.id import ID
+from domain.value_objects.page import Page, PageRequest
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+from .cursor import encode_cursor, decode_cursor
 
 
 class MySQLAgentRepository(AgentRepository):
@@ -14,44 +17,22 @@ class MySQLAgentRepository(AgentRepository):
     """
 
     def __init__(self, config: MySQLConfig):
-        try:
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="agent_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing agent connection pool: {err}")
-            raise
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
 
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         """
         コネクションプールからカーソルを取得し、処理後にクローズするコンテキストマネージャ
         """
-        conn = None
-        cursor = None
         try:
-            conn = self.pool.get_connection()
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
+            # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+            with DB_QUERY_SECONDS.time(repository="agent", operation="write" if commit else "read"):
+                async with self.pool.cursor(commit=commit) as cursor:
+                    yield cursor
+        except aiomysql.Error as err:
             print(f"Database error in agent repository: {err}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def _map_row_to_agent(self, row: tuple) -> Optional[Agent]:
         """
@@ -69,7 +50,7 @@ class MySQLAgentRepository(AgentRepository):
             description=row[4]
         )
 
-    def create(self, agent: Agent) -> Agent:
+    async def create(self, agent: Agent) -> Agent:
         sql = """
         INSERT INTO agents (user_id, owner, name, description)
         VALUES (%s, %s, %s, %s)
@@ -81,8 +62,8 @@ class MySQLAgentRepository(AgentRepository):
             agent.description
         )
 
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             new_id = cursor.lastrowid
 
         # 新しく採番されたIDでAgentオブジェクトを再構築して返す
@@ -94,31 +75,57 @@ class MySQLAgentRepository(AgentRepository):
             description=agent.description
         )
 
-    def find_by_id(self, agent_id: "ID") -> Optional[Agent]:
+    async def find_by_id(self, agent_id: "ID") -> Optional[Agent]:
         sql = "SELECT id, user_id, owner, name, description FROM agents WHERE id = %s"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (agent_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (agent_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_agent(row)
 
-    def list_by_user_id(self, user_id: "ID") -> List[Agent]:
+    async def list_by_user_id(self, user_id: "ID") -> List[Agent]:
         sql = "SELECT id, user_id, owner, name, description FROM agents WHERE user_id = %s ORDER BY id"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (user_id.value,))
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (user_id.value,))
+            rows = await cursor.fetchall()
             
         return [self._map_row_to_agent(row) for row in rows if row]
 
-    def find_all(self) -> List[Agent]:
+    async def find_all(self) -> List[Agent]:
         sql = "SELECT id, user_id, owner, name, description FROM agents ORDER BY id"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql)
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql)
+            rows = await cursor.fetchall()
             
         return [self._map_row_to_agent(row) for row in rows if row]
 
-    def update(self, agent: Agent) -> None:
+    async def find_page(self, page: PageRequest) -> Page[Agent]:
+        """
+        ID 昇順のキーセットページング。OFFSET を使わず主キーで範囲検索するため、
+        ページが進んでもスキャン量は limit 件程度に収まる。
+        """
+        after = decode_cursor(page.after, int)
+        params: list = []
+        where = ""
+        if after is not None:
+            where = "WHERE id > %s"
+            params.append(after[0])
+
+        # 次ページの有無を判定するため limit + 1 件取得する
+        sql = f"SELECT id, user_id, owner, name, description FROM agents {where} ORDER BY id LIMIT %s"
+        params.append(page.limit + 1)
+
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+
+        agents = [self._map_row_to_agent(row) for row in rows[:page.limit] if row]
+        next_cursor = None
+        if len(rows) > page.limit and agents:
+            next_cursor = encode_cursor(agents[-1].id.value)
+        return Page(items=agents, next_cursor=next_cursor)
+
+    async def update(self, agent: Agent) -> None:
         sql = """
         UPDATE agents
         SET name = %s, description = %s
@@ -131,11 +138,11 @@ class MySQLAgentRepository(AgentRepository):
             agent.user_id.value
         )
         
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
 
-    def delete(self, agent_id: "ID") -> None:
+    async def delete(self, agent_id: "ID") -> None:
         sql = "DELETE FROM agents WHERE id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (agent_id.value,))
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (agent_id.value,))
 
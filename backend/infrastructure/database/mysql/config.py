@@ -6,12 +6,39 @@ from dotenv import load_dotenv
 class MySQLConfig:
     """
     MySQLデータベースへの接続情報を保持するデータクラス。
+    プール関連の設定はプロセス全体で共有される非同期コネクションプールに適用される。
     """
     host: str
     port: int
     user: str
     password: str
     database: str
+    pool_min_size: int = 1
+    pool_max_size: int = 10
+    connect_timeout: float = 10.0
+    acquire_timeout: float = 10.0
+    pool_recycle: int = 3600
+
+
+def _get_int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        raise ValueError(f"{name}は有効な整数である必要があります。")
+
+
+def _get_float_env(name: str, default: float) -> float:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name}は有効な数値である必要があります。")
+
 
 def NewMySQLConfigFromEnv() -> MySQLConfig:
     """
@@ -23,6 +50,13 @@ def NewMySQLConfigFromEnv() -> MySQLConfig:
     DB_USER=root
     DB_PASSWORD=your_local_password
     DB_NAME=method_selector_db
+
+    コネクションプールは以下の任意の環境変数で調整できる:
+    DB_POOL_MIN_SIZE=1
+    DB_POOL_MAX_SIZE=10
+    DB_CONNECT_TIMEOUT=10
+    DB_POOL_ACQUIRE_TIMEOUT=10
+    DB_POOL_RECYCLE=3600
     """
     load_dotenv()
 
@@ -40,10 +74,20 @@ def NewMySQLConfigFromEnv() -> MySQLConfig:
     except ValueError:
         raise ValueError("DB_PORTは有効な整数である必要があります。")
 
+    pool_min_size = _get_int_env("DB_POOL_MIN_SIZE", 1)
+    pool_max_size = _get_int_env("DB_POOL_MAX_SIZE", 10)
+    if pool_min_size < 0 or pool_max_size < 1 or pool_min_size > pool_max_size:
+        raise ValueError("DB_POOL_MIN_SIZE / DB_POOL_MAX_SIZE の値が不正です。")
+
     return MySQLConfig(
         host=host,
         port=port,
         user=user,
         password=password,
         database=database,
-    )
\ No newline at end of file
+        pool_min_size=pool_min_size,
+        pool_max_size=pool_max_size,
+        connect_timeout=_get_float_env("DB_CONNECT_TIMEOUT", 10.0),
+        acquire_timeout=_get_float_env("DB_POOL_ACQUIRE_TIMEOUT", 10.0),
+        pool_recycle=_get_int_env("DB_POOL_RECYCLE", 3600),
+    )
@@ -0,0 +1,46 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional
+
+from domain.value_objects.page import InvalidPageCursorError
+
+
+# キーセットページング用カーソルのエンコード/デコード
+# カーソルは最後に返した行のソートキーを JSON 配列にして URL セーフな Base64 にしたもの。
+# datetime は ISO 8601 文字列として格納し、デコード時に datetime へ戻す。
+
+def encode_cursor(*values: Any) -> str:
+    """ソートキーの値からカーソル文字列を生成する"""
+    payload = [v.isoformat() if isinstance(v, datetime) else v for v in values]
+    raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], *types: type) -> Optional[List[Any]]:
+    """
+    カーソル文字列をソートキーの値に戻す。
+    types には各要素の期待する型 (int / datetime / str) を順に指定する。
+    cursor が None の場合は None を返す（先頭ページ）。
+    """
+    if cursor is None:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(payload, list) or len(payload) != len(types):
+            raise ValueError("cursor length mismatch")
+
+        values: List[Any] = []
+        for value, expected in zip(payload, types):
+            if expected is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif expected is int:
+                if not isinstance(value, int) or isinstance(value, bool):
+                    raise ValueError("cursor value is not int")
+                values.append(value)
+            else:
+                values.append(expected(value))
+        return values
+    except (ValueError, TypeError, UnicodeError, json.JSONDecodeError):
+        raise InvalidPageCursorError("Invalid pagination cursor.")
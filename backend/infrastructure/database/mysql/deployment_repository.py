@@ -1,7 +1,5 @@
-import mysql.connector
-from mysql.connector import pooling
 from typing import Optional, List, Any, Dict
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 
 # ドメインエンティティのインポート
 from domain.entities.deployment import (
@@ -9,50 +7,28 @@ from domain.entities.deployment import (
     DeploymentRepository,
 )
 from domain.value_objects.id import ID
+from domain.value_objects.page import Page, PageRequest
 
 # インフラストラクチャ層の依存関係
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+from .cursor import encode_cursor, decode_cursor
 
 
 class MySQLDeploymentRepository(DeploymentRepository):
 
     def __init__(self, config: MySQLConfig):
-        try:
-            # 接続プールの初期化 (プール名を変更)
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="deployment_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing connection pool: {err}")
-            raise
-
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         """データベース接続とカーソルを管理するコンテキストマネージャ"""
-        conn = None
-        cursor = None
-        try:
-            conn = self.pool.get_connection()
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
-            raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+        # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+        with DB_QUERY_SECONDS.time(repository="deployment", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
 
     def _map_row_to_deployment(self, row: tuple) -> Optional[Deployment]:
         """データベースの行データを Deployment エンティティにマッピング"""
@@ -69,7 +45,7 @@ class MySQLDeploymentRepository(DeploymentRepository):
             endpoint=row[3]
         )
 
-    def create(self, deployment: Deployment) -> Deployment:
+    async def create(self, deployment: Deployment) -> Deployment:
         """
         デプロイメントを作成して返す
         """
@@ -84,8 +60,8 @@ class MySQLDeploymentRepository(DeploymentRepository):
             deployment.endpoint
         )
 
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             new_id = cursor.lastrowid
         
         # DBで生成されたIDを反映して返す
@@ -96,7 +72,7 @@ class MySQLDeploymentRepository(DeploymentRepository):
             endpoint=deployment.endpoint
         )
 
-    def find_by_id(self, deployment_id: "ID") -> Optional[Deployment]:
+    async def find_by_id(self, deployment_id: "ID") -> Optional[Deployment]:
         """
         IDからデプロイメントを取得する
         """
@@ -104,13 +80,13 @@ class MySQLDeploymentRepository(DeploymentRepository):
         SELECT id, job_id, status, endpoint
         FROM deployments WHERE id = %s
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (deployment_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (deployment_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_deployment(row)
 
-    def list_by_agent(self, agent_id: "ID") -> list[Deployment]:
+    async def list_by_agent(self, agent_id: "ID") -> list[Deployment]:
         """
         指定エージェントに関連するデプロイメント一覧を取得する
         (finetuning_jobs テーブルとJOINして agent_id を参照)
@@ -123,13 +99,52 @@ class MySQLDeploymentRepository(DeploymentRepository):
         WHERE fj.agent_id = %s
         ORDER BY d.id DESC
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (agent_id.value,))
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (agent_id.value,))
+            rows = await cursor.fetchall()
             
         return [self._map_row_to_deployment(row) for row in rows if row]
 
-    def find_by_job_id(self, job_id: "ID") -> Optional[Deployment]:
+    async def list_page_by_agent(
+        self, agent_id: "ID", page: PageRequest, status: Optional[str] = None
+    ) -> Page[Deployment]:
+        """
+        d.id DESC のキーセットページング (finetuning_jobs とJOINして agent_id を参照)
+        """
+        after = decode_cursor(page.after, int)
+        conditions = ["fj.agent_id = %s"]
+        params: list = [agent_id.value]
+
+        if status is not None:
+            conditions.append("d.status = %s")
+            params.append(status)
+
+        if after is not None:
+            conditions.append("d.id < %s")
+            params.append(after[0])
+
+        sql = f"""
+        SELECT
+            d.id, d.job_id, d.status, d.endpoint
+        FROM deployments d
+        JOIN finetuning_jobs fj ON d.job_id = fj.id
+        WHERE {" AND ".join(conditions)}
+        ORDER BY d.id DESC
+        LIMIT %s
+        """
+        params.append(page.limit + 1)
+
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+
+        deployments = [self._map_row_to_deployment(row) for row in rows[:page.limit] if row]
+        next_cursor = None
+        if len(rows) > page.limit and deployments:
+            next_cursor = encode_cursor(deployments[-1].id.value)
+        return Page(items=deployments, next_cursor=next_cursor)
+
+    async def find_by_job_id(self, job_id: "ID") -> Optional[Deployment]:
         """
         job_id に紐づくデプロイメントを（1件）検索する
         """
@@ -137,19 +152,19 @@ class MySQLDeploymentRepository(DeploymentRepository):
         SELECT id, job_id, status, endpoint
         FROM deployments WHERE job_id = %s
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (job_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (job_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_deployment(row)
 
-    def delete(self, deployment_id: "ID") -> None:
+    async def delete(self, deployment_id: "ID") -> None:
         """
         デプロイメントを削除する
         """
         sql = "DELETE FROM deployments WHERE id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (deployment_id.value,))
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (deployment_id.value,))
 
     # -----------------------------------------------------------------
     # NOTE: DeploymentRepository ABC には 'update' が定義されていません。
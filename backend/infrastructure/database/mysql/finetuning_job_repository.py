@@ -1,7 +1,5 @@
-import mysql.connector
-from mysql.connector import pooling
 from typing import Optional, List, Any, Dict
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 from datetime import datetime
 
 # ドメインエンティティのインポート
@@ -10,50 +8,35 @@ from domain.entities.finetuning_job import (
     FinetuningJobRepository,
 )
 from domain.value_objects.id import ID
+from domain.value_objects.page import Page, PageRequest
 
 # インフラストラクチャ層の依存関係
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+from .cursor import encode_cursor, decode_cursor
+
+
+# _map_row_to_job が前提とする SELECT 列の順序
+_JOB_COLUMNS = (
+    "id, agent_id, training_file_path, status, created_at, finished_at, error_message, "
+    "training_file_hash, reused_from_job_id"
+)
 
 
 class MySQLFinetuningJobRepository(FinetuningJobRepository):
 
     def __init__(self, config: MySQLConfig):
-        try:
-            # 接続プールの初期化
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="finetuning_job_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing connection pool: {err}")
-            raise
-
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         """データベース接続とカーソルを管理するコンテキストマネージャ"""
-        conn = None
-        cursor = None
-        try:
-            conn = self.pool.get_connection()
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
-            raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+        # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+        with DB_QUERY_SECONDS.time(repository="finetuning_job", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
 
     def _map_row_to_job(self, row: tuple) -> Optional[FinetuningJob]:
         """データベースの行データを FinetuningJob エンティティにマッピング"""
@@ -62,7 +45,8 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
         
         # NOTE: rowのインデックスは SQL の SELECT 順序に依存します
         # 0: id, 1: agent_id, 2: training_file_path, 3: status,
-        # 4: created_at, 5: finished_at, 6: error_message
+        # 4: created_at, 5: finished_at, 6: error_message,
+        # 7: training_file_hash, 8: reused_from_job_id
         
         return FinetuningJob(
             id=ID(row[0]),
@@ -71,14 +55,16 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
             status=row[3],
             created_at=row[4],
             finished_at=row[5],
-            error_message=row[6]
+            error_message=row[6],
+            training_file_hash=row[7],
+            reused_from_job_id=ID(row[8]) if row[8] is not None else None,
         )
 
-    def create_job(self, job: FinetuningJob) -> FinetuningJob:
+    async def create_job(self, job: FinetuningJob) -> FinetuningJob:
         sql = """
         INSERT INTO finetuning_jobs 
-        (agent_id, training_file_path, status, created_at, finished_at, error_message)
-        VALUES (%s, %s, %s, %s, %s, %s)
+        (agent_id, training_file_path, status, created_at, finished_at, error_message, training_file_hash)
+        VALUES (%s, %s, %s, %s, %s, %s, %s)
         """
         data = (
             job.agent_id.value,
@@ -86,11 +72,12 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
             job.status,
             job.created_at,
             job.finished_at,
-            job.error_message
+            job.error_message,
+            job.training_file_hash
         )
 
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             new_id = cursor.lastrowid
         
         # DBで生成されたIDを反映して返す
@@ -101,76 +88,119 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
             status=job.status,
             created_at=job.created_at,
             finished_at=job.finished_at,
-            error_message=job.error_message
+            error_message=job.error_message,
+            training_file_hash=job.training_file_hash,
+            reused_from_job_id=job.reused_from_job_id
         )
 
-    def find_by_id(self, job_id: "ID") -> Optional[FinetuningJob]:
-        sql = """
-        SELECT id, agent_id, training_file_path, status, created_at, finished_at, error_message
+    async def find_by_id(self, job_id: "ID") -> Optional[FinetuningJob]:
+        sql = f"""
+        SELECT {_JOB_COLUMNS}
         FROM finetuning_jobs WHERE id = %s
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (job_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (job_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_job(row)
 
-    def is_any_running(self) -> bool:
+    async def is_any_running(self) -> bool:
         """status='running' のジョブがDBに存在するか確認する（ワーカー排他制御用）"""
         sql = "SELECT EXISTS(SELECT 1 FROM finetuning_jobs WHERE status = 'running' LIMIT 1)"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql)
-            result = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql)
+            result = await cursor.fetchone()
             return bool(result and result[0])
 
-    def find_next_queued(self) -> Optional[FinetuningJob]:
+    async def find_next_queued(self) -> Optional[FinetuningJob]:
         """最も古い 'queued' 状態のジョブを一つ取得する（ワーカーキュー処理用）"""
-        sql = """
-        SELECT id, agent_id, training_file_path, status, created_at, finished_at, error_message
+        sql = f"""
+        SELECT {_JOB_COLUMNS}
         FROM finetuning_jobs 
         WHERE status = 'queued'
         ORDER BY created_at ASC
         LIMIT 1
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql)
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql)
+            row = await cursor.fetchone()
         
         return self._map_row_to_job(row)
 
-    def list_by_agent(self, agent_id: "ID") -> list[FinetuningJob]:
+    async def list_by_agent(self, agent_id: "ID") -> list[FinetuningJob]:
         """指定エージェントに紐づくジョブ一覧を取得する"""
-        sql = """
-        SELECT id, agent_id, training_file_path, status, created_at, finished_at, error_message
+        sql = f"""
+        SELECT {_JOB_COLUMNS}
         FROM finetuning_jobs 
         WHERE agent_id = %s
         ORDER BY created_at DESC
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (agent_id.value,))
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (agent_id.value,))
+            rows = await cursor.fetchall()
             
         return [self._map_row_to_job(row) for row in rows if row]
 
-    def list_all_by_user(self, user_id: "ID") -> List[FinetuningJob]:
+    async def list_page_by_agent(
+        self, agent_id: "ID", page: PageRequest, status: Optional[str] = None
+    ) -> Page[FinetuningJob]:
+        """
+        (created_at DESC, id DESC) のキーセットページング。
+        ix_finetuning_jobs_agent_id_created_at 索引の範囲走査で limit + 1 件だけ読む。
+        """
+        after = decode_cursor(page.after, datetime, int)
+        conditions = ["agent_id = %s"]
+        params: list = [agent_id.value]
+
+        if status is not None:
+            conditions.append("status = %s")
+            params.append(status)
+
+        if after is not None:
+            # (created_at, id) < (前ページ最後の created_at, id)
+            conditions.append("(created_at < %s OR (created_at = %s AND id < %s))")
+            params.extend([after[0], after[0], after[1]])
+
+        sql = f"""
+        SELECT {_JOB_COLUMNS}
+        FROM finetuning_jobs
+        WHERE {" AND ".join(conditions)}
+        ORDER BY created_at DESC, id DESC
+        LIMIT %s
+        """
+        params.append(page.limit + 1)
+
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, tuple(params))
+            rows = await cursor.fetchall()
+
+        jobs = [self._map_row_to_job(row) for row in rows[:page.limit] if row]
+        next_cursor = None
+        if len(rows) > page.limit and jobs:
+            last = jobs[-1]
+            next_cursor = encode_cursor(last.created_at, last.id.value)
+        return Page(items=jobs, next_cursor=next_cursor)
+
+    async def list_all_by_user(self, user_id: "ID") -> List[FinetuningJob]:
         """
         特定のユーザーが所有する全てのエージェントに紐づくジョブ一覧を取得する。
         """
         sql = """
         SELECT
-            fj.id, fj.agent_id, fj.training_file_path, fj.status, fj.created_at, fj.finished_at, fj.error_message
+            fj.id, fj.agent_id, fj.training_file_path, fj.status, fj.created_at, fj.finished_at, fj.error_message,
+            fj.training_file_hash, fj.reused_from_job_id
         FROM finetuning_jobs fj
         JOIN agents a ON fj.agent_id = a.id
         WHERE a.user_id = %s
         ORDER BY fj.created_at DESC
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (user_id.value,))
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (user_id.value,))
+            rows = await cursor.fetchall()
         
         return [self._map_row_to_job(row) for row in rows if row]
 
-    def update_job(self, job: FinetuningJob) -> FinetuningJob:
+    async def update_job(self, job: FinetuningJob) -> FinetuningJob:
         """
         FinetuningJobエンティティの現在の状態に基づいてDBを更新する
         (インターフェースの update_job に合わせて実装)
@@ -181,7 +211,8 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
             training_file_path = %s,
             status = %s,
             finished_at = %s,
-            error_message = %s
+            error_message = %s,
+            training_file_hash = %s
         WHERE id = %s
         """
         data = (
@@ -189,17 +220,29 @@ class MySQLFinetuningJobRepository(FinetuningJobRepository):
             job.status,
             job.finished_at,
             job.error_message,
+            job.training_file_hash,
             job.id.value
         )
         
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             
         # 更新されたオブジェクトをそのまま返す
         return job
 
-    def delete(self, job_id: "ID") -> None:
+    async def fail_stale_uploading(self, created_before: datetime, error_message: str) -> int:
+        """created_before (UTC) より前に作成され 'uploading' のまま残っているジョブを 'failed' にする"""
+        sql = """
+        UPDATE finetuning_jobs
+        SET status = 'failed', error_message = %s
+        WHERE status = 'uploading' AND created_at < %s
+        """
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (error_message, created_before))
+            return cursor.rowcount
+
+    async def delete(self, job_id: "ID") -> None:
         sql = "DELETE FROM finetuning_jobs WHERE id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (job_id.value,))
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (job_id.value,))
 
@@ -1,7 +1,5 @@
-import mysql.connector
-from mysql.connector import pooling
 from typing import Optional, List, Any, Dict
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 import json # JSONシリアライズのために追加
 
 # ドメインエンティティのインポート
@@ -14,6 +12,8 @@ from domain.value_objects.id import ID
 
 # インフラストラクチャ層の依存関係
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
 
 
 class MySQLMethodsRepository(DeploymentMethodsRepository):
@@ -23,42 +23,16 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
     """
 
     def __init__(self, config: MySQLConfig):
-        try:
-            # 接続プールの初期化 (プール名を変更)
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="methods_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing connection pool: {err}")
-            raise
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
 
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         """データベース接続とカーソルを管理するコンテキストマネージャ"""
-        conn = None
-        cursor = None
-        try:
-            conn = self.pool.get_connection()
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
-            raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
+        # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+        with DB_QUERY_SECONDS.time(repository="methods", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
 
     def _map_row_to_deployment_methods(self, row: tuple) -> Optional[DeploymentMethods]:
         """データベースの行データを DeploymentMethods エンティティにマッピング"""
@@ -82,7 +56,7 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
             methods=method_vos
         )
 
-    def find_by_deployment_id(self, deployment_id: ID) -> Optional[DeploymentMethods]:
+    async def find_by_deployment_id(self, deployment_id: ID) -> Optional[DeploymentMethods]:
         """
         デプロイメントIDからメソッドの集合を取得する
         """
@@ -91,13 +65,13 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
         FROM deployment_methods 
         WHERE deployment_id = %s
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (deployment_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (deployment_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_deployment_methods(row)
     
-    def find_by_id(self, id: ID) -> Optional[DeploymentMethods]:
+    async def find_by_id(self, id: ID) -> Optional[DeploymentMethods]:
         """
         このエンティティ自体のIDから取得する
         """
@@ -106,13 +80,13 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
         FROM deployment_methods 
         WHERE id = %s
         """
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_deployment_methods(row)
 
-    def save(self, deployment_methods: DeploymentMethods) -> DeploymentMethods:
+    async def save(self, deployment_methods: DeploymentMethods) -> DeploymentMethods:
         """
         メソッドの集合を保存（作成または更新）する。
         deployment_id をキーとして Upsert を試みる。
@@ -124,7 +98,7 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
         deployment_id_val = deployment_methods.deployment_id.value
 
         # 2. 既にDBに存在するか (IDを知るため)
-        existing = self.find_by_deployment_id(deployment_methods.deployment_id)
+        existing = await self.find_by_deployment_id(deployment_methods.deployment_id)
         
         if existing:
             # 3a. 存在する場合 (UPDATE)
@@ -134,8 +108,8 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
             WHERE id = %s
             """
             data = (methods_json, existing.id.value)
-            with self._get_cursor(commit=True) as cursor:
-                cursor.execute(sql, data)
+            async with self._get_cursor(commit=True) as cursor:
+                await cursor.execute(sql, data)
             
             # 更新されたエンティティを返す (IDは既存のものを引き継ぐ)
             return DeploymentMethods(
@@ -150,8 +124,8 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
             VALUES (%s, %s)
             """
             data = (deployment_id_val, methods_json)
-            with self._get_cursor(commit=True) as cursor:
-                cursor.execute(sql, data)
+            async with self._get_cursor(commit=True) as cursor:
+                await cursor.execute(sql, data)
                 new_id = cursor.lastrowid
             
             # DBで採番されたIDを持つ新しいエンティティを返す
@@ -161,10 +135,10 @@ class MySQLMethodsRepository(DeploymentMethodsRepository):
                 methods=deployment_methods.methods
             )
 
-    def delete_by_deployment_id(self, deployment_id: ID) -> None:
+    async def delete_by_deployment_id(self, deployment_id: ID) -> None:
         """
         デプロイメントIDに紐づくメソッドの集合を削除する
         """
         sql = "DELETE FROM deployment_methods WHERE deployment_id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (deployment_id.value,))
\ No newline at end of file
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (deployment_id.value,))
\ No newline at end of file
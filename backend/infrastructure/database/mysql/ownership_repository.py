@@ -0,0 +1,139 @@
+from typing import Optional, Dict, Tuple
+from contextlib import asynccontextmanager
+
+# ドメインエンティティのインポート
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
+from domain.entities.agent import NewAgent
+from domain.entities.deployment import Deployment
+from domain.entities.finetuning_job import FinetuningJob
+from domain.value_objects.id import ID
+
+# インフラストラクチャ層の依存関係
+from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+
+
+# 所有関係を1回で取得するための共通 SELECT 句
+# NOTE: rowのインデックスは以下の SELECT 順序に依存します
+# 0-6: finetuning_jobs (id, agent_id, training_file_path, status, created_at, finished_at, error_message)
+# 7-11: agents (id, user_id, owner, name, description)
+# 12-15: deployments (id, job_id, status, endpoint) ※存在しない場合は NULL
+# 16: 問い合わせユーザーが所有者かどうか
+_SELECT_OWNERSHIP = """
+SELECT
+    fj.id, fj.agent_id, fj.training_file_path, fj.status, fj.created_at, fj.finished_at, fj.error_message,
+    a.id, a.user_id, a.owner, a.name, a.description,
+    d.id, d.job_id, d.status, d.endpoint,
+    a.user_id = %s
+"""
+
+
+class MySQLOwnershipRepository(OwnershipRepository):
+    """
+    OwnershipRepository の MySQL 実装。
+    deployments / finetuning_jobs / agents を1つの JOIN で取得する。
+
+    インスタンスはリクエストごとに生成する想定で、同一リクエスト内で
+    同じ行を二度読みしないよう、解決結果をインスタンス内にキャッシュする。
+    """
+
+    def __init__(self, config: MySQLConfig):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+        # リクエストスコープのキャッシュ: (種別, ID, user_id) -> OwnershipChain | None
+        self._cache: Dict[Tuple[str, int, int], Optional[OwnershipChain]] = {}
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
+        """データベース接続とカーソルを管理するコンテキストマネージャ"""
+        # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+        with DB_QUERY_SECONDS.time(repository="ownership", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
+
+    def _map_row_to_chain(self, row: tuple) -> Optional[OwnershipChain]:
+        """JOIN した行データを OwnershipChain にマッピング"""
+        if not row:
+            return None
+
+        job = FinetuningJob(
+            id=ID(row[0]),
+            agent_id=ID(row[1]),
+            training_file_path=row[2],
+            status=row[3],
+            created_at=row[4],
+            finished_at=row[5],
+            error_message=row[6]
+        )
+        agent = NewAgent(
+            id=row[7],
+            user_id=row[8],
+            owner=row[9],
+            name=row[10],
+            description=row[11]
+        )
+        deployment = None
+        if row[12] is not None:
+            deployment = Deployment(
+                id=ID(row[12]),
+                job_id=ID(row[13]),
+                status=row[14],
+                endpoint=row[15]
+            )
+
+        return OwnershipChain(
+            job=job,
+            agent=agent,
+            deployment=deployment,
+            is_owner=bool(row[16])
+        )
+
+    def _remember(self, chain: Optional[OwnershipChain], user_id: "ID") -> None:
+        """解決結果をジョブID・デプロイメントIDの両方のキーでキャッシュする"""
+        if chain is None:
+            return
+        self._cache[("job", chain.job.id.value, user_id.value)] = chain
+        if chain.deployment is not None:
+            self._cache[("deployment", chain.deployment.id.value, user_id.value)] = chain
+
+    async def resolve_by_job_id(self, job_id: "ID", user_id: "ID") -> Optional[OwnershipChain]:
+        key = ("job", job_id.value, user_id.value)
+        if key in self._cache:
+            return self._cache[key]
+
+        sql = _SELECT_OWNERSHIP + """
+        FROM finetuning_jobs fj
+        JOIN agents a ON a.id = fj.agent_id
+        LEFT JOIN deployments d ON d.job_id = fj.id
+        WHERE fj.id = %s
+        LIMIT 1
+        """
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (user_id.value, job_id.value))
+            row = await cursor.fetchone()
+
+        chain = self._map_row_to_chain(row)
+        self._cache[key] = chain
+        self._remember(chain, user_id)
+        return chain
+
+    async def resolve_by_deployment_id(self, deployment_id: "ID", user_id: "ID") -> Optional[OwnershipChain]:
+        key = ("deployment", deployment_id.value, user_id.value)
+        if key in self._cache:
+            return self._cache[key]
+
+        sql = _SELECT_OWNERSHIP + """
+        FROM deployments d
+        JOIN finetuning_jobs fj ON fj.id = d.job_id
+        JOIN agents a ON a.id = fj.agent_id
+        WHERE d.id = %s
+        """
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (user_id.value, deployment_id.value))
+            row = await cursor.fetchone()
+
+        chain = self._map_row_to_chain(row)
+        self._cache[key] = chain
+        self._remember(chain, user_id)
+        return chain
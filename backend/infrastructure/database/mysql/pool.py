@@ -0,0 +1,164 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Dict, Optional, Tuple
+
+import aiomysql
+
+from .config import MySQLConfig
+from infrastructure.metrics.prometheus import REGISTRY
+
+
+class MySQLPoolError(Exception):
+    """共有コネクションプールの初期化・取得に関するカスタムエラー"""
+    pass
+
+
+class SharedMySQLPool:
+    """
+    プロセス全体で共有される aiomysql の非同期コネクションプール。
+    リポジトリごとにプールを作らず、同一接続先の全リポジトリがこのプールを共有する。
+    プール本体はイベントループ上で最初に使われたときに生成される。
+    """
+
+    def __init__(self, config: MySQLConfig):
+        self._config = config
+        self._pool: Optional[aiomysql.Pool] = None
+        self._init_lock = asyncio.Lock()
+        # メトリクス用: 貸し出し中の接続数と取得待ちのコルーチン数
+        self._in_use = 0
+        self._waiting = 0
+
+    @property
+    def is_open(self) -> bool:
+        """プール本体が生成済み (接続済み) かどうか"""
+        return self._pool is not None
+
+    def stats(self) -> Dict[str, int]:
+        """プールの利用状況 (貸し出し中・取得待ち・生成済み・空き接続数)"""
+        pool = self._pool
+        return {
+            "in_use": self._in_use,
+            "waiting": self._waiting,
+            "size": pool.size if pool is not None else 0,
+            "free": pool.freesize if pool is not None else 0,
+            "max_size": self._config.pool_max_size,
+        }
+
+    async def _get_pool(self) -> aiomysql.Pool:
+        if self._pool is not None:
+            return self._pool
+
+        async with self._init_lock:
+            if self._pool is None:
+                try:
+                    self._pool = await aiomysql.create_pool(
+                        minsize=self._config.pool_min_size,
+                        maxsize=self._config.pool_max_size,
+                        pool_recycle=self._config.pool_recycle,
+                        host=self._config.host,
+                        port=self._config.port,
+                        user=self._config.user,
+                        password=self._config.password,
+                        db=self._config.database,
+                        connect_timeout=self._config.connect_timeout,
+                        # 読み取りで古いスナップショットを掴み続けないよう autocommit を有効にし、
+                        # 書き込み時のみ明示的にトランザクションを開始する
+                        autocommit=True,
+                        charset="utf8mb4",
+                    )
+                except aiomysql.Error as err:
+                    print(f"Error initializing shared connection pool: {err}")
+                    raise
+        return self._pool
+
+    @asynccontextmanager
+    async def connection(self):
+        """プールからコネクションを取得し、処理後に返却するコンテキストマネージャ"""
+        pool = await self._get_pool()
+        self._waiting += 1
+        try:
+            conn = await asyncio.wait_for(pool.acquire(), timeout=self._config.acquire_timeout)
+        except asyncio.TimeoutError:
+            raise MySQLPoolError(
+                f"Timed out after {self._config.acquire_timeout}s waiting for a database connection."
+            )
+        finally:
+            self._waiting -= 1
+        self._in_use += 1
+        try:
+            yield conn
+        finally:
+            self._in_use -= 1
+            pool.release(conn)
+
+    @asynccontextmanager
+    async def cursor(self, commit: bool = False):
+        """
+        カーソルを取得するコンテキストマネージャ。
+        commit=True の場合はブロック全体を1トランザクションとして実行する。
+        """
+        async with self.connection() as conn:
+            if commit:
+                await conn.begin()
+            cursor = await conn.cursor()
+            try:
+                yield cursor
+                if commit:
+                    await conn.commit()
+            except BaseException:
+                if commit:
+                    try:
+                        await conn.rollback()
+                    except Exception:
+                        pass
+                raise
+            finally:
+                await cursor.close()
+
+    async def close(self) -> None:
+        """プール内の全コネクションを閉じる（シャットダウン時用）"""
+        if self._pool is not None:
+            self._pool.close()
+            await self._pool.wait_closed()
+            self._pool = None
+
+
+# === プロセス全体で共有するプールのレジストリ ===
+_shared_pools: Dict[Tuple[str, int, str, str], SharedMySQLPool] = {}
+
+
+def GetSharedMySQLPool(config: MySQLConfig) -> SharedMySQLPool:
+    """
+    接続先 (host, port, user, database) ごとに1つの共有プールを返すファクトリ関数。
+    同じ設定で何度呼ばれても同一インスタンスを返す。
+    """
+    key = (config.host, config.port, config.user, config.database)
+    pool = _shared_pools.get(key)
+    if pool is None:
+        pool = SharedMySQLPool(config)
+        _shared_pools[key] = pool
+    return pool
+
+
+def _collect_pool_stats(field: str):
+    for (host, port, _user, database), pool in list(_shared_pools.items()):
+        yield (f"{host}:{port}/{database}", field), pool.stats()[field]
+
+
+# /metrics 出力時に全共有プールの利用状況を読み出すゲージ
+REGISTRY.gauge_func(
+    "agenthub_db_pool_connections",
+    "Shared MySQL pool connections by state (in_use, waiting, size, free, max_size).",
+    ("db", "state"),
+    lambda: [
+        sample
+        for field in ("in_use", "waiting", "size", "free", "max_size")
+        for sample in _collect_pool_stats(field)
+    ],
+)
+
+
+async def close_shared_mysql_pools() -> None:
+    """生成済みの全共有プールを閉じる"""
+    for pool in list(_shared_pools.values()):
+        await pool.close()
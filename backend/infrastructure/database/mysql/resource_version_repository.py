@@ -0,0 +1,109 @@
+from typing import Optional, Tuple, Any
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+# ドメインエンティティのインポート
+from domain.entities.resource_version import ResourceVersion, ResourceVersionRepository
+from domain.value_objects.id import ID
+
+# インフラストラクチャ層の依存関係
+from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+
+
+def _to_version(row: Optional[tuple]) -> Optional[ResourceVersion]:
+    """
+    (件数, 最終更新日時, ...) の行を版文字列に変換する。
+    行が無い (リソースが存在しない・所有者でない) 場合は None。
+    """
+    if not row:
+        return None
+    parts = []
+    for value in row:
+        if value is None:
+            parts.append("-")
+        elif isinstance(value, datetime):
+            parts.append(value.isoformat())
+        else:
+            parts.append(str(value))
+    return ResourceVersion(value=":".join(parts))
+
+
+class MySQLResourceVersionRepository(ResourceVersionRepository):
+    """
+    ResourceVersionRepository の MySQL 実装。
+    各テーブルの updated_at (DATETIME(6), ON UPDATE CURRENT_TIMESTAMP) の最大値と件数を
+    所有者条件付きの1つの集約クエリで取得する。
+    件数を含めるのは、行の削除を updated_at だけでは検出できないため。
+    """
+
+    def __init__(self, config: MySQLConfig):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
+        """データベース接続とカーソルを管理するコンテキストマネージャ"""
+        # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+        with DB_QUERY_SECONDS.time(repository="resource_version", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
+
+    async def _fetch_version(self, sql: str, params: Tuple[Any, ...]) -> Optional[ResourceVersion]:
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, params)
+            row = await cursor.fetchone()
+        return _to_version(row)
+
+    async def agent_jobs_version(self, agent_id: "ID", user_id: "ID", status: Optional[str] = None) -> Optional[ResourceVersion]:
+        # ジョブが0件でもエージェントの行は返るように LEFT JOIN する
+        status_clause = "AND fj.status = %s" if status is not None else ""
+        sql = f"""
+        SELECT COUNT(fj.id), MAX(fj.updated_at)
+        FROM agents a
+        LEFT JOIN finetuning_jobs fj ON fj.agent_id = a.id {status_clause}
+        WHERE a.id = %s AND a.user_id = %s
+        GROUP BY a.id
+        """
+        params: Tuple[Any, ...] = (agent_id.value, user_id.value)
+        if status is not None:
+            params = (status,) + params
+        return await self._fetch_version(sql, params)
+
+    async def agent_deployments_version(self, agent_id: "ID", user_id: "ID", status: Optional[str] = None) -> Optional[ResourceVersion]:
+        status_clause = "AND d.status = %s" if status is not None else ""
+        sql = f"""
+        SELECT COUNT(d.id), MAX(d.updated_at)
+        FROM agents a
+        LEFT JOIN finetuning_jobs fj ON fj.agent_id = a.id
+        LEFT JOIN deployments d ON d.job_id = fj.id {status_clause}
+        WHERE a.id = %s AND a.user_id = %s
+        GROUP BY a.id
+        """
+        params: Tuple[Any, ...] = (agent_id.value, user_id.value)
+        if status is not None:
+            params = (status,) + params
+        return await self._fetch_version(sql, params)
+
+    async def job_visualizations_version(self, job_id: "ID", user_id: "ID") -> Optional[ResourceVersion]:
+        sql = """
+        SELECT wv.job_id, wv.updated_at
+        FROM finetuning_jobs fj
+        JOIN agents a ON a.id = fj.agent_id
+        LEFT JOIN weight_visualizations wv ON wv.job_id = fj.id
+        WHERE fj.id = %s AND a.user_id = %s
+        """
+        return await self._fetch_version(sql, (job_id.value, user_id.value))
+
+    async def job_methods_version(self, job_id: "ID", user_id: "ID") -> Optional[ResourceVersion]:
+        # レスポンスに deployment_id を含むため、デプロイメントIDも版に含める
+        sql = """
+        SELECT d.id, dm.updated_at
+        FROM finetuning_jobs fj
+        JOIN agents a ON a.id = fj.agent_id
+        LEFT JOIN deployments d ON d.job_id = fj.id
+        LEFT JOIN deployment_methods dm ON dm.deployment_id = d.id
+        WHERE fj.id = %s AND a.user_id = %s
+        """
+        return await self._fetch_version(sql, (job_id.value, user_id.value))
@@ -0,0 +1,115 @@
+from typing import Optional, List
+from contextlib import asynccontextmanager
+
+# ドメインエンティティのインポート
+from domain.entities.training_link import TrainingLink, TrainingDataRepository
+from domain.value_objects.id import ID
+
+# インフラストラクチャ層の依存関係
+from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+
+
+# _map_row_to_link が前提とする SELECT 列の順序
+_LINK_COLUMNS = (
+    "job_id, data_url, file_name, record_count, file_size, file_mode, invalid_record_count, methods"
+)
+
+
+def _join_methods(methods: Optional[List[str]]) -> Optional[str]:
+    """メソッド一覧を改行区切りで保存する (None は「保存していない」、空リストは「メソッドなし」)"""
+    if methods is None:
+        return None
+    return "\n".join(methods)
+
+
+def _split_methods(value: Optional[str]) -> Optional[List[str]]:
+    if value is None:
+        return None
+    return [method for method in value.split("\n") if method]
+
+
+class MySQLTrainingDataRepository(TrainingDataRepository):
+
+    def __init__(self, config: MySQLConfig):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
+        """データベース接続とカーソルを管理するコンテキストマネージャ"""
+        with DB_QUERY_SECONDS.time(repository="training_data", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
+
+    def _map_row_to_link(self, row: tuple) -> Optional[TrainingLink]:
+        """データベースの行データを TrainingLink エンティティにマッピング"""
+        if not row:
+            return None
+        return TrainingLink(
+            job_id=ID(row[0]),
+            data_url=row[1],
+            file_name=row[2],
+            record_count=row[3],
+            file_size=row[4],
+            file_mode=row[5],
+            invalid_record_count=row[6],
+            methods=_split_methods(row[7]),
+        )
+
+    async def create(self, link: TrainingLink) -> TrainingLink:
+        # バックグラウンドタスクの再試行で同じジョブに2回書き込んでも失敗しないよう、既存行は上書きする
+        # created_at は NOT NULL (ORM の default は生の SQL には効かない)。他の時刻列と同じく UTC で記録する
+        sql = f"""
+        INSERT INTO training_links ({_LINK_COLUMNS}, created_at)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, UTC_TIMESTAMP())
+        ON DUPLICATE KEY UPDATE
+            data_url = VALUES(data_url),
+            file_name = VALUES(file_name),
+            record_count = VALUES(record_count),
+            file_size = VALUES(file_size),
+            file_mode = VALUES(file_mode),
+            invalid_record_count = VALUES(invalid_record_count),
+            methods = VALUES(methods)
+        """
+        data = (
+            link.job_id.value,
+            link.data_url,
+            link.file_name,
+            link.record_count,
+            link.file_size,
+            link.file_mode,
+            link.invalid_record_count,
+            _join_methods(link.methods),
+        )
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
+        return link
+
+    async def find_by_job(self, job_id: "ID") -> Optional[TrainingLink]:
+        sql = f"SELECT {_LINK_COLUMNS} FROM training_links WHERE job_id = %s"
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (job_id.value,))
+            row = await cursor.fetchone()
+        return self._map_row_to_link(row)
+
+    async def update(self, link: TrainingLink) -> None:
+        sql = """
+        UPDATE training_links
+        SET data_url = %s, file_name = %s, record_count = %s, file_size = %s,
+            file_mode = %s, invalid_record_count = %s, methods = %s
+        WHERE job_id = %s
+        """
+        data = (
+            link.data_url,
+            link.file_name,
+            link.record_count,
+            link.file_size,
+            link.file_mode,
+            link.invalid_record_count,
+            _join_methods(link.methods),
+            link.job_id.value,
+        )
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
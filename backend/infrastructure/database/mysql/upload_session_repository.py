@@ -0,0 +1,124 @@
+from typing import Optional, List
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+# ドメインエンティティのインポート
+from domain.entities.upload_session import (
+    UploadSession,
+    UploadSessionRepository,
+    UPLOAD_SESSION_OPEN,
+    UPLOAD_SESSION_FINALIZED,
+    UPLOAD_SESSION_EXPIRED,
+)
+from domain.value_objects.id import ID
+
+# インフラストラクチャ層の依存関係
+from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
+
+
+# _map_row_to_session が前提とする SELECT 列の順序
+_SESSION_COLUMNS = (
+    "id, user_id, agent_id, filename, total_size, chunk_size, received_size, "
+    "status, created_at, expires_at, job_id"
+)
+
+
+class MySQLUploadSessionRepository(UploadSessionRepository):
+
+    def __init__(self, config: MySQLConfig):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
+        """データベース接続とカーソルを管理するコンテキストマネージャ"""
+        with DB_QUERY_SECONDS.time(repository="upload_session", operation="write" if commit else "read"):
+            async with self.pool.cursor(commit=commit) as cursor:
+                yield cursor
+
+    def _map_row_to_session(self, row: tuple) -> Optional[UploadSession]:
+        """データベースの行データを UploadSession エンティティにマッピング"""
+        if not row:
+            return None
+        return UploadSession(
+            id=row[0],
+            user_id=ID(row[1]),
+            agent_id=ID(row[2]),
+            filename=row[3],
+            total_size=int(row[4]),
+            chunk_size=int(row[5]),
+            received_size=int(row[6]),
+            status=row[7],
+            created_at=row[8],
+            expires_at=row[9],
+            job_id=ID(row[10]) if row[10] is not None else None,
+        )
+
+    async def create(self, session: UploadSession) -> UploadSession:
+        sql = f"""
+        INSERT INTO upload_sessions ({_SESSION_COLUMNS})
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+        """
+        data = (
+            session.id,
+            session.user_id.value,
+            session.agent_id.value,
+            session.filename,
+            session.total_size,
+            session.chunk_size,
+            session.received_size,
+            session.status,
+            session.created_at,
+            session.expires_at,
+            session.job_id.value if session.job_id else None,
+        )
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
+        return session
+
+    async def find_by_id(self, session_id: str) -> Optional[UploadSession]:
+        sql = f"SELECT {_SESSION_COLUMNS} FROM upload_sessions WHERE id = %s"
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (session_id,))
+            row = await cursor.fetchone()
+        return self._map_row_to_session(row)
+
+    async def advance(self, session_id: str, expected_received_size: int, new_received_size: int) -> bool:
+        sql = """
+        UPDATE upload_sessions
+        SET received_size = %s
+        WHERE id = %s AND status = %s AND received_size = %s
+        """
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (new_received_size, session_id, UPLOAD_SESSION_OPEN, expected_received_size))
+            return cursor.rowcount == 1
+
+    async def finalize(self, session_id: str, job_id: "ID") -> bool:
+        sql = """
+        UPDATE upload_sessions
+        SET status = %s, job_id = %s
+        WHERE id = %s AND status = %s
+        """
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (UPLOAD_SESSION_FINALIZED, job_id.value, session_id, UPLOAD_SESSION_OPEN))
+            return cursor.rowcount == 1
+
+    async def list_expired(self, now: datetime, limit: int) -> List[UploadSession]:
+        sql = f"""
+        SELECT {_SESSION_COLUMNS}
+        FROM upload_sessions
+        WHERE status = %s AND expires_at < %s
+        ORDER BY expires_at ASC
+        LIMIT %s
+        """
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (UPLOAD_SESSION_OPEN, now, limit))
+            rows = await cursor.fetchall()
+        return [self._map_row_to_session(row) for row in rows if row]
+
+    async def mark_expired(self, session_id: str) -> None:
+        sql = "UPDATE upload_sessions SET status = %s WHERE id = %s AND status = %s"
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (UPLOAD_SESSION_EXPIRED, session_id, UPLOAD_SESSION_OPEN))
@@ -1,53 +1,36 @@
-import mysql.connector
-from mysql.connector import pooling
+import aiomysql
 from typing import Optional, List
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
 
 from domain.entities.user import User, UserRepository
 from domain.value_objects.id import ID
 from domain.value_objects.email import Email
 
+from infrastructure.cache.principal_cache import PrincipalCache
+
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
 
 
 class MySQLUserRepository(UserRepository):
 
-    def __init__(self, config: MySQLConfig):
-        try:
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="user_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing connection pool: {err}")
-            raise
+    def __init__(self, config: MySQLConfig, principal_cache: Optional[PrincipalCache] = None):
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
+        # ユーザー更新・削除時に認証キャッシュを無効化するために保持する
+        self.principal_cache = principal_cache
 
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
-        conn = None
-        cursor = None
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         try:
-            conn = self.pool.get_connection()
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
+            # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+            with DB_QUERY_SECONDS.time(repository="user", operation="write" if commit else "read"):
+                async with self.pool.cursor(commit=commit) as cursor:
+                    yield cursor
+        except aiomysql.Error as err:
             print(f"Database error: {err}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
 
     def _map_row_to_user(self, row: tuple) -> Optional[User]:
         if not row:
@@ -62,7 +45,7 @@ class MySQLUserRepository(UserRepository):
             password_hash=row[5]
         )
 
-    def create(self, user: User) -> User:
+    async def create(self, user: User) -> User:
         sql = """
         INSERT INTO users (username, name, email, avatar_url, password_hash)
         VALUES (%s, %s, %s, %s, %s)
@@ -75,8 +58,8 @@ class MySQLUserRepository(UserRepository):
             user.password_hash
         )
 
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             new_id = cursor.lastrowid
 
         return User(
@@ -88,39 +71,39 @@ class MySQLUserRepository(UserRepository):
             password_hash=user.password_hash
         )
 
-    def find_by_id(self, user_id: "ID") -> Optional[User]:
+    async def find_by_id(self, user_id: "ID") -> Optional[User]:
         sql = "SELECT id, username, name, email, avatar_url, password_hash FROM users WHERE id = %s"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (user_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (user_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_user(row)
 
-    def find_by_username(self, username: str) -> Optional[User]:
+    async def find_by_username(self, username: str) -> Optional[User]:
         sql = "SELECT id, username, name, email, avatar_url, password_hash FROM users WHERE username = %s"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (username,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (username,))
+            row = await cursor.fetchone()
             
         return self._map_row_to_user(row)
 
-    def find_by_email(self, email: "Email") -> Optional[User]:
+    async def find_by_email(self, email: "Email") -> Optional[User]:
         sql = "SELECT id, username, name, email, avatar_url, password_hash FROM users WHERE email = %s"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (email.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (email.value,))
+            row = await cursor.fetchone()
             
         return self._map_row_to_user(row)
 
-    def find_all(self) -> List[User]:
+    async def find_all(self) -> List[User]:
         sql = "SELECT id, username, name, email, avatar_url, password_hash FROM users ORDER BY id"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql)
-            rows = cursor.fetchall()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql)
+            rows = await cursor.fetchall()
             
         return [self._map_row_to_user(row) for row in rows if row]
 
-    def update(self, user: User) -> None:
+    async def update(self, user: User) -> None:
         sql = """
         UPDATE users
         SET username = %s, name = %s, email = %s, avatar_url = %s, password_hash = %s
@@ -135,15 +118,24 @@ class MySQLUserRepository(UserRepository):
             user.id.value
         )
         
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
 
-    def delete(self, user_id: "ID") -> None:
+        if self.principal_cache is not None:
+            await self.principal_cache.invalidate_user(user.id)
+
+    async def delete(self, user_id: "ID") -> None:
         sql = "DELETE FROM users WHERE id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (user_id.value,))
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (user_id.value,))
+
+        if self.principal_cache is not None:
+            await self.principal_cache.invalidate_user(user_id)
 
-    def delete_all(self) -> None:
+    async def delete_all(self) -> None:
         sql = "DELETE FROM users"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql)
\ No newline at end of file
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql)
+
+        if self.principal_cache is not None:
+            await self.principal_cache.clear()
\ No newline at end of file
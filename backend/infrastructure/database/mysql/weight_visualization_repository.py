@@ -1,16 +1,19 @@
-import mysql.connector
+import aiomysql
 import json
-from mysql.connector import pooling
 from typing import Optional, List, Dict, Any
-from contextlib import contextmanager
+from contextlib import asynccontextmanager
+from dataclasses import asdict
 
 # ドメインエンティティ/VOのインポート
 from domain.entities.weight_visualization import WeightVisualization, WeightVisualizationRepository
 from domain.value_objects.id import ID
-from domain.value_objects.visualization_details import LayerVisualization, WeightDetail
+from domain.value_objects.visualization_details import LayerVisualization, WeightDetail, parse_color_ranges
+from domain.value_objects.weight_change_stats import WeightChangeStats, parse_weight_change_stats
 
 # インフラストラクチャ層の依存関係
 from .config import MySQLConfig
+from .pool import GetSharedMySQLPool
+from infrastructure.metrics.prometheus import DB_QUERY_SECONDS
 
 
 class MySQLWeightVisualizationRepository(WeightVisualizationRepository):
@@ -20,52 +23,28 @@ class MySQLWeightVisualizationRepository(WeightVisualizationRepository):
     """
 
     def __init__(self, config: MySQLConfig):
-        try:
-            # 接続プールの初期化
-            self.pool = pooling.MySQLConnectionPool(
-                pool_name="vis_repo_pool",
-                pool_size=5,
-                pool_reset_session=True,
-                host=config.host,
-                port=config.port,
-                user=config.user,
-                password=config.password,
-                database=config.database
-            )
-        except mysql.connector.Error as err:
-            print(f"Error initializing connection pool: {err}")
-            raise
+        # プロセス全体で共有される非同期コネクションプールを利用する
+        self.pool = GetSharedMySQLPool(config)
 
-    @contextmanager
-    def _get_cursor(self, commit: bool = False):
+    @asynccontextmanager
+    async def _get_cursor(self, commit: bool = False):
         """DBカーソルを取得・管理するコンテキストマネージャ"""
-        conn = None
-        cursor = None
         try:
-            conn = self.pool.get_connection()
-            # dictionary=True を使わないことで、User Repository との互換性を保つ（今回はタプルで処理）
-            cursor = conn.cursor()
-            yield cursor
-            if commit:
-                conn.commit()
-        except mysql.connector.Error as err:
-            if conn:
-                conn.rollback()
+            # 接続待ちを含むカーソル保持時間をリポジトリ単位で記録する
+            with DB_QUERY_SECONDS.time(repository="weight_visualization", operation="write" if commit else "read"):
+                async with self.pool.cursor(commit=commit) as cursor:
+                    yield cursor
+        except aiomysql.Error as err:
             print(f"Database error: {err}")
             raise
-        finally:
-            if cursor:
-                cursor.close()
-            if conn:
-                conn.close()
-    
+
     # --- ヘルパー関数 ---
 
     def _serialize_layers(self, layers: List[LayerVisualization]) -> str:
         """LayerVisualizationのリストをJSON文字列に変換"""
         layers_data = []
         for layer in layers:
-            weights_data = [w.__dict__ for w in layer.weights] # WeightDetail (frozen=True) を辞書に変換
+            weights_data = [asdict(w) for w in layer.weights] # WeightDetail (frozen=True) を辞書に変換 (色範囲も辞書になる)
             layers_data.append({"layer_name": layer.layer_name, "weights": weights_data})
         return json.dumps(layers_data)
 
@@ -85,7 +64,8 @@ class MySQLWeightVisualizationRepository(WeightVisualizationRepository):
                         name=weight_dict.get("name", ""),
                         before_url=weight_dict.get("before_url", ""),
                         after_url=weight_dict.get("after_url", ""),
-                        delta_url=weight_dict.get("delta_url", "")
+                        delta_url=weight_dict.get("delta_url", ""),
+                        color_ranges=parse_color_ranges(weight_dict.get("color_ranges")),
                     ))
                 layers.append(LayerVisualization(
                     layer_name=layer_dict.get("layer_name", ""),
@@ -116,7 +96,7 @@ class MySQLWeightVisualizationRepository(WeightVisualizationRepository):
 
     # --- CRUD 実装 ---
 
-    def save(self, visualization: WeightVisualization) -> WeightVisualization:
+    async def save(self, visualization: WeightVisualization) -> WeightVisualization:
         """可視化データを新規保存または更新する (Create / Update)"""
         sql = """
         INSERT INTO weight_visualizations (job_id, layers_data)
@@ -127,22 +107,38 @@ class MySQLWeightVisualizationRepository(WeightVisualizationRepository):
         layers_json = self._serialize_layers(visualization.layers)
         data = (visualization.job_id.value, layers_json)
 
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, data)
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, data)
             
         return visualization # IDは既に持っているのでそのまま返す
 
-    def find_by_job_id(self, job_id: ID) -> Optional[WeightVisualization]:
+    async def find_by_job_id(self, job_id: ID) -> Optional[WeightVisualization]:
         """ジョブIDから可視化データを取得する (Read)"""
         sql = "SELECT job_id, layers_data FROM weight_visualizations WHERE job_id = %s"
-        with self._get_cursor() as cursor:
-            cursor.execute(sql, (job_id.value,))
-            row = cursor.fetchone()
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (job_id.value,))
+            row = await cursor.fetchone()
         
         return self._map_row_to_visualization(row)
 
-    def delete_by_job_id(self, job_id: ID) -> None:
+    async def find_stats_by_job_id(self, job_id: ID) -> Optional[WeightChangeStats]:
+        """ジョブIDから重み変化の統計だけを取得する (layers_data は読まない)"""
+        sql = "SELECT weight_stats FROM weight_visualizations WHERE job_id = %s"
+        async with self._get_cursor() as cursor:
+            await cursor.execute(sql, (job_id.value,))
+            row = await cursor.fetchone()
+
+        if not row or not row[0]:
+            return None
+        try:
+            # NOTE: row[0]: weight_stats (str/JSON)
+            return parse_weight_change_stats(json.loads(row[0]))
+        except (ValueError, TypeError) as e:
+            print(f"ERROR: Failed to deserialize weight stats for job {job_id.value}: {e}")
+            return None
+
+    async def delete_by_job_id(self, job_id: ID) -> None:
         """ジョブIDに紐づく可視化データを削除する (Delete)"""
         sql = "DELETE FROM weight_visualizations WHERE job_id = %s"
-        with self._get_cursor(commit=True) as cursor:
-            cursor.execute(sql, (job_id.value,))
+        async with self._get_cursor(commit=True) as cursor:
+            await cursor.execute(sql, (job_id.value,))
@@ -1,16 +1,17 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from jose import jwt, JWTError
-from passlib.context import CryptContext
 import os
 from dotenv import load_dotenv
 
 from domain.entities.user import User, UserRepository
 from domain.services.auth_domain_service import AuthDomainService
+from domain.services.password_hash_domain_service import PasswordHashDomainService
 # --- ▼ 修正: Value Objectをインポート ▼ ---
 from domain.value_objects.email import Email
 from domain.value_objects.id import ID
 # --- ▲ 修正 ▲ ---
+from infrastructure.cache.principal_cache import PrincipalCache
 
 # --- .env から設定を読み込む ---
 load_dotenv()
@@ -18,34 +19,45 @@ SECRET_KEY = os.getenv("SECRET_KEY", "default-secret-key")
 ALGORITHM = os.getenv("ALGORITHM", "HS256")
 ACCESS_TOKEN_EXPIRE_MINUTES = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "60"))
 
-# パスワードハッシュ用
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-
 class AuthDomainServiceImpl(AuthDomainService):
     """
     JWT を利用した認証ドメインサービスの具体的実装
     """
 
-    def __init__(self, user_repo: UserRepository):
+    def __init__(
+        self,
+        user_repo: UserRepository,
+        password_hasher: PasswordHashDomainService,
+        principal_cache: Optional[PrincipalCache] = None,
+    ):
         self.user_repo = user_repo
+        # bcrypt は専用のプロセスプールで実行される
+        self.password_hasher = password_hasher
+        # 検証済みトークン -> User のキャッシュ (None の場合は毎回 DB を参照する)
+        self.principal_cache = principal_cache
 
-    def login(self, email: str, password: str) -> str:
+    async def login(self, email: str, password: str) -> str:
         """
         メールアドレスとパスワードを検証し、JWT トークンを発行する。
         """
         # --- ▼ 修正: email(str)を渡す（内部でVOに変換） ▼ ---
-        user: Optional[User] = self._find_user_by_email(email)
+        user: Optional[User] = await self._find_user_by_email(email)
         # --- ▲ 修正 ▲ ---
         
         if not user:
             raise ValueError("User not found")
 
         # --- ▼ 修正: password_hash を user オブジェクトから取得 ▼ ---
-        if not pwd_context.verify(password, user.password_hash):
+        # (実行枠が埋まっている場合は PasswordHashBusyError がそのまま送出される)
+        is_valid = await self.password_hasher.verify(password, user.password_hash)
+        if not is_valid:
             raise ValueError("Invalid credentials")
         # --- ▲ 修正 ▲ ---
 
+        # コスト設定が変わっている場合は、平文が手元にあるこのタイミングで再ハッシュする
+        if self.password_hasher.needs_rehash(user.password_hash):
+            await self._rehash_password(user, password)
+
         # --- ▼ 修正: user.id (IDオブジェクト) を .value でプリミティブ値に変換 ▼ ---
         expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
         payload = {"sub": str(user.id.value), "exp": expire} 
@@ -54,10 +66,16 @@ class AuthDomainServiceImpl(AuthDomainService):
         token = jwt.encode(payload, SECRET_KEY, algorithm=ALGORITHM)
         return token
 
-    def verify_token(self, token: str) -> User:
+    async def verify_token(self, token: str) -> User:
         """
         JWT を検証して、対応する User を返す。
+        キャッシュにヒットした場合はデコードと DB 参照を省略する。
         """
+        if self.principal_cache is not None:
+            cached_user = await self.principal_cache.get(token)
+            if cached_user is not None:
+                return cached_user
+
         try:
             payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
             user_id_str = payload.get("sub")
@@ -70,11 +88,14 @@ class AuthDomainServiceImpl(AuthDomainService):
             except ValueError:
                 raise ValueError("Invalid user ID in token")
                 
-            user = self.user_repo.find_by_id(user_id_vo)
+            user = await self.user_repo.find_by_id(user_id_vo)
             # --- ▲ 修正 ▲ ---
             
             if not user:
                 raise ValueError("User not found")
+
+            if self.principal_cache is not None:
+                await self.principal_cache.set(token, user, payload.get("exp"))
             return user
         except JWTError:
             raise ValueError("Invalid or expired token")
@@ -86,7 +107,19 @@ class AuthDomainServiceImpl(AuthDomainService):
         return None
 
     # --- 内部ユーティリティ ---
-    def _find_user_by_email(self, email_str: str) -> Optional[User]:
+    async def _rehash_password(self, user: User, password: str) -> None:
+        """
+        現在のコスト設定でパスワードを再ハッシュして保存する。
+        失敗してもログイン自体は成功させる。
+        """
+        try:
+            user.password_hash = await self.password_hasher.hash(password)
+            await self.user_repo.update(user)
+            print(f"INFO: Rehashed password for user {user.id.value} with current cost.")
+        except Exception as e:
+            print(f"ERROR: Failed to rehash password for user {user.id.value}: {e}")
+
+    async def _find_user_by_email(self, email_str: str) -> Optional[User]:
         # --- ▼ 修正: find_all() をやめて、find_by_email() を使う ▼ ---
         """
         UserRepository の find_by_email を使用して効率的に検索する。
@@ -95,7 +128,7 @@ class AuthDomainServiceImpl(AuthDomainService):
             # 1. str を Email(VO) に変換
             email_vo = Email(email_str)
             # 2. リポジトリの find_by_email を呼び出す
-            return self.user_repo.find_by_email(email_vo)
+            return await self.user_repo.find_by_email(email_vo)
         except ValueError:
             # Email(VO) のバリデーション（形式チェックなど）でエラーになった場合
             return None
@@ -103,5 +136,9 @@ class AuthDomainServiceImpl(AuthDomainService):
 
 
 # --- ファクトリ関数 ---
-def NewAuthDomainService(user_repo: UserRepository) -> AuthDomainServiceImpl:
-    return AuthDomainServiceImpl(user_repo)
\ No newline at end of file
+def NewAuthDomainService(
+    user_repo: UserRepository,
+    password_hasher: PasswordHashDomainService,
+    principal_cache: Optional[PrincipalCache] = None,
+) -> AuthDomainServiceImpl:
+    return AuthDomainServiceImpl(user_repo, password_hasher, principal_cache)
\ No newline at end of file
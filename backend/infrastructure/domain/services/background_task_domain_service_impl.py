@@ -0,0 +1,53 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Set
+
+from domain.services.background_task_domain_service import BackgroundTaskDomainService
+
+
+class AsyncioBackgroundTaskDomainServiceImpl(BackgroundTaskDomainService):
+    """
+    BackgroundTaskDomainService の asyncio 実装。
+    タスクは API プロセスのイベントループ上で実行され、リクエストの完了とは独立して進む。
+    実行中のタスクは強参照で保持し (GC による途中終了を防ぐ)、シャットダウン時に完了を待つ。
+    """
+
+    def __init__(self, shutdown_timeout: float = 60.0):
+        self.shutdown_timeout = shutdown_timeout
+        self._tasks: Set[asyncio.Task] = set()
+
+    def submit(self, name: str, task: Callable[[], Awaitable[None]]) -> None:
+        loop = asyncio.get_running_loop()
+        running = loop.create_task(self._run(name, task), name=name)
+        self._tasks.add(running)
+        running.add_done_callback(self._tasks.discard)
+
+    async def _run(self, name: str, task: Callable[[], Awaitable[None]]) -> None:
+        try:
+            await task()
+        except asyncio.CancelledError:
+            print(f"ERROR: Background task {name} was cancelled.")
+            raise
+        except Exception as e:
+            # タスク側で処理されなかった例外はここで記録し、イベントループには伝播させない
+            print(f"ERROR: Background task {name} failed: {e}")
+
+    def stats(self) -> Dict[str, int]:
+        """実行中のタスク数"""
+        return {"in_flight": len(self._tasks)}
+
+    async def close(self) -> None:
+        """実行中のタスクの完了を shutdown_timeout 秒まで待ち、残りはキャンセルする"""
+        pending = list(self._tasks)
+        if not pending:
+            return
+        print(f"INFO: Waiting for {len(pending)} background task(s) to finish...")
+        _, still_running = await asyncio.wait(pending, timeout=self.shutdown_timeout)
+        for task in still_running:
+            task.cancel()
+        if still_running:
+            await asyncio.gather(*still_running, return_exceptions=True)
+
+
+def NewBackgroundTaskDomainService(shutdown_timeout: float = 60.0) -> AsyncioBackgroundTaskDomainServiceImpl:
+    """AsyncioBackgroundTaskDomainServiceImpl のファクトリ関数"""
+    return AsyncioBackgroundTaskDomainServiceImpl(shutdown_timeout=shutdown_timeout)
@@ -11,6 +11,7 @@ from domain.services.deployment_test_domain_service import DeploymentTestDomainS
 from domain.value_objects.deployment_test_result import DeploymentTestResult
 from domain.value_objects.inference_case_result import InferenceCaseResult
 from domain.value_objects.test_run_metrics import TestRunMetrics
+from infrastructure.metrics.prometheus import ENGINE_HTTP_SECONDS
 
 POWER_API_URL = os.environ.get("POWER_MONITOR_API_URL", "http://localhost:8080/power")
 
@@ -45,7 +46,8 @@ class DeploymentTestDomainServiceImpl(DeploymentTestDomainService):
     # ---------------------------
     async def _get_power_metrics(self) -> Dict[str, Any]:
         try:
-            response = await self._client.get(POWER_API_URL, timeout=5)
+            with ENGINE_HTTP_SECONDS.time(operation="power"):
+                response = await self._client.get(POWER_API_URL, timeout=5)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError:
@@ -57,7 +59,8 @@ class DeploymentTestDomainServiceImpl(DeploymentTestDomainService):
     async def _run_single_inference(self, endpoint_url: str, input_text: str) -> Dict[str, Any]:
         try:
             payload = {"prompt": input_text}
-            response = await self._client.post(endpoint_url, json=payload, timeout=10)
+            with ENGINE_HTTP_SECONDS.time(operation="inference"):
+                response = await self._client.post(endpoint_url, json=payload, timeout=10)
             response.raise_for_status()
             return response.json()
         except httpx.HTTPError as e:
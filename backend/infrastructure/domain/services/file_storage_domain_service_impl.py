@@ -1,15 +1,36 @@
+import hashlib
 import os
+import uuid
 import paramiko
 import stat
-from typing import Optional
+from typing import Optional, Tuple
 from domain.services.file_storage_domain_service import FileStorageDomainService
 from domain.value_objects.file_data import UploadedFileStream
-from infrastructure.storage.local_file_storage import save_training_file, FileStorageError
+from domain.value_objects.training_file_stats import TrainingFileStats, TrainingFileAnalyzer
+from infrastructure.storage.local_file_storage import (
+    FileStorageError, LocalStorageConfig, STORAGE_BACKEND_LOCAL,
+    GetStorageBackendFromEnv, NewLocalStorageConfigFromEnv, write_file_atomic, ensure_dir,
+)
+from infrastructure.metrics.prometheus import SFTP_SECONDS
+from infrastructure.storage.sftp_pool import SFTPConnectionPool, SFTPPoolConfig, GetSharedSFTPPool, NewSFTPPoolConfigFromEnv
 # --- 必要な鍵クラスをインポート ---
 from paramiko.ed25519key import Ed25519Key
 
 
 
+def _compute_content_hash(file_stream: UploadedFileStream) -> str:
+    """受信時に計算済みでない場合のみ、ストリームを読んで SHA-256 を求める"""
+    if file_stream.content_hash:
+        return file_stream.content_hash
+    digest = hashlib.sha256()
+    stream = file_stream.file_stream
+    stream.seek(0)
+    for chunk in iter(lambda: stream.read(1024 * 1024), b""):
+        digest.update(chunk)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
 class SFTPFileStorageDomainServiceImpl(FileStorageDomainService):
     """
     FileStorageDomainService の本番実装。
@@ -19,7 +40,8 @@ class SFTPFileStorageDomainServiceImpl(FileStorageDomainService):
     # --- パスワード引数を __init__ から削除 ---
     def __init__(self, vps_ip: str, vps_user: str,
                  key_file_path: str, remote_training_dir: str, 
-                 remote_model_dir: str, vps_port: int = 22):
+                 remote_model_dir: str, vps_port: int = 22,
+                 pool: Optional[SFTPConnectionPool] = None):
         
         self.vps_ip = vps_ip
         self.vps_user = vps_user
@@ -28,14 +50,10 @@ class SFTPFileStorageDomainServiceImpl(FileStorageDomainService):
         self.remote_training_dir = remote_training_dir
         self.remote_model_dir = remote_model_dir
         
-        if not os.path.exists(self.key_file_path):
-            raise FileNotFoundError(f"SSH key file not found at: {self.key_file_path}")
-        
-        # --- RSAKey を Ed25519Key に変更 ---
-        try:
-            self.private_key = paramiko.Ed25519Key(filename=self.key_file_path)
-        except Exception as e:
-            raise FileStorageError(f"Failed to load SSH private key (tried Ed25519): {e}")
+        # SSH トランスポートは全 SFTP サービスで共有するプールから借りる (鍵の読み込みもプールが行う)
+        self._pool = pool or GetSharedSFTPPool(
+            SFTPPoolConfig(host=vps_ip, port=vps_port, user=vps_user, key_file_path=key_file_path)
+        )
 
         print(f"INFO: SFTP Storage Service initialized. Target: {vps_user}@{vps_ip}") 
         print(f"INFO: -> Training Dir: {self.remote_training_dir}")
@@ -82,61 +100,87 @@ class SFTPFileStorageDomainServiceImpl(FileStorageDomainService):
         """SFTPでファイルをアップロードする共通ヘルパー"""
         
         remote_path = f"{remote_dir}/{filename}"
-        client = None
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            print(f"INFO: Connecting to {self.vps_ip} via SFTP...")
-            
-            # --- connect() から password 引数を削除 ---
-            client.connect(
-                self.vps_ip, 
-                port=self.vps_port, 
-                username=self.vps_user,
-                pkey=self.private_key
-            )
-
-            sftp = client.open_sftp()
-            
-            # --- ▼▼▼ 修正点 9: 脆弱なmkdirを、堅牢な再帰的mkdirの呼び出しに置き換え ▼▼▼ ---
-            # リモートディレクトリの存在確認と自動作成
-            try:
-                self._ensure_remote_dir_recursive(sftp, remote_dir)
-            except Exception as dir_e:
-                raise FileStorageError(f"Failed to ensure remote directory {remote_dir}: {dir_e}")
-            # --- ▲▲▲ 修正点 9 完了 ▲▲▲ ---
+            # プールから SFTP チャネルを借りる (接続済みのトランスポートがあればハンドシェイクは発生しない)
+            with self._pool.session(service="storage") as sftp:
+                # リモートディレクトリの存在確認と自動作成
+                try:
+                    self._ensure_remote_dir_recursive(sftp, remote_dir)
+                except Exception as dir_e:
+                    raise FileStorageError(f"Failed to ensure remote directory {remote_dir}: {dir_e}")
+
+                # ファイルをストリームで転送
+                actual_binary_stream = file_stream.file_stream
+                actual_binary_stream.seek(0)
+                
+                print(f"INFO: Uploading to SFTP: {remote_path}...")
+                with SFTP_SECONDS.time(service="storage", operation="upload"):
+                    sftp.putfo(actual_binary_stream, remote_path)
+                print(f"INFO: Upload successful.")
 
-            # ファイルをストリームで転送
-            actual_binary_stream = file_stream.file_stream
-            actual_binary_stream.seek(0)
-            
-            print(f"INFO: Uploading to SFTP: {remote_path}...")
-            sftp.putfo(actual_binary_stream, remote_path)
-            print(f"INFO: Upload successful.")
-            
-            sftp.close()
-            
             return remote_path
 
         except Exception as e:
             print(f"ERROR: Failed to upload file via SFTP. Error: {e}")
             raise FileStorageError(f"Failed to save file to VPS: {e}")
-        finally:
-            if client:
-                client.close()
-                print("INFO: SFTP Connection closed.")
+
+    def _save_blob(self, file_stream: UploadedFileStream, remote_root: str) -> str:
+        """
+        内容の SHA-256 をファイル名にしたブロブとして保存する (コンテンツアドレス方式)。
+        同じ内容のブロブが既にあればアップロードしない。
+        書き込み途中のファイルが参照されないよう、一時名で転送してからリネームする。
+        """
+        content_hash = _compute_content_hash(file_stream)
+        suffix = os.path.splitext(file_stream.filename or "")[1].lower()
+        remote_dir = f"{remote_root}/blobs/{content_hash[:2]}"
+        remote_path = f"{remote_dir}/{content_hash}{suffix}"
+        try:
+            with self._pool.session(service="storage") as sftp:
+                try:
+                    sftp.stat(remote_path)
+                    print(f"INFO: Blob already stored, skipping upload: {remote_path}")
+                    return remote_path
+                except FileNotFoundError:
+                    pass
+
+                try:
+                    self._ensure_remote_dir_recursive(sftp, remote_dir)
+                except Exception as dir_e:
+                    raise FileStorageError(f"Failed to ensure remote directory {remote_dir}: {dir_e}")
+
+                actual_binary_stream = file_stream.file_stream
+                actual_binary_stream.seek(0)
+                temp_path = f"{remote_path}.part-{uuid.uuid4().hex}"
+
+                print(f"INFO: Uploading blob to SFTP: {remote_path}...")
+                with SFTP_SECONDS.time(service="storage", operation="upload"):
+                    sftp.putfo(actual_binary_stream, temp_path)
+                try:
+                    sftp.posix_rename(temp_path, remote_path)
+                except IOError:
+                    # posix-rename 拡張が無いサーバー向け。同時アップロードで先に置かれていれば一時ファイルを消す
+                    try:
+                        sftp.rename(temp_path, remote_path)
+                    except IOError:
+                        sftp.remove(temp_path)
+                        sftp.stat(remote_path)
+                print(f"INFO: Upload successful.")
+
+            return remote_path
+
+        except FileStorageError:
+            raise
+        except Exception as e:
+            print(f"ERROR: Failed to upload blob via SFTP. Error: {e}")
+            raise FileStorageError(f"Failed to save file to VPS: {e}")
 
     def save_training_file(self, uploaded_file: UploadedFileStream, unique_id: str) -> str:
         """
         訓練データファイルを保存する。
+        同じ内容のファイルは1つのブロブを共有する (unique_id はパスには使わない)。
         """
-        filename = f"{unique_id}_{uploaded_file.filename}"
-        return self._save_file(
-            file_stream=uploaded_file,
-            remote_dir=self.remote_training_dir,
-            filename=filename
-        )
+        print(f"INFO: Saving training file for {unique_id}...")
+        return self._save_blob(uploaded_file, self.remote_training_dir)
 
     def save_training_model(self, model_artifact: UploadedFileStream, unique_id: str) -> str:
         """
@@ -149,12 +193,212 @@ class SFTPFileStorageDomainServiceImpl(FileStorageDomainService):
             filename=filename
         )
 
+    # --- 再開可能な分割アップロード ---
+
+    def _upload_part_path(self, upload_id: str) -> str:
+        return f"{self.remote_training_dir}/uploads/{upload_id}.part"
+
+    def create_upload(self, upload_id: str) -> None:
+        remote_dir = f"{self.remote_training_dir}/uploads"
+        try:
+            with self._pool.session(service="storage") as sftp:
+                self._ensure_remote_dir_recursive(sftp, remote_dir)
+                with sftp.open(self._upload_part_path(upload_id), "wb"):
+                    pass
+        except FileStorageError:
+            raise
+        except Exception as e:
+            raise FileStorageError(f"Failed to create upload file on VPS: {e}")
+
+    def write_upload_chunk(self, upload_id: str, offset: int, data: bytes) -> None:
+        try:
+            with self._pool.session(service="storage") as sftp:
+                with SFTP_SECONDS.time(service="storage", operation="upload_chunk"):
+                    with sftp.open(self._upload_part_path(upload_id), "r+b") as part:
+                        part.set_pipelined(True)
+                        part.seek(offset)
+                        part.write(data)
+        except FileNotFoundError:
+            raise FileStorageError(f"Upload {upload_id} does not exist on VPS.")
+        except Exception as e:
+            raise FileStorageError(f"Failed to write upload chunk to VPS: {e}")
+
+    def commit_upload(self, upload_id: str, filename: str) -> Tuple[str, str, TrainingFileStats]:
+        part_path = self._upload_part_path(upload_id)
+        try:
+            with self._pool.session(service="storage") as sftp:
+                # 受信済みのファイルを読み直して SHA-256 と統計を求める (チャンクは別リクエスト・別プロセスで受信しているため)
+                digest = hashlib.sha256()
+                analyzer = TrainingFileAnalyzer()
+                with SFTP_SECONDS.time(service="storage", operation="hash"):
+                    with sftp.open(part_path, "rb") as part:
+                        part.prefetch()
+                        for chunk in iter(lambda: part.read(1024 * 1024), b""):
+                            digest.update(chunk)
+                            analyzer.feed(chunk)
+                content_hash = digest.hexdigest()
+                stats = analyzer.finish()
+
+                suffix = os.path.splitext(filename or "")[1].lower()
+                remote_dir = f"{self.remote_training_dir}/blobs/{content_hash[:2]}"
+                remote_path = f"{remote_dir}/{content_hash}{suffix}"
+                try:
+                    sftp.stat(remote_path)
+                    print(f"INFO: Blob already stored, discarding upload {upload_id}: {remote_path}")
+                    sftp.remove(part_path)
+                    return remote_path, content_hash, stats
+                except FileNotFoundError:
+                    pass
+
+                self._ensure_remote_dir_recursive(sftp, remote_dir)
+                try:
+                    sftp.posix_rename(part_path, remote_path)
+                except IOError:
+                    try:
+                        sftp.rename(part_path, remote_path)
+                    except IOError:
+                        sftp.remove(part_path)
+                        sftp.stat(remote_path)
+            print(f"INFO: Upload {upload_id} committed to {remote_path}.")
+            return remote_path, content_hash, stats
+        except FileStorageError:
+            raise
+        except FileNotFoundError:
+            raise FileStorageError(f"Upload {upload_id} does not exist on VPS.")
+        except Exception as e:
+            raise FileStorageError(f"Failed to commit upload on VPS: {e}")
+
+    def discard_upload(self, upload_id: str) -> None:
+        try:
+            with self._pool.session(service="storage") as sftp:
+                sftp.remove(self._upload_part_path(upload_id))
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            print(f"Warning: Failed to delete upload file for {upload_id}. Error: {e}")
+
+
+class LocalFileStorageDomainServiceImpl(FileStorageDomainService):
+    """
+    FileStorageDomainService のローカルディスク (共有ボリューム) 実装。
+    ディレクトリ構成・ブロブの命名は SFTP 実装と同じで、返すパスはワーカーがそのまま開ける絶対パス。
+    """
+
+    def __init__(self, config: LocalStorageConfig):
+        self.remote_training_dir = config.training_dir
+        self.remote_model_dir = config.model_dir
+        print(f"INFO: Local Storage Service initialized.")
+        print(f"INFO: -> Training Dir: {self.remote_training_dir}")
+        print(f"INFO: -> Model Dir: {self.remote_model_dir}")
+
+    def _write(self, file_stream: UploadedFileStream, dest_path: str) -> None:
+        # スプール済みのファイルはパスからコピーする (ユーザー空間を経由しない)
+        write_file_atomic(dest_path, file_stream.file_stream, getattr(file_stream, "path", None))
+
+    def save_training_file(self, uploaded_file: UploadedFileStream, unique_id: str) -> str:
+        """
+        訓練データファイルを内容の SHA-256 をファイル名にしたブロブとして保存する。
+        同じ内容のブロブが既にあれば書き込まない。
+        """
+        print(f"INFO: Saving training file for {unique_id}...")
+        content_hash = _compute_content_hash(uploaded_file)
+        suffix = os.path.splitext(uploaded_file.filename or "")[1].lower()
+        path = os.path.join(self.remote_training_dir, "blobs", content_hash[:2], f"{content_hash}{suffix}")
+        if os.path.exists(path):
+            print(f"INFO: Blob already stored, skipping write: {path}")
+            return path
+        self._write(uploaded_file, path)
+        print(f"INFO: Saved training file to {path}.")
+        return path
+
+    def save_training_model(self, model_artifact: UploadedFileStream, unique_id: str) -> str:
+        """
+        訓練モデルファイルを保存する。
+        """
+        path = os.path.join(self.remote_model_dir, f"{unique_id}_{model_artifact.filename}")
+        self._write(model_artifact, path)
+        return path
+
+
+    # --- 再開可能な分割アップロード ---
+
+    def _upload_part_path(self, upload_id: str) -> str:
+        return os.path.join(self.remote_training_dir, "uploads", f"{upload_id}.part")
+
+    def create_upload(self, upload_id: str) -> None:
+        path = self._upload_part_path(upload_id)
+        ensure_dir(os.path.dirname(path))
+        try:
+            with open(path, "wb"):
+                pass
+        except OSError as e:
+            raise FileStorageError(f"Failed to create upload file {path}: {e}")
+
+    def write_upload_chunk(self, upload_id: str, offset: int, data: bytes) -> None:
+        path = self._upload_part_path(upload_id)
+        try:
+            fd = os.open(path, os.O_WRONLY)
+        except FileNotFoundError:
+            raise FileStorageError(f"Upload {upload_id} does not exist.")
+        try:
+            written = 0
+            while written < len(data):
+                written += os.pwrite(fd, data[written:], offset + written)
+        except OSError as e:
+            raise FileStorageError(f"Failed to write upload chunk to {path}: {e}")
+        finally:
+            os.close(fd)
+
+    def commit_upload(self, upload_id: str, filename: str) -> Tuple[str, str, TrainingFileStats]:
+        part_path = self._upload_part_path(upload_id)
+        digest = hashlib.sha256()
+        analyzer = TrainingFileAnalyzer()
+        try:
+            with open(part_path, "rb") as part:
+                for chunk in iter(lambda: part.read(1024 * 1024), b""):
+                    digest.update(chunk)
+                    analyzer.feed(chunk)
+        except FileNotFoundError:
+            raise FileStorageError(f"Upload {upload_id} does not exist.")
+        content_hash = digest.hexdigest()
+        stats = analyzer.finish()
+
+        suffix = os.path.splitext(filename or "")[1].lower()
+        path = os.path.join(self.remote_training_dir, "blobs", content_hash[:2], f"{content_hash}{suffix}")
+        try:
+            if os.path.exists(path):
+                os.unlink(part_path)
+            else:
+                ensure_dir(os.path.dirname(path))
+                os.replace(part_path, path)
+        except OSError as e:
+            raise FileStorageError(f"Failed to commit upload {upload_id}: {e}")
+        print(f"INFO: Upload {upload_id} committed to {path}.")
+        return path, content_hash, stats
+
+    def discard_upload(self, upload_id: str) -> None:
+        try:
+            os.unlink(self._upload_part_path(upload_id))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Failed to delete upload file for {upload_id}. Error: {e}")
+
+
+def NewLocalFileStorageDomainService(config: Optional[LocalStorageConfig] = None) -> FileStorageDomainService:
+    """LocalFileStorageDomainServiceImpl のファクトリ関数 (設定省略時は環境変数から読み込む)"""
+    return LocalFileStorageDomainServiceImpl(config or NewLocalStorageConfigFromEnv())
+
 
 def NewFileStorageDomainService() -> FileStorageDomainService:
     """
     FileStorageDomainService のファクトリ関数。
-    環境変数を読み込み、SFTPサービスを初期化する。
+    環境変数 STORAGE_BACKEND が 'local' ならローカルストレージ、それ以外は SFTP サービスを初期化する。
     """
+    if GetStorageBackendFromEnv() == STORAGE_BACKEND_LOCAL:
+        print("INFO: Initializing LocalFileStorageDomainServiceImpl")
+        return NewLocalFileStorageDomainService()
+
     print("INFO: Initializing SFTPFileStorageDomainServiceImpl")
     try:
         # 環境変数から本番用の設定を読み込む
@@ -179,7 +423,8 @@ def NewFileStorageDomainService() -> FileStorageDomainService:
             key_file_path=key_file_path,
             remote_training_dir=remote_training_dir,
             remote_model_dir=remote_model_dir,
-            vps_port=vps_port
+            vps_port=vps_port,
+            pool=GetSharedSFTPPool(NewSFTPPoolConfigFromEnv()),
         )
         
     except KeyError as e:
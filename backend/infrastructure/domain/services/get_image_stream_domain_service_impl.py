@@ -1,6 +1,9 @@
 import os
 import mimetypes
-from io import BytesIO
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
 from typing import Tuple, Optional, BinaryIO
 import paramiko # SFTP接続用
 # --- ▼▼▼ 修正点 1: 必要な鍵クラスをインポート ▼▼▼ ---
@@ -12,6 +15,14 @@ from paramiko.ed25519key import Ed25519Key
 # ★★★ 修正: パスを変更 ★★★
 from domain.services.get_image_stream_domain_service import FileStreamDomainService 
 from domain.value_objects.binary_stream import BinaryStream 
+from domain.value_objects.file_info import FileInfo
+from infrastructure.metrics.prometheus import SFTP_SECONDS
+from infrastructure.storage.sftp_pool import SFTPConnectionPool, SFTPPoolConfig, GetSharedSFTPPool, NewSFTPPoolConfigFromEnv
+from infrastructure.cache.image_disk_cache import ImageDiskCache, NewImageDiskCacheFromEnv
+from infrastructure.storage.local_file_storage import (
+    LocalStorageConfig, STORAGE_BACKEND_LOCAL, GetStorageBackendFromEnv, GetVisualsBaseDirFromEnv, NewLocalStorageConfigFromEnv,
+    resolve_within,
+)
 
 # 既存のSFTP実装に必要な依存関係 (エラー処理)
 class FileStreamError(Exception):
@@ -19,108 +30,239 @@ class FileStreamError(Exception):
     pass
 
 
+def _guess_image_mime_type(path: str) -> str:
+    mime_type, _ = mimetypes.guess_type(path)
+    return mime_type if mime_type and mime_type.startswith('image/') else 'application/octet-stream'
+
+
+class SFTPFileStream:
+    """
+    プールから借りた SFTP チャネル上のリモートファイルを、read() のたびに必要な分だけ読み出すストリーム。
+    1回の read() は 32KiB ずつの要求をまとめて送る (readv) ので、往復遅延は read() 1回につき1回分で済み、
+    メモリも read() のサイズ分しか使わない。close() でファイルを閉じ、チャネルをプールへ返却する。
+    """
+    # SFTP の1要求あたりの読み出しサイズ (paramiko の上限と同じ)
+    REQUEST_SIZE = 32 * 1024
+
+    def __init__(self, resources: ExitStack, handle: paramiko.SFTPFile, size: int):
+        self._resources = resources
+        self._handle = handle
+        self._size = size
+        self._pos = 0
+        self._closed = False
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._pos
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def read(self, size: int = -1) -> bytes:
+        remaining = self._size - self._pos
+        if size is None or size < 0 or size > remaining:
+            size = remaining
+        if size <= 0:
+            return b""
+        chunks = [
+            (self._pos + start, min(self.REQUEST_SIZE, size - start))
+            for start in range(0, size, self.REQUEST_SIZE)
+        ]
+        with SFTP_SECONDS.time(service="stream", operation="read"):
+            data = b"".join(self._handle.readv(chunks))
+        self._pos += len(data)
+        return data
+
+    def close(self) -> None:
+        # レスポンス終了時と切断時の両方から呼ばれるため、2回目以降は何もしない
+        if self._closed:
+            return
+        self._closed = True
+        self._resources.close()
+
+    def __enter__(self) -> "SFTPFileStream":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+
 class SFTPFileStreamDomainServiceImpl(FileStreamDomainService):
     """
     FileStreamDomainService の具体的な実装。
     SFTP接続を利用して、リモートVPSからファイルをBinaryStreamとして取得する。
+    cache を指定した場合は取得した画像をローカルディスクにキャッシュし、2回目以降は SFTP を使わずに
+    キャッシュ上のファイルを直接送信する (get_local_file_path がキャッシュのパスを返す)。
+    VPS 上に無かったパスは miss_ttl_seconds の間記録し、その間は SFTP を使わずに「見つからない」とする
+    (weights.npz のみ保存したジョブの画像は毎回ここで見つからず、表示時の描画に回るため)。
     """
+    # 記録する「見つからなかったパス」の上限 (超えた分は古いものから忘れる)
+    MISS_CACHE_MAX_ENTRIES = 10000
     
     # --- ▼▼▼ 修正点 2: 不要なパスワード引数を __init__ から削除 ▼▼▼ ---
-    def __init__(self, vps_ip: str, vps_user: str, vps_key_path: str, vps_port: int, remote_visuals_base_dir: str):
+    def __init__(self, vps_ip: str, vps_user: str, vps_key_path: str, vps_port: int, remote_visuals_base_dir: str,
+                 pool: Optional[SFTPConnectionPool] = None, cache: Optional[ImageDiskCache] = None,
+                 miss_ttl_seconds: float = 0.0):
         self._vps_ip = vps_ip
         self._vps_user = vps_user
         # self._vps_password = vps_password # ← 削除
         self._vps_key_path = vps_key_path
         self._vps_port = vps_port
         self._remote_visuals_base_dir = remote_visuals_base_dir
+        self.image_cache = cache
+        self._miss_ttl_seconds = miss_ttl_seconds
+        # 相対パス -> 記録の有効期限 (time.monotonic())
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self._misses_lock = threading.Lock()
     # --- ▲▲▲ 修正点 2 完了 ▲▲▲ ---
         
-        # 鍵のロード
-        if not os.path.exists(self._vps_key_path):
-             raise FileNotFoundError(f"SSH key not found: {self._vps_key_path}")
-        
-        # --- ▼▼▼ 修正点 3: RSAKey を Ed25519Key に変更 ▼▼▼ ---
-        try:
-             # self._private_key = paramiko.RSAKey(filename=self._vps_key_path) # ← 古い
-             self._private_key = paramiko.Ed25519Key(filename=self._vps_key_path) # ← 新しい鍵
-        except Exception as e:
-             raise FileStreamError(f"Failed to load SSH key (tried Ed25519): {e}")
-        # --- ▲▲▲ 修正点 3 完了 ▲▲▲ ---
-
-    # --- SFTP接続ヘルパー ---
-    def _connect_sftp(self) -> paramiko.SFTPClient:
-        client = None
-        try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-            
-            # --- ▼▼▼ 修正点 4: connect() から password 引数を削除 ▼▼▼ ---
-            client.connect(
-                self._vps_ip, 
-                port=self._vps_port, 
-                username=self._vps_user,
-                # password=self._vps_password, # ← パスワード認証は無効なので削除
-                pkey=self._private_key
-            )
-            # --- ▲▲▲ 修正点 4 完了 ▲▲▲ ---
-            return client.open_sftp()
-        except Exception as e:
-            if client: client.close()
-            raise FileStreamError(f"SFTP connection failed: {e}")
-
-    def _close_sftp(self, sftp: paramiko.SFTPClient):
-        # SSHクライアントも閉じる
-        if sftp:
-            try:
-                ssh_client = sftp.channel.transport # type: ignore
-                sftp.close()
-                if ssh_client:
-                    ssh_client.close()
-            except Exception: 
-                pass # 既に閉じている場合は無視
-
+        # SSH トランスポートは全 SFTP サービスで共有するプールから借りる (鍵の読み込みもプールが行う)
+        self._pool = pool or GetSharedSFTPPool(
+            SFTPPoolConfig(host=vps_ip, port=vps_port, user=vps_user, key_file_path=vps_key_path)
+        )
 
     # --- FileStreamDomainService インターフェース実装 ---
 
-    def get_file_stream_by_path(self, relative_path: str) -> Tuple[BinaryStream, str]:
+    def get_file_stream_by_path(self, relative_path: str) -> Tuple[BinaryStream, str, FileInfo]:
         """
-        相対パスからVPS上の画像をストリームとして取得し、BinaryStreamとMIMEタイプを返す。
+        相対パスからVPS上の画像を開き、BinaryStream (SFTPFileStream) とMIMEタイプ、サイズ・更新時刻を返す。
+        内容はまだ読み込まない (配信時に read() で少しずつ読み出す)。ストリームを閉じるまでチャネルを占有する。
         """
         # 1. VPS上の絶対パスを構築
         # relative_path は 'job_ID/layer0/image.png' 形式
         # (os.path.join は paramiko が良しなに / にしてくれるのでこのままでOK)
         vps_absolute_path = os.path.join(self._remote_visuals_base_dir, relative_path).replace("\\", "/")
+        if self._is_known_miss(relative_path):
+            raise FileStreamError(f"Image not found on VPS: {vps_absolute_path}")
         
-        sftp = None
-        
+        resources = ExitStack()
         try:
-            # 2. SFTP接続
-            sftp = self._connect_sftp()
-            
-            # 3. ファイルをBytesIOストリームにダウンロード
-            mem_stream = BytesIO() 
-            sftp.getfo(vps_absolute_path, mem_stream)
-            
-            mem_stream.seek(0) # ポインタを先頭に戻す
-            
-            # 4. MIMEタイプを判定
-            mime_type, _ = mimetypes.guess_type(vps_absolute_path)
-            mime_type = mime_type if mime_type and mime_type.startswith('image/') else 'application/octet-stream'
-
-            # 5. 結果を抽象型で返す (BytesIOはプロトコルを満たす)
-            return mem_stream, mime_type
-            
+            # 2. プールから SFTP チャネルを借り、ファイルを開いてサイズ・更新時刻を取得
+            # (チャネルとファイルはストリームの close() で返却・クローズする)
+            sftp = resources.enter_context(self._pool.session(service="stream"))
+            with SFTP_SECONDS.time(service="stream", operation="open"):
+                handle = resources.enter_context(sftp.open(vps_absolute_path, "rb"))
+                attributes = handle.stat()
+            info = FileInfo(size=attributes.st_size, modified_at=float(attributes.st_mtime))
+
+            # 3. MIMEタイプを判定
+            mime_type = _guess_image_mime_type(vps_absolute_path)
+
+            # 4. 結果を抽象型で返す (SFTPFileStream はプロトコルを満たす)
+            return SFTPFileStream(resources, handle, info.size), mime_type, info
+
         except FileNotFoundError as e:
+             resources.close()
+             self._remember_miss(relative_path)
              raise FileStreamError(f"Image not found on VPS: {vps_absolute_path}")
         except Exception as e:
+             resources.close()
              raise FileStreamError(f"Error streaming file from VPS: {e}")
-        finally:
-             if sftp: self._close_sftp(sftp)
+
+    def get_local_file_path(self, relative_path: str) -> Optional[str]:
+        """
+        キャッシュが有効な場合は、VPS 上の画像をキャッシュに取得してそのパスを返す (ヒット時は SFTP を使わない)。
+        キャッシュが無効な場合は None (get_file_stream_by_path でストリームとして取得する)。
+        """
+        if self.image_cache is None:
+            return None
+        vps_absolute_path = os.path.join(self._remote_visuals_base_dir, relative_path).replace("\\", "/")
+        if self._is_known_miss(relative_path):
+            raise FileStreamError(f"Image not found on VPS: {vps_absolute_path}")
+
+        def fill(dest: BinaryIO) -> float:
+            with self._pool.session(service="stream") as sftp:
+                with SFTP_SECONDS.time(service="stream", operation="download"):
+                    sftp.getfo(vps_absolute_path, dest)
+                    # キャッシュ上のファイルにも VPS 上の更新時刻を付ける (ETag・Last-Modified が取得し直しても変わらない)
+                    return float(sftp.stat(vps_absolute_path).st_mtime)
+
+        try:
+            return self.image_cache.get_or_fill(relative_path, fill)
+        except FileNotFoundError:
+            self._remember_miss(relative_path)
+            raise FileStreamError(f"Image not found on VPS: {vps_absolute_path}")
+        except Exception as e:
+            raise FileStreamError(f"Error streaming file from VPS: {e}")
+
+    def local_file_is_cache(self) -> bool:
+        # get_local_file_path はキャッシュ上の複製のパスを返す (容量の上限で追い出される)
+        return self.image_cache is not None
+
+    def _is_known_miss(self, relative_path: str) -> bool:
+        """relative_path が最近 VPS 上に見つからなかったかどうか (期限切れの記録は消す)"""
+        if self._miss_ttl_seconds <= 0:
+            return False
+        with self._misses_lock:
+            expires_at = self._misses.get(relative_path)
+            if expires_at is None:
+                return False
+            if expires_at <= time.monotonic():
+                del self._misses[relative_path]
+                return False
+            return True
+
+    def _remember_miss(self, relative_path: str) -> None:
+        if self._miss_ttl_seconds <= 0:
+            return
+        with self._misses_lock:
+            self._misses[relative_path] = time.monotonic() + self._miss_ttl_seconds
+            self._misses.move_to_end(relative_path)
+            while len(self._misses) > self.MISS_CACHE_MAX_ENTRIES:
+                self._misses.popitem(last=False)
+
+
+class LocalFileStreamDomainServiceImpl(FileStreamDomainService):
+    """
+    FileStreamDomainService のローカルディスク (共有ボリューム) 実装。
+    可視化ディレクトリの外を指すパス (../ やシンボリックリンク経由) は見つからないものとして扱う。
+    """
+
+    def __init__(self, config: LocalStorageConfig):
+        self._visuals_dir = config.visuals_dir
+
+    def get_local_file_path(self, relative_path: str) -> Optional[str]:
+        try:
+            path = resolve_within(self._visuals_dir, relative_path)
+        except FileNotFoundError:
+            raise FileStreamError(f"Image not found: {relative_path}")
+        if not os.path.isfile(path):
+            raise FileStreamError(f"Image not found: {relative_path}")
+        return path
+
+    def local_file_is_cache(self) -> bool:
+        # 共有ボリューム上の元のファイル (削除されない)
+        return False
+
+    def get_file_stream_by_path(self, relative_path: str) -> Tuple[BinaryStream, str, FileInfo]:
+        path = self.get_local_file_path(relative_path)
+        try:
+            stream = open(path, "rb")
+            st = os.fstat(stream.fileno())
+            return stream, _guess_image_mime_type(path), FileInfo(size=st.st_size, modified_at=st.st_mtime)
+        except FileNotFoundError:
+            raise FileStreamError(f"Image not found: {relative_path}")
+        except OSError as e:
+            raise FileStreamError(f"Error reading file from local storage: {e}")
 
 
 # === ファクトリ関数 ===
+def NewLocalFileStreamDomainService(config: Optional[LocalStorageConfig] = None) -> FileStreamDomainService:
+    """LocalFileStreamDomainServiceImpl のファクトリ関数 (設定省略時は環境変数から読み込む)"""
+    return LocalFileStreamDomainServiceImpl(config or NewLocalStorageConfigFromEnv())
+
+
 def NewFileStreamDomainService() -> FileStreamDomainService:
-    """環境変数から設定を読み込み、SFTPFileStreamDomainServiceImplを初期化する。"""
+    """
+    環境変数から設定を読み込み、FileStreamDomainService を初期化する。
+    STORAGE_BACKEND が 'local' ならローカルストレージ、それ以外は SFTPFileStreamDomainServiceImpl
+    (IMAGE_CACHE_MAX_BYTES が 0 でなければ、取得した画像をローカルディスクにキャッシュする。
+    VPS 上に無かったパスは IMAGE_MISS_CACHE_SECONDS 秒 (既定 60、0 で無効) の間 SFTP で探し直さない)。
+    """
+    if GetStorageBackendFromEnv() == STORAGE_BACKEND_LOCAL:
+        return NewLocalFileStreamDomainService()
     try:
         # 環境変数はrouter/fastapi.pyで既に読み込まれている前提
         vps_ip = os.environ["VPS_IP"]
@@ -134,7 +276,7 @@ def NewFileStreamDomainService() -> FileStreamDomainService:
         vps_port = int(os.environ.get("VPS_PORT", 22))
         
         # --- ▼▼▼ 修正点 6: 接続先はWindows (satoy機) なので、デフォルトパスをWindows形式に変更 ▼▼▼ ---
-        vps_visuals_dir = os.environ.get("VPS_VISUALS_DIR", f"/C/Users/{vps_user}/visualizations")
+        vps_visuals_dir = GetVisualsBaseDirFromEnv()
         # --- ▲▲▲ 修正点 6 完了 ▲▲▲ ---
 
         # --- ▼▼▼ 修正点 7: インスタンス化からパスワード引数を削除 ▼▼▼ ---
@@ -144,7 +286,10 @@ def NewFileStreamDomainService() -> FileStreamDomainService:
             # vps_password=vps_password, # ← 削除
             vps_key_path=vps_key_path, 
             vps_port=vps_port,
-            remote_visuals_base_dir=vps_visuals_dir
+            remote_visuals_base_dir=vps_visuals_dir,
+            pool=GetSharedSFTPPool(NewSFTPPoolConfigFromEnv()),
+            cache=NewImageDiskCacheFromEnv(),
+            miss_ttl_seconds=float(os.getenv("IMAGE_MISS_CACHE_SECONDS") or 60),
         )
         # --- ▲▲▲ 修正点 7 完了 ▲▲▲ ---
         
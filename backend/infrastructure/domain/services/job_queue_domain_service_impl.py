@@ -4,26 +4,18 @@ from celery import Celery # Celery本体をインポート
 import os
 from decouple import config # 環境変数読み込みのため
 
-# -----------------------------------------------------------------
-# 1. Celery クライアントの初期化 (このファイル内で完結)
-# -----------------------------------------------------------------
-# 環境変数から設定を取得
-BROKER_URL = os.getenv('CELERY_BROKER_URL', config('CELERY_BROKER_URL'))
-
-celery_client = Celery(
-    'agenthub_client', # クライアントアプリケーション名
-    broker=BROKER_URL
-)
-# -----------------------------------------------------------------
-
 
 class CeleryJobQueueDomainServiceImpl(JobQueueDomainService):
     """
     JobQueueDomainService の Celery 向け実装。
     タスク名を文字列で指定し、キューに投入する責務を持つ。
+    Celery クライアントはインポート時ではなくインスタンス生成時に作成する。
     """
-    def __init__(self):
-        pass
+    def __init__(self, broker_url: str):
+        self.celery_client = Celery(
+            'agenthub_client', # クライアントアプリケーション名
+            broker=broker_url
+        )
 
     def enqueue_finetuning_job(self, job_id: int, file_path: str) -> None:
         """
@@ -32,7 +24,7 @@ class CeleryJobQueueDomainServiceImpl(JobQueueDomainService):
         TASK_NAME = 'finetuning.submit_job' 
         
         try:
-            celery_client.send_task(
+            self.celery_client.send_task(
                 TASK_NAME,
                 args=(job_id, file_path),
                 kwargs={}
@@ -49,7 +41,7 @@ class CeleryJobQueueDomainServiceImpl(JobQueueDomainService):
         TASK_NAME = 'deployment.deploy_model' 
         
         try:
-            celery_client.send_task(
+            self.celery_client.send_task(
                 TASK_NAME,
                 args=(job_id, model_path),
                 kwargs={}
@@ -68,7 +60,7 @@ class CeleryJobQueueDomainServiceImpl(JobQueueDomainService):
         
         try:
             # model_pathをdeployment_idに変更
-            celery_client.send_task(
+            self.celery_client.send_task(
                 TASK_NAME,
                 args=(job_id, deployment_id, test_data_path), 
                 kwargs={}
@@ -80,6 +72,12 @@ class CeleryJobQueueDomainServiceImpl(JobQueueDomainService):
             raise RuntimeError(f"Failed to submit engine test job to worker queue: {e}")
 
 
+    def close(self) -> None:
+        """ブローカーへの接続プールを閉じる (シャットダウン時用)"""
+        self.celery_client.close()
+
+
 def NewJobQueueDomainService() -> JobQueueDomainService:
-    """JobQueueDomainService のファクトリ関数"""
-    return CeleryJobQueueDomainServiceImpl()
\ No newline at end of file
+    """JobQueueDomainService のファクトリ関数 (環境変数 CELERY_BROKER_URL を使用)"""
+    broker_url = os.getenv('CELERY_BROKER_URL') or config('CELERY_BROKER_URL')
+    return CeleryJobQueueDomainServiceImpl(broker_url=broker_url)
@@ -0,0 +1,138 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import weakref
+from typing import Dict, Optional
+
+from passlib.context import CryptContext
+
+from domain.services.password_hash_domain_service import (
+    PasswordHashDomainService,
+    PasswordHashBusyError,
+)
+from infrastructure.metrics.prometheus import REGISTRY
+
+
+# --- ワーカープロセス側で実行される関数 (pickle 可能なようにモジュールレベルに定義) ---
+_contexts: Dict[int, CryptContext] = {}
+
+
+def _get_context(rounds: int) -> CryptContext:
+    ctx = _contexts.get(rounds)
+    if ctx is None:
+        ctx = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=rounds)
+        _contexts[rounds] = ctx
+    return ctx
+
+
+def _bcrypt_hash(password: str, rounds: int) -> str:
+    return _get_context(rounds).hash(password)
+
+
+def _bcrypt_verify(password: str, password_hash: str, rounds: int) -> bool:
+    try:
+        return _get_context(rounds).verify(password, password_hash)
+    except ValueError:
+        # ハッシュ形式が不正な場合は不一致として扱う
+        return False
+
+
+# /metrics で実行中件数を出力するため、生成済みインスタンスを弱参照で保持する
+_instances: "weakref.WeakSet[BcryptPasswordHashDomainServiceImpl]" = weakref.WeakSet()
+
+
+class BcryptPasswordHashDomainServiceImpl(PasswordHashDomainService):
+    """
+    PasswordHashDomainService の bcrypt 実装。
+
+    bcrypt は CPU バウンドなため、リクエスト処理スレッドとは独立した
+    サイズ上限付きのプロセスプールで実行する。
+    実行中＋待機中の件数が上限 (max_workers + max_pending) に達している場合は
+    キューに積まずに PasswordHashBusyError で即座に失敗させる (アドミッション制御)。
+    """
+
+    def __init__(self, rounds: int = 12, max_workers: int = 2, max_pending: int = 16):
+        self.rounds = rounds
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._in_flight = 0
+        # needs_rehash はプロセス内で判定できる軽量処理
+        self._local_context = _get_context(rounds)
+        _instances.add(self)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            # fork はイベントループやスレッドを抱えた親プロセスの状態を複製してしまうため spawn を使う
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return self._executor
+
+    async def _submit(self, func, *args):
+        if self._in_flight >= self.max_workers + self.max_pending:
+            raise PasswordHashBusyError("Too many concurrent password operations. Please retry later.")
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            try:
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+            except BrokenProcessPool:
+                # ワーカープロセスが異常終了した場合はプールを作り直して1度だけ再試行する
+                print("ERROR: Password hash process pool is broken. Recreating it.")
+                self._executor = None
+                return await loop.run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._in_flight -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._submit(_bcrypt_hash, password, self.rounds)
+
+    async def verify(self, password: str, password_hash: str) -> bool:
+        return await self._submit(_bcrypt_verify, password, password_hash, self.rounds)
+
+    def needs_rehash(self, password_hash: str) -> bool:
+        try:
+            return self._local_context.needs_update(password_hash)
+        except ValueError:
+            return False
+
+    def in_flight(self) -> int:
+        """現在実行中・待機中の件数"""
+        return self._in_flight
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+REGISTRY.gauge_func(
+    "agenthub_password_hash_pool_tasks",
+    "Password hash process pool tasks by state (in_flight, capacity).",
+    ("state",),
+    lambda: [
+        (("in_flight",), sum(s.in_flight() for s in list(_instances))),
+        (("capacity",), sum(s.max_workers + s.max_pending for s in list(_instances))),
+    ],
+)
+
+
+def NewPasswordHashDomainServiceFromEnv() -> BcryptPasswordHashDomainServiceImpl:
+    """
+    環境変数から PasswordHashDomainService を生成するファクトリ関数。
+
+    BCRYPT_ROUNDS=12              # bcrypt のコスト。変更するとログイン時に透過的に再ハッシュされる
+    PASSWORD_HASH_WORKERS=2       # ハッシュ専用プロセス数
+    PASSWORD_HASH_MAX_PENDING=16  # 実行待ちとして受け付ける最大件数。超過分は 503 を返す
+    """
+    rounds = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    max_workers = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+    max_pending = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "16"))
+    return BcryptPasswordHashDomainServiceImpl(
+        rounds=rounds, max_workers=max_workers, max_pending=max_pending
+    )
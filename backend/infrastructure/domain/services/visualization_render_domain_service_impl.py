@@ -0,0 +1,169 @@
+import os
+import re
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from contextlib import ExitStack
+from dataclasses import dataclass
+from typing import BinaryIO, Optional, Tuple
+
+import numpy as np
+
+from domain.services.get_image_stream_domain_service import FileStreamDomainService
+from domain.services.visualization_render_domain_service import VisualizationRenderDomainService
+from infrastructure.cache.image_disk_cache import ImageDiskCache
+from infrastructure.visualization.heatmap_renderer import DEFAULT_HEIGHT, DEFAULT_WIDTH, color_range, write_heatmap
+from infrastructure.visualization.heatmap_tiles import dzi_descriptor, matrix_size, render_tile
+from infrastructure.visualization.weight_archive import WEIGHT_ARCHIVE_NAME, WeightArchive
+
+
+# 可視化画像の相対パス:
+#   <job_ID>/<layerN>/<重み名>_<before|after|delta>.png                       画像全体 (worker と同じ大きさ)
+#   <job_ID>/<layerN>/<重み名>_<before|after|delta>.dzi                       タイルピラミッドの記述子
+#   <job_ID>/<layerN>/<重み名>_<before|after|delta>_files/<レベル>/<列>_<行>.png  タイル
+_IMAGE_PATH_PATTERN = re.compile(
+    r"^(?P<job>[^/]+)/(?P<layer>[^/]+)/(?P<name>[^/]+)_(?P<image_type>before|after|delta)"
+    r"(?:\.(?P<ext>png|dzi)|_files/(?P<level>\d+)/(?P<column>\d+)_(?P<row>\d+)\.png)$"
+)
+
+# 復元した重み行列をメモリに保持する数 (ビューアは1枚の画像のタイルを続けて要求するため、毎回アーカイブから読まない)
+MATRIX_CACHE_ENTRIES = 4
+
+
+@dataclass(frozen=True)
+class _LoadedWeight:
+    """アーカイブから復元した重み行列と、全タイルで共通の色範囲"""
+    values: np.ndarray
+    vmin: float
+    vmax: float
+    cmap: str
+    image_size: Tuple[int, int]
+    modified_at: float
+
+
+class VisualizationRenderDomainServiceImpl(VisualizationRenderDomainService):
+    """
+    VisualizationRenderDomainService の具体的な実装。
+    ジョブの weights.npz を FileStreamDomainService から取得し、画像全体 (heatmap_renderer) または
+    タイルピラミッドの記述子・タイル (heatmap_tiles) を描画する。
+    描画した画像は ImageDiskCache に保持し、2回目以降は描画しない (同じ画像への同時要求も1回の描画にまとめる)。
+    描画した画像には weights.npz の更新時刻を付ける (描画し直しても ETag・Last-Modified が変わらない)。
+    cache が None の場合は描画しない (render_image は常に None)。
+    """
+
+    def __init__(self, file_stream_service: FileStreamDomainService, cache: Optional[ImageDiskCache]):
+        self._file_stream_service = file_stream_service
+        self.image_cache = cache
+        self._matrices: "OrderedDict[Tuple[str, str, str, str], _LoadedWeight]" = OrderedDict()
+        self._matrices_lock = threading.Lock()
+
+    def render_image(self, relative_path: str) -> Optional[str]:
+        if self.image_cache is None:
+            return None
+        match = _IMAGE_PATH_PATTERN.match(relative_path.replace("\\", "/"))
+        if not match:
+            return None
+
+        # 描画済みならアーカイブを開かずにキャッシュのパスを返す
+        try:
+            return self.image_cache.get_or_fill(relative_path, lambda dest: self._render(dest, match))
+        except FileNotFoundError:
+            return None
+
+    def is_render_only(self, relative_path: str) -> bool:
+        # 画像全体 (.png) は worker が事前に描画してアップロードしている場合がある。記述子・タイルは常に描画する
+        match = _IMAGE_PATH_PATTERN.match(relative_path.replace("\\", "/"))
+        return bool(match) and match.group("ext") != "png"
+
+    def _render(self, dest: BinaryIO, match: "re.Match[str]") -> float:
+        """要求された画像を dest に書き出し、weights.npz の更新時刻を返す。描画できない場合は FileNotFoundError"""
+        job, layer, name, image_type = match.group("job", "layer", "name", "image_type")
+        weight = self._load_weight(job, layer, name, image_type)
+
+        if match.group("ext") == "png":
+            # worker が描画する場合と同じ名前・大きさで描画する (色範囲とテキストチャンクが一致する)
+            with tempfile.NamedTemporaryFile(suffix=".png") as rendered:
+                width, height = weight.image_size
+                write_heatmap(
+                    rendered.name, f"{name}_{image_type}", weight.values, width=width, height=height,
+                    color=(weight.vmin, weight.vmax, weight.cmap),
+                )
+                shutil.copyfileobj(rendered, dest)
+        elif match.group("ext") == "dzi":
+            dest.write(dzi_descriptor(*matrix_size(weight.values)))
+        else:
+            level, column, row = (int(match.group(key)) for key in ("level", "column", "row"))
+            try:
+                dest.write(render_tile(weight.values, weight.vmin, weight.vmax, weight.cmap, level, column, row))
+            except IndexError as e:
+                raise FileNotFoundError(str(e))
+        print(f"INFO: Rendered {match.group(0)} from {WEIGHT_ARCHIVE_NAME}")
+        return weight.modified_at
+
+    def _load_weight(self, job: str, layer: str, name: str, image_type: str) -> _LoadedWeight:
+        """重み行列を復元する (直近に使ったものはメモリから返す)。アーカイブ・重みが無い場合は FileNotFoundError"""
+        key = (job, layer, name, image_type)
+        with self._matrices_lock:
+            weight = self._matrices.get(key)
+            if weight is not None:
+                self._matrices.move_to_end(key)
+                return weight
+
+        with ExitStack() as resources:
+            archive_path = self._open_archive(resources, f"{job}/{WEIGHT_ARCHIVE_NAME}")
+            with WeightArchive(archive_path) as archive:
+                entry = archive.entry(name)
+                if not entry or entry.get("layer") != layer or image_type not in entry.get("images", []):
+                    raise FileNotFoundError(f"{layer}/{name}_{image_type} is not in {job}/{WEIGHT_ARCHIVE_NAME}")
+                values = archive.load(name, image_type)
+                # 画面に表示する値の範囲 (manifest に記録した量子化前の範囲) と色を揃える
+                vmin, vmax, cmap = archive.color_range(name, image_type) or color_range(f"{name}_{image_type}", values)
+                weight = _LoadedWeight(
+                    values=values, vmin=vmin, vmax=vmax, cmap=cmap,
+                    image_size=archive.image_size(DEFAULT_WIDTH, DEFAULT_HEIGHT),
+                    modified_at=os.stat(archive_path).st_mtime,
+                )
+
+        with self._matrices_lock:
+            self._matrices[key] = weight
+            while len(self._matrices) > MATRIX_CACHE_ENTRIES:
+                self._matrices.popitem(last=False)
+        return weight
+
+    def _open_archive(self, resources: ExitStack, archive_relative_path: str) -> str:
+        """
+        weights.npz をローカルディスク上のファイルとして用意し、そのパスを返す。無い・取得できない場合は FileNotFoundError。
+        ローカルストレージ・画像キャッシュが有効な場合はそのファイルを使い、それ以外は一時ファイルに取得する。
+        """
+        try:
+            path = self._file_stream_service.get_local_file_path(archive_relative_path)
+            if path:
+                return path
+            stream, _, _ = self._file_stream_service.get_file_stream_by_path(archive_relative_path)
+            with stream:
+                spool = resources.enter_context(tempfile.NamedTemporaryFile(suffix=".npz"))
+                shutil.copyfileobj(stream, spool, 1024 * 1024)
+                spool.flush()
+            return spool.name
+        except Exception as e:
+            # 重みを保存していないジョブ (画像を事前に描画したジョブ) ではアーカイブが無い
+            print(f"WARN: Weight archive {archive_relative_path} is not available: {e}")
+            raise FileNotFoundError(archive_relative_path) from e
+
+
+# === ファクトリ関数 ===
+def NewVisualizationRenderDomainService(file_stream_service: FileStreamDomainService) -> VisualizationRenderDomainService:
+    """
+    環境変数から描画済み画像のキャッシュを設定し、VisualizationRenderDomainService を初期化する。
+    RENDERED_IMAGE_CACHE_MAX_BYTES に 0 を指定した場合は表示時の描画を行わない。
+
+    RENDERED_IMAGE_CACHE_DIR=/var/cache/agenthub/rendered   # 既定: <一時ディレクトリ>/agenthub-rendered-images
+    RENDERED_IMAGE_CACHE_MAX_BYTES=536870912                # 既定: 512MiB
+    """
+    max_bytes = int(os.getenv("RENDERED_IMAGE_CACHE_MAX_BYTES") or 512 * 1024 * 1024)
+    if max_bytes <= 0:
+        print("INFO: On-demand heatmap rendering is disabled (RENDERED_IMAGE_CACHE_MAX_BYTES=0).")
+        return VisualizationRenderDomainServiceImpl(file_stream_service, None)
+    cache_dir = os.getenv("RENDERED_IMAGE_CACHE_DIR") or os.path.join(tempfile.gettempdir(), "agenthub-rendered-images")
+    return VisualizationRenderDomainServiceImpl(file_stream_service, ImageDiskCache(cache_dir, max_bytes))
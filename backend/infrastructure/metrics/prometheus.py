@@ -0,0 +1,165 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+# Prometheus テキスト形式 (exposition format 0.0.4) で出力する最小限のメトリクス実装。
+# ヒストグラムは SFTP 転送などワーカースレッドからも記録されるためロックで保護する。
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# 秒単位のレイテンシ用バケット (5ms 〜 60s)
+DEFAULT_BUCKETS: Tuple[float, ...] = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0,
+)
+
+LabelValues = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra is not None:
+        pairs.append(f'{extra[0]}="{_escape(extra[1])}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+class Histogram:
+    """ラベル付きヒストグラム (累積バケット・合計・件数)"""
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(sorted(buckets))
+        # ラベル値 -> (バケットごとの件数, 合計, 件数)
+        self._series: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(n, "")) for n in self.label_names)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0, 0.0])
+                self._series[key] = series
+            counts, totals = series
+            counts[index] += 1
+            totals[0] += value
+            totals[1] += 1
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """ブロックの所要時間 (秒) を記録するコンテキストマネージャ。例外時も記録する"""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = [(k, list(c), list(t)) for k, (c, t) in self._series.items()]
+        for key, counts, totals in sorted(snapshot):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(totals[0])}")
+            lines.append(f"{self.name}_count{labels} {int(totals[1])}")
+        return lines
+
+
+class GaugeFunc:
+    """
+    出力時にコールバックで値を取得するゲージ。
+    コールバックは (ラベル値のタプル, 値) を列挙する。
+    """
+
+    def __init__(self, name: str, documentation: str, label_names: Sequence[str], callback: Callable[[], Iterable[Tuple[LabelValues, float]]]):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = tuple(label_names)
+        self._callback = callback
+
+    def collect(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        try:
+            samples = list(self._callback())
+        except Exception as e:
+            print(f"ERROR: Failed to collect gauge {self.name}: {e}")
+            samples = []
+        for key, value in samples:
+            lines.append(f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """登録されたメトリクスをまとめてテキスト形式で出力する"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name: str, documentation: str, label_names: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(name, lambda: Histogram(name, documentation, label_names, buckets))
+
+    def gauge_func(self, name: str, documentation: str, label_names: Sequence[str], callback: Callable[[], Iterable[Tuple[LabelValues, float]]]) -> GaugeFunc:
+        return self._register(name, lambda: GaugeFunc(name, documentation, label_names, callback))
+
+    def _register(self, name: str, create):
+        # 同名のメトリクスは1つだけ登録する (モジュールの再インポート時など)
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = create()
+                self._metrics[name] = metric
+            return metric
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines: List[str] = []
+        for metric in metrics:
+            lines.extend(metric.collect())
+        return "\n".join(lines) + "\n"
+
+
+# === プロセス全体で共有するレジストリと共通メトリクス ===
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    "agenthub_http_request_duration_seconds",
+    "HTTP request latency by route template and status code.",
+    ("method", "route", "status"),
+)
+DB_QUERY_SECONDS = REGISTRY.histogram(
+    "agenthub_db_query_duration_seconds",
+    "Time spent holding a database cursor (pool wait + queries), by repository.",
+    ("repository", "operation"),
+)
+SFTP_SECONDS = REGISTRY.histogram(
+    "agenthub_sftp_duration_seconds",
+    "Time spent in SFTP operations, by service and operation.",
+    ("service", "operation"),
+)
+ENGINE_HTTP_SECONDS = REGISTRY.histogram(
+    "agenthub_engine_http_duration_seconds",
+    "Time spent in HTTP calls to the inference engine and power monitor.",
+    ("operation",),
+)
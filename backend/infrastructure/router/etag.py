@@ -0,0 +1,58 @@
+import hashlib
+from typing import Any, Optional
+
+from fastapi.responses import Response
+
+
+# ETag / 条件付き GET の共通処理
+# ETag はリソースの版 (updated_at と件数) とクエリパラメータから計算する強い ETag。
+# 認証付きのレスポンスなので、共有キャッシュに載らないよう Cache-Control は必ず private にする。
+
+# 状態が頻繁に変わる一覧: キャッシュは保持してよいが、使う前に毎回 304 で再検証させる
+CACHE_CONTROL_REVALIDATE = "private, no-cache"
+# 一度書き込まれるとほぼ変わらないもの (可視化レイヤ・メソッド一覧)
+# 同じ URI への PUT 成功時はブラウザ側のキャッシュが無効化される (RFC 9111 4.4)
+CACHE_CONTROL_VISUALIZATIONS = "private, max-age=3600"
+CACHE_CONTROL_METHODS = "private, max-age=300"
+
+
+def make_etag(*parts: Any) -> str:
+    """版やクエリパラメータから強い ETag ("..." 形式) を生成する"""
+    raw = "|".join("" if p is None else str(p) for p in parts)
+    return '"' + hashlib.sha256(raw.encode("utf-8")).hexdigest()[:32] + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    If-None-Match ヘッダが ETag に一致するかを判定する。
+    If-None-Match は弱い比較 (W/ を無視) で判定する (RFC 9110 13.1.2)。
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == etag:
+            return True
+    return False
+
+
+def not_modified_response(etag: str, cache_control: str) -> Response:
+    """304 Not Modified (本文なし) を返す"""
+    return Response(
+        status_code=304,
+        headers={"ETag": etag, "Cache-Control": cache_control, "Vary": "Authorization"},
+    )
+
+
+def apply_cache_headers(response: Response, etag: Optional[str], cache_control: str) -> Response:
+    """成功レスポンス (200) にのみ ETag と Cache-Control を付与する"""
+    if etag is None or response.status_code != 200:
+        return response
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = cache_control
+    response.headers["Vary"] = "Authorization"
+    return response
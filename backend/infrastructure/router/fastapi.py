@@ -1,14 +1,21 @@
 import json
+import asyncio
 from typing import Dict, Union, Any, List, Optional
-from dataclasses import is_dataclass, asdict
-from datetime import datetime 
 from io import BytesIO 
 
-from fastapi import APIRouter, Depends, UploadFile, File, Path
+from fastapi import APIRouter, Depends, UploadFile, File, Path, Query, Header, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import JSONResponse, Response, StreamingResponse
+from starlette.datastructures import UploadFile as StarletteUploadFile
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-import httpx
+
+from infrastructure.router.responses import FastJSONResponse
+from infrastructure.router.etag import (
+    make_etag, etag_matches, not_modified_response, apply_cache_headers,
+    CACHE_CONTROL_REVALIDATE, CACHE_CONTROL_VISUALIZATIONS, CACHE_CONTROL_METHODS,
+)
+
+from domain.value_objects.page import DEFAULT_PAGE_LIMIT, MAX_PAGE_LIMIT
 
 # --- Controller / Presenter / Usecase imports ---
 from adapter.controller.auth_signup_controller import CreateUserController
@@ -38,6 +45,24 @@ from usecase.get_agents import GetAgentsInput, GetAgentsOutput, new_get_agents_i
 from adapter.controller.create_finetuning_job_controller import CreateFinetuningJobController
 from adapter.presenter.create_finetuning_job_presenter import new_create_finetuning_job_presenter
 from usecase.create_finetuning_job import CreateFinetuningJobInput, CreateFinetuningJobOutput, new_create_finetuning_job_interactor
+
+from adapter.controller.create_upload_session_controller import CreateUploadSessionController
+from adapter.presenter.create_upload_session_presenter import new_create_upload_session_presenter
+from usecase.create_upload_session import (
+    CreateUploadSessionInput, CreateUploadSessionOutput, new_create_upload_session_interactor, UPLOAD_MAX_CHUNK_SIZE,
+)
+
+from adapter.controller.get_upload_session_controller import GetUploadSessionController
+from adapter.presenter.get_upload_session_presenter import new_get_upload_session_presenter
+from usecase.get_upload_session import GetUploadSessionInput, GetUploadSessionOutput, new_get_upload_session_interactor
+
+from adapter.controller.upload_chunk_controller import UploadChunkController
+from adapter.presenter.upload_chunk_presenter import new_upload_chunk_presenter
+from usecase.upload_chunk import UploadChunkInput, UploadChunkOutput, new_upload_chunk_interactor
+
+from adapter.controller.finalize_upload_session_controller import FinalizeUploadSessionController
+from adapter.presenter.finalize_upload_session_presenter import new_finalize_upload_session_presenter
+from usecase.finalize_upload_session import FinalizeUploadSessionInput, new_finalize_upload_session_interactor
 from infrastructure.domain.value_objects.file_data_impl import FastAPIUploadedFileAdapter
 
 from adapter.controller.get_agent_finetuning_jobs_controller import GetAgentFinetuningJobsController
@@ -52,6 +77,10 @@ from adapter.controller.get_weight_visualizations_controller import GetWeightVis
 from adapter.presenter.get_weight_visualizations_presenter import new_get_finetuning_job_visualization_presenter
 from usecase.get_weight_visualizations import GetFinetuningJobVisualizationInput, GetFinetuningJobVisualizationOutput, new_get_finetuning_job_visualization_interactor
 
+from adapter.controller.get_weight_stats_controller import GetWeightStatsController
+from adapter.presenter.get_weight_stats_presenter import new_get_finetuning_job_weight_stats_presenter
+from usecase.get_weight_stats import GetFinetuningJobWeightStatsOutput, new_get_finetuning_job_weight_stats_interactor
+
 from adapter.controller.get_image_stream_controller import GetImageStreamController
 from adapter.presenter.get_image_stream_presenter import new_get_image_stream_presenter
 from usecase.get_image_stream import GetImageStreamInput, GetImageStreamOutput, new_get_image_stream_interactor
@@ -59,24 +88,9 @@ from usecase.get_image_stream import GetImageStreamInput, GetImageStreamOutput,
 from adapter.controller.test_deployment_inference_controller import TestDeploymentInferenceController
 from adapter.presenter.test_deployment_inference_presenter import new_test_deployment_inference_presenter
 from usecase.test_deployment_inference import TestDeploymentInferenceInput, TestDeploymentInferenceOutput, new_test_deployment_inference_interactor
-from infrastructure.domain.services.deployment_test_domain_service_impl import DeploymentTestDomainServiceImpl
-
-# (Infrastructure / Domain Services)
-from infrastructure.database.mysql.user_repository import MySQLUserRepository
-from infrastructure.database.mysql.agent_repository import MySQLAgentRepository 
-from infrastructure.database.mysql.finetuning_job_repository import MySQLFinetuningJobRepository
-from infrastructure.database.mysql.weight_visualization_repository import MySQLWeightVisualizationRepository
-from infrastructure.database.mysql.config import NewMySQLConfigFromEnv
-from infrastructure.domain.services.auth_domain_service_impl import NewAuthDomainService
-from infrastructure.domain.services.file_storage_domain_service_impl import NewFileStorageDomainService
-from infrastructure.domain.services.job_queue_domain_service_impl import NewJobQueueDomainService
-from infrastructure.domain.services.system_time_domain_service_impl import NewSystemTimeDomainService 
-from infrastructure.domain.services.get_image_stream_domain_service_impl import NewFileStreamDomainService
-
-# (4 NEW DEPLOYMENT APIs IMPORTS)
-from infrastructure.database.mysql.deployment_repository import MySQLDeploymentRepository
-from infrastructure.database.mysql.methods_repository import MySQLMethodsRepository
-from infrastructure.domain.services.job_method_finder_domain_service_impl import JobMethodFinderDomainServiceImpl
+
+# (Infrastructure)
+from infrastructure.container import AppContainer
 
 from adapter.controller.create_finetuning_job_deployment_controller import CreateFinetuningJobDeploymentController
 from adapter.presenter.create_finetuning_job_deployment_presenter import new_create_finetuning_job_deployment_presenter
@@ -94,30 +108,26 @@ from adapter.controller.set_deployment_methods_controller import SetDeploymentMe
 from adapter.presenter.set_deployment_methods_presenter import new_set_deployment_methods_presenter
 from usecase.set_deployment_methods import SetDeploymentMethodsInput, SetDeploymentMethodsOutput, new_set_deployment_methods_interactor
 
+from adapter.controller.get_resource_version_controller import GetResourceVersionController
+from adapter.presenter.get_resource_version_presenter import new_get_resource_version_presenter
+from usecase.get_resource_version import (
+    new_get_resource_version_interactor,
+    RESOURCE_AGENT_JOBS, RESOURCE_AGENT_DEPLOYMENTS, RESOURCE_JOB_VISUALIZATIONS, RESOURCE_JOB_METHODS,
+)
+
 
 # === Router Setup ===
-router = APIRouter()
-db_config = NewMySQLConfigFromEnv()
-user_repo = MySQLUserRepository(db_config)
-agent_repo = MySQLAgentRepository(db_config) 
-finetuning_job_repo = MySQLFinetuningJobRepository(db_config) 
-weight_visualization_repo = MySQLWeightVisualizationRepository(db_config)
+router = APIRouter(default_response_class=FastJSONResponse)
 ctx_timeout = 10.0
 oauth2_scheme = HTTPBearer()
 
-file_storage_service = NewFileStorageDomainService()
-job_queue_service = NewJobQueueDomainService()
-system_time_service = NewSystemTimeDomainService() 
-file_stream_service = NewFileStreamDomainService() 
-
-# DI Setup
-deployment_repo = MySQLDeploymentRepository(db_config)
-methods_repo = MySQLMethodsRepository(db_config)
-job_method_finder_service = JobMethodFinderDomainServiceImpl(timeout=5)
-auth_service = NewAuthDomainService(user_repo) 
 
-async_http_client = httpx.AsyncClient(timeout=15.0) 
-test_inference_service = DeploymentTestDomainServiceImpl(client=async_http_client)
+def get_container(request: Request) -> AppContainer:
+    """
+    lifespan で生成された DI コンテナを返す依存関数。
+    リポジトリ・ドメインサービスはコンテナから取得し、初回利用時に生成される。
+    """
+    return request.app.state.container
 
 
 # --- Helper: 共通レスポンス処理 ---
@@ -127,28 +137,39 @@ def handle_response(response_dict: Dict, success_code: int = 200):
 
     if isinstance(data, StreamingResponse):
         return data
-        
-    if is_dataclass(data):
-        data = asdict(data)
-        
-        def convert_datetime_to_str(obj):
-            if isinstance(obj, datetime):
-                return obj.isoformat()
-            if isinstance(obj, dict):
-                return {k: convert_datetime_to_str(v) for k, v in obj.items()}
-            if isinstance(obj, list):
-                return [convert_datetime_to_str(v) for v in obj]
-            return obj
-        
-        data = convert_datetime_to_str(data)
 
+    # Presenter の dataclass (datetime を含む) は FastJSONResponse が1パスで直列化する
     if status_code >= 400:
-        return JSONResponse(content=data, status_code=status_code)
+        return FastJSONResponse(content=data, status_code=status_code)
 
     if success_code == 204:
         return Response(status_code=204)
 
-    return JSONResponse(content=data, status_code=success_code)
+    return FastJSONResponse(content=data, status_code=success_code)
+
+
+# --- Helper: 条件付き GET (ETag) ---
+async def resolve_etag(container: AppContainer, token: str, resource: str, resource_id: int, status: Optional[str] = None, *variant: Any) -> Optional[str]:
+    """
+    本体のユースケースを実行せずに、認証・所有者チェック付きでリソースの版を取得し ETag を返す。
+    取得できない場合 (未認証・存在しない・所有者でない等) は None を返し、
+    呼び出し側は通常どおり本体のユースケースを実行してエラーを返す。
+    """
+    presenter = new_get_resource_version_presenter()
+    usecase = new_get_resource_version_interactor(
+        presenter=presenter,
+        version_repo=container.resource_version_repo,
+        auth_service=container.auth_service,
+    )
+    controller = GetResourceVersionController(usecase)
+    response_dict = await controller.execute(
+        token=token, resource=resource, resource_id=resource_id, status=status
+    )
+    output = response_dict.get("data")
+    if response_dict.get("status") != 200 or output.version is None:
+        return None
+    # ページングやフィルタの条件ごとに本文が異なるため ETag に含める
+    return make_etag(resource, resource_id, output.version, status, *variant)
 
 
 # === Request DTOs ===
@@ -167,285 +188,513 @@ class CreateAgentRequest(BaseModel):
     name: str
     description: Optional[str]
 
+class CreateUploadSessionRequest(BaseModel):
+    filename: str
+    total_size: int
+    chunk_size: Optional[int] = None
+
+class FinalizeUploadSessionRequest(BaseModel):
+    sha256: Optional[str] = None
+
 
 # === Auth and User Routes ===
 @router.post("/v1/auth/signup", response_model=CreateUserOutput)
-def create_user(request: CreateUserRequest):
+async def create_user(request: CreateUserRequest, container: AppContainer = Depends(get_container)):
     try:
-        repo = user_repo 
+        repo = container.user_repo 
         presenter = new_auth_signup_presenter()
-        usecase = new_create_user_interactor(presenter, repo, ctx_timeout)
+        usecase = new_create_user_interactor(presenter, repo, container.password_hasher, ctx_timeout)
         controller = CreateUserController(usecase)
         input_data = CreateUserInput(**request.dict())
-        response_dict = controller.execute(input_data)
+        response_dict = await controller.execute(input_data)
         return handle_response(response_dict, success_code=201)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 
 @router.post("/v1/auth/login", response_model=LoginUserOutput)
-def login_user(request: LoginUserRequest):
+async def login_user(request: LoginUserRequest, container: AppContainer = Depends(get_container)):
     try:
-        repo = user_repo 
-        auth_service = NewAuthDomainService(repo)
         presenter = new_login_user_presenter()
-        usecase = new_login_user_interactor(presenter, auth_service, ctx_timeout)
+        usecase = new_login_user_interactor(presenter, container.auth_service, ctx_timeout)
         controller = LoginUserController(usecase)
         input_data = LoginUserInput(**request.dict())
-        response_dict = controller.execute(input_data)
+        response_dict = await controller.execute(input_data)
         return handle_response(response_dict, success_code=200)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 
 @router.get("/v1/users/me", response_model=GetUserOutput)
-def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)):
+async def get_current_user(
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
     try:
         token = credentials.credentials
-        repo = user_repo
-        auth_service = NewAuthDomainService(repo)
         presenter = new_get_user_presenter()
-        usecase = new_get_user_interactor(presenter, auth_service, ctx_timeout)
+        usecase = new_get_user_interactor(presenter, container.auth_service, ctx_timeout)
         controller = GetUserController(usecase)
         input_data = GetUserInput(token=token)
-        response_dict = controller.execute(input_data)
+        response_dict = await controller.execute(input_data)
         return handle_response(response_dict, success_code=200)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 # === Agent Routes ===
 @router.post("/v1/agents", response_model=CreateAgentOutput)
-def create_agent(
+async def create_agent(
     request: CreateAgentRequest,
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_create_agent_presenter()
-        usecase = new_create_agent_interactor(presenter, agent_repo, auth_service, ctx_timeout)
+        usecase = new_create_agent_interactor(presenter, container.agent_repo, container.auth_service, ctx_timeout)
         controller = CreateAgentController(usecase)
         input_data = CreateAgentInput(
             token=token,
             name=request.name,
             description=request.description
         )
-        response_dict = controller.execute(input_data)
+        response_dict = await controller.execute(input_data)
         return handle_response(response_dict, success_code=201)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 
 @router.get("/v1/agents", response_model=GetUserAgentsOutput)
-def get_user_agents(credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)):
+async def get_user_agents(
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
     """
     認証されたユーザーが作成した全てのエージェント一覧を取得するAPIエンドポイント。
     """
     try:
         token = credentials.credentials
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_get_user_agents_presenter()
-        usecase = new_get_user_agents_interactor(presenter, agent_repo, auth_service)
+        usecase = new_get_user_agents_interactor(presenter, container.agent_repo, container.auth_service)
         controller = GetUserAgentsController(usecase)
-        response_dict = controller.execute(token=token) 
+        response_dict = await controller.execute(token=token) 
         return handle_response(response_dict, success_code=200)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 @router.get("/v1/agents/all", response_model=GetAgentsOutput)
-def get_all_agents():
+async def get_all_agents(
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="Page size"),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    container: AppContainer = Depends(get_container),
+):
     try:
         presenter = new_get_agents_presenter()
-        usecase = new_get_agents_interactor(presenter, agent_repo)
+        usecase = new_get_agents_interactor(presenter, container.agent_repo)
         controller = GetAgentsController(usecase)
         # Input DTOを渡す際は、キーワード引数 'input_data' を使用する
-        response_dict = controller.execute(input_data=GetAgentsInput()) 
+        response_dict = await controller.execute(input_data=GetAgentsInput(limit=limit, after=after)) 
         return handle_response(response_dict, success_code=200)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 # === Finetuning & Job Routes ===
-@router.post("/v1/agents/{agent_id}/finetuning", response_model=CreateFinetuningJobOutput)
-def create_finetuning_job(
+# 本文 (multipart/form-data) はトークンと所有権の確認後にルート内で読むため、UploadFile 引数ではなく OpenAPI に直接記述する
+_TRAINING_FILE_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        "multipart/form-data": {
+            "schema": {
+                "type": "object",
+                "required": ["training_file"],
+                "properties": {
+                    "training_file": {"type": "string", "format": "binary", "description": "Training data file (.txt)"},
+                },
+            },
+        },
+    },
+}
+
+
+@router.post(
+    "/v1/agents/{agent_id}/finetuning", response_model=CreateFinetuningJobOutput, status_code=202,
+    openapi_extra={"requestBody": _TRAINING_FILE_REQUEST_BODY},
+)
+async def create_finetuning_job(
     agent_id: int,
-    training_file: UploadFile = File(..., description="Training data file (.txt)"),
+    request: Request,
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
-        domain_file_stream = FastAPIUploadedFileAdapter(training_file)
+        presenter = new_create_finetuning_job_presenter()
+        usecase = new_create_finetuning_job_interactor(
+            presenter=presenter, job_repo=container.finetuning_job_repo, agent_repo=container.agent_repo,
+            auth_service=container.auth_service, file_storage_service=container.file_storage_service, 
+            job_queue_service=container.job_queue_service, system_time_service=container.system_time_service, 
+            background_task_service=container.background_task_service,
+            training_data_repo=container.training_data_repo,
+        )
+
+        async def receive_training_file():
+            # ユースケースがトークンとエージェントの所有権を確認した後に呼ぶ (ここで初めて本文を読む)
+            try:
+                form = await request.form()
+            except Exception as e:
+                raise ValueError(f"Invalid multipart body: {e}")
+            try:
+                training_file = form.get("training_file")
+                if not isinstance(training_file, StarletteUploadFile):
+                    raise ValueError("training_file is required.")
+                # フォームの一時ファイルはこの関数を抜けると閉じるため、バックグラウンド転送用にローカルディスクへ退避する
+                # (以降のスプールファイルの削除はユースケースが行う)
+                return await container.upload_spool.spool(training_file)
+            finally:
+                await form.close()
+
         input_data = CreateFinetuningJobInput(
             token=token,
             agent_id=agent_id,
-            training_file=domain_file_stream
-        )
-        auth_service = NewAuthDomainService(user_repo)
-        presenter = new_create_finetuning_job_presenter()
-        usecase = new_create_finetuning_job_interactor(
-            presenter=presenter, job_repo=finetuning_job_repo, agent_repo=agent_repo,
-            auth_service=auth_service, file_storage_service=file_storage_service, 
-            job_queue_service=job_queue_service, system_time_service=system_time_service, 
+            receive_training_file=receive_training_file,
         )
         controller = CreateFinetuningJobController(usecase)
-        response_dict = controller.execute(input_data=input_data)
+        response_dict = await controller.execute(input_data=input_data)
+        return handle_response(response_dict, success_code=202)
+    except Exception as e:
+        return FastJSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
+
+
+# --- 再開可能な分割アップロード ---
+# 1. POST   /v1/agents/{agent_id}/finetuning/uploads                     セッションを作成 (chunk_size が返る)
+# 2. PUT    /v1/finetuning/uploads/{upload_id}/chunks/{index}            チャンクを順番に送る (X-Chunk-SHA256 必須)
+# 3. GET    /v1/finetuning/uploads/{upload_id}                           切断後は next_chunk を問い合わせて再開
+# 4. POST   /v1/finetuning/uploads/{upload_id}/finalize                  ジョブを作成 (以降は通常のアップロードと同じ)
+@router.post("/v1/agents/{agent_id}/finetuning/uploads", response_model=CreateUploadSessionOutput, status_code=201)
+async def create_upload_session(
+    request: CreateUploadSessionRequest,
+    agent_id: int = Path(..., description="ID of the Agent"),
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
+    try:
+        token = credentials.credentials
+        presenter = new_create_upload_session_presenter()
+        usecase = new_create_upload_session_interactor(
+            presenter=presenter, session_repo=container.upload_session_repo, agent_repo=container.agent_repo,
+            auth_service=container.auth_service, file_storage_service=container.file_storage_service,
+            system_time_service=container.system_time_service,
+            background_task_service=container.background_task_service,
+        )
+        input_data = CreateUploadSessionInput(
+            token=token,
+            agent_id=agent_id,
+            filename=request.filename,
+            total_size=request.total_size,
+            chunk_size=request.chunk_size,
+        )
+        controller = CreateUploadSessionController(usecase)
+        response_dict = await controller.execute(input_data=input_data)
         return handle_response(response_dict, success_code=201)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
+
+
+@router.get("/v1/finetuning/uploads/{upload_id}", response_model=GetUploadSessionOutput)
+async def get_upload_session(
+    upload_id: str = Path(..., description="ID of the upload session"),
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
+    try:
+        token = credentials.credentials
+        presenter = new_get_upload_session_presenter()
+        usecase = new_get_upload_session_interactor(
+            presenter=presenter, session_repo=container.upload_session_repo,
+            auth_service=container.auth_service, system_time_service=container.system_time_service,
+        )
+        controller = GetUploadSessionController(usecase)
+        response_dict = await controller.execute(input_data=GetUploadSessionInput(token=token, upload_id=upload_id))
+        return handle_response(response_dict, success_code=200)
+    except Exception as e:
+        return FastJSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
+
+
+@router.put("/v1/finetuning/uploads/{upload_id}/chunks/{index}", response_model=UploadChunkOutput)
+async def upload_chunk(
+    request: Request,
+    upload_id: str = Path(..., description="ID of the upload session"),
+    index: int = Path(..., ge=0, description="Zero-based chunk number"),
+    x_chunk_sha256: Optional[str] = Header(None, description="SHA-256 (hex) of the chunk body"),
+    content_length: Optional[int] = Header(None),
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
+    try:
+        # 本文を読む前に上限を超えるチャンクを拒否する
+        if content_length is not None and content_length > UPLOAD_MAX_CHUNK_SIZE:
+            return FastJSONResponse({"error": f"Chunk exceeds {UPLOAD_MAX_CHUNK_SIZE} bytes."}, status_code=413)
+
+        token = credentials.credentials
+        presenter = new_upload_chunk_presenter()
+        usecase = new_upload_chunk_interactor(
+            presenter=presenter, session_repo=container.upload_session_repo,
+            auth_service=container.auth_service, file_storage_service=container.file_storage_service,
+            system_time_service=container.system_time_service,
+        )
+        input_data = UploadChunkInput(
+            token=token,
+            upload_id=upload_id,
+            index=index,
+            data=await request.body(),
+            sha256=x_chunk_sha256,
+        )
+        controller = UploadChunkController(usecase)
+        response_dict = await controller.execute(input_data=input_data)
+        return handle_response(response_dict, success_code=200)
+    except Exception as e:
+        return FastJSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
+
+
+@router.post("/v1/finetuning/uploads/{upload_id}/finalize", response_model=CreateFinetuningJobOutput, status_code=202)
+async def finalize_upload_session(
+    request: Optional[FinalizeUploadSessionRequest] = None,
+    upload_id: str = Path(..., description="ID of the upload session"),
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
+    try:
+        token = credentials.credentials
+        presenter = new_finalize_upload_session_presenter()
+        usecase = new_finalize_upload_session_interactor(
+            presenter=presenter, session_repo=container.upload_session_repo,
+            job_repo=container.finetuning_job_repo, agent_repo=container.agent_repo,
+            auth_service=container.auth_service, file_storage_service=container.file_storage_service,
+            job_queue_service=container.job_queue_service, system_time_service=container.system_time_service,
+            background_task_service=container.background_task_service,
+            training_data_repo=container.training_data_repo,
+        )
+        input_data = FinalizeUploadSessionInput(
+            token=token,
+            upload_id=upload_id,
+            sha256=request.sha256 if request else None,
+        )
+        controller = FinalizeUploadSessionController(usecase)
+        response_dict = await controller.execute(input_data=input_data)
+        return handle_response(response_dict, success_code=202)
+    except Exception as e:
+        return FastJSONResponse({"error": f"An unexpected error occurred: {e}"}, status_code=500)
 
 
 @router.get("/v1/agents/{agent_id}/jobs", response_model=GetAgentFinetuningJobsOutput)
-def get_agent_finetuning_jobs(
+async def get_agent_finetuning_jobs(
     agent_id: int = Path(..., description="ID of the Agent"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="Page size"),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    status: Optional[str] = Query(None, description="Filter by job status"),
+    if_none_match: Optional[str] = Header(None),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
-        auth_service = NewAuthDomainService(user_repo)
+
+        etag = await resolve_etag(container, token, RESOURCE_AGENT_JOBS, agent_id, status, limit, after)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag, CACHE_CONTROL_REVALIDATE)
         
         presenter = new_get_agent_finetuning_jobs_presenter() 
         usecase = new_get_agent_finetuning_jobs_interactor(
             presenter=presenter, 
-            job_repo=finetuning_job_repo, 
-            auth_service=auth_service,
-            agent_repo=agent_repo, 
+            job_repo=container.finetuning_job_repo, 
+            auth_service=container.auth_service,
+            agent_repo=container.agent_repo, 
         )
 
         controller = GetAgentFinetuningJobsController(usecase) 
-        response_dict = controller.execute(token=token, agent_id=agent_id) 
+        response_dict = await controller.execute(
+            token=token, agent_id=agent_id, limit=limit, after=after, status=status
+        ) 
         
-        return handle_response(response_dict, success_code=200)
+        return apply_cache_headers(handle_response(response_dict, success_code=200), etag, CACHE_CONTROL_REVALIDATE)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 
 @router.get("/v1/jobs/{job_id}/visualizations", response_model=GetFinetuningJobVisualizationOutput)
-def get_job_visualizations(
+async def get_job_visualizations(
     job_id: int = Path(..., description="ID of the Finetuning Job"), 
+    if_none_match: Optional[str] = Header(None),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
+
+        etag = await resolve_etag(container, token, RESOURCE_JOB_VISUALIZATIONS, job_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag, CACHE_CONTROL_VISUALIZATIONS)
+
         input_data = GetFinetuningJobVisualizationInput(token=token, job_id=job_id)
-        auth_service = NewAuthDomainService(user_repo)
-        presenter = new_get_finetuning_job_visualization_presenter()
+        presenter = new_get_finetuning_job_visualization_presenter(container.visuals_base_dir)
         usecase = new_get_finetuning_job_visualization_interactor(
-            presenter=presenter, vis_repo=weight_visualization_repo, job_repo=finetuning_job_repo,
-            agent_repo=agent_repo, auth_service=auth_service,
+            presenter=presenter, vis_repo=container.weight_visualization_repo,
+            ownership_repo=container.new_ownership_repo(), auth_service=container.auth_service,
         )
         controller = GetWeightVisualizationsController(usecase)
-        response_dict = controller.execute(token=token, job_id=job_id)
-        return handle_response(response_dict, success_code=200)
+        response_dict = await controller.execute(token=token, job_id=job_id)
+        return apply_cache_headers(handle_response(response_dict, success_code=200), etag, CACHE_CONTROL_VISUALIZATIONS)
+    except Exception as e:
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+
+
+@router.get("/v1/jobs/{job_id}/weight-stats", response_model=GetFinetuningJobWeightStatsOutput)
+async def get_job_weight_stats(
+    job_id: int = Path(..., description="ID of the Finetuning Job"),
+    include_tensors: bool = Query(True, description="Include per-tensor statistics (false: per-layer and model totals only)"),
+    if_none_match: Optional[str] = Header(None),
+    container: AppContainer = Depends(get_container),
+    credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
+):
+    try:
+        token = credentials.credentials
+
+        # 統計は可視化データと同じ行に保存されるため、同じ版 (行の updated_at) を使う
+        etag = await resolve_etag(container, token, RESOURCE_JOB_VISUALIZATIONS, job_id, None, "weight_stats", include_tensors)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag, CACHE_CONTROL_VISUALIZATIONS)
+
+        presenter = new_get_finetuning_job_weight_stats_presenter()
+        usecase = new_get_finetuning_job_weight_stats_interactor(
+            presenter=presenter, vis_repo=container.weight_visualization_repo,
+            ownership_repo=container.new_ownership_repo(), auth_service=container.auth_service,
+        )
+        controller = GetWeightStatsController(usecase)
+        response_dict = await controller.execute(token=token, job_id=job_id, include_tensors=include_tensors)
+        return apply_cache_headers(handle_response(response_dict, success_code=200), etag, CACHE_CONTROL_VISUALIZATIONS)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 # === Deployment Routes ===
 @router.get("/v1/agents/{agent_id}/deployments", response_model=GetAgentDeploymentsOutput)
-def get_agent_deployments(
+async def get_agent_deployments(
     agent_id: int = Path(..., description="ID of the Agent"),
+    limit: int = Query(DEFAULT_PAGE_LIMIT, ge=1, le=MAX_PAGE_LIMIT, description="Page size"),
+    after: Optional[str] = Query(None, description="next_cursor of the previous page"),
+    status: Optional[str] = Query(None, description="Filter by deployment status"),
+    if_none_match: Optional[str] = Header(None),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
-        auth_service = NewAuthDomainService(user_repo)
+
+        etag = await resolve_etag(container, token, RESOURCE_AGENT_DEPLOYMENTS, agent_id, status, limit, after)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag, CACHE_CONTROL_REVALIDATE)
 
         presenter = new_get_agent_deployments_presenter()
         usecase = new_get_agent_deployments_interactor(
             presenter=presenter,
-            deployment_repo=deployment_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service,
+            deployment_repo=container.deployment_repo,
+            agent_repo=container.agent_repo,
+            auth_service=container.auth_service,
         )
 
         controller = GetAgentDeploymentsController(usecase)
-        response_dict = controller.execute(token=token, agent_id=agent_id)
+        response_dict = await controller.execute(
+            token=token, agent_id=agent_id, limit=limit, after=after, status=status
+        )
         
-        return handle_response(response_dict, success_code=200)
+        return apply_cache_headers(handle_response(response_dict, success_code=200), etag, CACHE_CONTROL_REVALIDATE)
     except Exception as e:
-        return JSONResponse({"error": str(e)}, status_code=500)
+        return FastJSONResponse({"error": str(e)}, status_code=500)
 
 
 @router.post("/v1/jobs/{job_id}/deployment", response_model=CreateFinetuningJobDeploymentOutput)
-def create_deployment(
+async def create_deployment(
     job_id: int = Path(..., description="ID of the Finetuning Job to deploy"),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
         input_data = CreateFinetuningJobDeploymentInput(token=token, job_id=job_id)
         
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_create_finetuning_job_deployment_presenter()
         
         usecase = new_create_finetuning_job_deployment_interactor(
             presenter=presenter,
-            deployment_repo=deployment_repo,
-            job_repo=finetuning_job_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service
+            deployment_repo=container.deployment_repo,
+            ownership_repo=container.new_ownership_repo(),
+            auth_service=container.auth_service
         )
         controller = CreateFinetuningJobDeploymentController(usecase)
-        response_dict = controller.execute(input_data=input_data)
+        response_dict = await controller.execute(input_data=input_data)
         return handle_response(response_dict, success_code=201)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 @router.get("/v1/jobs/{job_id}/deployment", response_model=GetFinetuningJobDeploymentOutput)
-def get_deployment(
+async def get_deployment(
     job_id: int = Path(..., description="ID of the Finetuning Job"),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
         input_data = GetFinetuningJobDeploymentInput(token=token, job_id=job_id)
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_get_finetuning_job_deployment_presenter()
         
         usecase = new_get_finetuning_job_deployment_interactor(
             presenter=presenter,
-            deployment_repo=deployment_repo,
-            job_repo=finetuning_job_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service
+            ownership_repo=container.new_ownership_repo(),
+            auth_service=container.auth_service
         )
         controller = GetFinetuningJobDeploymentController(usecase)
-        response_dict = controller.execute(input_data=input_data)
+        response_dict = await controller.execute(input_data=input_data)
         return handle_response(response_dict, success_code=200)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 @router.get("/v1/jobs/{job_id}/methods", response_model=GetDeploymentMethodsOutput)
-def get_methods(
+async def get_methods(
     job_id: int = Path(..., description="ID of the Finetuning Job"),
+    if_none_match: Optional[str] = Header(None),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
         token = credentials.credentials
+
+        etag = await resolve_etag(container, token, RESOURCE_JOB_METHODS, job_id)
+        if etag is not None and etag_matches(if_none_match, etag):
+            return not_modified_response(etag, CACHE_CONTROL_METHODS)
+
         input_data = GetDeploymentMethodsInput(token=token, job_id=job_id)
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_get_deployment_methods_presenter()
         
         usecase = new_get_deployment_methods_interactor(
             presenter=presenter,
-            methods_repo=methods_repo,
-            deployment_repo=deployment_repo,
-            job_repo=finetuning_job_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service
+            methods_repo=container.methods_repo,
+            ownership_repo=container.new_ownership_repo(),
+            auth_service=container.auth_service
         )
         
         controller = GetDeploymentMethodsController(usecase)
-        response_dict = controller.execute(input_data=input_data)
-        return handle_response(response_dict, success_code=200)
+        response_dict = await controller.execute(input_data=input_data)
+        return apply_cache_headers(handle_response(response_dict, success_code=200), etag, CACHE_CONTROL_METHODS)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 @router.put("/v1/jobs/{job_id}/methods", response_model=SetDeploymentMethodsOutput) 
-def set_methods(
+async def set_methods(
     job_id: int = Path(..., description="ID of the Finetuning Job"),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
@@ -456,31 +705,29 @@ def set_methods(
             job_id=job_id
         )
         
-        auth_service = NewAuthDomainService(user_repo)
         presenter = new_set_deployment_methods_presenter()
         
         usecase = new_set_deployment_methods_interactor(
             presenter=presenter,
-            methods_repo=methods_repo,
-            deployment_repo=deployment_repo,
-            job_repo=finetuning_job_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service,
-            method_finder_service=job_method_finder_service 
+            methods_repo=container.methods_repo,
+            ownership_repo=container.new_ownership_repo(),
+            auth_service=container.auth_service,
+            method_finder_service=container.job_method_finder_service 
         )
         
         controller = SetDeploymentMethodsController(usecase)
-        response_dict = controller.execute(input_data=input_data)
+        response_dict = await controller.execute(input_data=input_data)
         return handle_response(response_dict, success_code=200)
     except Exception as e:
         print(f"Set Methods Error: {e}") 
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 @router.post("/v1/deployments/{deployment_id}/test", response_model=TestDeploymentInferenceOutput)
 async def test_deployment_inference(
     deployment_id: int = Path(..., description="ID of the Deployment to test"),
     test_file: UploadFile = File(..., description="Test data file (.txt)"),
+    container: AppContainer = Depends(get_container),
     credentials: HTTPAuthorizationCredentials = Depends(oauth2_scheme)
 ):
     try:
@@ -497,11 +744,9 @@ async def test_deployment_inference(
         presenter = new_test_deployment_inference_presenter()
         usecase = new_test_deployment_inference_interactor(
             presenter=presenter,
-            deployment_repo=deployment_repo,
-            job_repo=finetuning_job_repo,
-            agent_repo=agent_repo,
-            auth_service=auth_service,
-            test_service=test_inference_service
+            ownership_repo=container.new_ownership_repo(),
+            auth_service=container.auth_service,
+            test_service=container.test_inference_service
         )
         
         controller = TestDeploymentInferenceController(usecase)
@@ -511,20 +756,23 @@ async def test_deployment_inference(
         return handle_response(response_dict, success_code=200)
         
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
 
 
 # === File Stream / Proxy Routes ===
 @router.get("/v1/visuals/{filepath:path}", response_class=StreamingResponse)
-async def serve_visualizations(filepath: str):
+async def serve_visualizations(filepath: str, request: Request, container: AppContainer = Depends(get_container)):
     try:
         presenter = new_get_image_stream_presenter()
         usecase = new_get_image_stream_interactor(
             presenter=presenter,
-            file_stream_service=file_stream_service,
+            file_stream_service=container.file_stream_service,
+            render_service=container.visualization_render_service,
         )
         controller = GetImageStreamController(usecase)
 
-        return controller.execute(relative_path=filepath)
+        # SFTP からの取得はブロッキングI/Oのため、スレッドで実行してイベントループを止めない
+        # (Range・条件付き GET の評価にリクエストヘッダーを渡す)
+        return await asyncio.to_thread(controller.execute, relative_path=filepath, headers=request.headers)
     except Exception as e:
-        return JSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
\ No newline at end of file
+        return FastJSONResponse({"error": f"An unexpected server error occurred: {e}"}, status_code=500)
\ No newline at end of file
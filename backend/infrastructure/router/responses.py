@@ -0,0 +1,52 @@
+import dataclasses
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import Response
+
+# orjson は任意依存。未インストールの場合は標準 json にフォールバックする
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """orjson / json が標準で扱えない型の変換"""
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def _stdlib_default(obj: Any) -> Any:
+    """標準 json 用: dataclass と datetime も1パスで変換する"""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj)}
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    return _default(obj)
+
+
+def dumps(content: Any) -> bytes:
+    """
+    Presenter が返す dataclass / datetime を含むオブジェクトを1パスで JSON バイト列にする。
+    asdict によるディープコピーや datetime の再帰変換を行わない。
+    """
+    if orjson is not None:
+        # dataclass と datetime (ISO 8601) は orjson がネイティブに直列化する
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(
+        content, default=_stdlib_default, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """
+    全ルート共通の JSON レスポンスクラス。
+    dataclass をそのまま content に渡してよい。
+    """
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,82 +1,112 @@
 import os
 import shutil
-from pathlib import Path
-from fastapi import UploadFile
+import uuid
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+
+# ローカルディスク (またはワーカー・推論エンジンと共有するマウント済みボリューム) 上のストレージ。
+# 同一ホストに同居する構成や開発・テスト環境で、VPS への SFTP 転送の代わりに使う。
+# backend と worker は同じボリュームを同じパスにマウントする前提 (DB に保存するパスを共通にするため)。
+
+# 既定のストレージルート (docker-compose.yml の agenthub_storage ボリュームのマウント先)
+DEFAULT_LOCAL_STORAGE_ROOT = "/data/agenthub"
+
+# ストレージバックエンドの切り替え (環境変数 STORAGE_BACKEND)
+STORAGE_BACKEND_SFTP = "sftp"
+STORAGE_BACKEND_LOCAL = "local"
+
+COPY_CHUNK_SIZE = 1024 * 1024
 
-# ファイル保存のベースディレクトリを定義
-# このパスは、docker-compose.yml でホストと共有されているディレクトリと一致する必要があります。
-# 例: ホストの /mnt/training_data がコンテナ内の /data/training にマウントされている場合
-# 環境変数で設定することが理想的ですが、ここではコンテナ内のマウントパスを仮定します。
-STORAGE_BASE_DIR = "/data/training"
 
 class FileStorageError(Exception):
     """ファイルストレージ操作に関するカスタムエラー"""
     pass
 
-def initialize_storage():
-    """ストレージディレクトリが存在することを確認し、なければ作成する"""
-    path = Path(STORAGE_BASE_DIR)
-    try:
-        if not path.exists():
-            path.mkdir(parents=True, exist_ok=True)
-            print(f"Storage directory created: {STORAGE_BASE_DIR}")
-    except OSError as e:
-        raise FileStorageError(f"Failed to initialize storage directory {STORAGE_BASE_DIR}: {e}")
 
-def save_training_file(upload_file: UploadFile, agent_id: str) -> str:
+@dataclass(frozen=True)
+class LocalStorageConfig:
+    """ローカルストレージの各ディレクトリ (VPS_TRAINING_DIR / VPS_MODEL_DIR / VPS_VISUALS_DIR に対応)"""
+    training_dir: str
+    model_dir: str
+    visuals_dir: str
+
+
+def GetStorageBackendFromEnv() -> str:
+    """環境変数 STORAGE_BACKEND ('sftp' または 'local'、既定は 'sftp') を返す"""
+    backend = os.environ.get("STORAGE_BACKEND", STORAGE_BACKEND_SFTP).strip().lower()
+    if backend not in (STORAGE_BACKEND_SFTP, STORAGE_BACKEND_LOCAL):
+        raise EnvironmentError(f"Unsupported STORAGE_BACKEND: {backend!r} (expected 'sftp' or 'local').")
+    return backend
+
+
+def NewLocalStorageConfigFromEnv() -> LocalStorageConfig:
     """
-    アップロードされたファイルを共有ストレージに保存し、保存先パスを返す。
+    環境変数 LOCAL_STORAGE_ROOT (既定: /data/agenthub) から LocalStorageConfig を生成するファクトリ関数。
+    ルート直下の training_data / models / visualizations を使う (worker と同じ構成)。
+    """
+    root = os.path.abspath(os.environ.get("LOCAL_STORAGE_ROOT") or DEFAULT_LOCAL_STORAGE_ROOT)
+    return LocalStorageConfig(
+        training_dir=os.path.join(root, "training_data"),
+        model_dir=os.path.join(root, "models"),
+        visuals_dir=os.path.join(root, "visualizations"),
+    )
 
-    Args:
-        upload_file: FastAPIの UploadFile オブジェクト
-        agent_id: ファイル名の一意性を確保するために使用するエージェントID (str)
 
-    Returns:
-        str: ファイルが保存された絶対パス（ワーカーが読み込むパス）
-    
-    Raises:
-        FileStorageError: ファイル操作に失敗した場合
+def GetVisualsBaseDirFromEnv() -> str:
+    """
+    可視化画像の保存先のベースディレクトリ (worker が DB に保存するパスの接頭辞) を環境変数から返す。
+    STORAGE_BACKEND が 'local' なら LOCAL_STORAGE_ROOT 直下の visualizations、それ以外は VPS_VISUALS_DIR。
     """
-    if not upload_file.filename:
-        raise FileStorageError("File upload failed: filename is missing.")
-
-    # ファイル名が一意になるようにIDとタイムスタンプを付加
-    timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-    # パスとして安全なファイル名を生成
-    safe_filename = Path(upload_file.filename).name
-    
-    # 最終的なコンテナ内の保存パス
-    final_filename = f"{agent_id}_{timestamp}_{safe_filename}"
-    file_path = Path(STORAGE_BASE_DIR) / final_filename
-    
-    # ファイル保存の実行
+    if GetStorageBackendFromEnv() == STORAGE_BACKEND_LOCAL:
+        return NewLocalStorageConfigFromEnv().visuals_dir
+    return os.environ.get("VPS_VISUALS_DIR", f"/C/Users/{os.environ.get('VPS_USER', '')}/visualizations")
+
+
+def ensure_dir(path: str) -> None:
+    """ディレクトリが存在することを確認し、なければ作成する"""
     try:
-        # ディレクトリの存在確認 (コンテナ起動時に失敗している場合を考慮)
-        initialize_storage() 
+        os.makedirs(path, exist_ok=True)
+    except OSError as e:
+        raise FileStorageError(f"Failed to create storage directory {path}: {e}")
 
-        with file_path.open("wb") as buffer:
-            # UploadFileのコンテンツをストリームでファイルに書き込む
-            shutil.copyfileobj(upload_file.file, buffer)
-            
-        # ワーカーがこのパスを使ってファイルを読み込む
-        return str(file_path)
 
+def write_file_atomic(dest_path: str, source: BinaryIO, source_path: Optional[str] = None) -> None:
+    """
+    ファイルを一時名で書き込んでからリネームする (書き込み途中のファイルを参照させない)。
+    source_path (ディスク上のファイル) があれば shutil.copyfile でカーネル内コピー (copy_file_range/sendfile) する。
+    """
+    ensure_dir(os.path.dirname(dest_path))
+    temp_path = f"{dest_path}.part-{uuid.uuid4().hex}"
+    try:
+        if source_path:
+            shutil.copyfile(source_path, temp_path)
+        else:
+            source.seek(0)
+            with open(temp_path, "wb") as dst:
+                shutil.copyfileobj(source, dst, COPY_CHUNK_SIZE)
+        os.replace(temp_path, dest_path)
     except Exception as e:
-        # ファイル保存中にエラーが発生した場合
-        raise FileStorageError(f"Error saving file to {file_path}: {e}")
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise FileStorageError(f"Error saving file to {dest_path}: {e}")
 
 
-def delete_training_file(file_path: str) -> None:
+def resolve_within(base_dir: str, path: str) -> str:
     """
-    指定されたパスのファイルを共有ストレージから削除する（クリーンアップ用）。
+    base_dir 配下のパスを解決する。path は base_dir からの相対パス、または base_dir 配下の絶対パス
+    (DB に保存されたリモート絶対パスをそのまま URL にした場合) を受け付ける。
+    シンボリックリンクを解決した結果が base_dir の外を指す場合は FileNotFoundError を送出する。
     """
-    path = Path(file_path)
-    try:
-        if path.exists():
-            path.unlink()
-    except OSError as e:
-        # 削除失敗はジョブ全体を妨げないが、ログに記録すべき
-        print(f"Warning: Failed to delete file {file_path}. Error: {e}")
+    base_real = os.path.realpath(base_dir)
+    normalized = "/" + path.replace("\\", "/").lstrip("/")
+    if normalized == base_dir or normalized.startswith(base_dir.rstrip("/") + "/"):
+        candidate = normalized
+    else:
+        candidate = os.path.join(base_dir, path.replace("\\", "/").lstrip("/"))
 
-# 外部から datetime を使用するためにインポート
-from datetime import datetime
\ No newline at end of file
+    resolved = os.path.realpath(candidate)
+    if resolved != base_real and not resolved.startswith(base_real + os.sep):
+        raise FileNotFoundError(f"Path is outside of the storage directory: {path}")
+    return resolved
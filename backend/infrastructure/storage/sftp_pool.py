@@ -0,0 +1,379 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import paramiko
+
+from infrastructure.metrics.prometheus import REGISTRY, SFTP_SECONDS
+
+
+class SFTPPoolError(Exception):
+    """SFTP 接続プールの取得・接続に関するカスタムエラー"""
+    pass
+
+
+@dataclass(frozen=True)
+class SFTPPoolConfig:
+    """
+    SFTP 接続プールの設定。
+    接続先は既存の VPS_* 環境変数、プールの調整値は VPS_SFTP_* 環境変数から読み込む。
+    """
+    host: str
+    port: int
+    user: str
+    key_file_path: str
+    # 同時に張る SSH トランスポート (TCP 接続 + 鍵交換 + 認証) の上限
+    max_transports: int = 2
+    # 1トランスポートあたりの SFTP チャネル数の上限 (サーバーの MaxSessions 以下にする)
+    max_sessions: int = 8
+    keepalive_seconds: int = 30
+    # この秒数使われなかったチャネル・トランスポートは閉じる
+    idle_timeout: float = 300.0
+    connect_timeout: float = 10.0
+    # 全チャネルが使用中の場合に空きを待つ最大秒数
+    acquire_timeout: float = 30.0
+    # この秒数以上アイドルだったチャネルは再利用前に疎通確認する
+    health_check_seconds: float = 30.0
+
+
+def NewSFTPPoolConfigFromEnv() -> SFTPPoolConfig:
+    """環境変数から SFTPPoolConfig を生成するファクトリ関数"""
+    try:
+        return SFTPPoolConfig(
+            host=os.environ["VPS_IP"],
+            port=int(os.environ.get("VPS_PORT", 22)),
+            user=os.environ["VPS_USER"],
+            key_file_path=os.environ["VPS_KEY_FILE_PATH"],
+            max_transports=int(os.environ.get("VPS_SFTP_MAX_TRANSPORTS", 2)),
+            max_sessions=int(os.environ.get("VPS_SFTP_MAX_SESSIONS", 8)),
+            keepalive_seconds=int(os.environ.get("VPS_SFTP_KEEPALIVE_SECONDS", 30)),
+            idle_timeout=float(os.environ.get("VPS_SFTP_IDLE_TIMEOUT", 300)),
+            connect_timeout=float(os.environ.get("VPS_SFTP_CONNECT_TIMEOUT", 10)),
+            acquire_timeout=float(os.environ.get("VPS_SFTP_ACQUIRE_TIMEOUT", 30)),
+        )
+    except KeyError as e:
+        raise EnvironmentError(f"Missing environment variable for SFTP setup: {e}.")
+
+
+class _PooledTransport:
+    """1本の SSH トランスポートと、その上に多重化された SFTP チャネル"""
+
+    def __init__(self, client: paramiko.SSHClient):
+        self.client = client
+        self.transport = client.get_transport()
+        self.active = 0
+        self.idle: List[Tuple[paramiko.SFTPClient, float]] = []
+        self.last_used = time.monotonic()
+
+    @property
+    def sessions(self) -> int:
+        return self.active + len(self.idle)
+
+    def is_alive(self) -> bool:
+        return self.transport is not None and self.transport.is_active()
+
+    def close(self) -> None:
+        for sftp, _ in self.idle:
+            _close_quietly(sftp)
+        self.idle = []
+        _close_quietly(self.client)
+
+
+def _close_quietly(resource) -> None:
+    try:
+        resource.close()
+    except Exception:
+        pass
+
+
+def _channel_alive(sftp: paramiko.SFTPClient) -> bool:
+    channel = sftp.get_channel()
+    if channel is None or channel.closed:
+        return False
+    transport = channel.get_transport()
+    return transport is not None and transport.is_active()
+
+
+class SFTPConnectionPool:
+    """
+    長寿命の SSH トランスポートを保持し、SFTP チャネルを多重化して貸し出すスレッドセーフなプール。
+
+    - 操作ごとの TCP 接続・鍵交換・認証を避け、チャネル (SFTP セッション) を再利用する
+    - トランスポートは keepalive を送り、切断を検知したものは破棄して次回取得時に再接続する
+    - 長時間アイドルだったチャネルは再利用前に stat で疎通確認する
+    - 操作中に接続が切れた場合はそのチャネル (必要ならトランスポートも) を破棄する
+    - fork 後の子プロセスでは親のソケットを使わず新たに接続する
+    """
+
+    def __init__(self, config: SFTPPoolConfig):
+        self._config = config
+        if not os.path.exists(config.key_file_path):
+            raise FileNotFoundError(f"SSH key file not found at: {config.key_file_path}")
+        try:
+            self._private_key = paramiko.Ed25519Key(filename=config.key_file_path)
+        except Exception as e:
+            raise SFTPPoolError(f"Failed to load SSH private key (tried Ed25519): {e}")
+
+        self._cond = threading.Condition()
+        self._transports: List[_PooledTransport] = []
+        self._connecting = 0
+        self._waiting = 0
+        self._pid = os.getpid()
+        # 累計値 (メトリクス用)
+        self._counters: Dict[str, int] = {
+            "connects": 0,
+            "connect_failures": 0,
+            "dropped_transports": 0,
+            "sessions_opened": 0,
+            "sessions_reused": 0,
+        }
+
+    @property
+    def config(self) -> SFTPPoolConfig:
+        return self._config
+
+    # --- 接続管理 ---
+
+    def _connect(self) -> _PooledTransport:
+        config = self._config
+        client = paramiko.SSHClient()
+        client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
+        print(f"INFO: Opening SFTP transport to {config.user}@{config.host}:{config.port}...")
+        try:
+            client.connect(
+                config.host,
+                port=config.port,
+                username=config.user,
+                pkey=self._private_key,
+                timeout=config.connect_timeout,
+                banner_timeout=config.connect_timeout,
+                auth_timeout=config.connect_timeout,
+                allow_agent=False,
+                look_for_keys=False,
+            )
+            client.get_transport().set_keepalive(config.keepalive_seconds)
+        except Exception:
+            _close_quietly(client)
+            raise
+        return _PooledTransport(client)
+
+    def _discard_locked(self, pooled: _PooledTransport) -> None:
+        if pooled in self._transports:
+            self._transports.remove(pooled)
+            self._counters["dropped_transports"] += 1
+        pooled.close()
+
+    def _reap_locked(self) -> None:
+        """切断済みのトランスポートと、アイドル時間を超えたチャネル・トランスポートを閉じる"""
+        if os.getpid() != self._pid:
+            # fork 後は親プロセスのソケットを閉じずに手放す
+            self._transports = []
+            self._connecting = 0
+            self._pid = os.getpid()
+
+        now = time.monotonic()
+        for pooled in list(self._transports):
+            if not pooled.is_alive():
+                print(f"INFO: SFTP transport to {self._config.host} was disconnected. It will be re-established.")
+                self._discard_locked(pooled)
+                continue
+            fresh = []
+            for sftp, idle_since in pooled.idle:
+                if now - idle_since > self._config.idle_timeout:
+                    _close_quietly(sftp)
+                else:
+                    fresh.append((sftp, idle_since))
+            pooled.idle = fresh
+            if pooled.sessions == 0 and now - pooled.last_used > self._config.idle_timeout:
+                self._transports.remove(pooled)
+                pooled.close()
+
+    def _acquire(self) -> Tuple[_PooledTransport, paramiko.SFTPClient, bool]:
+        """
+        チャネルを1つ確保する。戻り値の3番目は再利用前に疎通確認が必要かどうか。
+        接続・チャネル生成 (ネットワーク I/O) はロックの外で行う。
+        """
+        deadline = time.monotonic() + self._config.acquire_timeout
+        target: Optional[_PooledTransport] = None
+        create = False
+
+        with self._cond:
+            while True:
+                self._reap_locked()
+                now = time.monotonic()
+
+                # 1. アイドルのチャネルを再利用する
+                for pooled in self._transports:
+                    while pooled.idle:
+                        sftp, idle_since = pooled.idle.pop()
+                        if _channel_alive(sftp):
+                            pooled.active += 1
+                            self._counters["sessions_reused"] += 1
+                            return pooled, sftp, now - idle_since > self._config.health_check_seconds
+                        _close_quietly(sftp)
+
+                # 2. 既存トランスポートに新しいチャネルを開く (負荷の低いものから)
+                for pooled in sorted(self._transports, key=lambda p: p.sessions):
+                    if pooled.sessions < self._config.max_sessions:
+                        pooled.active += 1
+                        target = pooled
+                        break
+                if target is not None:
+                    break
+
+                # 3. 新しいトランスポートを張る
+                if len(self._transports) + self._connecting < self._config.max_transports:
+                    self._connecting += 1
+                    create = True
+                    break
+
+                # 4. 空きが出るまで待つ
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise SFTPPoolError(
+                        f"Timed out after {self._config.acquire_timeout}s waiting for an SFTP session."
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+        if create:
+            try:
+                pooled = self._connect()
+            except Exception as e:
+                with self._cond:
+                    self._connecting -= 1
+                    self._counters["connect_failures"] += 1
+                    self._cond.notify_all()
+                raise SFTPPoolError(f"SFTP connection failed: {e}")
+            with self._cond:
+                self._connecting -= 1
+                self._counters["connects"] += 1
+                pooled.active += 1
+                self._transports.append(pooled)
+            target = pooled
+
+        try:
+            sftp = paramiko.SFTPClient.from_transport(target.transport)
+            if sftp is None:
+                raise SFTPPoolError("Failed to open SFTP channel.")
+        except Exception as e:
+            with self._cond:
+                target.active -= 1
+                if not target.is_alive():
+                    self._discard_locked(target)
+                self._cond.notify_all()
+            raise SFTPPoolError(f"Failed to open SFTP session: {e}")
+
+        with self._cond:
+            self._counters["sessions_opened"] += 1
+        return target, sftp, False
+
+    def _release(self, pooled: _PooledTransport, sftp: paramiko.SFTPClient, reusable: bool) -> None:
+        with self._cond:
+            pooled.active -= 1
+            pooled.last_used = time.monotonic()
+            if reusable and pooled.is_alive() and _channel_alive(sftp) and pooled in self._transports:
+                pooled.idle.append((sftp, pooled.last_used))
+            else:
+                _close_quietly(sftp)
+                if not pooled.is_alive():
+                    self._discard_locked(pooled)
+            self._cond.notify_all()
+
+    @contextmanager
+    def session(self, service: str = "default") -> Iterator[paramiko.SFTPClient]:
+        """
+        SFTP チャネルを借りるコンテキストマネージャ。ブロックを抜けるとプールへ返却される。
+        ブロック内の例外がファイル不在などアプリケーション上のものであれば、チャネルはそのまま再利用される。
+        service は取得待ち・接続時間のメトリクスのラベルに使う。
+        """
+        with SFTP_SECONDS.time(service=service, operation="acquire"):
+            pooled, sftp, needs_check = self._acquire()
+            if needs_check:
+                try:
+                    sftp.stat(".")
+                except Exception:
+                    # 無通信の間にサーバー側で切られていた場合は破棄して取り直す
+                    self._release(pooled, sftp, reusable=False)
+                    pooled, sftp, _ = self._acquire()
+
+        reusable = True
+        try:
+            yield sftp
+        except BaseException:
+            reusable = _channel_alive(sftp)
+            raise
+        finally:
+            self._release(pooled, sftp, reusable)
+
+    # --- 状態確認・終了処理 ---
+
+    def stats(self) -> Dict[str, int]:
+        """トランスポート数・使用中/アイドルのチャネル数・取得待ち数と累計値"""
+        with self._cond:
+            return {
+                "transports": len(self._transports),
+                "connecting": self._connecting,
+                "sessions_in_use": sum(p.active for p in self._transports),
+                "sessions_idle": sum(len(p.idle) for p in self._transports),
+                "waiting": self._waiting,
+                **self._counters,
+            }
+
+    def close(self) -> None:
+        """全トランスポートを閉じる (シャットダウン時用)"""
+        with self._cond:
+            for pooled in self._transports:
+                pooled.close()
+            self._transports = []
+            self._cond.notify_all()
+
+
+# === プロセス全体で共有するプールのレジストリ ===
+_shared_pools: Dict[Tuple[str, int, str, str], SFTPConnectionPool] = {}
+_shared_pools_lock = threading.Lock()
+
+
+def GetSharedSFTPPool(config: SFTPPoolConfig) -> SFTPConnectionPool:
+    """
+    接続先 (host, port, user, 鍵) ごとに1つの共有プールを返すファクトリ関数。
+    ストレージ・ストリームの両サービスが同じプールを使う。
+    """
+    key = (config.host, config.port, config.user, config.key_file_path)
+    with _shared_pools_lock:
+        pool = _shared_pools.get(key)
+        if pool is None:
+            pool = SFTPConnectionPool(config)
+            _shared_pools[key] = pool
+        return pool
+
+
+def close_shared_sftp_pools() -> None:
+    """生成済みの全共有プールを閉じる"""
+    with _shared_pools_lock:
+        pools = list(_shared_pools.values())
+    for pool in pools:
+        pool.close()
+
+
+def _collect_pool_stats():
+    with _shared_pools_lock:
+        pools = list(_shared_pools.items())
+    for (host, port, _user, _key), pool in pools:
+        for state, value in pool.stats().items():
+            yield (f"{host}:{port}", state), value
+
+
+# /metrics 出力時に全共有プールの状態を読み出すゲージ (累計値も state ラベルで出力する)
+REGISTRY.gauge_func(
+    "agenthub_sftp_pool",
+    "Shared SFTP pool transports, sessions (in use / idle), waiters and cumulative connect/reuse counts.",
+    ("host", "state"),
+    lambda: list(_collect_pool_stats()),
+)
@@ -0,0 +1,157 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, BinaryIO, Optional
+
+from domain.value_objects.file_data import UploadedFileStream
+from domain.value_objects.training_file_stats import TrainingFileStats, TrainingFileAnalyzer
+
+
+# スプールへのコピー単位
+SPOOL_COPY_CHUNK_SIZE = 1024 * 1024
+
+
+class UploadSpoolError(Exception):
+    """アップロードファイルのスプール (ローカルディスクへの退避) に関するカスタムエラー"""
+    pass
+
+
+class SpooledUploadedFile(UploadedFileStream):
+    """
+    ローカルディスクに退避したアップロードファイル。
+    FastAPI の UploadFile はレスポンス送信後に閉じられるため、
+    バックグラウンドでストレージへ転送する場合はこのクラスでファイルを保持する。
+    close() でスプールファイルを削除する。
+    """
+
+    def __init__(
+        self, path: str, filename: str, content_type: Optional[str], size: int, sha256: str,
+        stats: Optional[TrainingFileStats] = None,
+    ):
+        self._path = path
+        self._filename = filename
+        self._content_type = content_type
+        self.size = size
+        self._sha256 = sha256
+        self._stats = stats
+        self._stream: Optional[BinaryIO] = None
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def filename(self) -> str:
+        return self._filename
+
+    @property
+    def content_type(self) -> Optional[str]:
+        return self._content_type
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        return self._sha256
+
+    @property
+    def training_stats(self) -> Optional[TrainingFileStats]:
+        return self._stats
+
+    @property
+    def file_stream(self) -> BinaryIO:
+        if self._stream is None or self._stream.closed:
+            self._stream = open(self._path, "rb")
+        return self._stream
+
+    async def read(self) -> bytes:
+        return await asyncio.to_thread(Path(self._path).read_bytes)
+
+    def close(self) -> None:
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        try:
+            os.unlink(self._path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            print(f"Warning: Failed to delete spooled upload {self._path}. Error: {e}")
+
+
+class UploadSpool:
+    """
+    アップロードされたファイルをローカルディスクのスプールディレクトリへコピーする。
+    コピーはワーカースレッドで行い、イベントループを止めない。
+    """
+
+    def __init__(self, spool_dir: str, stale_seconds: float = 24 * 3600):
+        self.spool_dir = spool_dir
+        try:
+            os.makedirs(self.spool_dir, exist_ok=True)
+        except OSError as e:
+            raise UploadSpoolError(f"Failed to initialize upload spool directory {self.spool_dir}: {e}")
+        self._purge_stale(stale_seconds)
+
+    def _purge_stale(self, stale_seconds: float) -> None:
+        """プロセスの異常終了などで残った古いスプールファイルを削除する"""
+        threshold = time.time() - stale_seconds
+        for entry in os.scandir(self.spool_dir):
+            try:
+                if entry.is_file() and entry.name.startswith("upload-") and entry.stat().st_mtime < threshold:
+                    os.unlink(entry.path)
+                    print(f"INFO: Removed stale spooled upload {entry.path}")
+            except OSError:
+                pass
+
+    def _copy(self, source: BinaryIO) -> tuple[str, int, str, TrainingFileStats]:
+        """ディスクへコピーしながら SHA-256 の計算と訓練データの検証・集計を行う (ファイルを2回読まない)"""
+        fd, path = tempfile.mkstemp(prefix="upload-", dir=self.spool_dir)
+        digest = hashlib.sha256()
+        analyzer = TrainingFileAnalyzer()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as spooled:
+                source.seek(0)
+                while True:
+                    chunk = source.read(SPOOL_COPY_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    digest.update(chunk)
+                    analyzer.feed(chunk)
+                    spooled.write(chunk)
+                    size += len(chunk)
+        except Exception:
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            raise
+        return path, size, digest.hexdigest(), analyzer.finish()
+
+    async def spool(self, upload_file: Any) -> SpooledUploadedFile:
+        """
+        FastAPI の UploadFile をスプールディレクトリにコピーし、SpooledUploadedFile を返す。
+        呼び出し側 (またはバックグラウンドタスク) が close() でファイルを削除する責任を持つ。
+        """
+        try:
+            path, size, sha256, stats = await asyncio.to_thread(self._copy, upload_file.file)
+        except Exception as e:
+            raise UploadSpoolError(f"Failed to spool uploaded file: {e}")
+        return SpooledUploadedFile(
+            path=path,
+            filename=upload_file.filename or "",
+            content_type=upload_file.content_type or None,
+            size=size,
+            sha256=sha256,
+            stats=stats,
+        )
+
+
+def NewUploadSpoolFromEnv() -> UploadSpool:
+    """
+    環境変数 UPLOAD_SPOOL_DIR (既定: <一時ディレクトリ>/agenthub-uploads) から UploadSpool を生成するファクトリ関数。
+    """
+    spool_dir = os.environ.get("UPLOAD_SPOOL_DIR") or os.path.join(tempfile.gettempdir(), "agenthub-uploads")
+    return UploadSpool(spool_dir)
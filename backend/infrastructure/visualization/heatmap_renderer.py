@@ -0,0 +1,214 @@
+"""
+heatmap_renderer.py
+
+重み行列のヒートマップを matplotlib を使わずに PNG へ書き出すレンダラー。
+値 → 色の変換は 256 段階の LUT (カラーマップの参照表) を NumPy のインデックス参照で行い、
+PNG は zlib で直接エンコードする (figure・colorbar・tight_layout の生成コストがない)。
+
+色範囲の決め方は従来の save_heatmap と同じ:
+  - delta: |値| の 99 パーセンタイルで対称にクリップ (bwr)
+  - それ以外: 1〜99 パーセンタイルでクリップ (viridis)
+タイトルとカラーバーは画像に描かず、値の範囲は PNG のテキストチャンク (vmin / vmax / cmap) に書き込む
+(read_png_text で読み出せる。画面では値の範囲とカラーバーを画像の横に表示する)。
+カラーバーは write_colorbar でカラーマップごとに1枚だけ出力できる。
+
+worker/tasks/finetuning/heatmap_renderer.py と同じ内容 (backend と worker は別イメージのため複製している)。
+worker が事前に描画した画像と backend が weights.npz から描画した画像が同じになるよう、両方を揃えて変更すること。
+"""
+
+from __future__ import annotations
+
+import struct
+import zlib
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+# 従来の出力 (figsize=(6, 4), dpi=200) と同じ画素数
+DEFAULT_WIDTH = 1200
+DEFAULT_HEIGHT = 800
+
+# PNG の圧縮レベル (重みのヒートマップはほぼノイズなので、高い圧縮レベルは時間の割に縮まない。
+# BERT-base の intermediate で 1 と 6 のサイズ差は約5%、時間は約7倍)
+DEFAULT_COMPRESS_LEVEL = 1
+
+# matplotlib の viridis を 1/16 刻みで標本化した値 (0-255)。線形補間で 256 段階に展開する
+# (元の viridis との差は各チャンネル最大 6/255 程度)
+_VIRIDIS_ANCHORS = [
+    (68, 1, 84), (72, 24, 106), (71, 45, 123), (66, 64, 134), (59, 82, 139), (51, 99, 141),
+    (44, 114, 142), (38, 130, 142), (33, 145, 140), (31, 160, 136), (40, 174, 128), (63, 188, 115),
+    (94, 201, 98), (132, 212, 75), (173, 220, 48), (216, 226, 25), (253, 231, 37),
+]
+# bwr: 青 → 白 → 赤
+_BWR_ANCHORS = [(0, 0, 255), (255, 255, 255), (255, 0, 0)]
+
+
+def _build_lut(anchors) -> np.ndarray:
+    """等間隔の色の列を線形補間して (256, 3) の uint8 LUT を作る"""
+    points = np.asarray(anchors, dtype=np.float64)
+    x = np.linspace(0.0, 1.0, 256)
+    xp = np.linspace(0.0, 1.0, len(points))
+    lut = np.stack([np.interp(x, xp, points[:, channel]) for channel in range(3)], axis=1)
+    return np.round(lut).astype(np.uint8)
+
+
+COLORMAPS: Dict[str, np.ndarray] = {
+    "viridis": _build_lut(_VIRIDIS_ANCHORS),
+    "bwr": _build_lut(_BWR_ANCHORS),
+}
+
+
+def color_range(name: str, arr: np.ndarray) -> Tuple[float, float, str]:
+    """重み名と値から (vmin, vmax, カラーマップ名) を決める (従来の save_heatmap と同じ基準)"""
+    if arr.size == 0:
+        return (-1.0, 1.0, "bwr") if "delta" in name.lower() else (0.0, 1.0, "viridis")
+    if "delta" in name.lower():
+        # 差分は 0 を中心に対称にする (99パーセンタイルでクリッピング)
+        vmax = float(np.percentile(np.abs(arr), 99))
+        return -vmax, vmax, "bwr"
+    # 1回の呼び出しで両端を求める (percentile 2回分の並べ替えを1回にする)
+    vmin, vmax = np.percentile(arr, [1, 99])
+    return float(vmin), float(vmax), "viridis"
+
+
+def _as_2d(arr: np.ndarray) -> np.ndarray:
+    if arr.ndim == 2:
+        return arr
+    if arr.ndim < 2:
+        return arr.reshape(1, -1)
+    return arr.reshape(arr.shape[0], -1)
+
+
+def _resample_axis(arr: np.ndarray, size: int, axis: int) -> np.ndarray:
+    """
+    指定した軸を size 個に揃える。縮小は区間ごとの平均 (小さな変化が間引きで消えない)、
+    拡大は最近傍 (画素の複製) で行う。
+    """
+    length = arr.shape[axis]
+    if size <= 0 or size == length:
+        return arr
+    starts = (np.arange(size, dtype=np.int64) * length) // size
+    if size > length:
+        return np.take(arr, starts, axis=axis)
+    counts = np.diff(np.append(starts, length))
+    sums = np.add.reduceat(arr, starts, axis=axis, dtype=np.float32)
+    shape = [1] * arr.ndim
+    shape[axis] = size
+    return sums / counts.reshape(shape)
+
+
+def render_rgb(
+    arr: np.ndarray,
+    vmin: float,
+    vmax: float,
+    cmap: str,
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+) -> np.ndarray:
+    """
+    2次元配列を (height, width, 3) の uint8 RGB 画像に変換する。width / height が 0 の場合は元の大きさのまま。
+    [vmin, vmax] の外側は両端の色にクリップし、NaN は vmin の色にする。
+    """
+    data = _as_2d(np.asarray(arr)).astype(np.float32, copy=False)
+    # 縮小 (平均) は値のまま行い、拡大 (複製) は色の番号に変換してから行う (float の配列を大きくしない)
+    height = height or data.shape[0]
+    width = width or data.shape[1]
+    if height < data.shape[0]:
+        data = _resample_axis(data, height, 0)
+    if width < data.shape[1]:
+        data = _resample_axis(data, width, 1)
+
+    span = vmax - vmin
+    scale = 255.0 / span if span > 0 else 0.0
+    index = (data - np.float32(vmin)) * np.float32(scale)
+    np.nan_to_num(index, copy=False, nan=0.0)
+    np.clip(index, 0, 255, out=index)
+    # +0.5 で四捨五入 (uint8 への変換は切り捨て)
+    index += 0.5
+    index = _resample_axis(_resample_axis(index.astype(np.uint8), height, 0), width, 1)
+    # np.take は同じ参照の添字 (lut[index]) より数倍速い
+    return np.take(COLORMAPS[cmap], index, axis=0)
+
+
+def _png_chunk(kind: bytes, payload: bytes) -> bytes:
+    return (
+        struct.pack(">I", len(payload)) + kind + payload
+        + struct.pack(">I", zlib.crc32(kind + payload) & 0xFFFFFFFF)
+    )
+
+
+def encode_png(rgb: np.ndarray, text: Optional[Dict[str, str]] = None, level: int = DEFAULT_COMPRESS_LEVEL) -> bytes:
+    """(height, width, 3) の uint8 配列を 8bit RGB の PNG にエンコードする"""
+    height, width, _ = rgb.shape
+    # 各行の先頭にフィルタ種別 0 (None) を付けて、まとめて1回で圧縮する
+    raw = np.empty((height, width * 3 + 1), dtype=np.uint8)
+    raw[:, 0] = 0
+    raw[:, 1:] = rgb.reshape(height, width * 3)
+
+    parts = [
+        b"\x89PNG\r\n\x1a\n",
+        _png_chunk(b"IHDR", struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)),
+    ]
+    for key, value in (text or {}).items():
+        parts.append(_png_chunk(b"tEXt", key.encode("latin-1") + b"\x00" + value.encode("latin-1", "replace")))
+    parts.append(_png_chunk(b"IDAT", zlib.compress(raw.tobytes(), level)))
+    parts.append(_png_chunk(b"IEND", b""))
+    return b"".join(parts)
+
+
+def write_heatmap(
+    path: str,
+    name: str,
+    arr: np.ndarray,
+    width: int = DEFAULT_WIDTH,
+    height: int = DEFAULT_HEIGHT,
+    level: int = DEFAULT_COMPRESS_LEVEL,
+    color: Optional[Tuple[float, float, str]] = None,
+) -> Tuple[float, float, str]:
+    """
+    重み行列のヒートマップを path に書き出し、使った (vmin, vmax, カラーマップ名) を返す。
+    color を指定した場合は color_range で求めずにその色範囲を使う (量子化前の値から求めた範囲を使う場合)。
+    """
+    vmin, vmax, cmap = color or color_range(name, arr)
+    rgb = render_rgb(arr, vmin, vmax, cmap, width=width, height=height)
+    text = {
+        "Title": name,
+        "vmin": f"{vmin:.6g}",
+        "vmax": f"{vmax:.6g}",
+        "cmap": cmap,
+        "shape": "x".join(str(dim) for dim in np.shape(arr)),
+    }
+    with open(path, "wb") as f:
+        f.write(encode_png(rgb, text=text, level=level))
+    return vmin, vmax, cmap
+
+
+def read_png_text(path: str) -> Dict[str, str]:
+    """PNG のテキストチャンク (tEXt) を読む。画素データ (IDAT) の前に置かれたものだけを読み、本体は読まない"""
+    text: Dict[str, str] = {}
+    with open(path, "rb") as f:
+        if f.read(8) != b"\x89PNG\r\n\x1a\n":
+            return text
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                break
+            length, kind = struct.unpack(">I4s", header)
+            if kind in (b"IDAT", b"IEND"):
+                break
+            payload = f.read(length)
+            f.seek(4, 1)  # CRC
+            if kind == b"tEXt":
+                key, _, value = payload.partition(b"\x00")
+                text[key.decode("latin-1")] = value.decode("latin-1")
+    return text
+
+
+def write_colorbar(path: str, cmap: str, width: int = 24, height: int = 256) -> None:
+    """カラーマップの凡例 (上が vmax・下が vmin の縦長のグラデーション) を書き出す"""
+    column = COLORMAPS[cmap][::-1]
+    index = (np.arange(height) * len(column)) // height
+    rgb = np.repeat(column[index][:, None, :], width, axis=1)
+    with open(path, "wb") as f:
+        f.write(encode_png(np.ascontiguousarray(rgb), text={"cmap": cmap}))
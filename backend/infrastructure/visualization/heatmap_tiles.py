@@ -0,0 +1,96 @@
+"""
+heatmap_tiles.py
+
+重み行列のヒートマップを Deep Zoom (DZI) 形式のタイルピラミッドとして描画する。
+最も細かいレベルは行列の1要素を1画素 (幅 = 列数, 高さ = 行数) とし、1つ粗いレベルごとに縦横を 1/2 にする
+(2^k x 2^k 要素の区間平均。heatmap_renderer の縮小と同じく小さな変化が間引きで消えない)。
+レベル 0 は 1x1 画素。各レベルを TILE_SIZE 四方のタイル (重なりなし) に分け、要求されたタイルだけを描画する。
+
+色範囲は行列全体から heatmap_renderer.color_range で決め、全タイルで共通にする (タイルの境目で色が変わらない)。
+クライアント (OpenSeadragon 等の DZI ビューア) は <名前>.dzi の記述子を読み、
+<名前>_files/<レベル>/<列>_<行>.png のタイルを表示範囲の分だけ取得する。
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+from infrastructure.visualization.heatmap_renderer import encode_png, render_rgb
+
+
+TILE_SIZE = 256
+TILE_FORMAT = "png"
+
+_DZI_TEMPLATE = (
+    '<?xml version="1.0" encoding="UTF-8"?>\n'
+    '<Image xmlns="http://schemas.microsoft.com/deepzoom/2008" Format="{format}" Overlap="0" TileSize="{tile_size}">'
+    '<Size Width="{width}" Height="{height}"/></Image>\n'
+)
+
+
+def matrix_size(arr: np.ndarray) -> Tuple[int, int]:
+    """ヒートマップ全体の (幅, 高さ) = (列数, 行数)。2次元でない重みは render_rgb と同じく (先頭の軸, 残り) にまとめる"""
+    if arr.ndim == 0:
+        return 1, 1
+    if arr.ndim == 1:
+        return arr.shape[0], 1
+    return int(np.prod(arr.shape[1:])), arr.shape[0]
+
+
+def max_level(width: int, height: int) -> int:
+    """最も細かいレベルの番号 (= ceil(log2(max(幅, 高さ))))"""
+    return (max(width, height, 1) - 1).bit_length()
+
+
+def level_size(width: int, height: int, level: int) -> Tuple[int, int]:
+    """レベルごとの画像の (幅, 高さ)"""
+    factor = 1 << (max_level(width, height) - level)
+    return -(-width // factor), -(-height // factor)
+
+
+def dzi_descriptor(width: int, height: int, tile_size: int = TILE_SIZE) -> bytes:
+    """DZI の記述子 (XML)"""
+    return _DZI_TEMPLATE.format(format=TILE_FORMAT, tile_size=tile_size, width=width, height=height).encode("utf-8")
+
+
+def _block_mean(arr: np.ndarray, factor: int, axis: int) -> np.ndarray:
+    """axis 方向に factor 個ずつの区間平均をとる (端の区間は残りの要素だけで平均する)"""
+    if factor == 1:
+        return arr
+    length = arr.shape[axis]
+    starts = np.arange(0, length, factor)
+    counts = np.diff(np.append(starts, length))
+    shape = [1] * arr.ndim
+    shape[axis] = len(starts)
+    return np.add.reduceat(arr, starts, axis=axis, dtype=np.float32) / counts.reshape(shape)
+
+
+def render_tile(
+    arr: np.ndarray,
+    vmin: float,
+    vmax: float,
+    cmap: str,
+    level: int,
+    column: int,
+    row: int,
+    tile_size: int = TILE_SIZE,
+) -> bytes:
+    """
+    レベル level の (column, row) 番目のタイルを PNG にエンコードして返す。
+    範囲外のタイルは IndexError。タイルに対応する行列の区間だけを読むので、細かいレベルほど速い。
+    """
+    data = arr.reshape(arr.shape[0], -1) if arr.ndim >= 2 else arr.reshape(1, -1)
+    width, height = data.shape[1], data.shape[0]
+    top = max_level(width, height)
+    if not 0 <= level <= top:
+        raise IndexError(f"Level {level} is out of range (0-{top})")
+    level_width, level_height = level_size(width, height, level)
+    if column < 0 or row < 0 or column * tile_size >= level_width or row * tile_size >= level_height:
+        raise IndexError(f"Tile {column}_{row} is out of range at level {level}")
+
+    factor = 1 << (top - level)
+    span = tile_size * factor
+    region = data[row * span:(row + 1) * span, column * span:(column + 1) * span]
+    pooled = _block_mean(_block_mean(region, factor, 0), factor, 1)
+    rgb = render_rgb(pooled, vmin, vmax, cmap, width=0, height=0)
+    return encode_png(rgb, text={"vmin": f"{vmin:.6g}", "vmax": f"{vmax:.6g}", "cmap": cmap})
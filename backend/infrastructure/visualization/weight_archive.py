@@ -0,0 +1,97 @@
+"""
+weight_archive.py
+
+worker (visualize_finetuning_diff.py --output_format tensors) が保存する weights.npz の読み出し。
+形式は worker/tasks/finetuning/weight_archive.py を参照:
+  manifest.json                               重みの一覧 {"format", "image_size", "weights": {名前: {"layer", "shape", "images", "color_ranges"}}}
+  <name>/delta.npy, <name>/delta_scale.npy    差分 (int8) と行ごとのスケール (float32)
+  <name>/before.npy, <name>/before_scale.npy  変化前の重み (delta のみ保存した場合は無い)
+変化後の重みは before + delta で復元する。
+"""
+
+import json
+import zipfile
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+
+WEIGHT_ARCHIVE_NAME = "weights.npz"
+MANIFEST_MEMBER = "manifest.json"
+SUPPORTED_FORMAT_VERSION = 1
+
+IMAGE_TYPES = ("before", "after", "delta")
+
+
+class WeightArchiveError(Exception):
+    """weights.npz の読み出しに関するカスタムエラー"""
+    pass
+
+
+class WeightArchive:
+    """
+    weights.npz を開き、画像の種類 (before / after / delta) ごとに重み行列を復元する。
+    必要な重みのメンバーだけを読み出す (アーカイブ全体を展開しない)。
+    """
+
+    def __init__(self, path: str):
+        try:
+            self._zip = zipfile.ZipFile(path)
+            self.manifest: Dict[str, object] = json.loads(self._zip.read(MANIFEST_MEMBER))
+        except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+            raise WeightArchiveError(f"Invalid weight archive {path}: {e}")
+        if self.manifest.get("format") != SUPPORTED_FORMAT_VERSION:
+            self._zip.close()
+            raise WeightArchiveError(f"Unsupported weight archive format: {self.manifest.get('format')}")
+
+    def entry(self, name: str) -> Optional[Dict[str, object]]:
+        """重み (画像ファイル名の基) の manifest エントリ。無ければ None"""
+        return self.manifest.get("weights", {}).get(name)
+
+    def image_size(self, default_width: int, default_height: int):
+        """worker が画像を描画する場合と同じ (幅, 高さ)。記録が無ければ既定値"""
+        size = self.manifest.get("image_size") or (default_width, default_height)
+        return int(size[0]), int(size[1])
+
+    def color_range(self, name: str, image_type: str) -> Optional[Tuple[float, float, str]]:
+        """worker が量子化前の値から求めた (vmin, vmax, カラーマップ名)。記録が無い (古いアーカイブ) 場合は None"""
+        color = ((self.entry(name) or {}).get("color_ranges") or {}).get(image_type)
+        if not color:
+            return None
+        vmin, vmax, cmap = color
+        return float(vmin), float(vmax), str(cmap)
+
+    def load(self, name: str, image_type: str) -> np.ndarray:
+        """画像の種類に対応する重み行列 (float32、元の形状) を復元する"""
+        if image_type == "before":
+            arr = self._dequantize(f"{name}/before")
+        elif image_type == "after":
+            arr = self._dequantize(f"{name}/before") + self._dequantize(f"{name}/delta")
+        elif image_type == "delta":
+            arr = self._dequantize(f"{name}/delta")
+        else:
+            raise WeightArchiveError(f"Unknown image type: {image_type}")
+        shape = (self.entry(name) or {}).get("shape")
+        return arr.reshape(shape) if shape else arr
+
+    def close(self) -> None:
+        self._zip.close()
+
+    def __enter__(self) -> "WeightArchive":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> bool:
+        self.close()
+        return False
+
+    def _dequantize(self, member: str) -> np.ndarray:
+        q = self._read_array(f"{member}.npy")
+        scale = self._read_array(f"{member}_scale.npy")
+        return q.astype(np.float32) * scale.astype(np.float32)[:, None]
+
+    def _read_array(self, member: str) -> np.ndarray:
+        try:
+            with self._zip.open(member) as f:
+                return np.lib.format.read_array(f, allow_pickle=False)
+        except KeyError:
+            raise WeightArchiveError(f"Weight archive has no member {member}")
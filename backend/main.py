@@ -1,12 +1,59 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Depends, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from infrastructure.router.fastapi import router
+from infrastructure.container import AppContainer, NewAppContainer
+from infrastructure.metrics.prometheus import REGISTRY, CONTENT_TYPE, HTTP_REQUEST_SECONDS
+from infrastructure.router.fastapi import router, get_container
+from infrastructure.router.responses import FastJSONResponse
+from usecase.create_finetuning_job import UPLOAD_INTERRUPTED_MESSAGE
+
+
+async def fail_interrupted_uploads(container: AppContainer) -> None:
+    """
+    訓練データの転送はプロセス内のバックグラウンドタスクで行うため、転送中にプロセスが停止したジョブは
+    'uploading' のまま残る。起動時に、作成から STALE_UPLOAD_JOB_SECONDS 秒 (既定 1800) を過ぎたものを 'failed' にする。
+    (しきい値は、他のプロセスが転送中のジョブを失敗させないよう、転送と再試行にかかる時間より長くする)
+    """
+    stale_seconds = int(os.getenv("STALE_UPLOAD_JOB_SECONDS") or 1800)
+    try:
+        created_before = datetime.utcnow() - timedelta(seconds=stale_seconds)
+        failed = await container.finetuning_job_repo.fail_stale_uploading(created_before, UPLOAD_INTERRUPTED_MESSAGE)
+        if failed:
+            print(f"WARN: Marked {failed} interrupted upload job(s) as failed.")
+    except Exception as e:
+        # DB に接続できない場合も起動は続ける (次回の起動時に再度後始末する)
+        print(f"ERROR: Failed to clean up interrupted upload jobs: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    起動時に DI コンテナとそのリソースを生成し、
+    シャットダウン時に生成済みのリソース (DBプール・キャッシュ接続・ハッシュ用プロセス・HTTPクライアント等) を閉じる
+    """
+    app.state.container = NewAppContainer()
+    # 鍵の読み込み・Redis への接続などブロッキング処理を含むため、イベントループではなくスレッドで生成する
+    # (生成に失敗したものは起動を止めず、/health/ready に報告する。以降の参照時にスレッドで再試行する)
+    await asyncio.to_thread(app.state.container.warm_up)
+    await fail_interrupted_uploads(app.state.container)
+    try:
+        yield
+    finally:
+        await app.state.container.aclose()
+
 
 # FastAPIインスタンスを作成
 app = FastAPI(
     title="AgentHub-Training API",
     description="A FastAPI application for AgentHub-Training.",
     version="0.1.0",
+    default_response_class=FastJSONResponse,
+    lifespan=lifespan,
 )
 
 # フロントエンドからのアクセスを許可するためのCORS設定
@@ -16,8 +63,34 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # 条件付き GET 用に ETag をフロントエンドから参照できるようにする
+    expose_headers=["ETag"],
 )
 
+
+
+@app.middleware("http")
+async def record_request_latency(request: Request, call_next):
+    """
+    リクエストごとのレイテンシをルートテンプレート (/v1/agents/{agent_id} など) とステータスコード単位で記録する。
+    パス文字列そのものではなくテンプレートを使うことでラベルの種類数を抑える。
+    """
+    started = time.perf_counter()
+    status = 500
+    try:
+        response = await call_next(request)
+        status = response.status_code
+        return response
+    finally:
+        route = request.scope.get("route")
+        HTTP_REQUEST_SECONDS.observe(
+            time.perf_counter() - started,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status),
+        )
+
+
 # ルーターを組み込む
 app.include_router(router)
 
@@ -35,4 +108,60 @@ def health_check():
     """
     ヘルスチェック用エンドポイント
     """
-    return {"status": "ok"}
\ No newline at end of file
+    return {"status": "ok"}
+
+
+@app.get("/health/ready")
+async def readiness_check(
+    warm: bool = Query(False, description="true の場合、起動時に生成できなかったリソースを再度生成してから報告する"),
+    container: AppContainer = Depends(get_container),
+):
+    """
+    レディネスチェック用エンドポイント。
+    DI コンテナの各リソースが生成済み (warm) かどうかと、生成に失敗したものを返す。
+    """
+    if warm:
+        # 鍵の読み込みなどブロッキング処理を含むためスレッドで実行する
+        await asyncio.to_thread(container.warm_up)
+    resources = container.status()
+    failed = sorted(name for name, info in resources.items() if info["error"])
+    return {"status": "degraded" if failed else "ok", "failed": failed, "resources": resources}
+
+
+@app.get("/health/auth-cache")
+def auth_cache_stats(container: AppContainer = Depends(get_container)):
+    """
+    認証プリンシパルキャッシュのヒット/ミス数を返すエンドポイント
+    """
+    return container.principal_cache.stats()
+
+
+@app.get("/health/agent-cache")
+def agent_cache_stats(container: AppContainer = Depends(get_container)):
+    """
+    エージェント一覧キャッシュのヒット/ミス数・Redis の利用可否を返すエンドポイント
+    """
+    return container.agent_repo.stats()
+
+
+@app.get("/health/image-cache")
+def image_cache_stats(container: AppContainer = Depends(get_container)):
+    """
+    可視化画像のディスクキャッシュのヒット/ミス数・使用量・追い出し数を返すエンドポイント
+    (rendered は weights.npz から描画した画像のキャッシュ)
+    """
+    cache = getattr(container.file_stream_service, "image_cache", None)
+    stats = {"enabled": False} if cache is None else {"enabled": True, **cache.stats()}
+    # weights.npz から表示時に描画した画像のキャッシュ
+    rendered = getattr(container.visualization_render_service, "image_cache", None)
+    stats["rendered"] = {"enabled": False} if rendered is None else {"enabled": True, **rendered.stats()}
+    return stats
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus テキスト形式でメトリクスを返すエンドポイント
+    (ルート別レイテンシ・DB/SFTP/推論エンジンの所要時間・各プールの使用状況)
+    """
+    return Response(REGISTRY.render(), media_type=CONTENT_TYPE)
@@ -7,7 +7,7 @@ from domain.services.auth_domain_service import AuthDomainService
 # Usecaseのインターフェース定義
 # ======================================
 class LoginUserUseCase(Protocol):
-    def execute(
+    async def execute(
         self, input: "LoginUserInput"
     ) -> Tuple["LoginUserOutput", Exception | None]:
         ...
@@ -53,12 +53,12 @@ class LoginUserInteractor:
         self.auth_service = auth_service
         self.timeout_sec = timeout_sec
 
-    def execute(
+    async def execute(
         self, input: LoginUserInput
     ) -> Tuple["LoginUserOutput", Exception | None]:
         try:
             # ドメインサービスに認証を委譲
-            token = self.auth_service.login(input.email, input.password)
+            token = await self.auth_service.login(input.email, input.password)
 
             # Presenterに渡す
             output = self.presenter.output(token)
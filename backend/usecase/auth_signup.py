@@ -2,22 +2,16 @@ import abc
 from dataclasses import dataclass
 from typing import Protocol, Tuple
 
-from passlib.context import CryptContext
-
 # domain 側の型 / ファクトリをインポート
 from domain.entities.user import User, UserRepository, NewUser
-
-# ======================================
-# パスワードハッシュ用
-# ======================================
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from domain.services.password_hash_domain_service import PasswordHashDomainService
 
 
 # ======================================
 # Usecaseのインターフェース定義
 # ======================================
 class CreateUserUseCase(Protocol):
-    def execute(self, input: "CreateUserInput") -> Tuple["CreateUserOutput", Exception | None]:
+    async def execute(self, input: "CreateUserInput") -> Tuple["CreateUserOutput", Exception | None]:
         ...
 
 
@@ -58,15 +52,22 @@ class CreateUserPresenter(abc.ABC):
 # Usecaseの具体的な実装
 # ======================================
 class CreateUserInteractor:
-    def __init__(self, presenter: "CreateUserPresenter", repo: UserRepository, timeout_sec: int = 10):
+    def __init__(
+        self,
+        presenter: "CreateUserPresenter",
+        repo: UserRepository,
+        password_hasher: PasswordHashDomainService,
+        timeout_sec: int = 10,
+    ):
         self.presenter = presenter
         self.repo = repo
+        self.password_hasher = password_hasher
         self.timeout_sec = timeout_sec
 
-    def execute(self, input: CreateUserInput) -> Tuple["CreateUserOutput", Exception | None]:
+    async def execute(self, input: CreateUserInput) -> Tuple["CreateUserOutput", Exception | None]:
         try:
-            # パスワードをハッシュ化
-            hashed_password = pwd_context.hash(input.password)
+            # パスワードをハッシュ化 (CPU負荷が高いため専用のプロセスプールで実行)
+            hashed_password = await self.password_hasher.hash(input.password)
 
             # IDはDB側で自動採番される想定なので仮で0をセット
             # domain側の NewUser のシグネチャに合わせて呼び出す
@@ -79,7 +80,7 @@ class CreateUserInteractor:
             )
 
             # 永続化
-            created = self.repo.create(new_user)
+            created = await self.repo.create(new_user)
 
             # Presenterに渡す
             output = self.presenter.output(created)
@@ -96,6 +97,13 @@ class CreateUserInteractor:
 # ======================================
 # Usecaseインスタンスを生成するファクトリ関数
 # ======================================
-def new_create_user_interactor(presenter: "CreateUserPresenter", repo: UserRepository, timeout_sec: int = 10) -> CreateUserUseCase:
-    return CreateUserInteractor(presenter=presenter, repo=repo, timeout_sec=timeout_sec)
+def new_create_user_interactor(
+    presenter: "CreateUserPresenter",
+    repo: UserRepository,
+    password_hasher: PasswordHashDomainService,
+    timeout_sec: int = 10,
+) -> CreateUserUseCase:
+    return CreateUserInteractor(
+        presenter=presenter, repo=repo, password_hasher=password_hasher, timeout_sec=timeout_sec
+    )
 
@@ -11,7 +11,7 @@ from domain.value_objects.id import ID
 # Usecaseのインターフェース定義
 # ======================================
 class CreateAgentUseCase(Protocol):
-    def execute(
+    async def execute(
         self, input: "CreateAgentInput"
     ) -> Tuple["CreateAgentOutput", Exception | None]:
         ...
@@ -64,12 +64,12 @@ class CreateAgentInteractor:
         self.auth_service = auth_service
         self.timeout_sec = timeout_sec
 
-    def execute(
+    async def execute(
         self, input: CreateAgentInput
     ) -> Tuple["CreateAgentOutput", Exception | None]:
         try:
             # トークンを検証してユーザー情報を取得
-            user = self.auth_service.verify_token(input.token)
+            user = await self.auth_service.verify_token(input.token)
 
             # Agentエンティティを生成
             agent_to_create = Agent(
@@ -81,7 +81,7 @@ class CreateAgentInteractor:
             )
 
             # リポジトリに永続化を委譲
-            created_agent = self.agent_repo.create(agent_to_create)
+            created_agent = await self.agent_repo.create(agent_to_create)
 
             # Presenterに渡してOutput DTOに変換
             output = self.presenter.output(created_agent)
@@ -1,24 +1,45 @@
 import abc
+import asyncio
 from dataclasses import dataclass
-from typing import Protocol, Tuple, Optional, Any
+from typing import Protocol, Tuple, Optional, Any, Awaitable, Callable
 
 # ドメイン層の依存関係
 from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
 from domain.entities.agent import AgentRepository
+from domain.entities.training_link import TrainingDataRepository, NewTrainingLink
 from domain.services.auth_domain_service import AuthDomainService
 # 新しい抽象ドメインサービス
 from domain.services.file_storage_domain_service import FileStorageDomainService
 from domain.services.job_queue_domain_service import JobQueueDomainService
+from domain.services.background_task_domain_service import BackgroundTaskDomainService
 from domain.services.system_time_domain_service import SystemTimeDomainService
 from domain.value_objects.id import ID
 from domain.value_objects.file_data import UploadedFileStream 
+from domain.value_objects.training_file_stats import TrainingFileStats, format_file_size
+
+
+# ジョブのステータス
+JOB_STATUS_UPLOADING = "uploading"  # 訓練データをストレージへ転送中
+JOB_STATUS_QUEUED = "queued"
+JOB_STATUS_FAILED = "failed"
+
+# 転送中にプロセスが停止 (シャットダウン時のキャンセル・クラッシュ・再起動) した場合のエラーメッセージ
+UPLOAD_INTERRUPTED_MESSAGE = "Training file upload was interrupted by a server restart. Please submit the job again."
+
+# 訓練データを受信する関数の型 (リクエスト本文を読み、ローカルディスクへ退避したファイルを返す)
+TrainingFileReceiver = Callable[[], Awaitable[UploadedFileStream]]
+
+
+class TrainingFileReceiveError(Exception):
+    """訓練データの受信 (ローカルディスクへの退避) に失敗した (本文の形式の誤りは ValueError)"""
+    pass
 
 
 # ======================================
 # Usecaseのインターフェース定義
 # ======================================
 class CreateFinetuningJobUseCase(Protocol):
-    def execute(
+    async def execute(
         self, input: "CreateFinetuningJobInput"
     ) -> Tuple["CreateFinetuningJobOutput", Exception | None]:
         ...
@@ -31,7 +52,8 @@ class CreateFinetuningJobUseCase(Protocol):
 class CreateFinetuningJobInput:
     token: str
     agent_id: int
-    training_file: UploadedFileStream # 抽象型を使用
+    # 訓練データはトークンと所有権を確認した後に受信する (他人のエージェント宛ての本文を読み込まない)
+    receive_training_file: TrainingFileReceiver
 
 
 # ======================================
@@ -43,7 +65,7 @@ class CreateFinetuningJobOutput:
     agent_id: int
     status: str
     created_at: str
-    message: str = "Job successfully queued."
+    message: str = "Job accepted. The training file is being uploaded."
 
 
 # ======================================
@@ -59,6 +81,12 @@ class CreateFinetuningJobPresenter(abc.ABC):
 # Usecaseの具体的な実装 (Interactor)
 # ======================================
 class CreateFinetuningJobInteractor:
+    """
+    ジョブを 'uploading' 状態で登録した時点で応答を返し、
+    ストレージへのファイル転送・'queued' への更新・キュー投入はバックグラウンドタスクで行う。
+    クライアントはジョブのステータスをポーリングして進捗を確認する
+    (uploading -> queued -> running -> completed / failed)。
+    """
     def __init__(
         self,
         presenter: "CreateFinetuningJobPresenter",
@@ -68,6 +96,10 @@ class CreateFinetuningJobInteractor:
         file_storage_service: FileStorageDomainService, 
         job_queue_service: JobQueueDomainService,
         system_time_service: SystemTimeDomainService, 
+        background_task_service: BackgroundTaskDomainService,
+        training_data_repo: TrainingDataRepository,
+        max_attempts: int = 3,
+        retry_base_delay: float = 2.0,
     ):
         self.presenter = presenter
         self.job_repo = job_repo
@@ -76,8 +108,12 @@ class CreateFinetuningJobInteractor:
         self.file_storage_service = file_storage_service 
         self.job_queue_service = job_queue_service       
         self.system_time_service = system_time_service 
+        self.background_task_service = background_task_service
+        self.training_data_repo = training_data_repo
+        self.max_attempts = max_attempts
+        self.retry_base_delay = retry_base_delay
 
-    def execute(
+    async def execute(
         self, input: CreateFinetuningJobInput
     ) -> Tuple["CreateFinetuningJobOutput", Exception | None]:
         
@@ -85,73 +121,180 @@ class CreateFinetuningJobInteractor:
         
         # (Job IDを先に取得するため、一時的なジョブを保持する変数を定義)
         temp_job_created: Optional[FinetuningJob] = None
+        # 受信した訓練データ (受信前に失敗した場合は None)
+        training_file: Optional[UploadedFileStream] = None
+        # バックグラウンドタスクへファイルを引き渡したかどうか (引き渡し後の後始末はタスク側が行う)
+        handed_off = False
         
         try:
             # 1. トークンを検証してユーザー情報を取得
-            user = self.auth_service.verify_token(input.token)
+            user = await self.auth_service.verify_token(input.token)
 
             # 2. Agentの存在確認と所有権チェック
-            agent = self.agent_repo.find_by_id(ID(input.agent_id))
+            agent = await self.agent_repo.find_by_id(ID(input.agent_id))
             if not agent:
                 raise ValueError(f"Agent with ID {input.agent_id} not found.")
             if agent.user_id.value != user.id.value:
                 raise PermissionError("User does not own this agent.")
+
+            # 2.5. 訓練データを受信する (ここで初めてリクエスト本文を読む)
+            try:
+                training_file = await input.receive_training_file()
+            except ValueError:
+                raise
+            except Exception as e:
+                raise TrainingFileReceiveError(str(e))
+
+            # 受信時の検証で形式の誤りが見つかったファイルはジョブを作らずに拒否する
+            stats = training_file.training_stats
+            if stats is not None and not stats.is_valid:
+                raise ValueError(stats.error)
                 
             # 3. 時刻サービスの利用
             current_time_str = self.system_time_service.get_current_time()
             
-            # 4. FinetuningJobエンティティを「プレ生成」
+            # 4. FinetuningJobエンティティを「プレ生成」(転送完了までは 'uploading')
             new_job_placeholder = FinetuningJob(
                 id=ID(0), 
                 agent_id=ID(input.agent_id),
                 training_file_path="pending_job_id", 
-                status="creating",                  
+                status=JOB_STATUS_UPLOADING,
                 created_at=current_time_str, 
                 finished_at=None,
                 error_message=None
             )
 
             # 5. リポジトリにジョブを「先に」永続化し、IDを取得
-            created_job = self.job_repo.create_job(new_job_placeholder)
+            created_job = await self.job_repo.create_job(new_job_placeholder)
             temp_job_created = created_job # (ロールバック用に保持)
-            job_id_str = str(created_job.id.value) # (これが欲しかったID)
 
-            # 6. 取得した Job ID を使って、ファイルを抽象サービスに委譲
-            file_path = self.file_storage_service.save_training_file(
-                input.training_file, 
-                job_id_str # (ご要望の Job ID を使用)
+            # 6. ファイル転送とキュー投入をバックグラウンドタスクに委譲し、応答を先に返す
+            received_file = training_file
+            self.background_task_service.submit(
+                f"finetuning-upload-{created_job.id.value}",
+                lambda: self._complete_upload(created_job, received_file),
             )
+            handed_off = True
 
-            # 7. ジョブのファイルパスとステータスを更新
-            created_job.training_file_path = file_path
-            created_job.status = "queued" # (ここで 'queued' にする)
-            
-            # リポジトリの更新メソッドを呼び出す
-            updated_job = self.job_repo.update_job(created_job) 
-
-            # 8. 抽象的なキューサービスを通じてタスクをキューに投入
-            self.job_queue_service.enqueue_finetuning_job(
-                updated_job.id.value, 
-                updated_job.training_file_path
-            )
-
-            # 9. Presenterに渡してOutput DTOに変換
-            output = self.presenter.output(updated_job)
+            # 7. Presenterに渡してOutput DTOに変換
+            output = self.presenter.output(created_job)
             return output, None
             
         except Exception as e:
-            # エラー処理: もしファイル保存(6)やジョブ更新(7)に失敗した場合
+            # エラー処理: バックグラウンドタスクの登録に失敗した場合
             # 先に作成したジョブ(5)のステータスを 'failed' に更新する
-            if temp_job_created:
+            if temp_job_created and not handed_off:
                 print(f"ERROR: Rolling back job status for job ID {temp_job_created.id.value} due to: {e}")
-                temp_job_created.status = "failed"
-                temp_job_created.error_message = str(e)
-                # エラー状態もDBに反映
-                self.job_repo.update_job(temp_job_created) 
+                await self._mark_failed(temp_job_created, str(e))
+
+            if training_file is not None and not handed_off:
+                training_file.close()
 
             import traceback; traceback.print_exc()
             return empty_output, e
 
+    async def _complete_upload(self, job: FinetuningJob, training_file: UploadedFileStream) -> None:
+        """
+        バックグラウンドで実行される後半処理。
+        ファイル転送・ジョブ更新・キュー投入をそれぞれ再試行付きで行い、
+        最終的に失敗した場合はジョブを 'failed' にする。
+        """
+        job_id_str = str(job.id.value)
+        try:
+            # ファイルを抽象サービスに委譲 (ブロッキングI/Oのためスレッドで実行する)
+            file_path = await self._with_retry(
+                "upload", job,
+                lambda: asyncio.to_thread(self.file_storage_service.save_training_file, training_file, job_id_str),
+            )
+
+            await self._queue_stored_job(
+                job, file_path, training_file.content_hash, training_file.filename, training_file.training_stats
+            )
+        except asyncio.CancelledError:
+            # シャットダウン時のキャンセル (except Exception では捕まらない)。'uploading' のまま残さない
+            print(f"ERROR: Finetuning job {job_id_str} upload was cancelled.")
+            await self._mark_failed(job, UPLOAD_INTERRUPTED_MESSAGE)
+            raise
+        except Exception as e:
+            print(f"ERROR: Finetuning job {job_id_str} could not be queued: {e}")
+            await self._mark_failed(job, str(e))
+        finally:
+            # スプールファイルはここで削除する
+            await asyncio.to_thread(training_file.close)
+
+    async def _queue_stored_job(
+        self,
+        job: FinetuningJob,
+        file_path: str,
+        content_hash: Optional[str],
+        filename: Optional[str],
+        stats: Optional[TrainingFileStats],
+    ) -> None:
+        """
+        ストレージへの保存が済んだジョブを 'queued' に更新し、キューに投入する (それぞれ再試行付き)。
+        分割アップロードの確定処理からも使う。
+        """
+        # 受信時の集計結果を保存する (ワーカーはファイルを再走査せずに学習の要否とメソッド一覧を決める)
+        # 保存できなくてもワーカーがファイルから判定できるので、ジョブは失敗させない。
+        # キュー投入がこの書き込みを待つため、再試行 (バックオフ) はせず1回だけ試みる
+        if stats is not None:
+            link = NewTrainingLink(
+                job_id=job.id.value,
+                data_url=file_path,
+                file_name=filename,
+                record_count=stats.record_count,
+                file_size=format_file_size(stats.file_size),
+                file_mode=stats.file_mode,
+                invalid_record_count=stats.invalid_record_count,
+                methods=stats.methods,
+            )
+            try:
+                await self.training_data_repo.create(link)
+            except Exception as e:
+                print(f"WARN: Failed to save training file statistics for job ID {job.id.value}: {e}")
+
+        # ジョブのファイルパス・内容ハッシュ・ステータスを更新
+        # (ハッシュはワーカーが学習済み成果物を再利用できるかの判定に使う)
+        job.training_file_path = file_path
+        job.training_file_hash = content_hash
+        job.status = JOB_STATUS_QUEUED
+        updated_job = await self._with_retry("update", job, lambda: self.job_repo.update_job(job))
+
+        # 抽象的なキューサービスを通じてタスクをキューに投入
+        await self._with_retry(
+            "enqueue", job,
+            lambda: asyncio.to_thread(
+                self.job_queue_service.enqueue_finetuning_job,
+                updated_job.id.value,
+                updated_job.training_file_path,
+            ),
+        )
+        print(f"INFO: Finetuning job {job.id.value} uploaded and queued.")
+
+    async def _with_retry(self, operation: str, job: FinetuningJob, func: Callable[[], Awaitable[Any]]) -> Any:
+        """func を最大 max_attempts 回まで指数バックオフで再試行する"""
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                return await func()
+            except Exception as e:
+                if attempt >= self.max_attempts:
+                    raise
+                delay = self.retry_base_delay * (2 ** (attempt - 1))
+                print(
+                    f"ERROR: {operation} failed for job ID {job.id.value} "
+                    f"(attempt {attempt}/{self.max_attempts}): {e}. Retrying in {delay:.1f}s."
+                )
+                await asyncio.sleep(delay)
+
+    async def _mark_failed(self, job: FinetuningJob, error_message: str) -> None:
+        job.status = JOB_STATUS_FAILED
+        job.error_message = error_message
+        try:
+            # エラー状態もDBに反映
+            await self.job_repo.update_job(job)
+        except Exception as update_err:
+            print(f"ERROR: Failed to mark job ID {job.id.value} as failed: {update_err}")
+
 
 # ======================================
 # Usecaseインスタンスを生成するファクトリ関数
@@ -164,6 +307,8 @@ def new_create_finetuning_job_interactor(
     file_storage_service: FileStorageDomainService,
     job_queue_service: JobQueueDomainService,
     system_time_service: SystemTimeDomainService,
+    background_task_service: BackgroundTaskDomainService,
+    training_data_repo: TrainingDataRepository,
 ) -> "CreateFinetuningJobUseCase":
     return CreateFinetuningJobInteractor(
         presenter=presenter,
@@ -173,4 +318,6 @@ def new_create_finetuning_job_interactor(
         file_storage_service=file_storage_service,
         job_queue_service=job_queue_service,
         system_time_service=system_time_service,
+        background_task_service=background_task_service,
+        training_data_repo=training_data_repo,
     )
\ No newline at end of file
@@ -6,8 +6,7 @@ from typing import Protocol, Tuple, Optional, List
 
 # ドメイン層の依存関係
 # --- 認証・権限チェック用 ---
-from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
-from domain.entities.agent import Agent, AgentRepository
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
 from domain.entities.user import User
 from domain.services.auth_domain_service import AuthDomainService
 from domain.value_objects.id import ID
@@ -23,7 +22,7 @@ class CreateFinetuningJobDeploymentUseCase(Protocol):
     特定のFinetuning Job IDに紐づくデプロイメントを（1件）作成する
     ユースケースのインターフェース
     """
-    def execute(
+    async def execute(
         self, input: "CreateFinetuningJobDeploymentInput"
     ) -> Tuple["CreateFinetuningJobDeploymentOutput", Exception | None]:
         ...
@@ -78,14 +77,12 @@ class CreateFinetuningJobDeploymentInteractor:
         self,
         presenter: "CreateFinetuningJobDeploymentPresenter",
         deployment_repo: DeploymentRepository,
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository,
+        ownership_repo: OwnershipRepository,
         auth_service: AuthDomainService,
     ):
         self.presenter = presenter
         self.deployment_repo = deployment_repo
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
         
         # C++エンジンのベースURLを環境変数から読み込む
@@ -96,7 +93,7 @@ class CreateFinetuningJobDeploymentInteractor:
             base_url += '/'
         self.engine_base_url = base_url
 
-    def execute(
+    async def execute(
         self, input: CreateFinetuningJobDeploymentInput
     ) -> Tuple["CreateFinetuningJobDeploymentOutput", Exception | None]:
         """
@@ -106,23 +103,18 @@ class CreateFinetuningJobDeploymentInteractor:
         
         try:
             # 1. 認証 (Auth)
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             
-            # 2. ジョブ取得 (Find Job)
+            # 2. ジョブ・エージェント・既存デプロイメントを一括取得 (Resolve Ownership)
             job_id_vo = ID(input.job_id)
-            job: Optional[FinetuningJob] = self.job_repo.find_by_id(job_id_vo)
+            chain: Optional[OwnershipChain] = await self.ownership_repo.resolve_by_job_id(job_id_vo, user.id)
             
-            if job is None:
+            if chain is None:
                 raise FileNotFoundError(f"Job {input.job_id} not found.")
 
             # 3. 権限チェック (Check Permission)
-            agent: Optional[Agent] = self.agent_repo.find_by_id(job.agent_id)
-            
-            if agent is None:
-                raise FileNotFoundError(f"Agent {job.agent_id} (for job {job.id}) not found.")
-            
-            # Agentの`owner`ではなく`user_id`フィールドを参照
-            if agent.user_id != user.id:
+            # Agentの`owner`ではなく`user_id`フィールドで判定済み
+            if not chain.is_owner:
                 raise PermissionError(
                     "User does not have permission to create a deployment for this job."
                 )
@@ -130,7 +122,7 @@ class CreateFinetuningJobDeploymentInteractor:
             # 4. ロジック本体 (Create)
             
             # 4a. 既存デプロイメントのチェック（ジョブ：デプロイ＝1：1 のため）
-            existing_deployment = self.deployment_repo.find_by_job_id(job_id_vo)
+            existing_deployment = chain.deployment
             if existing_deployment:
                 # すでに存在する
                 raise FileExistsError(
@@ -152,7 +144,7 @@ class CreateFinetuningJobDeploymentInteractor:
             )
             
             # 4d. リポジトリに作成を依頼
-            created_deployment: Deployment = self.deployment_repo.create(new_deployment_data)
+            created_deployment: Deployment = await self.deployment_repo.create(new_deployment_data)
             
             # 5. Presenterに渡してOutput DTOに変換
             output = self.presenter.output(created_deployment)
@@ -172,14 +164,12 @@ class CreateFinetuningJobDeploymentInteractor:
 def new_create_finetuning_job_deployment_interactor(
     presenter: "CreateFinetuningJobDeploymentPresenter",
     deployment_repo: DeploymentRepository,
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
 ) -> "CreateFinetuningJobDeploymentUseCase":
     return CreateFinetuningJobDeploymentInteractor(
         presenter=presenter,
         deployment_repo=deployment_repo,
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
     )
\ No newline at end of file
@@ -0,0 +1,187 @@
+import abc
+import asyncio
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Protocol, Tuple, Optional
+
+# ドメイン層の依存関係
+from domain.entities.upload_session import UploadSession, UploadSessionRepository, UPLOAD_SESSION_OPEN
+from domain.entities.agent import AgentRepository
+from domain.services.auth_domain_service import AuthDomainService
+from domain.services.file_storage_domain_service import FileStorageDomainService
+from domain.services.background_task_domain_service import BackgroundTaskDomainService
+from domain.services.system_time_domain_service import SystemTimeDomainService
+from domain.value_objects.id import ID
+
+
+# 分割アップロードの制限
+UPLOAD_DEFAULT_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MIN_CHUNK_SIZE = 256 * 1024
+UPLOAD_MAX_CHUNK_SIZE = 32 * 1024 * 1024
+UPLOAD_MAX_TOTAL_SIZE = 4 * 1024 * 1024 * 1024
+# セッションの有効期限 (この間に finalize されなければ一時ファイルを削除する)
+UPLOAD_SESSION_TTL = timedelta(hours=24)
+# セッション作成のついでに後始末する期限切れセッションの数
+UPLOAD_EXPIRED_PURGE_BATCH = 20
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class CreateUploadSessionUseCase(Protocol):
+    async def execute(
+        self, input: "CreateUploadSessionInput"
+    ) -> Tuple["CreateUploadSessionOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput
+# ======================================
+@dataclass
+class CreateUploadSessionInput:
+    token: str
+    agent_id: int
+    filename: str
+    total_size: int
+    chunk_size: Optional[int] = None
+
+
+# ======================================
+# Output DTO
+# ======================================
+@dataclass
+class CreateUploadSessionOutput:
+    upload_id: str
+    agent_id: int
+    filename: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_size: int
+    next_chunk: int
+    status: str
+    expires_at: datetime
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class CreateUploadSessionPresenter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, session: UploadSession) -> CreateUploadSessionOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class CreateUploadSessionInteractor:
+    """
+    訓練データの分割アップロードを開始する。
+    ストレージ上に空の一時ファイルを作成し、クライアントはここから chunk_size ごとにチャンクを送る。
+    """
+    def __init__(
+        self,
+        presenter: "CreateUploadSessionPresenter",
+        session_repo: UploadSessionRepository,
+        agent_repo: AgentRepository,
+        auth_service: AuthDomainService,
+        file_storage_service: FileStorageDomainService,
+        system_time_service: SystemTimeDomainService,
+        background_task_service: BackgroundTaskDomainService,
+    ):
+        self.presenter = presenter
+        self.session_repo = session_repo
+        self.agent_repo = agent_repo
+        self.auth_service = auth_service
+        self.file_storage_service = file_storage_service
+        self.system_time_service = system_time_service
+        self.background_task_service = background_task_service
+
+    async def execute(
+        self, input: CreateUploadSessionInput
+    ) -> Tuple["CreateUploadSessionOutput", Exception | None]:
+        empty_output = CreateUploadSessionOutput(
+            upload_id="", agent_id=0, filename="", total_size=0, chunk_size=0,
+            total_chunks=0, received_size=0, next_chunk=0, status="", expires_at=datetime.min,
+        )
+        try:
+            # 1. トークンを検証してユーザー情報を取得
+            user = await self.auth_service.verify_token(input.token)
+
+            # 2. Agentの存在確認と所有権チェック
+            agent = await self.agent_repo.find_by_id(ID(input.agent_id))
+            if not agent:
+                raise ValueError(f"Agent with ID {input.agent_id} not found.")
+            if agent.user_id.value != user.id.value:
+                raise PermissionError("User does not own this agent.")
+
+            # 3. 入力値の検証
+            filename = (input.filename or "").strip()
+            if not filename:
+                raise ValueError("filename is required.")
+            if input.total_size <= 0 or input.total_size > UPLOAD_MAX_TOTAL_SIZE:
+                raise ValueError(f"total_size must be between 1 and {UPLOAD_MAX_TOTAL_SIZE} bytes.")
+            chunk_size = input.chunk_size or UPLOAD_DEFAULT_CHUNK_SIZE
+            if chunk_size < UPLOAD_MIN_CHUNK_SIZE or chunk_size > UPLOAD_MAX_CHUNK_SIZE:
+                raise ValueError(
+                    f"chunk_size must be between {UPLOAD_MIN_CHUNK_SIZE} and {UPLOAD_MAX_CHUNK_SIZE} bytes."
+                )
+
+            # 4. セッションを生成し、ストレージに一時ファイルを作ってから永続化する
+            now = datetime.fromisoformat(self.system_time_service.get_current_time())
+            session = UploadSession(
+                id=uuid.uuid4().hex,
+                user_id=user.id,
+                agent_id=ID(input.agent_id),
+                filename=filename,
+                total_size=input.total_size,
+                chunk_size=chunk_size,
+                received_size=0,
+                status=UPLOAD_SESSION_OPEN,
+                created_at=now,
+                expires_at=now + UPLOAD_SESSION_TTL,
+            )
+            await asyncio.to_thread(self.file_storage_service.create_upload, session.id)
+            created = await self.session_repo.create(session)
+
+            # 5. 放置された期限切れセッションの一時ファイルを応答後に削除する
+            self.background_task_service.submit("upload-session-purge", lambda: self._purge_expired(now))
+
+            return self.presenter.output(created), None
+        except Exception as e:
+            return empty_output, e
+
+    async def _purge_expired(self, now: datetime) -> None:
+        expired = await self.session_repo.list_expired(now, UPLOAD_EXPIRED_PURGE_BATCH)
+        for session in expired:
+            # 先に 'expired' にしてから削除する (以降のチャンクは受け付けない)
+            await self.session_repo.mark_expired(session.id)
+            await asyncio.to_thread(self.file_storage_service.discard_upload, session.id)
+        if expired:
+            print(f"INFO: Purged {len(expired)} expired upload session(s).")
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_create_upload_session_interactor(
+    presenter: "CreateUploadSessionPresenter",
+    session_repo: UploadSessionRepository,
+    agent_repo: AgentRepository,
+    auth_service: AuthDomainService,
+    file_storage_service: FileStorageDomainService,
+    system_time_service: SystemTimeDomainService,
+    background_task_service: BackgroundTaskDomainService,
+) -> "CreateUploadSessionUseCase":
+    return CreateUploadSessionInteractor(
+        presenter=presenter,
+        session_repo=session_repo,
+        agent_repo=agent_repo,
+        auth_service=auth_service,
+        file_storage_service=file_storage_service,
+        system_time_service=system_time_service,
+        background_task_service=background_task_service,
+    )
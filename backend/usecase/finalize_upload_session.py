@@ -0,0 +1,201 @@
+import abc
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol, Tuple, Optional
+
+# ドメイン層の依存関係
+from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
+from domain.entities.upload_session import (
+    UploadSession,
+    UploadSessionRepository,
+    UploadSessionNotFoundError,
+    UploadSessionConflictError,
+    UPLOAD_SESSION_OPEN,
+)
+from domain.entities.agent import AgentRepository
+from domain.entities.training_link import TrainingDataRepository
+from domain.services.auth_domain_service import AuthDomainService
+from domain.services.file_storage_domain_service import FileStorageDomainService
+from domain.services.job_queue_domain_service import JobQueueDomainService
+from domain.services.background_task_domain_service import BackgroundTaskDomainService
+from domain.services.system_time_domain_service import SystemTimeDomainService
+from domain.value_objects.id import ID
+
+# ジョブの登録・キュー投入は通常のアップロードと共通
+from usecase.create_finetuning_job import (
+    CreateFinetuningJobInteractor,
+    CreateFinetuningJobOutput,
+    JOB_STATUS_UPLOADING,
+    UPLOAD_INTERRUPTED_MESSAGE,
+)
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class FinalizeUploadSessionUseCase(Protocol):
+    async def execute(
+        self, input: "FinalizeUploadSessionInput"
+    ) -> Tuple["CreateFinetuningJobOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput
+# ======================================
+@dataclass
+class FinalizeUploadSessionInput:
+    token: str
+    upload_id: str
+    # ファイル全体の SHA-256 (任意)。指定された場合は確定時に照合する
+    sha256: Optional[str] = None
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class FinalizeUploadSessionPresenter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, job: FinetuningJob) -> CreateFinetuningJobOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class FinalizeUploadSessionInteractor(CreateFinetuningJobInteractor):
+    """
+    全チャンクを受信したセッションからファインチューニングジョブを作成する。
+    ジョブを 'uploading' で登録した時点で応答を返し、一時ファイルのハッシュ計算・ブロブへの確定・
+    'queued' への更新・キュー投入はバックグラウンドタスクで行う (通常のアップロードと同じ流れ)。
+    """
+    def __init__(
+        self,
+        presenter: "FinalizeUploadSessionPresenter",
+        session_repo: UploadSessionRepository,
+        job_repo: FinetuningJobRepository,
+        agent_repo: AgentRepository,
+        auth_service: AuthDomainService,
+        file_storage_service: FileStorageDomainService,
+        job_queue_service: JobQueueDomainService,
+        system_time_service: SystemTimeDomainService,
+        background_task_service: BackgroundTaskDomainService,
+        training_data_repo: TrainingDataRepository,
+    ):
+        super().__init__(
+            presenter=presenter,
+            job_repo=job_repo,
+            agent_repo=agent_repo,
+            auth_service=auth_service,
+            file_storage_service=file_storage_service,
+            job_queue_service=job_queue_service,
+            system_time_service=system_time_service,
+            background_task_service=background_task_service,
+            training_data_repo=training_data_repo,
+        )
+        self.session_repo = session_repo
+
+    async def execute(
+        self, input: FinalizeUploadSessionInput
+    ) -> Tuple["CreateFinetuningJobOutput", Exception | None]:
+        empty_output = CreateFinetuningJobOutput(id=0, agent_id=0, status="", created_at="", message="")
+        created_job: Optional[FinetuningJob] = None
+        try:
+            # 1. 認証とセッションの所有権チェック
+            user = await self.auth_service.verify_token(input.token)
+
+            current_time_str = self.system_time_service.get_current_time()
+            session = await self.session_repo.find_by_id(input.upload_id)
+            if not session or session.is_expired(datetime.fromisoformat(current_time_str)):
+                raise UploadSessionNotFoundError(f"Upload session {input.upload_id} not found.")
+            if session.user_id.value != user.id.value:
+                raise PermissionError("User does not own this upload session.")
+            if session.status != UPLOAD_SESSION_OPEN:
+                raise UploadSessionConflictError(
+                    f"Upload session {input.upload_id} is already {session.status}"
+                    + (f" (job {session.job_id.value})." if session.job_id else ".")
+                )
+            if not session.is_complete:
+                raise UploadSessionConflictError(
+                    f"Upload is incomplete: received {session.received_size} of {session.total_size} bytes."
+                )
+
+            # 2. ジョブを 'uploading' で登録し、セッションに紐づける
+            # (並行した finalize のうち、セッションを更新できた1つだけがジョブを残す)
+            created_job = await self.job_repo.create_job(FinetuningJob(
+                id=ID(0),
+                agent_id=session.agent_id,
+                training_file_path="pending_job_id",
+                status=JOB_STATUS_UPLOADING,
+                created_at=current_time_str,
+                finished_at=None,
+                error_message=None,
+            ))
+            if not await self.session_repo.finalize(session.id, created_job.id):
+                await self.job_repo.delete(created_job.id)
+                created_job = None
+                raise UploadSessionConflictError(f"Upload session {input.upload_id} was already finalized.")
+
+            # 3. 一時ファイルの確定とキュー投入をバックグラウンドタスクに委譲し、応答を先に返す
+            job = created_job
+            created_job = None
+            self.background_task_service.submit(
+                f"finetuning-upload-{job.id.value}",
+                lambda: self._commit_session(job, session, input.sha256),
+            )
+            return self.presenter.output(job), None
+        except Exception as e:
+            if created_job:
+                print(f"ERROR: Rolling back job status for job ID {created_job.id.value} due to: {e}")
+                await self._mark_failed(created_job, str(e))
+            return empty_output, e
+
+    async def _commit_session(self, job: FinetuningJob, session: UploadSession, expected_sha256: Optional[str]) -> None:
+        try:
+            file_path, content_hash, stats = await self._with_retry(
+                "commit", job,
+                lambda: asyncio.to_thread(self.file_storage_service.commit_upload, session.id, session.filename),
+            )
+            if expected_sha256 and content_hash != expected_sha256.strip().lower():
+                raise ValueError(f"Checksum mismatch: uploaded file has SHA-256 {content_hash}.")
+            if not stats.is_valid:
+                raise ValueError(stats.error)
+            await self._queue_stored_job(job, file_path, content_hash, session.filename, stats)
+        except asyncio.CancelledError:
+            # シャットダウン時のキャンセル (except Exception では捕まらない)。'uploading' のまま残さない
+            print(f"ERROR: Finetuning job {job.id.value} upload was cancelled.")
+            await self._mark_failed(job, UPLOAD_INTERRUPTED_MESSAGE)
+            raise
+        except Exception as e:
+            print(f"ERROR: Finetuning job {job.id.value} could not be queued: {e}")
+            await self._mark_failed(job, str(e))
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_finalize_upload_session_interactor(
+    presenter: "FinalizeUploadSessionPresenter",
+    session_repo: UploadSessionRepository,
+    job_repo: FinetuningJobRepository,
+    agent_repo: AgentRepository,
+    auth_service: AuthDomainService,
+    file_storage_service: FileStorageDomainService,
+    job_queue_service: JobQueueDomainService,
+    system_time_service: SystemTimeDomainService,
+    background_task_service: BackgroundTaskDomainService,
+    training_data_repo: TrainingDataRepository,
+) -> "FinalizeUploadSessionUseCase":
+    return FinalizeUploadSessionInteractor(
+        presenter=presenter,
+        session_repo=session_repo,
+        job_repo=job_repo,
+        agent_repo=agent_repo,
+        auth_service=auth_service,
+        file_storage_service=file_storage_service,
+        job_queue_service=job_queue_service,
+        system_time_service=system_time_service,
+        background_task_service=background_task_service,
+        training_data_repo=training_data_repo,
+    )
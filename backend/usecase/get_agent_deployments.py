@@ -7,6 +7,7 @@ from domain.entities.deployment import Deployment, DeploymentRepository
 from domain.entities.agent import Agent, AgentRepository 
 from domain.entities.user import User  
 from domain.value_objects.id import ID 
+from domain.value_objects.page import PageRequest, DEFAULT_PAGE_LIMIT
 from domain.services.auth_domain_service import AuthDomainService
 
 
@@ -15,7 +16,7 @@ from domain.services.auth_domain_service import AuthDomainService
 # ======================================
 class GetAgentDeploymentsUseCase(Protocol):
     """特定のAgentに紐づくデプロイメント一覧を取得するユースケースのインターフェース"""
-    def execute(
+    async def execute(
         self, input: "GetAgentDeploymentsInput"
     ) -> Tuple["GetAgentDeploymentsOutput", Exception | None]:
         ...
@@ -26,9 +27,12 @@ class GetAgentDeploymentsUseCase(Protocol):
 # ======================================
 @dataclass
 class GetAgentDeploymentsInput:
-    """ユーザーを特定するための認証トークンと、対象AgentのID"""
+    """ユーザーを特定するための認証トークンと、対象AgentのID、ページング・絞り込み条件"""
     token: str
     agent_id: int 
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: Optional[str] = None   # 前ページの next_cursor
+    status: Optional[str] = None  # 例: "active", "pending", "stopped"
 
 
 # ======================================
@@ -50,6 +54,7 @@ class DeploymentListItem:
 class GetAgentDeploymentsOutput:
     """デプロイメントのリストを含む最終的なOutput DTO"""
     deployments: List[DeploymentListItem]
+    next_cursor: Optional[str] = None  # 次ページが無い場合は None
 
 
 # ======================================
@@ -58,7 +63,7 @@ class GetAgentDeploymentsOutput:
 class GetAgentDeploymentsPresenter(abc.ABC):
     """ドメインエンティティのリストをOutput DTOに変換するPresenter"""
     @abc.abstractmethod
-    def output(self, deployments: List[Deployment]) -> GetAgentDeploymentsOutput:
+    def output(self, deployments: List[Deployment], next_cursor: Optional[str] = None) -> GetAgentDeploymentsOutput:
         pass
 
 
@@ -78,7 +83,7 @@ class GetAgentDeploymentsInteractor:
         self.agent_repo = agent_repo
         self.auth_service = auth_service
 
-    def execute(
+    async def execute(
         self, input: GetAgentDeploymentsInput
     ) -> Tuple["GetAgentDeploymentsOutput", Exception | None]:
         
@@ -86,11 +91,11 @@ class GetAgentDeploymentsInteractor:
         
         try:
             # 1. トークンを検証してユーザー情報を取得
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             agent_id_vo = ID(input.agent_id)
             
             # 2. 権限チェック: このAgentをユーザーが所有しているか確認
-            agent: Optional[Agent] = self.agent_repo.find_by_id(agent_id_vo)
+            agent: Optional[Agent] = await self.agent_repo.find_by_id(agent_id_vo)
             
             if agent is None:
                 raise FileNotFoundError(f"Agent {input.agent_id} not found.")
@@ -100,12 +105,12 @@ class GetAgentDeploymentsInteractor:
                     "User does not have permission to access this agent's deployments."
                 )
             
-            # 3. 権限OK。DeploymentRepositoryから特定の agent_id に紐づく全てのデプロイメントを取得
-            # DeploymentRepository に list_by_agent(agent_id_vo) が存在することを前提とする
-            deployments_list: List[Deployment] = self.deployment_repo.list_by_agent(agent_id_vo)
+            # 3. 権限OK。DeploymentRepositoryから特定の agent_id に紐づくデプロイメントを1ページ分取得
+            page = PageRequest(limit=input.limit, after=input.after)
+            deployments_page = await self.deployment_repo.list_page_by_agent(agent_id_vo, page, status=input.status)
             
             # 4. Presenterに渡してOutput DTOに変換
-            output = self.presenter.output(deployments_list)
+            output = self.presenter.output(deployments_page.items, deployments_page.next_cursor)
             return output, None
             
         except Exception as e:
@@ -7,6 +7,7 @@ from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepositor
 from domain.entities.user import User  
 from domain.entities.agent import Agent, AgentRepository 
 from domain.value_objects.id import ID 
+from domain.value_objects.page import PageRequest, DEFAULT_PAGE_LIMIT
 from domain.services.auth_domain_service import AuthDomainService
 
 
@@ -15,7 +16,7 @@ from domain.services.auth_domain_service import AuthDomainService
 # ======================================
 class GetAgentFinetuningJobsUseCase(Protocol):
     """特定のAgentに紐づくファインチューニングジョブ一覧を取得するユースケースのインターフェース"""
-    def execute(
+    async def execute(
         self, input: "GetAgentFinetuningJobsInput"
     ) -> Tuple["GetAgentFinetuningJobsOutput", Exception | None]:
         ...
@@ -26,9 +27,12 @@ class GetAgentFinetuningJobsUseCase(Protocol):
 # ======================================
 @dataclass
 class GetAgentFinetuningJobsInput:
-    """ユーザーを特定するための認証トークンと、対象AgentのID"""
+    """ユーザーを特定するための認証トークンと、対象AgentのID、ページング・絞り込み条件"""
     token: str
     agent_id: int 
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: Optional[str] = None   # 前ページの next_cursor
+    status: Optional[str] = None  # 例: "queued", "running", "completed", "failed"
 
 
 # ======================================
@@ -44,6 +48,9 @@ class FinetuningJobListItem:
     created_at: str # ISO 8601 string
     finished_at: Optional[str] # ISO 8601 string
     error_message: Optional[str]
+    training_file_hash: Optional[str] = None
+    cache_hit: bool = False  # 学習済み成果物を再利用して完了した場合 True
+    reused_from_job_id: Optional[int] = None
 
 # ======================================
 # Output DTO (全体)
@@ -52,6 +59,7 @@ class FinetuningJobListItem:
 class GetAgentFinetuningJobsOutput:
     """ジョブのリストを含む最終的なOutput DTO"""
     jobs: List[FinetuningJobListItem]
+    next_cursor: Optional[str] = None  # 次ページが無い場合は None
 
 
 # ======================================
@@ -60,7 +68,7 @@ class GetAgentFinetuningJobsOutput:
 class GetAgentFinetuningJobsPresenter(abc.ABC):
     """ドメインエンティティのリストをOutput DTOに変換するPresenter"""
     @abc.abstractmethod
-    def output(self, jobs: List[FinetuningJob]) -> GetAgentFinetuningJobsOutput:
+    def output(self, jobs: List[FinetuningJob], next_cursor: Optional[str] = None) -> GetAgentFinetuningJobsOutput:
         pass
 
 
@@ -80,7 +88,7 @@ class GetAgentFinetuningJobsInteractor:
         self.auth_service = auth_service
         self.agent_repo = agent_repo
 
-    def execute(
+    async def execute(
         self, input: GetAgentFinetuningJobsInput
     ) -> Tuple["GetAgentFinetuningJobsOutput", Exception | None]:
         
@@ -88,11 +96,11 @@ class GetAgentFinetuningJobsInteractor:
         
         try:
             # 1. トークンを検証してユーザー情報を取得
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             agent_id_vo = ID(input.agent_id)
             
             # 2. 権限チェック: このAgentをユーザーが所有しているか確認
-            agent: Optional[Agent] = self.agent_repo.find_by_id(agent_id_vo)
+            agent: Optional[Agent] = await self.agent_repo.find_by_id(agent_id_vo)
             
             if agent is None:
                 raise FileNotFoundError(f"Agent {input.agent_id} not found.")
@@ -102,13 +110,12 @@ class GetAgentFinetuningJobsInteractor:
                     "User does not have permission to access this agent's jobs."
                 )
             
-            # 3. JobRepositoryから特定の agent_id に紐づく全てのジョブを取得
-            # ⬇️⬇️⬇️ 修正箇所：メソッド名を 'list_by_agent' に修正 ⬇️⬇️⬇️
-            jobs_list: List[FinetuningJob] = self.job_repo.list_by_agent(agent_id_vo)
-            # ⬆️⬆️⬆️ 修正箇所 ⬆️⬆️⬆️
+            # 3. JobRepositoryから特定の agent_id に紐づくジョブを1ページ分取得
+            page = PageRequest(limit=input.limit, after=input.after)
+            jobs_page = await self.job_repo.list_page_by_agent(agent_id_vo, page, status=input.status)
             
             # 4. Presenterに渡してOutput DTOに変換
-            output = self.presenter.output(jobs_list)
+            output = self.presenter.output(jobs_page.items, jobs_page.next_cursor)
             return output, None
             
         except Exception as e:
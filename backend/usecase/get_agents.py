@@ -4,6 +4,7 @@ from typing import Protocol, Tuple, Optional, List
 
 # ドメイン層の依存関係
 from domain.entities.agent import Agent, AgentRepository 
+from domain.value_objects.page import PageRequest, DEFAULT_PAGE_LIMIT
 
 
 # ======================================
@@ -11,7 +12,7 @@ from domain.entities.agent import Agent, AgentRepository
 # ======================================
 class GetAgentsUseCase(Protocol):
     """現存する全てのエージェントを取得するユースケースのインターフェース"""
-    def execute(
+    async def execute(
         self, input: "GetAgentsInput"
     ) -> Tuple["GetAgentsOutput", Exception | None]:
         ...
@@ -19,12 +20,13 @@ class GetAgentsUseCase(Protocol):
 
 # ======================================
 # UsecaseのInput
-# (全件取得であり、認証不要のため空)
+# (認証不要。キーセットページングの指定のみ)
 # ======================================
 @dataclass
 class GetAgentsInput:
-    """インプットデータは不要だが、インターフェース整合性のため定義"""
-    pass
+    """ページングの指定（after には前ページの next_cursor を渡す）"""
+    limit: int = DEFAULT_PAGE_LIMIT
+    after: Optional[str] = None
 
 
 # ======================================
@@ -47,6 +49,7 @@ class AgentListItem:
 class GetAgentsOutput:
     """エージェントのリストを含む最終的なOutput DTO"""
     agents: List[AgentListItem]
+    next_cursor: Optional[str] = None  # 次ページが無い場合は None
 
 
 # ======================================
@@ -55,7 +58,7 @@ class GetAgentsOutput:
 class GetAgentsPresenter(abc.ABC):
     """ドメインエンティティのリストをOutput DTOに変換するPresenter"""
     @abc.abstractmethod
-    def output(self, agents: List[Agent]) -> GetAgentsOutput:
+    def output(self, agents: List[Agent], next_cursor: Optional[str] = None) -> GetAgentsOutput:
         """AgentエンティティのリストをDTOに変換して返す"""
         pass
 
@@ -73,20 +76,21 @@ class GetAgentsInteractor:
         self.presenter = presenter
         self.agent_repo = agent_repo
 
-    def execute(
+    async def execute(
         self, input: GetAgentsInput
     ) -> Tuple[GetAgentsOutput, Exception | None]:
         """
-        AgentRepositoryから全てのエージェント一覧を取得する。
+        AgentRepositoryからエージェント一覧を1ページ分取得する。
         """
         empty_output = GetAgentsOutput(agents=[])
         
         try:
-            # 1. AgentRepositoryから全てのエージェントを取得（←ここを修正）
-            agents_list: List[Agent] = self.agent_repo.find_all()
+            # 1. AgentRepositoryからエージェントを1ページ分取得
+            page = PageRequest(limit=input.limit, after=input.after)
+            agents_page = await self.agent_repo.find_page(page)
             
             # 2. Presenterに渡してOutput DTOに変換
-            output = self.presenter.output(agents_list)
+            output = self.presenter.output(agents_page.items, agents_page.next_cursor)
             return output, None
             
         except Exception as e:
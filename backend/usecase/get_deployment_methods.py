@@ -3,16 +3,15 @@ from dataclasses import dataclass
 from typing import Protocol, Tuple, Optional, List
 
 # ドメイン層の依存関係
-from domain.entities.finetuning_job import FinetuningJobRepository
-from domain.entities.agent import AgentRepository
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
 from domain.entities.user import User
 from domain.services.auth_domain_service import AuthDomainService
 from domain.services.job_method_finder_domain_service import JobMethodFinderDomainService 
 from domain.value_objects.id import ID
 from domain.value_objects.method import Method
 
-# ★★★ 修正箇所1: メソッドとデプロイメントのリポジトリをインポート ★★★
-from domain.entities.deployment import Deployment, DeploymentRepository
+# ★★★ 修正箇所1: メソッドのリポジトリをインポート ★★★
+from domain.entities.deployment import Deployment
 from domain.entities.methods import DeploymentMethods, DeploymentMethodsRepository
 
 
@@ -20,7 +19,7 @@ from domain.entities.methods import DeploymentMethods, DeploymentMethodsReposito
 # Usecaseのインターフェース定義
 # ======================================
 class GetDeploymentMethodsUseCase(Protocol):
-    def execute(
+    async def execute(
         self, input: "GetDeploymentMethodsInput"
     ) -> Tuple["GetDeploymentMethodsOutput", Exception | None]:
         ...
@@ -73,51 +72,44 @@ class GetDeploymentMethodsInteractor:
         # 修正2a: HTTPサービスを削除
         # job_method_finder_service: JobMethodFinderDomainService,
         
-        # 修正2b: メソッドリポジトリとデプロイメントリポジトリを追加
+        # 修正2b: メソッドリポジトリを追加
         methods_repo: DeploymentMethodsRepository,
-        deployment_repo: DeploymentRepository,
         
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository,
+        # ジョブ・エージェント・デプロイメントは1回の JOIN で取得する
+        ownership_repo: OwnershipRepository,
         auth_service: AuthDomainService,
     ):
         self.presenter = presenter
         # self.job_method_finder_service = job_method_finder_service # 削除
         
         self.methods_repo = methods_repo # 追加
-        self.deployment_repo = deployment_repo # 追加
         
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
 
-    def execute(
+    async def execute(
         self, input: GetDeploymentMethodsInput
     ) -> Tuple["GetDeploymentMethodsOutput", Exception | None]:
         
         try:
             # 1. 認証 (Auth)
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             job_id_vo = ID(input.job_id)
             
-            # 2. 権限チェックのためにジョブとエージェントを取得
-            job = self.job_repo.find_by_id(job_id_vo)
-            if job is None:
+            # 2. 権限チェックのためにジョブ・エージェント・デプロイメントを一括取得
+            chain: Optional[OwnershipChain] = await self.ownership_repo.resolve_by_job_id(job_id_vo, user.id)
+            if chain is None:
                 raise FileNotFoundError(f"Job {input.job_id} not found.")
-
-            agent = self.agent_repo.find_by_id(job.agent_id)
-            if agent is None:
-                raise FileNotFoundError(f"Agent {job.agent_id} not found.")
             
-            if agent.user_id != user.id:
+            if not chain.is_owner:
                 raise PermissionError(
                     "User does not have permission to view methods for this job."
                 )
 
             # ★★★ 修正3: ロジック本体 - リポジトリから取得 ★★★
             
-            # 3a. デプロイメントIDを取得
-            deployment: Optional[Deployment] = self.deployment_repo.find_by_job_id(job_id_vo)
+            # 3a. デプロイメントIDを取得 (所有関係と同時に取得済み)
+            deployment: Optional[Deployment] = chain.deployment
             
             if deployment is None:
                 method_vos = [] # デプロイメントがない場合はメソッドもない
@@ -125,7 +117,7 @@ class GetDeploymentMethodsInteractor:
             else:
                 deployment_id_value = deployment.id.value # IDオブジェクトから値を取得
                 # 3b. デプロイメントIDからメソッドエンティティを取得
-                methods_entity: Optional[DeploymentMethods] = self.methods_repo.find_by_deployment_id(deployment.id)
+                methods_entity: Optional[DeploymentMethods] = await self.methods_repo.find_by_deployment_id(deployment.id)
 
                 if methods_entity is None:
                     method_vos = [] # 設定がない場合は空
@@ -154,12 +146,10 @@ def new_get_deployment_methods_interactor(
     # 修正4a: HTTPサービスを削除
     # job_method_finder_service: JobMethodFinderDomainService,
     
-    # 修正4b: メソッドリポジトリとデプロイメントリポジトリを追加
+    # 修正4b: メソッドリポジトリを追加
     methods_repo: DeploymentMethodsRepository,
-    deployment_repo: DeploymentRepository,
     
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
 ) -> "GetDeploymentMethodsUseCase":
     return GetDeploymentMethodsInteractor(
@@ -167,9 +157,7 @@ def new_get_deployment_methods_interactor(
         # job_method_finder_service=job_method_finder_service, # 削除
         
         methods_repo=methods_repo, # 追加
-        deployment_repo=deployment_repo, # 追加
         
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
     )
\ No newline at end of file
@@ -4,9 +4,8 @@ from typing import Protocol, Tuple, Optional, List
 
 # ドメイン層の依存関係
 # --- 今回必要になるリポジトリ群 ---
-from domain.entities.deployment import Deployment, DeploymentRepository
-from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
-from domain.entities.agent import Agent, AgentRepository 
+from domain.entities.deployment import Deployment
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
 # --- 認証サービスとエンティティ ---
 from domain.entities.user import User
 from domain.services.auth_domain_service import AuthDomainService
@@ -21,7 +20,7 @@ class GetFinetuningJobDeploymentUseCase(Protocol):
     特定のFinetuning Job IDに紐づくデプロイメントを取得する
     ユースケースのインターフェース
     """
-    def execute(
+    async def execute(
         self, input: "GetFinetuningJobDeploymentInput"
     ) -> Tuple["GetFinetuningJobDeploymentOutput", Exception | None]:
         ...
@@ -69,18 +68,14 @@ class GetFinetuningJobDeploymentInteractor:
     def __init__(
         self,
         presenter: "GetFinetuningJobDeploymentPresenter",
-        deployment_repo: DeploymentRepository,
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository,
+        ownership_repo: OwnershipRepository,
         auth_service: AuthDomainService,
     ):
         self.presenter = presenter
-        self.deployment_repo = deployment_repo
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
 
-    def execute(
+    async def execute(
         self, input: GetFinetuningJobDeploymentInput
     ) -> Tuple["GetFinetuningJobDeploymentOutput", Exception | None]:
         """
@@ -94,29 +89,24 @@ class GetFinetuningJobDeploymentInteractor:
         
         try:
             # 1. トークンを検証してユーザー情報を取得
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             
-            # 2. Job IDからジョブ情報を取得
+            # 2. Job IDからジョブ・エージェント・デプロイメントを一括取得
             job_id_vo = ID(input.job_id)
-            job: Optional[FinetuningJob] = self.job_repo.find_by_id(job_id_vo)
+            chain: Optional[OwnershipChain] = await self.ownership_repo.resolve_by_job_id(job_id_vo, user.id)
             
-            if job is None:
+            if chain is None:
                 raise FileNotFoundError(f"Job {input.job_id} not found.")
 
             # 3. 権限チェック：
-            agent: Optional[Agent] = self.agent_repo.find_by_id(job.agent_id)
-            
-            if agent is None:
-                raise FileNotFoundError(f"Agent {job.agent_id} (for job {job.id}) not found.")
-            
-            if agent.user_id != user.id:
+            if not chain.is_owner:
                 raise PermissionError(
                     "User does not have permission to access this job's deployment."
                 )
 
             # 4. 権限OK。Job IDに紐づくデプロイメントを取得
-            # 修正4: リポジトリのfind_by_job_idは単一のOptional[Deployment]を返すことを想定
-            deployment: Optional[Deployment] = self.deployment_repo.find_by_job_id(job_id_vo)
+            # (所有関係の解決時に LEFT JOIN で取得済み)
+            deployment: Optional[Deployment] = chain.deployment
             
             if deployment is None:
                 raise FileNotFoundError(f"Deployment for job {input.job_id} not found.")
@@ -136,15 +126,11 @@ class GetFinetuningJobDeploymentInteractor:
 # ======================================
 def new_get_finetuning_job_deployment_interactor(
     presenter: "GetFinetuningJobDeploymentPresenter",
-    deployment_repo: DeploymentRepository,
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
 ) -> "GetFinetuningJobDeploymentUseCase":
     return GetFinetuningJobDeploymentInteractor(
         presenter=presenter,
-        deployment_repo=deployment_repo,
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
     )
\ No newline at end of file
@@ -1,11 +1,18 @@
 import os
 import abc
+import mimetypes
 from dataclasses import dataclass
-from typing import Protocol, Tuple, Any
+from typing import Optional, Protocol, Tuple, Any
 
 # ドメイン層の依存関係
 from domain.value_objects.binary_stream import BinaryStream 
+from domain.value_objects.file_info import FileInfo
 from domain.services.get_image_stream_domain_service import FileStreamDomainService 
+from domain.services.visualization_render_domain_service import VisualizationRenderDomainService
+
+
+# 表示時に描画した画像のうち PNG 以外のもの (タイルピラミッドの記述子)
+_RENDERED_MIME_TYPES = {".dzi": "application/xml"}
 
 
 # ======================================
@@ -37,6 +44,13 @@ class GetImageStreamOutput:
     stream: BinaryStream
     mime_type: str
     filename: str
+    # ローカルディスク上のファイルの場合はそのパス (stream は None。配信側でファイルを直接送信する)
+    file_path: Optional[str] = None
+    # file_path がキャッシュ上のファイルで、他のリクエストによる追い出しで削除されうる場合は True
+    # (配信側は取得直後に開き、開いたファイルから送信する)
+    evictable: bool = False
+    # stream のサイズと最終更新時刻 (Content-Length・Range・条件付き GET に使う)
+    info: Optional[FileInfo] = None
 
 
 # ======================================
@@ -57,31 +71,81 @@ class GetImageStreamInteractor:
         self,
         presenter: "GetImageStreamPresenter",
         file_stream_service: FileStreamDomainService, 
+        render_service: Optional[VisualizationRenderDomainService] = None,
     ):
-        """依存性注入: PresenterとFileStreamDomainServiceを受け取る"""
+        """
+        依存性注入: PresenterとFileStreamDomainServiceを受け取る。
+        render_service を指定した場合、ストレージに無い画像はジョブが保存した重みから描画して返す。
+        """
         self.presenter = presenter
         self.file_stream_service = file_stream_service
+        self.render_service = render_service
 
     def execute(
         self, input: GetImageStreamInput
     ) -> Tuple["GetImageStreamOutput", Exception | None]:
+        if self.render_service is not None and self.render_service.is_render_only(input.relative_path):
+            # タイル・記述子はストレージに無いので、探さずに描画 (描画済みならキャッシュ) に進む
+            output = GetImageStreamOutput(stream=None, mime_type="", filename="")
+            error: Exception | None = FileNotFoundError(f"Image not found: {input.relative_path}")
+        else:
+            output, error = self._get_stored_image(input)
+            if error is None or self.render_service is None:
+                return output, error
+
+        # 画像がストレージに無い場合 (ジョブが weights.npz のみ保存した場合) は、表示時に描画する
+        try:
+            file_path = self.render_service.render_image(input.relative_path)
+        except Exception as e:
+            print(f"ERROR: Failed to render {input.relative_path}: {e}")
+            return output, e
+        if not file_path:
+            return output, error
+        output = GetImageStreamOutput(
+            stream=None,
+            mime_type=_RENDERED_MIME_TYPES.get(os.path.splitext(file_path)[1], "image/png"),
+            filename=os.path.basename(input.relative_path),
+            file_path=file_path,
+            # 描画した画像は ImageDiskCache 上にある
+            evictable=True,
+        )
+        return self.presenter.output(output), None
+
+    def _get_stored_image(
+        self, input: GetImageStreamInput
+    ) -> Tuple["GetImageStreamOutput", Exception | None]:
         
         empty_output = GetImageStreamOutput(stream=None, mime_type="", filename="")
         
         try:
-            # 1. ドメインサービスに画像ストリームの取得を委譲
-            stream, mime_type = self.file_stream_service.get_file_stream_by_path(
+            # ファイル名を取得
+            filename = os.path.basename(input.relative_path)
+
+            # 1. ローカルファイルとして直接送信できる場合は、ストリームを開かずパスを返す
+            file_path = self.file_stream_service.get_local_file_path(input.relative_path)
+            if file_path:
+                mime_type, _ = mimetypes.guess_type(file_path)
+                output = GetImageStreamOutput(
+                    stream=None,
+                    mime_type=mime_type if mime_type and mime_type.startswith('image/') else 'application/octet-stream',
+                    filename=filename,
+                    file_path=file_path,
+                    evictable=self.file_stream_service.local_file_is_cache(),
+                )
+                return self.presenter.output(output), None
+
+            # 2. ドメインサービスに画像ストリームの取得を委譲
+            # (ストリームはまだ内容を読み込んでいない。配信側が必要な範囲だけ読み出して閉じる)
+            stream, mime_type, info = self.file_stream_service.get_file_stream_by_path(
                 input.relative_path
             )
 
-            # 2. ファイル名を取得
-            filename = os.path.basename(input.relative_path)
-
             # 3. Output DTOを生成
             output = GetImageStreamOutput(
                 stream=stream,
                 mime_type=mime_type,
-                filename=filename
+                filename=filename,
+                info=info,
             )
 
             # 4. Presenterに渡す (パススルーを想定)
@@ -98,8 +162,10 @@ class GetImageStreamInteractor:
 def new_get_image_stream_interactor(
     presenter: "GetImageStreamPresenter",
     file_stream_service: FileStreamDomainService,
+    render_service: Optional[VisualizationRenderDomainService] = None,
 ) -> "GetImageStreamUseCase":
     return GetImageStreamInteractor(
         presenter=presenter,
         file_stream_service=file_stream_service,
+        render_service=render_service,
     )
\ No newline at end of file
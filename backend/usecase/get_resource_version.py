@@ -0,0 +1,117 @@
+import abc
+from dataclasses import dataclass
+from typing import Protocol, Tuple, Optional
+
+# ドメイン層の依存関係
+from domain.entities.resource_version import ResourceVersion, ResourceVersionRepository
+from domain.entities.user import User
+from domain.services.auth_domain_service import AuthDomainService
+from domain.value_objects.id import ID
+
+
+# 版を取得できるリソースの種類
+RESOURCE_AGENT_JOBS = "agent_jobs"
+RESOURCE_AGENT_DEPLOYMENTS = "agent_deployments"
+RESOURCE_JOB_VISUALIZATIONS = "job_visualizations"
+RESOURCE_JOB_METHODS = "job_methods"
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class GetResourceVersionUseCase(Protocol):
+    async def execute(
+        self, input: "GetResourceVersionInput"
+    ) -> Tuple["GetResourceVersionOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput
+# ======================================
+@dataclass
+class GetResourceVersionInput:
+    """認証トークンと、版を取得する対象リソースの種類・ID"""
+    token: str
+    resource: str  # RESOURCE_* のいずれか
+    resource_id: int  # agent_* はエージェントID、job_* はジョブID
+    status: Optional[str] = None  # 一覧のステータス絞り込み
+
+
+# ======================================
+# Output DTO
+# ======================================
+@dataclass
+class GetResourceVersionOutput:
+    # リソースが存在しない・所有者でない場合は None (本体のユースケースでエラーを返す)
+    version: Optional[str]
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class GetResourceVersionPresenter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, version: Optional[ResourceVersion]) -> GetResourceVersionOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class GetResourceVersionInteractor:
+    """
+    条件付き GET 用に、一覧・詳細の本体を組み立てずに
+    認証と所有者チェック付きの「版」だけを取得するユースケース。
+    """
+    def __init__(
+        self,
+        presenter: "GetResourceVersionPresenter",
+        version_repo: ResourceVersionRepository,
+        auth_service: AuthDomainService,
+    ):
+        self.presenter = presenter
+        self.version_repo = version_repo
+        self.auth_service = auth_service
+
+    async def execute(
+        self, input: GetResourceVersionInput
+    ) -> Tuple["GetResourceVersionOutput", Exception | None]:
+        try:
+            # 1. 認証 (プリンシパルキャッシュにより通常はDBアクセスなし)
+            user: User = await self.auth_service.verify_token(input.token)
+            resource_id_vo = ID(input.resource_id)
+
+            # 2. 所有者条件付きで版を取得 (1回の集約クエリ)
+            version: Optional[ResourceVersion]
+            if input.resource == RESOURCE_AGENT_JOBS:
+                version = await self.version_repo.agent_jobs_version(resource_id_vo, user.id, input.status)
+            elif input.resource == RESOURCE_AGENT_DEPLOYMENTS:
+                version = await self.version_repo.agent_deployments_version(resource_id_vo, user.id, input.status)
+            elif input.resource == RESOURCE_JOB_VISUALIZATIONS:
+                version = await self.version_repo.job_visualizations_version(resource_id_vo, user.id)
+            elif input.resource == RESOURCE_JOB_METHODS:
+                version = await self.version_repo.job_methods_version(resource_id_vo, user.id)
+            else:
+                raise ValueError(f"Unknown resource type: {input.resource}")
+
+            output = self.presenter.output(version)
+            return output, None
+
+        except Exception as e:
+            return GetResourceVersionOutput(version=None), e
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_get_resource_version_interactor(
+    presenter: "GetResourceVersionPresenter",
+    version_repo: ResourceVersionRepository,
+    auth_service: AuthDomainService,
+) -> "GetResourceVersionUseCase":
+    return GetResourceVersionInteractor(
+        presenter=presenter,
+        version_repo=version_repo,
+        auth_service=auth_service,
+    )
@@ -0,0 +1,114 @@
+import abc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol, Tuple, Optional
+
+# ドメイン層の依存関係
+from domain.entities.upload_session import UploadSession, UploadSessionRepository, UploadSessionNotFoundError
+from domain.services.auth_domain_service import AuthDomainService
+from domain.services.system_time_domain_service import SystemTimeDomainService
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class GetUploadSessionUseCase(Protocol):
+    async def execute(
+        self, input: "GetUploadSessionInput"
+    ) -> Tuple["GetUploadSessionOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput
+# ======================================
+@dataclass
+class GetUploadSessionInput:
+    token: str
+    upload_id: str
+
+
+# ======================================
+# Output DTO
+# ======================================
+@dataclass
+class GetUploadSessionOutput:
+    upload_id: str
+    agent_id: int
+    filename: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_size: int
+    next_chunk: int
+    status: str
+    expires_at: datetime
+    job_id: Optional[int] = None
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class GetUploadSessionPresenter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, session: UploadSession) -> GetUploadSessionOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class GetUploadSessionInteractor:
+    """
+    分割アップロードの受信済みオフセットを返す。
+    接続が切れたクライアントは next_chunk から送信を再開する。
+    """
+    def __init__(
+        self,
+        presenter: "GetUploadSessionPresenter",
+        session_repo: UploadSessionRepository,
+        auth_service: AuthDomainService,
+        system_time_service: SystemTimeDomainService,
+    ):
+        self.presenter = presenter
+        self.session_repo = session_repo
+        self.auth_service = auth_service
+        self.system_time_service = system_time_service
+
+    async def execute(
+        self, input: GetUploadSessionInput
+    ) -> Tuple["GetUploadSessionOutput", Exception | None]:
+        empty_output = GetUploadSessionOutput(
+            upload_id="", agent_id=0, filename="", total_size=0, chunk_size=0,
+            total_chunks=0, received_size=0, next_chunk=0, status="", expires_at=datetime.min,
+        )
+        try:
+            user = await self.auth_service.verify_token(input.token)
+
+            now = datetime.fromisoformat(self.system_time_service.get_current_time())
+            session = await self.session_repo.find_by_id(input.upload_id)
+            if not session or session.is_expired(now):
+                raise UploadSessionNotFoundError(f"Upload session {input.upload_id} not found.")
+            if session.user_id.value != user.id.value:
+                raise PermissionError("User does not own this upload session.")
+
+            return self.presenter.output(session), None
+        except Exception as e:
+            return empty_output, e
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_get_upload_session_interactor(
+    presenter: "GetUploadSessionPresenter",
+    session_repo: UploadSessionRepository,
+    auth_service: AuthDomainService,
+    system_time_service: SystemTimeDomainService,
+) -> "GetUploadSessionUseCase":
+    return GetUploadSessionInteractor(
+        presenter=presenter,
+        session_repo=session_repo,
+        auth_service=auth_service,
+        system_time_service=system_time_service,
+    )
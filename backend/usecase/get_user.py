@@ -8,7 +8,7 @@ from domain.entities.user import User
 # Usecaseのインターフェース定義
 # ======================================
 class GetUserUseCase(Protocol):
-    def execute(
+    async def execute(
         self, input: "GetUserInput"
     ) -> Tuple["GetUserOutput", Exception | None]:
         ...
@@ -57,12 +57,12 @@ class GetUserInteractor:
         self.auth_service = auth_service
         self.timeout_sec = timeout_sec
 
-    def execute(
+    async def execute(
         self, input: GetUserInput
     ) -> Tuple["GetUserOutput", Exception | None]:
         try:
             # ドメインサービスにトークン検証とユーザー取得を委譲
-            user = self.auth_service.verify_token(input.token)
+            user = await self.auth_service.verify_token(input.token)
 
             # PresenterにUserエンティティを渡してOutput DTOを生成
             output = self.presenter.output(user)
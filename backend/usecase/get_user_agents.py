@@ -14,7 +14,7 @@ from domain.value_objects.id import ID
 # ======================================
 class GetUserAgentsUseCase(Protocol):
     """特定のユーザーが作成した全てのエージェントを取得するユースケースのインターフェース"""
-    def execute(
+    async def execute(
         self, input: "GetUserAgentsInput"
     ) -> Tuple["GetUserAgentsOutput", Exception | None]:
         ...
@@ -74,7 +74,7 @@ class GetUserAgentsInteractor:
         self.agent_repo = agent_repo
         self.auth_service = auth_service
 
-    def execute(
+    async def execute(
         self, input: GetUserAgentsInput
     ) -> Tuple["GetUserAgentsOutput", Exception | None]:
         """
@@ -84,11 +84,11 @@ class GetUserAgentsInteractor:
         
         try:
             # 1. トークンを検証してユーザー情報を取得
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             
             # 2. AgentRepositoryから特定の user_id に紐づく全てのエージェントを取得
             # 既存のリポジトリメソッド名 (list_by_user_id) を使用
-            agents_list: List[Agent] = self.agent_repo.list_by_user_id(user.id)
+            agents_list: List[Agent] = await self.agent_repo.list_by_user_id(user.id)
             
             # 3. Presenterに渡してOutput DTOに変換
             output = self.presenter.output(agents_list)
@@ -0,0 +1,156 @@
+import abc
+from dataclasses import dataclass
+from typing import Protocol, Tuple, Optional, List
+
+# ドメイン層の依存関係
+from domain.entities.weight_visualization import WeightVisualizationRepository
+from domain.entities.ownership import OwnershipRepository
+from domain.services.auth_domain_service import AuthDomainService
+from domain.value_objects.id import ID
+from domain.value_objects.weight_change_stats import WeightChangeStats
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class GetFinetuningJobWeightStatsUseCase(Protocol):
+    """特定のジョブの重み変化の統計 (画像を伴わない数値の要約) を取得するユースケースのインターフェース"""
+    async def execute(
+        self, input: "GetFinetuningJobWeightStatsInput"
+    ) -> Tuple["GetFinetuningJobWeightStatsOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput DTO
+# ======================================
+@dataclass
+class GetFinetuningJobWeightStatsInput:
+    """ユーザー認証トークンとジョブID。include_tensors が False の場合はレイヤー・モデル全体の統計のみ返す"""
+    token: str
+    job_id: int
+    include_tensors: bool = True
+
+
+# ======================================
+# Output DTO
+# ======================================
+@dataclass(frozen=True)
+class WeightChangeMetricsOutput:
+    numel: int
+    l2_delta: Optional[float]
+    l2_before: Optional[float]
+    relative_change: Optional[float]
+    cosine_similarity: Optional[float]
+    abs_delta_p50: Optional[float]
+    abs_delta_p90: Optional[float]
+    abs_delta_p99: Optional[float]
+    max_abs_delta: Optional[float]
+    sparsity: Optional[float]
+
+@dataclass(frozen=True)
+class TensorWeightChangeOutput:
+    name: str
+    metrics: WeightChangeMetricsOutput
+
+@dataclass(frozen=True)
+class LayerWeightChangeOutput:
+    layer_name: str
+    metrics: WeightChangeMetricsOutput
+    tensors: List[TensorWeightChangeOutput]
+
+@dataclass
+class GetFinetuningJobWeightStatsOutput:
+    """
+    重み変化の統計全体の最終的なOutput DTO。
+    統計が無いジョブ (統計の集計を導入する前のジョブ・可視化に失敗したジョブ) では model が None、layers が空。
+    """
+    job_id: int
+    sparsity_tolerance: Optional[float]
+    model: Optional[WeightChangeMetricsOutput]
+    layers: List[LayerWeightChangeOutput]
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class GetFinetuningJobWeightStatsPresenter(abc.ABC):
+    """値オブジェクトをOutput DTOに変換するPresenter"""
+    @abc.abstractmethod
+    def output(self, job_id: int, stats: WeightChangeStats, include_tensors: bool) -> GetFinetuningJobWeightStatsOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class GetFinetuningJobWeightStatsInteractor:
+    def __init__(
+        self,
+        presenter: "GetFinetuningJobWeightStatsPresenter",
+        vis_repo: WeightVisualizationRepository,
+        ownership_repo: OwnershipRepository, # 所有権チェック (ジョブ→エージェント) を1回で解決する
+        auth_service: AuthDomainService,
+    ):
+        self.presenter = presenter
+        self.vis_repo = vis_repo
+        self.ownership_repo = ownership_repo
+        self.auth_service = auth_service
+
+    async def execute(
+        self, input: GetFinetuningJobWeightStatsInput
+    ) -> Tuple["GetFinetuningJobWeightStatsOutput", Exception | None]:
+
+        empty_output = GetFinetuningJobWeightStatsOutput(
+            job_id=input.job_id, sparsity_tolerance=None, model=None, layers=[]
+        )
+
+        try:
+            # 1. トークンを検証してユーザー情報を取得 (認証)
+            user = await self.auth_service.verify_token(input.token)
+
+            job_id_obj = ID(input.job_id)
+
+            # 2. ジョブの存在確認と所有権チェック (セキュリティ)
+            chain = await self.ownership_repo.resolve_by_job_id(job_id_obj, user.id)
+            if not chain:
+                raise ValueError(f"Finetuning Job with ID {input.job_id} not found.")
+
+            # 2a. UserがAgentの所有者であることを確認
+            if not chain.is_owner:
+                 raise PermissionError("User does not have access to this job's data.")
+
+            # 3. 統計だけを取得する (画像のパス一覧は読まない)
+            stats = await self.vis_repo.find_stats_by_job_id(job_id_obj)
+
+            if not stats:
+                # 統計が無い場合は、エラーではなく空の統計を返す (404ではない)
+                return empty_output, None
+
+            # 4. Presenterに渡してOutput DTOに変換
+            output = self.presenter.output(input.job_id, stats, input.include_tensors)
+            return output, None
+
+        except (ValueError, PermissionError) as e:
+            # 認証エラー、権限エラー、ジョブが見つからないエラー
+            return empty_output, e
+        except Exception as e:
+            # DBエラーなどのその他のシステムエラー
+            return empty_output, e
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_get_finetuning_job_weight_stats_interactor(
+    presenter: "GetFinetuningJobWeightStatsPresenter",
+    vis_repo: WeightVisualizationRepository,
+    ownership_repo: OwnershipRepository,
+    auth_service: AuthDomainService,
+) -> "GetFinetuningJobWeightStatsUseCase":
+    return GetFinetuningJobWeightStatsInteractor(
+        presenter=presenter,
+        vis_repo=vis_repo,
+        ownership_repo=ownership_repo,
+        auth_service=auth_service,
+    )
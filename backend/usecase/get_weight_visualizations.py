@@ -1,11 +1,10 @@
 import abc
-from dataclasses import dataclass
-from typing import Protocol, Tuple, Optional, List, Any
+from dataclasses import dataclass, field
+from typing import Protocol, Tuple, Optional, List, Any, Dict
 
 # ドメイン層の依存関係
 from domain.entities.weight_visualization import WeightVisualization, WeightVisualizationRepository
-from domain.entities.finetuning_job import FinetuningJobRepository
-from domain.entities.agent import AgentRepository
+from domain.entities.ownership import OwnershipRepository
 from domain.services.auth_domain_service import AuthDomainService
 from domain.value_objects.id import ID
 
@@ -15,7 +14,7 @@ from domain.value_objects.id import ID
 # ======================================
 class GetFinetuningJobVisualizationUseCase(Protocol):
     """特定のジョブの重み可視化データを取得するユースケースのインターフェース"""
-    def execute(
+    async def execute(
         self, input: "GetFinetuningJobVisualizationInput"
     ) -> Tuple["GetFinetuningJobVisualizationOutput", Exception | None]:
         ...
@@ -34,12 +33,21 @@ class GetFinetuningJobVisualizationInput:
 # ======================================
 # Output DTO (Value Object のリストを JSON フレンドリーに変換)
 # ======================================
+@dataclass(frozen=True)
+class ColorRangeOutput:
+    vmin: float
+    vmax: float
+    cmap: str
+    legend_url: str
+
 @dataclass(frozen=True)
 class WeightVisualizationDetail:
     name: str
     before_url: str
     after_url: str
     delta_url: str
+    # 画像の種類 (before / after / delta) → 色範囲 (記録されていないジョブでは空)
+    color_ranges: Dict[str, ColorRangeOutput] = field(default_factory=dict)
 
 @dataclass(frozen=True)
 class LayerVisualizationOutput:
@@ -71,17 +79,15 @@ class GetFinetuningJobVisualizationInteractor:
         self,
         presenter: "GetFinetuningJobVisualizationPresenter",
         vis_repo: WeightVisualizationRepository,
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository, # 所有権チェックのために AgentRepository も必要
+        ownership_repo: OwnershipRepository, # 所有権チェック (ジョブ→エージェント) を1回で解決する
         auth_service: AuthDomainService,
     ):
         self.presenter = presenter
         self.vis_repo = vis_repo
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
 
-    def execute(
+    async def execute(
         self, input: GetFinetuningJobVisualizationInput
     ) -> Tuple["GetFinetuningJobVisualizationOutput", Exception | None]:
         
@@ -89,22 +95,21 @@ class GetFinetuningJobVisualizationInteractor:
         
         try:
             # 1. トークンを検証してユーザー情報を取得 (認証)
-            user = self.auth_service.verify_token(input.token)
+            user = await self.auth_service.verify_token(input.token)
             
             job_id_obj = ID(input.job_id)
 
             # 2. ジョブの存在確認と所有権チェック (セキュリティ)
-            job = self.job_repo.find_by_id(job_id_obj)
-            if not job:
+            chain = await self.ownership_repo.resolve_by_job_id(job_id_obj, user.id)
+            if not chain:
                 raise ValueError(f"Finetuning Job with ID {input.job_id} not found.")
 
-            # 2a. Agentを取得し、UserがAgentの所有者であることを確認
-            agent = self.agent_repo.find_by_id(job.agent_id)
-            if not agent or agent.user_id.value != user.id.value:
+            # 2a. UserがAgentの所有者であることを確認
+            if not chain.is_owner:
                  raise PermissionError("User does not have access to this job's data.")
             
             # 3. Visualization Repositoryからデータを取得
-            visualization = self.vis_repo.find_by_job_id(job_id_obj)
+            visualization = await self.vis_repo.find_by_job_id(job_id_obj)
             
             if not visualization:
                 # データが見つからない場合は、エラーではなく空のリストを返す (404ではない)
@@ -128,14 +133,12 @@ class GetFinetuningJobVisualizationInteractor:
 def new_get_finetuning_job_visualization_interactor(
     presenter: "GetFinetuningJobVisualizationPresenter",
     vis_repo: WeightVisualizationRepository,
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
 ) -> "GetFinetuningJobVisualizationUseCase":
     return GetFinetuningJobVisualizationInteractor(
         presenter=presenter,
         vis_repo=vis_repo,
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
     )
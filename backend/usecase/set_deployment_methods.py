@@ -1,14 +1,14 @@
 import abc
+import asyncio
 from dataclasses import dataclass
 from typing import Protocol, Tuple, Optional, List
 
 # ドメイン層の依存関係
-from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
-from domain.entities.agent import Agent, AgentRepository
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
 from domain.entities.user import User
 from domain.services.auth_domain_service import AuthDomainService
 from domain.value_objects.id import ID
-from domain.entities.deployment import Deployment, DeploymentRepository
+from domain.entities.deployment import Deployment
 from domain.entities.methods import DeploymentMethods, DeploymentMethodsRepository
 from domain.value_objects.method import Method
 # --- ロジックの核 ---
@@ -23,7 +23,7 @@ class SetDeploymentMethodsUseCase(Protocol):
     特定のデプロイメントに紐づくメソッド（機能）を
     （上書き）設定するユースケースのインターフェース
     """
-    def execute(
+    async def execute(
         self, input: "SetDeploymentMethodsInput"
     ) -> Tuple["SetDeploymentMethodsOutput", Exception | None]:
         ...
@@ -75,21 +75,17 @@ class SetDeploymentMethodsInteractor:
         self,
         presenter: "SetDeploymentMethodsPresenter",
         methods_repo: DeploymentMethodsRepository,
-        deployment_repo: DeploymentRepository,
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository,
+        ownership_repo: OwnershipRepository,
         auth_service: AuthDomainService,
         method_finder_service: JobMethodFinderDomainService
     ):
         self.presenter = presenter
         self.methods_repo = methods_repo
-        self.deployment_repo = deployment_repo
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
         self.method_finder_service = method_finder_service
 
-    def execute(
+    async def execute(
         self, input: SetDeploymentMethodsInput
     ) -> Tuple["SetDeploymentMethodsOutput", Exception | None]:
         """
@@ -100,29 +96,24 @@ class SetDeploymentMethodsInteractor:
         
         try:
             # 1. 認証 (Auth)
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             
-            # 2. ジョブ取得 (Find Job)
+            # 2. ジョブ・エージェント・デプロイメントを一括取得 (Resolve Ownership)
             job_id_vo = ID(input.job_id)
-            job: Optional[FinetuningJob] = self.job_repo.find_by_id(job_id_vo)
+            chain: Optional[OwnershipChain] = await self.ownership_repo.resolve_by_job_id(job_id_vo, user.id)
             
-            if job is None:
+            if chain is None:
                 raise FileNotFoundError(f"Job {input.job_id} not found.")
 
             # 3. 権限チェック (Check Permission)
-            agent: Optional[Agent] = self.agent_repo.find_by_id(job.agent_id)
-            
-            if agent is None:
-                raise FileNotFoundError(f"Agent {job.agent_id} (for job {job.id}) not found.")
-            
-            if agent.user_id != user.id:
+            if not chain.is_owner:
                 raise PermissionError(
                     "User does not have permission to set methods for this job."
                 )
             # ▲▲▲ 修正箇所 ▲▲▲
 
-            # 4. 親となるデプロイメントを取得
-            deployment: Optional[Deployment] = self.deployment_repo.find_by_job_id(job_id_vo)
+            # 4. 親となるデプロイメントを取得 (所有関係と同時に取得済み)
+            deployment: Optional[Deployment] = chain.deployment
             
             if deployment is None:
                 raise FileNotFoundError(
@@ -132,10 +123,12 @@ class SetDeploymentMethodsInteractor:
             # 5. ロジック本体 (Find & Save Methods)
             
             # 5a. ドメインサービスを使って「登録すべきメソッド」を取得
-            method_vos: List[Method] = self.method_finder_service.find_methods_by_job_id(job_id_vo)
+            method_vos: List[Method] = await asyncio.to_thread(
+                self.method_finder_service.find_methods_by_job_id, job_id_vo
+            )
             
             # 5b. 既存のメソッドエンティティを探す
-            existing_methods: Optional[DeploymentMethods] = self.methods_repo.find_by_deployment_id(deployment.id)
+            existing_methods: Optional[DeploymentMethods] = await self.methods_repo.find_by_deployment_id(deployment.id)
 
             if existing_methods:
                 # 存在する場合：更新（上書き）
@@ -151,7 +144,7 @@ class SetDeploymentMethodsInteractor:
                 )
             
             # 5c. リポジトリに保存（作成または更新）を依頼
-            saved_methods: DeploymentMethods = self.methods_repo.save(methods_to_save)
+            saved_methods: DeploymentMethods = await self.methods_repo.save(methods_to_save)
 
             # 6. Presenterに渡してOutput DTOに変換
             output = self.presenter.output(saved_methods)
@@ -170,18 +163,14 @@ class SetDeploymentMethodsInteractor:
 def new_set_deployment_methods_interactor(
     presenter: "SetDeploymentMethodsPresenter",
     methods_repo: DeploymentMethodsRepository,
-    deployment_repo: DeploymentRepository,
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
     method_finder_service: JobMethodFinderDomainService
 ) -> "SetDeploymentMethodsUseCase":
     return SetDeploymentMethodsInteractor(
         presenter=presenter,
         methods_repo=methods_repo,
-        deployment_repo=deployment_repo,
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
         method_finder_service=method_finder_service
     )
\ No newline at end of file
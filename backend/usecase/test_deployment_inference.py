@@ -3,12 +3,11 @@ from dataclasses import dataclass
 from typing import Protocol, Tuple, Optional, List, Dict, Any
 
 # ドメイン層の依存関係
-from domain.entities.finetuning_job import FinetuningJob, FinetuningJobRepository
-from domain.entities.agent import Agent, AgentRepository
+from domain.entities.ownership import OwnershipChain, OwnershipRepository
 from domain.entities.user import User
 from domain.services.auth_domain_service import AuthDomainService
 from domain.value_objects.id import ID
-from domain.entities.deployment import Deployment, DeploymentRepository
+from domain.entities.deployment import Deployment
 from domain.value_objects.file_data import UploadedFileStream 
 
 # --- 新しいドメインサービスとV.O. ---
@@ -79,16 +78,12 @@ class TestDeploymentInferenceInteractor:
     def __init__(
         self,
         presenter: "TestDeploymentInferencePresenter",
-        deployment_repo: DeploymentRepository,
-        job_repo: FinetuningJobRepository,
-        agent_repo: AgentRepository,
+        ownership_repo: OwnershipRepository,
         auth_service: AuthDomainService,
         test_service: DeploymentTestDomainService
     ):
         self.presenter = presenter
-        self.deployment_repo = deployment_repo
-        self.job_repo = job_repo
-        self.agent_repo = agent_repo
+        self.ownership_repo = ownership_repo
         self.auth_service = auth_service
         self.test_service = test_service
 
@@ -99,24 +94,18 @@ class TestDeploymentInferenceInteractor:
         
         try:
             # 1. 認証 (Auth)
-            user: User = self.auth_service.verify_token(input.token)
+            user: User = await self.auth_service.verify_token(input.token)
             
-            # 2. デプロイメントの取得
+            # 2. デプロイメント・ジョブ・エージェントを1回の問い合わせで取得
             deployment_id_vo = ID(input.deployment_id)
-            deployment: Optional[Deployment] = self.deployment_repo.find_by_id(deployment_id_vo)
+            chain: Optional[OwnershipChain] = await self.ownership_repo.resolve_by_deployment_id(deployment_id_vo, user.id)
+            deployment: Optional[Deployment] = chain.deployment if chain else None
             
             if deployment is None or deployment.endpoint is None:
                 raise FileNotFoundError("Deployment not found or endpoint is not active.")
 
-            # 3. Job ID と Agent ID を辿り、権限チェック
-            job_id_vo = deployment.job_id
-            job: Optional[FinetuningJob] = self.job_repo.find_by_id(job_id_vo)
-            
-            if job is None:
-                raise FileNotFoundError(f"Job {job_id_vo.value} not found (Deployment linked to non-existent job).")
-
-            agent: Optional[Agent] = self.agent_repo.find_by_id(job.agent_id)
-            if agent is None or agent.user_id != user.id:
+            # 3. 権限チェック
+            if not chain.is_owner:
                 raise PermissionError("User does not have permission to run tests for this deployment.")
 
             # 4. ロジック本体: テストサービスを使って推論テストを実行
@@ -144,17 +133,13 @@ class TestDeploymentInferenceInteractor:
 # ======================================
 def new_test_deployment_inference_interactor(
     presenter: "TestDeploymentInferencePresenter",
-    deployment_repo: DeploymentRepository,
-    job_repo: FinetuningJobRepository,
-    agent_repo: AgentRepository,
+    ownership_repo: OwnershipRepository,
     auth_service: AuthDomainService,
     test_service: DeploymentTestDomainService
 ) -> "TestDeploymentInferenceUseCase":
     return TestDeploymentInferenceInteractor(
         presenter=presenter,
-        deployment_repo=deployment_repo,
-        job_repo=job_repo,
-        agent_repo=agent_repo,
+        ownership_repo=ownership_repo,
         auth_service=auth_service,
         test_service=test_service
     )
\ No newline at end of file
@@ -0,0 +1,163 @@
+import abc
+import asyncio
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Protocol, Tuple, Optional
+
+# ドメイン層の依存関係
+from domain.entities.upload_session import (
+    UploadSession,
+    UploadSessionRepository,
+    UploadSessionNotFoundError,
+    UploadSessionConflictError,
+    UPLOAD_SESSION_OPEN,
+)
+from domain.services.auth_domain_service import AuthDomainService
+from domain.services.file_storage_domain_service import FileStorageDomainService
+from domain.services.system_time_domain_service import SystemTimeDomainService
+
+
+# ======================================
+# Usecaseのインターフェース定義
+# ======================================
+class UploadChunkUseCase(Protocol):
+    async def execute(
+        self, input: "UploadChunkInput"
+    ) -> Tuple["UploadChunkOutput", Exception | None]:
+        ...
+
+
+# ======================================
+# UsecaseのInput
+# ======================================
+@dataclass
+class UploadChunkInput:
+    token: str
+    upload_id: str
+    index: int
+    data: bytes
+    # チャンク内容の SHA-256 (16進文字列)。転送中の破損を検出する
+    sha256: Optional[str]
+
+
+# ======================================
+# Output DTO
+# ======================================
+@dataclass
+class UploadChunkOutput:
+    upload_id: str
+    total_size: int
+    chunk_size: int
+    total_chunks: int
+    received_size: int
+    next_chunk: int
+    is_complete: bool
+
+
+# ======================================
+# Presenterのインターフェース定義
+# ======================================
+class UploadChunkPresenter(abc.ABC):
+    @abc.abstractmethod
+    def output(self, session: UploadSession) -> UploadChunkOutput:
+        pass
+
+
+# ======================================
+# Usecaseの具体的な実装 (Interactor)
+# ======================================
+class UploadChunkInteractor:
+    """
+    番号付きのチャンクを1つ受け取り、ストレージ上の一時ファイルの該当オフセットに書き込む。
+    チャンクは順番に受け付ける (next_chunk 以外は 409)。受信済みのチャンクの再送は成功として扱うので、
+    応答を受け取れずに再送した場合も安全に続行できる。
+    """
+    def __init__(
+        self,
+        presenter: "UploadChunkPresenter",
+        session_repo: UploadSessionRepository,
+        auth_service: AuthDomainService,
+        file_storage_service: FileStorageDomainService,
+        system_time_service: SystemTimeDomainService,
+    ):
+        self.presenter = presenter
+        self.session_repo = session_repo
+        self.auth_service = auth_service
+        self.file_storage_service = file_storage_service
+        self.system_time_service = system_time_service
+
+    async def execute(
+        self, input: UploadChunkInput
+    ) -> Tuple["UploadChunkOutput", Exception | None]:
+        empty_output = UploadChunkOutput(
+            upload_id="", total_size=0, chunk_size=0, total_chunks=0,
+            received_size=0, next_chunk=0, is_complete=False,
+        )
+        try:
+            # 1. 認証とセッションの所有権チェック
+            user = await self.auth_service.verify_token(input.token)
+
+            now = datetime.fromisoformat(self.system_time_service.get_current_time())
+            session = await self.session_repo.find_by_id(input.upload_id)
+            if not session or session.is_expired(now):
+                raise UploadSessionNotFoundError(f"Upload session {input.upload_id} not found.")
+            if session.user_id.value != user.id.value:
+                raise PermissionError("User does not own this upload session.")
+            if session.status != UPLOAD_SESSION_OPEN:
+                raise UploadSessionConflictError(f"Upload session {input.upload_id} is already {session.status}.")
+
+            # 2. チャンクのサイズとチェックサムを検証
+            offset, expected_size = session.chunk_range(input.index)
+            if len(input.data) != expected_size:
+                raise ValueError(
+                    f"Chunk {input.index} must be {expected_size} bytes, got {len(input.data)}."
+                )
+            if not input.sha256:
+                raise ValueError("X-Chunk-SHA256 header is required.")
+            actual_sha256 = await asyncio.to_thread(lambda: hashlib.sha256(input.data).hexdigest())
+            if actual_sha256 != input.sha256.strip().lower():
+                raise ValueError(f"Checksum mismatch for chunk {input.index}.")
+
+            # 3. 受信済みのチャンクの再送はそのまま現在のオフセットを返す
+            end = offset + expected_size
+            if end <= session.received_size:
+                return self.presenter.output(session), None
+            if offset != session.received_size:
+                raise UploadSessionConflictError(
+                    f"Expected chunk {session.next_chunk}, got chunk {input.index}."
+                )
+
+            # 4. 一時ファイルに書き込んでから受信済みサイズを進める
+            # (書き込み後に失敗した場合もオフセットは進まないので、同じチャンクを再送すれば上書きされる)
+            await asyncio.to_thread(self.file_storage_service.write_upload_chunk, session.id, offset, input.data)
+            if not await self.session_repo.advance(session.id, offset, end):
+                # 同じチャンクが並行して送られた場合は、先に進めた側の結果を返す
+                latest = await self.session_repo.find_by_id(session.id)
+                if not latest or latest.status != UPLOAD_SESSION_OPEN or latest.received_size < end:
+                    raise UploadSessionConflictError(f"Upload session {input.upload_id} was modified concurrently.")
+                return self.presenter.output(latest), None
+            session.received_size = end
+
+            return self.presenter.output(session), None
+        except Exception as e:
+            return empty_output, e
+
+
+# ======================================
+# Usecaseインスタンスを生成するファクトリ関数
+# ======================================
+def new_upload_chunk_interactor(
+    presenter: "UploadChunkPresenter",
+    session_repo: UploadSessionRepository,
+    auth_service: AuthDomainService,
+    file_storage_service: FileStorageDomainService,
+    system_time_service: SystemTimeDomainService,
+) -> "UploadChunkUseCase":
+    return UploadChunkInteractor(
+        presenter=presenter,
+        session_repo=session_repo,
+        auth_service=auth_service,
+        file_storage_service=file_storage_service,
+        system_time_service=system_time_service,
+    )
@@ -7,7 +7,7 @@ import Cookies from "js-cookie";
 // Fetch 関連
 import { getUser } from "@/fetchs/get_user/get_user";
 import { getUserAgents, AgentListItem } from "@/fetchs/get_user_agents/get_user_agents";
-import { getAgentFinetuningJobs } from "@/fetchs/get_agent_finetuning_jobs/get_agent_finetuning_jobs";
+import { getAllAgentFinetuningJobs } from "@/fetchs/get_agent_finetuning_jobs/get_agent_finetuning_jobs";
 import { getFinetuningJobDeployment, GetFinetuningJobDeploymentResponse } from "@/fetchs/get_finetuning_job_deployment/get_finetuning_job_deployment";
 import { getDeploymentMethods } from "@/fetchs/get_deployment_methods/get_deployment_methods";
 import { testDeploymentInference } from "@/fetchs/test_deployment_inference/test_deployment_inference";
@@ -85,18 +85,19 @@ export default function DeploymentDetailPage({ params }: DeploymentDetailPagePro
         );
         if (!foundAgent) notFound();
 
-        const jobsRes = await getAgentFinetuningJobs(foundAgent.id, token);
+        // 一覧はページ単位のため next_cursor を辿って全件取得する
+        const jobsRes = await getAllAgentFinetuningJobs(foundAgent.id, token);
         const foundJob = jobsRes.jobs.find(
           (j) => Number(j.id) === Number(deploymentid)
         );
         if (!foundJob) notFound();
 
-        const JobStatusUnion = ["completed", "running", "failed", "queued"];
+        const JobStatusUnion = ["completed", "running", "failed", "queued", "uploading"];
         const isStatusValid = JobStatusUnion.includes(foundJob.status.toLowerCase());
         const safeJobData = {
           ...foundJob,
           status: isStatusValid
-            ? (foundJob.status as "completed" | "running" | "failed" | "queued")
+            ? (foundJob.status as "completed" | "running" | "failed" | "queued" | "uploading")
             : "failed",
         } as FinetuningJobListItem;
 
@@ -8,7 +8,7 @@ import Cookies from "js-cookie";
 import { getUserAgents, AgentListItem } from "@/fetchs/get_user_agents/get_user_agents";
 // ★★★ 修正1: Fetcherの名前とパスを新しいものに置き換え ★★★
 import { 
-  getAgentFinetuningJobs, // ★ 関数名を修正
+  getAllAgentFinetuningJobs, // ★ 関数名を修正
   FinetuningJobListItem, // ★ 型のインポート元も修正
 } from "@/fetchs/get_agent_finetuning_jobs/get_agent_finetuning_jobs"; 
 // ▲▲▲ 修正ここまで ▲▲▲
@@ -17,6 +17,7 @@ import {
   getWeightVisualizations, 
   GetWeightVisualizationsResponse, 
 } from "@/fetchs/get_weight_visualizations/get_weight_visualizations";
+import { getWeightStats, GetWeightStatsResponse } from "@/fetchs/get_weight_stats/get_weight_stats";
 import { API_URL } from "@/fetchs/config"; 
 
 import type { Agent, FinetuningJob, Visualizations } from "@/lib/data";
@@ -25,6 +26,7 @@ import JobDetailHeader from "@/components/finetuning/JobDetailHeader";
 import JobSummaryCard from "@/components/finetuning/JobSummaryCard";
 import TrainingDataCard from "@/components/finetuning/TrainingDataCard";
 import WeightVisualizationAccordion from "@/components/finetuning/WeightVisualizationAccordion";
+import WeightChangeSummaryCard from "@/components/finetuning/WeightChangeSummaryCard";
 import JobDangerZone from "@/components/finetuning/JobDangerZone";
 
 
@@ -46,6 +48,7 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
   const [agentData, setAgentData] = useState<AgentListItem | null>(null);
   const [jobData, setJobData] = useState<FinetuningJobListItem | null>(null);
   const [visualizations, setVisualizations] = useState<GetWeightVisualizationsResponse | undefined>(undefined);
+  const [weightStats, setWeightStats] = useState<GetWeightStatsResponse | undefined>(undefined);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
 
@@ -76,8 +79,8 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
         }
         
         // 2. ★★★ 修正2: Agent IDを使ってジョブ一覧を取得 ★★★
-        // jobsResponse の型は GetAgentFinetuningJobsResponse になる
-        const jobsResponse = await getAgentFinetuningJobs(foundAgent.id, token);
+        // jobsResponse の型は GetAgentFinetuningJobsResponse になる (一覧はページ単位のため next_cursor を辿って全件取得する)
+        const jobsResponse = await getAllAgentFinetuningJobs(foundAgent.id, token);
         
         // 3. ★★★ 修正3: 取得したリストの中から jobid と一致するものを探す ★★★
         const foundJob = jobsResponse.jobs.find(
@@ -97,8 +100,14 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
         }
 
         let foundVisualizations: GetWeightVisualizationsResponse | undefined = undefined;
+        let foundWeightStats: GetWeightStatsResponse | undefined = undefined;
         
         if (foundJob.status === "completed") {
+            // 統計 (数値の要約) は画像の一覧と並行して取得する。表にはレイヤー単位の値だけを使う
+            const weightStatsPromise = getWeightStats(token, jobid, false).catch((statsError) => {
+                console.warn(`WARN: Could not fetch weight stats for job ${jobid}.`, statsError);
+                return undefined;
+            });
             try {
                 const rawVisualizations = await getWeightVisualizations(token, jobid);
                 
@@ -111,6 +120,12 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
                             before_url: `${VISUALS_BASE_URL}${weight.before_url}`,
                             after_url: `${VISUALS_BASE_URL}${weight.after_url}`,
                             delta_url: `${VISUALS_BASE_URL}${weight.delta_url}`,
+                            color_ranges: Object.fromEntries(
+                                Object.entries(weight.color_ranges ?? {}).map(([imageType, color]) => [
+                                    imageType,
+                                    color && { ...color, legend_url: color.legend_url ? `${VISUALS_BASE_URL}${color.legend_url}` : "" },
+                                ])
+                            ),
                         }))
                     }))
                 };
@@ -120,11 +135,13 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
             } catch (visError) {
                 console.warn(`WARN: Could not fetch visualizations for job ${jobid}.`, visError);
             }
+            foundWeightStats = await weightStatsPromise;
         }
         
         setJobData(foundJob);
         setAgentData(foundAgent);
         setVisualizations(foundVisualizations);
+        setWeightStats(foundWeightStats);
 
       } catch (e: unknown) {
         console.error("Failed to fetch job/agent data:", e);
@@ -187,6 +204,8 @@ export default function JobDetailPage({ params }: JobDetailPageProps) {
         <TrainingDataCard job={job} />
       </div>
 
+      {weightStats && <WeightChangeSummaryCard stats={weightStats} />}
+
       {visualizationsCasted && (
         <WeightVisualizationAccordion visualizations={visualizationsCasted} />
       )}
@@ -13,13 +13,13 @@ import Cookies from "js-cookie";
 
 // Finetuning Jobs Fetcherと型をインポート
 import { 
-  getAgentFinetuningJobs, 
+  getAllAgentFinetuningJobs, 
   FinetuningJobListItem, 
 } from "@/fetchs/get_agent_finetuning_jobs/get_agent_finetuning_jobs"; 
 
 // Deployments Fetcherと型をインポート
 import { 
-    getAgentDeployments, 
+    getAllAgentDeployments, 
     DeploymentListItem, 
 } from "@/fetchs/get_agent_deployments/get_agent_deployments";
 
@@ -100,8 +100,9 @@ export default function AgentPage({
 
 
         // --- データ取得ロジック ---
-        // 1. ジョブ一覧は常に取得
-        const jobsResponse = await getAgentFinetuningJobs(foundAgent.id, token);
+        // 1. ジョブ一覧は常に取得 (一覧 API はページ単位のため next_cursor を辿って全件取得する。
+        //    デプロイメントとの差分を取るため、どちらも全件が必要)
+        const jobsResponse = await getAllAgentFinetuningJobs(foundAgent.id, token);
         const jobsList = jobsResponse.jobs;
         setFinetuningJobs(jobsList);
         console.log(`[DEBUG] Total Jobs Found: ${jobsList.length}`);
@@ -111,11 +112,11 @@ export default function AgentPage({
         let existingDeployments: DeploymentListItem[] = [];
         try {
             console.log("[DEBUG] 1/3. Attempting to fetch existing deployments...");
-            const deploymentsResponse = await getAgentDeployments(foundAgent.id, token);
+            const deploymentsResponse = await getAllAgentDeployments(foundAgent.id, token);
             existingDeployments = deploymentsResponse.deployments;
             console.log(`[DEBUG] Found existing deployments: ${existingDeployments.length}`);
         } catch (e) {
-            console.warn("[DEBUG] WARN: getAgentDeployments failed (expected for 404/empty). Assuming empty list.");
+            console.warn("[DEBUG] WARN: getAllAgentDeployments failed (expected for 404/empty). Assuming empty list.");
         }
         
         // 3. ★★★ 差分を計算し、必要なデプロイメントを作成 / メソッド設定 ★★★
@@ -4,7 +4,7 @@ import { useEffect, useState } from "react";
 import Cookies from "js-cookie";
 import { getUser, GetUserResponse } from "@/fetchs/get_user/get_user";
 import { getUserAgents, GetUserAgentsResponse } from "@/fetchs/get_user_agents/get_user_agents";
-import { getAgents, GetAgentsResponse } from "@/fetchs/get_agents/get_agents";
+import { getAllAgents, GetAgentsResponse } from "@/fetchs/get_agents/get_agents";
 import { UserProfileCard } from "@/components/home/UserProfileCard";
 import { UserAgentsList } from "@/components/home/UserAgentsList";
 import { FeedCard } from "@/components/home/FeedCard";
@@ -29,7 +29,7 @@ export default function HomePage() {
         const [userData, userAgentsData, allAgentsData] = await Promise.all([
           getUser(token),
           getUserAgents(token),
-          getAgents(),
+          getAllAgents(),
         ]);
         setUser(userData);
         setUserAgents(userAgentsData.agents);
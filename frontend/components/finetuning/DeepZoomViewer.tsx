@@ -0,0 +1,205 @@
+"use client";
+import { useCallback, useEffect, useRef, useState } from "react";
+import Image from "next/image";
+
+// 重みのヒートマップを Deep Zoom (DZI) のタイルピラミッドで拡大表示するビューア。
+// 画像URL (.../<重み名>_delta.png) の .dzi から全体の大きさを読み、表示範囲・倍率に合うレベルのタイルだけを取得する。
+// .dzi が無いジョブ (画像を事前に描画したジョブ) では、従来どおり画像全体を表示する。
+
+type DeepZoomViewerProps = {
+  imageUrl: string;
+  alt: string;
+};
+
+type DziInfo = {
+  width: number;
+  height: number;
+  tileSize: number;
+  format: string;
+  maxLevel: number;
+};
+
+// 表示位置: 画像の画素 (px, py) は画面上の (x + px * scale, y + py * scale) に描かれる
+type View = { scale: number; x: number; y: number };
+
+// 拡大の上限 (画面の1画素あたりの重み行列の要素数の逆数)
+const MAX_SCALE = 32;
+
+const toDziUrl = (imageUrl: string) => imageUrl.replace(/\.png$/, ".dzi");
+const toTileBaseUrl = (imageUrl: string) => imageUrl.replace(/\.png$/, "_files");
+
+const parseDzi = (xml: string): DziInfo | null => {
+  const doc = new DOMParser().parseFromString(xml, "application/xml");
+  const image = doc.getElementsByTagName("Image")[0];
+  const size = doc.getElementsByTagName("Size")[0];
+  if (!image || !size) return null;
+  const width = Number(size.getAttribute("Width"));
+  const height = Number(size.getAttribute("Height"));
+  const tileSize = Number(image.getAttribute("TileSize"));
+  if (!width || !height || !tileSize) return null;
+  return {
+    width,
+    height,
+    tileSize,
+    format: image.getAttribute("Format") || "png",
+    // 最も細かいレベル (行列の1要素 = 1画素)。レベル0は1x1画素
+    maxLevel: Math.ceil(Math.log2(Math.max(width, height, 1))),
+  };
+};
+
+export default function DeepZoomViewer({ imageUrl, alt }: DeepZoomViewerProps) {
+  const containerRef = useRef<HTMLDivElement>(null);
+  const dragRef = useRef<{ x: number; y: number } | null>(null);
+  const [dzi, setDzi] = useState<DziInfo | null>(null);
+  const [unavailable, setUnavailable] = useState(false);
+  const [size, setSize] = useState({ width: 0, height: 0 });
+  const [view, setView] = useState<View | null>(null);
+
+  // 記述子の取得 (無ければ画像全体の表示に切り替える)
+  useEffect(() => {
+    let cancelled = false;
+    setDzi(null);
+    setView(null);
+    setUnavailable(false);
+    fetch(toDziUrl(imageUrl))
+      .then((res) => (res.ok ? res.text() : Promise.reject(new Error(`HTTP ${res.status}`))))
+      .then((xml) => {
+        if (cancelled) return;
+        const info = parseDzi(xml);
+        if (info) setDzi(info);
+        else setUnavailable(true);
+      })
+      .catch(() => !cancelled && setUnavailable(true));
+    return () => {
+      cancelled = true;
+    };
+  }, [imageUrl]);
+
+  // 表示領域の大きさを追跡する
+  useEffect(() => {
+    const element = containerRef.current;
+    if (!element) return;
+    const observer = new ResizeObserver(([entry]) => {
+      setSize({ width: entry.contentRect.width, height: entry.contentRect.height });
+    });
+    observer.observe(element);
+    return () => observer.disconnect();
+  }, [unavailable]);
+
+  const fitView = useCallback((): View | null => {
+    if (!dzi || !size.width || !size.height) return null;
+    const scale = Math.min(size.width / dzi.width, size.height / dzi.height);
+    return {
+      scale,
+      x: (size.width - dzi.width * scale) / 2,
+      y: (size.height - dzi.height * scale) / 2,
+    };
+  }, [dzi, size]);
+
+  // 初回は全体が収まる倍率にする
+  useEffect(() => {
+    if (!view) setView(fitView());
+  }, [view, fitView]);
+
+  // ホイールで拡大・縮小 (カーソル位置を中心にする)。ダイアログがスクロールしないよう passive: false で登録する
+  useEffect(() => {
+    const element = containerRef.current;
+    if (!element) return;
+    const onWheel = (event: WheelEvent) => {
+      event.preventDefault();
+      const rect = element.getBoundingClientRect();
+      const mx = event.clientX - rect.left;
+      const my = event.clientY - rect.top;
+      setView((current) => {
+        const fit = fitView();
+        if (!current || !fit) return current;
+        const scale = Math.min(Math.max(current.scale * Math.exp(-event.deltaY * 0.002), fit.scale / 2), MAX_SCALE);
+        const ratio = scale / current.scale;
+        return { scale, x: mx - (mx - current.x) * ratio, y: my - (my - current.y) * ratio };
+      });
+    };
+    element.addEventListener("wheel", onWheel, { passive: false });
+    return () => element.removeEventListener("wheel", onWheel);
+  }, [fitView, unavailable]);
+
+  if (unavailable) {
+    return (
+      <Image
+        src={imageUrl}
+        alt={alt}
+        width={1200}
+        height={800}
+        className="h-auto w-full rounded-md object-contain max-h-[80vh]"
+        unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
+      />
+    );
+  }
+
+  // 表示倍率に合うレベル (レベルの1画素が画面の1画素以上になる最も粗いレベル) と、見えている範囲のタイル
+  const tiles: { key: string; src: string; left: number; top: number; width: number; height: number }[] = [];
+  if (dzi && view) {
+    const level = Math.min(dzi.maxLevel, Math.max(0, dzi.maxLevel + Math.ceil(Math.log2(view.scale))));
+    const factor = 2 ** (dzi.maxLevel - level);
+    const span = dzi.tileSize * factor; // タイル1枚が覆う元の画素数
+    const lastColumn = Math.ceil(dzi.width / span) - 1;
+    const lastRow = Math.ceil(dzi.height / span) - 1;
+    const firstVisibleColumn = Math.max(0, Math.floor(-view.x / view.scale / span));
+    const lastVisibleColumn = Math.min(lastColumn, Math.floor((size.width - view.x) / view.scale / span));
+    const firstVisibleRow = Math.max(0, Math.floor(-view.y / view.scale / span));
+    const lastVisibleRow = Math.min(lastRow, Math.floor((size.height - view.y) / view.scale / span));
+    const baseUrl = toTileBaseUrl(imageUrl);
+    for (let column = firstVisibleColumn; column <= lastVisibleColumn; column++) {
+      for (let row = firstVisibleRow; row <= lastVisibleRow; row++) {
+        tiles.push({
+          key: `${level}/${column}_${row}`,
+          src: `${baseUrl}/${level}/${column}_${row}.${dzi.format}`,
+          left: view.x + column * span * view.scale,
+          top: view.y + row * span * view.scale,
+          width: Math.min(span, dzi.width - column * span) * view.scale,
+          height: Math.min(span, dzi.height - row * span) * view.scale,
+        });
+      }
+    }
+  }
+
+  return (
+    <div
+      ref={containerRef}
+      className="relative h-[70vh] w-full cursor-grab touch-none overflow-hidden rounded-md border bg-muted active:cursor-grabbing"
+      onPointerDown={(event) => {
+        event.currentTarget.setPointerCapture(event.pointerId);
+        dragRef.current = { x: event.clientX, y: event.clientY };
+      }}
+      onPointerMove={(event) => {
+        const last = dragRef.current;
+        if (!last) return;
+        dragRef.current = { x: event.clientX, y: event.clientY };
+        setView((current) => current && { ...current, x: current.x + event.clientX - last.x, y: current.y + event.clientY - last.y });
+      }}
+      onPointerUp={() => {
+        dragRef.current = null;
+      }}
+      onPointerCancel={() => {
+        dragRef.current = null;
+      }}
+      onDoubleClick={() => setView(fitView())}
+    >
+      {tiles.map((tile) => (
+        // eslint-disable-next-line @next/next/no-img-element
+        <img
+          key={tile.key}
+          src={tile.src}
+          alt={alt}
+          draggable={false}
+          className="pointer-events-none absolute max-w-none select-none"
+          style={{ left: tile.left, top: tile.top, width: tile.width, height: tile.height, imageRendering: "pixelated" }}
+        />
+      ))}
+      {dzi && (
+        <p className="pointer-events-none absolute bottom-2 left-2 rounded bg-background/80 px-2 py-1 font-mono text-xs text-muted-foreground">
+          {dzi.height} x {dzi.width} · {view ? `${Math.round(view.scale * 100)}%` : ""}
+        </p>
+      )}
+    </div>
+  );
+}
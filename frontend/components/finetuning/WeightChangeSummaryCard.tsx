@@ -0,0 +1,68 @@
+"use client";
+import { Card, CardHeader, CardTitle, CardDescription, CardContent } from "@/components/ui/card";
+import { Table, TableBody, TableCell, TableHead, TableHeader, TableRow } from "@/components/ui/table";
+import type { GetWeightStatsResponse, WeightChangeMetrics } from "@/fetchs/get_weight_stats/get_weight_stats";
+
+// 重み変化の統計 (レイヤーごと・モデル全体) を表で表示するカード。画像を読み込まずに変化の大きさを比較できる。
+
+type WeightChangeSummaryCardProps = {
+  stats: GetWeightStatsResponse;
+};
+
+const formatPercent = (value: number | null) => (value === null ? "-" : `${(value * 100).toFixed(2)}%`);
+const formatNumber = (value: number | null) => (value === null ? "-" : value.toPrecision(3));
+const formatCosine = (value: number | null) => (value === null ? "-" : value.toFixed(6));
+
+function MetricsCells({ metrics }: { metrics: WeightChangeMetrics }) {
+  return (
+    <>
+      <TableCell className="text-right font-mono">{formatPercent(metrics.relative_change)}</TableCell>
+      <TableCell className="text-right font-mono">{formatNumber(metrics.l2_delta)}</TableCell>
+      <TableCell className="text-right font-mono">{formatCosine(metrics.cosine_similarity)}</TableCell>
+      <TableCell className="text-right font-mono">{formatNumber(metrics.abs_delta_p99)}</TableCell>
+      <TableCell className="text-right font-mono">{formatPercent(metrics.sparsity)}</TableCell>
+    </>
+  );
+}
+
+export default function WeightChangeSummaryCard({ stats }: WeightChangeSummaryCardProps) {
+  if (!stats.model) return null;
+
+  return (
+    <Card className="mt-6">
+      <CardHeader>
+        <CardTitle>Weight Change Summary</CardTitle>
+        <CardDescription>
+          Relative change is ||Δ|| / ||W_before||. Unchanged is the share of weights whose change is at most{" "}
+          {formatPercent(stats.sparsity_tolerance)} of the tensor&apos;s RMS. Layer percentiles are approximate.
+        </CardDescription>
+      </CardHeader>
+      <CardContent>
+        <Table>
+          <TableHeader>
+            <TableRow>
+              <TableHead>Layer</TableHead>
+              <TableHead className="text-right">Relative change</TableHead>
+              <TableHead className="text-right">L2 Δ</TableHead>
+              <TableHead className="text-right">Cosine</TableHead>
+              <TableHead className="text-right">p99 |Δ|</TableHead>
+              <TableHead className="text-right">Unchanged</TableHead>
+            </TableRow>
+          </TableHeader>
+          <TableBody>
+            {stats.layers.map((layer) => (
+              <TableRow key={layer.layer_name}>
+                <TableCell className="font-medium">{layer.layer_name}</TableCell>
+                <MetricsCells metrics={layer.metrics} />
+              </TableRow>
+            ))}
+            <TableRow className="font-semibold">
+              <TableCell>Model</TableCell>
+              <MetricsCells metrics={stats.model} />
+            </TableRow>
+          </TableBody>
+        </Table>
+      </CardContent>
+    </Card>
+  );
+}
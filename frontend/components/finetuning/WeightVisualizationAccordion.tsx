@@ -7,7 +7,8 @@ import { Dialog, DialogContent, DialogHeader, DialogTitle } from "@/components/u
 import { Button } from "@/components/ui/button";
 import { Download } from "lucide-react";
 // ★★★ data.tsから型をインポート ★★★
-import type { Visualizations, WeightVisualizationDetail } from "@/lib/data";
+import type { ColorRange, Visualizations, WeightVisualizationDetail } from "@/lib/data";
+import DeepZoomViewer from "@/components/finetuning/DeepZoomViewer";
 
 // NOTE: WeightVisualizationDetail 型は、JobDetailPageでURL変換後に
 // before_url, after_url, delta_url が完全な画像URLを持つことを想定しています。
@@ -31,9 +32,36 @@ const getDownloadFileName = (url: string, baseName: string) => {
     return `${baseName.replace(/\./g, '_')}${type}.${ext}`;
 };
 
+// 色範囲の数値は統計の表 (WeightChangeSummaryCard) と同じく有効数字3桁で表示する
+const formatScaleValue = (value: number) => value.toPrecision(3);
+
+// ヒートマップの値の目盛り (画像には描かれていないため、凡例と上端・中央・下端の値を画像の横に表示する)
+function ColorScale({ range, className }: { range?: ColorRange; className: string }) {
+  if (!range) return null;
+  return (
+    <div className={`flex items-stretch gap-1 font-mono text-[10px] text-muted-foreground ${className}`} title={range.cmap}>
+      {range.legend_url && (
+        <Image
+          src={range.legend_url}
+          alt={`Color scale: ${range.cmap}`}
+          width={12}
+          height={200}
+          className="h-full w-3 rounded-sm border"
+          unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
+        />
+      )}
+      <div className="flex flex-col justify-between">
+        <span>{formatScaleValue(range.vmax)}</span>
+        <span>{formatScaleValue((range.vmin + range.vmax) / 2)}</span>
+        <span>{formatScaleValue(range.vmin)}</span>
+      </div>
+    </div>
+  );
+}
+
 export default function WeightVisualizationAccordion({ visualizations }: WeightVisualizationAccordionProps) {
   // selectedImage.url は完全な画像URL (http://localhost:8000/v1/visuals/...)
-  const [selectedImage, setSelectedImage] = useState<{ url: string; name: string } | null>(null);
+  const [selectedImage, setSelectedImage] = useState<{ url: string; name: string; color?: ColorRange } | null>(null);
 
   // DTOの型に合わせたプロパティ名を内部で使用するためのカスタムタイプアサーション
   // ※バックエンドのDTOとフロントエンドのdata.tsの型定義が一致していることを前提とします
@@ -45,7 +73,10 @@ export default function WeightVisualizationAccordion({ visualizations }: WeightV
         <Card>
           <CardHeader>
             <CardTitle>Weight Change Visualization</CardTitle>
-            <CardDescription>Click on an image to enlarge.</CardDescription>
+            <CardDescription>
+              Click on an image to enlarge. Scroll to zoom, drag to pan, double-click to reset. Values outside the scale
+              next to each image are clipped to its end colors.
+            </CardDescription>
           </CardHeader>
           <CardContent>
             <Accordion type="single" collapsible defaultValue="item-0">
@@ -62,51 +93,60 @@ export default function WeightVisualizationAccordion({ visualizations }: WeightV
                             {/* BEFORE 画像 */}
                             <div className="flex flex-col items-center gap-2">
                               <p className="font-semibold">Before</p>
-                              <div 
-                                className="cursor-pointer" 
-                                onClick={() => setSelectedImage({ url: weight.before_url, name: weight.name })}>
-                                <Image 
-                                  src={weight.before_url} 
-                                  alt={`Before: ${weight.name}`} 
-                                  width={200} 
-                                  height={200} 
-                                  className="rounded-md border" 
-                                  unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
-                                />
+                              <div className="flex items-stretch gap-2">
+                                <div 
+                                  className="cursor-pointer" 
+                                  onClick={() => setSelectedImage({ url: weight.before_url, name: weight.name, color: weight.color_ranges?.before })}>
+                                  <Image 
+                                    src={weight.before_url} 
+                                    alt={`Before: ${weight.name}`} 
+                                    width={200} 
+                                    height={200} 
+                                    className="rounded-md border" 
+                                    unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
+                                  />
+                                </div>
+                                <ColorScale range={weight.color_ranges?.before} className="h-[200px]" />
                               </div>
                             </div>
                             
                             {/* AFTER 画像 */}
                             <div className="flex flex-col items-center gap-2">
                               <p className="font-semibold">After</p>
-                              <div 
-                                className="cursor-pointer" 
-                                onClick={() => setSelectedImage({ url: weight.after_url, name: weight.name })}>
-                                <Image 
-                                  src={weight.after_url} 
-                                  alt={`After: ${weight.name}`} 
-                                  width={200} 
-                                  height={200} 
-                                  className="rounded-md border" 
-                                  unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
-                                />
+                              <div className="flex items-stretch gap-2">
+                                <div 
+                                  className="cursor-pointer" 
+                                  onClick={() => setSelectedImage({ url: weight.after_url, name: weight.name, color: weight.color_ranges?.after })}>
+                                  <Image 
+                                    src={weight.after_url} 
+                                    alt={`After: ${weight.name}`} 
+                                    width={200} 
+                                    height={200} 
+                                    className="rounded-md border" 
+                                    unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
+                                  />
+                                </div>
+                                <ColorScale range={weight.color_ranges?.after} className="h-[200px]" />
                               </div>
                             </div>
                             
                             {/* DELTA 画像 */}
                             <div className="flex flex-col items-center gap-2">
                               <p className="font-semibold">Delta</p>
-                              <div 
-                                className="cursor-pointer" 
-                                onClick={() => setSelectedImage({ url: weight.delta_url, name: weight.name })}>
-                                <Image 
-                                  src={weight.delta_url} 
-                                  alt={`Delta: ${weight.name}`} 
-                                  width={200} 
-                                  height={200} 
-                                  className="rounded-md border" 
-                                  unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
-                                />
+                              <div className="flex items-stretch gap-2">
+                                <div 
+                                  className="cursor-pointer" 
+                                  onClick={() => setSelectedImage({ url: weight.delta_url, name: weight.name, color: weight.color_ranges?.delta })}>
+                                  <Image 
+                                    src={weight.delta_url} 
+                                    alt={`Delta: ${weight.name}`} 
+                                    width={200} 
+                                    height={200} 
+                                    className="rounded-md border" 
+                                    unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
+                                  />
+                                </div>
+                                <ColorScale range={weight.color_ranges?.delta} className="h-[200px]" />
                               </div>
                             </div>
                           </div>
@@ -128,14 +168,13 @@ export default function WeightVisualizationAccordion({ visualizations }: WeightV
           </DialogHeader>
           {selectedImage && (
             <div className="flex flex-col items-center gap-4">
-              <Image 
-                src={selectedImage.url} 
-                alt="Enlarged view" 
-                width={1200} 
-                height={800} 
-                className="h-auto w-full rounded-md object-contain max-h-[80vh]"
-                unoptimized // ★★★ プロキシ経由で動的なため最適化を無効化 ★★★
-              />
+              {/* 拡大表示はタイルピラミッドから表示範囲のタイルだけを取得する (無いジョブは画像全体を表示) */}
+              <div className="flex w-full items-start gap-3">
+                <div className="min-w-0 flex-1">
+                  <DeepZoomViewer imageUrl={selectedImage.url} alt="Enlarged view" />
+                </div>
+                <ColorScale range={selectedImage.color} className="h-[70vh]" />
+              </div>
               <a href={selectedImage.url} download={getDownloadFileName(selectedImage.url, selectedImage.name)} className="w-full sm:w-auto">
                 <Button className="w-full"><Download className="mr-2 h-4 w-4" />Download Image</Button>
               </a>
@@ -22,3 +22,6 @@ if (isServer) {
 }
 
 export const API_URL = apiUrl;
+
+// 一覧 API の1ページあたりの最大件数 (バックエンドの MAX_PAGE_LIMIT と同じ)。全件を辿る場合に使う
+export const MAX_PAGE_LIMIT = 200;
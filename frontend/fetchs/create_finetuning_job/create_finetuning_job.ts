@@ -16,7 +16,7 @@ export interface CreateFinetuningJobRequest {
 export interface CreateFinetuningJobResponse {
   id: number;
   agent_id: number;
-  status: string; // e.g., "queued"
+  status: string; // e.g., "uploading" (転送完了後に "queued" へ遷移)
   created_at: string; // JavaScriptのDateオブジェクトとして扱われることが多いが、APIからは文字列で受け取る
   message: string;
 }
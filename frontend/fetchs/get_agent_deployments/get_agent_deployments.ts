@@ -1,6 +1,6 @@
 // frontend/fetchs/get_agent_deployments/get_agent_deployments.ts
 
-import { API_URL } from "../config";
+import { API_URL, MAX_PAGE_LIMIT } from "../config";
 
 // ======================================
 // Output DTO (内部リスト用 - バックエンドの DeploymentListItem に対応)
@@ -35,6 +35,11 @@ export interface GetAgentDeploymentsResponse {
    * デプロイメントリスト
    */
   deployments: DeploymentListItem[];
+
+  /**
+   * 次ページ取得用カーソル (最終ページの場合は null)
+   */
+  next_cursor: string | null;
 }
 
 // ======================================
@@ -52,14 +57,21 @@ interface ApiError {
  * 認証トークンとAgent IDを使用して、特定のAgentに紐づくデプロイメント一覧を取得する。
  * @param agentId 対象の Agent ID (URLパスパラメータ)
  * @param token ユーザー認証トークン
+ * @param options ページング (limit / after) とステータス絞り込み (status)
  * @returns DeploymentListItem の配列を含むレスポンスオブジェクト
  */
 export async function getAgentDeployments(
   agentId: number,
-  token: string
+  token: string,
+  options: { limit?: number; after?: string; status?: string } = {}
 ): Promise<GetAgentDeploymentsResponse> {
   // GET /v1/agents/{agent_id}/deployments エンドポイント
-  const url = `${API_URL}/v1/agents/${agentId}/deployments`;
+  const params = new URLSearchParams();
+  if (options.limit !== undefined) params.set("limit", String(options.limit));
+  if (options.after) params.set("after", options.after);
+  if (options.status) params.set("status", options.status);
+  const query = params.toString();
+  const url = `${API_URL}/v1/agents/${agentId}/deployments${query ? `?${query}` : ""}`;
 
   try {
     const response = await fetch(url, {
@@ -84,4 +96,26 @@ export async function getAgentDeployments(
     }
     throw new Error("An unknown error occurred while fetching the agent deployments.");
   }
-}
\ No newline at end of file
+}
+
+/**
+ * next_cursor を辿って、特定のAgentに紐づくデプロイメントを全件取得する。
+ * @param agentId 対象の Agent ID
+ * @param token ユーザー認証トークン
+ * @param options ステータス絞り込み (status)
+ * @returns 全ページの DeploymentListItem を連結したレスポンスオブジェクト (next_cursor は null)
+ */
+export async function getAllAgentDeployments(
+  agentId: number,
+  token: string,
+  options: { status?: string } = {}
+): Promise<GetAgentDeploymentsResponse> {
+  const deployments: DeploymentListItem[] = [];
+  let after: string | undefined = undefined;
+  do {
+    const page: GetAgentDeploymentsResponse = await getAgentDeployments(agentId, token, { ...options, limit: MAX_PAGE_LIMIT, after });
+    deployments.push(...page.deployments);
+    after = page.next_cursor ?? undefined;
+  } while (after);
+  return { deployments, next_cursor: null };
+}
@@ -1,6 +1,6 @@
 // frontend/fetchs/get_agent_finetuning_jobs/get_agent_finetuning_jobs.ts
 
-import { API_URL } from "../config";
+import { API_URL, MAX_PAGE_LIMIT } from "../config";
 
 // ======================================
 // Output DTO (バックエンドの GetAgentFinetuningJobsOutput に対応)
@@ -24,6 +24,8 @@ export interface FinetuningJobListItem {
  */
 export interface GetAgentFinetuningJobsResponse { // ★ クラス名を修正
   jobs: FinetuningJobListItem[];
+  // 次ページ取得用カーソル (最終ページの場合は null)
+  next_cursor: string | null;
 }
 
 // ======================================
@@ -41,14 +43,21 @@ interface ApiError {
  * 認証トークンを使用して、特定のAgentに紐づくファインチューニングジョブ一覧を取得する。
  * @param agentId 対象の Agent ID
  * @param token 認証トークン (Bearer)
+ * @param options ページング (limit / after) とステータス絞り込み (status)
  * @returns FinetuningJobListItem の配列を含むレスポンスオブジェクト
  */
 export async function getAgentFinetuningJobs( // ★ 関数名を修正
   agentId: number, // ★ 引数に agentId を追加
-  token: string
+  token: string,
+  options: { limit?: number; after?: string; status?: string } = {}
 ): Promise<GetAgentFinetuningJobsResponse> { // ★ Output DTO名を修正
   // ★★★ 修正: エンドポイントを /v1/jobs から /v1/agents/{agentId}/jobs に変更 ★★★
-  const url = `${API_URL}/v1/agents/${agentId}/jobs`;
+  const params = new URLSearchParams();
+  if (options.limit !== undefined) params.set("limit", String(options.limit));
+  if (options.after) params.set("after", options.after);
+  if (options.status) params.set("status", options.status);
+  const query = params.toString();
+  const url = `${API_URL}/v1/agents/${agentId}/jobs${query ? `?${query}` : ""}`;
 
   try {
     const response = await fetch(url, {
@@ -74,4 +83,27 @@ export async function getAgentFinetuningJobs( // ★ 関数名を修正
     }
     throw new Error("An unknown error occurred while fetching agent fine-tuning jobs."); // ★ エラーメッセージの修正
   }
-}
\ No newline at end of file
+}
+
+/**
+ * next_cursor を辿って、特定のAgentに紐づくファインチューニングジョブを全件取得する。
+ * (一覧 API は1ページ分しか返さないため、ID で1件を探す場合や一覧を全件表示する場合はこちらを使う)
+ * @param agentId 対象の Agent ID
+ * @param token 認証トークン (Bearer)
+ * @param options ステータス絞り込み (status)
+ * @returns 全ページの FinetuningJobListItem を連結したレスポンスオブジェクト (next_cursor は null)
+ */
+export async function getAllAgentFinetuningJobs(
+  agentId: number,
+  token: string,
+  options: { status?: string } = {}
+): Promise<GetAgentFinetuningJobsResponse> {
+  const jobs: FinetuningJobListItem[] = [];
+  let after: string | undefined = undefined;
+  do {
+    const page: GetAgentFinetuningJobsResponse = await getAgentFinetuningJobs(agentId, token, { ...options, limit: MAX_PAGE_LIMIT, after });
+    jobs.push(...page.jobs);
+    after = page.next_cursor ?? undefined;
+  } while (after);
+  return { jobs, next_cursor: null };
+}
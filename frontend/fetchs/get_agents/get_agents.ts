@@ -1,4 +1,4 @@
-import { API_URL } from "../config";
+import { API_URL, MAX_PAGE_LIMIT } from "../config";
 
 // ======================================
 // Output DTO (バックエンドの GetAgentsOutput に対応)
@@ -21,6 +21,8 @@ export interface AgentListItem {
  */
 export interface GetAgentsResponse {
   agents: AgentListItem[];
+  // 次ページ取得用カーソル (最終ページの場合は null)
+  next_cursor: string | null;
 }
 
 // ======================================
@@ -37,11 +39,17 @@ interface ApiError {
 /**
  * 現存する全てのアクティブなエージェント一覧を取得する。
  * (このAPIは認証を必要としない)
- * * @returns AgentListItem の配列を含むレスポンスオブジェクト
+ * @param limit 1ページあたりの件数 (省略時はサーバー既定値)
+ * @param after 前ページの next_cursor (先頭ページは省略)
+ * @returns AgentListItem の配列を含むレスポンスオブジェクト
  */
-export async function getAgents(): Promise<GetAgentsResponse> {
+export async function getAgents(limit?: number, after?: string): Promise<GetAgentsResponse> {
   // GET /v1/agents/all エンドポイント (認証不要)
-  const url = `${API_URL}/v1/agents/all`;
+  const params = new URLSearchParams();
+  if (limit !== undefined) params.set("limit", String(limit));
+  if (after) params.set("after", after);
+  const query = params.toString();
+  const url = `${API_URL}/v1/agents/all${query ? `?${query}` : ""}`;
 
   try {
     const response = await fetch(url, {
@@ -72,4 +80,19 @@ export async function getAgents(): Promise<GetAgentsResponse> {
     // その他の予期せぬエラーの場合
     throw new Error("An unknown error occurred while fetching all agents data.");
   }
-}
\ No newline at end of file
+}
+
+/**
+ * next_cursor を辿って、全てのアクティブなエージェントを全件取得する。
+ * @returns 全ページの AgentListItem を連結したレスポンスオブジェクト (next_cursor は null)
+ */
+export async function getAllAgents(): Promise<GetAgentsResponse> {
+  const agents: AgentListItem[] = [];
+  let after: string | undefined = undefined;
+  do {
+    const page: GetAgentsResponse = await getAgents(MAX_PAGE_LIMIT, after);
+    agents.push(...page.agents);
+    after = page.next_cursor ?? undefined;
+  } while (after);
+  return { agents, next_cursor: null };
+}
@@ -0,0 +1,99 @@
+import { API_URL } from "../config";
+
+// ======================================
+// Output DTO (バックエンドの GetFinetuningJobWeightStatsOutput に対応)
+// ======================================
+
+/**
+ * 重みの変化の大きさ (テンソル・レイヤー・モデル全体で共通)。求められない値は null
+ */
+export interface WeightChangeMetrics {
+  numel: number;
+  l2_delta: number | null;
+  l2_before: number | null;
+  relative_change: number | null;
+  cosine_similarity: number | null;
+  abs_delta_p50: number | null;
+  abs_delta_p90: number | null;
+  abs_delta_p99: number | null;
+  max_abs_delta: number | null;
+  sparsity: number | null;
+}
+
+/**
+ * テンソル (重み) ごとの統計
+ */
+export interface TensorWeightChange {
+  name: string;
+  metrics: WeightChangeMetrics;
+}
+
+/**
+ * レイヤーごとの統計 (includeTensors が false の場合 tensors は空)
+ */
+export interface LayerWeightChange {
+  layer_name: string;
+  metrics: WeightChangeMetrics;
+  tensors: TensorWeightChange[];
+}
+
+/**
+ * 重み変化の統計全体のレスポンス型 (統計が無いジョブでは model が null)
+ */
+export interface GetWeightStatsResponse {
+  job_id: number;
+  sparsity_tolerance: number | null;
+  model: WeightChangeMetrics | null;
+  layers: LayerWeightChange[];
+}
+
+// ======================================
+// エラーインターフェース
+// ======================================
+interface ApiError {
+  error: string;
+}
+
+// ======================================
+// Fetcher 関数
+// ======================================
+
+/**
+ * 認証トークンとジョブIDを使用して、特定のジョブの重み変化の統計を取得する (画像は読み込まない)。
+ * @param token 認証トークン (Bearer)
+ * @param jobId 取得対象のファインチューニングジョブID
+ * @param includeTensors テンソルごとの統計を含めるか (false でレイヤー・モデル全体のみ)
+ * @returns 重み変化の統計を含むレスポンスオブジェクト
+ */
+export async function getWeightStats(
+  token: string,
+  jobId: string | number,
+  includeTensors: boolean = true
+): Promise<GetWeightStatsResponse> {
+  const url = `${API_URL}/v1/jobs/${jobId}/weight-stats?include_tensors=${includeTensors}`; // GET /v1/jobs/{job_id}/weight-stats
+
+  try {
+    const response = await fetch(url, {
+      method: "GET",
+      headers: {
+        "Content-Type": "application/json",
+        "Authorization": `Bearer ${token}`,
+      },
+    });
+
+    if (!response.ok) {
+      const errorData: ApiError = await response.json();
+      throw new Error(errorData.error || `HTTP error! status: ${response.status}`);
+    }
+
+    return (await response.json()) as GetWeightStatsResponse;
+
+  } catch (error) {
+    console.error(`Get Weight Stats Fetch Error for job ${jobId}:`, error);
+
+    if (error instanceof Error) {
+      throw error;
+    }
+    throw new Error("An unknown error occurred while fetching weight stats.");
+  }
+}
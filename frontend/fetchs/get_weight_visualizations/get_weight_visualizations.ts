@@ -5,13 +5,24 @@ import { API_URL } from "../config";
 // ======================================
 
 /**
- * 可視化画像のURL詳細
+ * ヒートマップの色範囲と凡例画像のURL (凡例が無い場合は空文字列)
+ */
+export interface ColorRangeOutput {
+  vmin: number;
+  vmax: number;
+  cmap: string;
+  legend_url: string;
+}
+
+/**
+ * 可視化画像のURL詳細と、画像の種類ごとの色範囲 (記録されていないジョブでは空)
  */
 export interface WeightVisualizationDetail {
   name: string;
   before_url: string;
   after_url: string;
   delta_url: string;
+  color_ranges?: Partial<Record<"before" | "after" | "delta", ColorRangeOutput>>;
 }
 
 /**
@@ -26,11 +26,14 @@ export type User = {
 export type FinetuningJob = {
   id: number;
   agent_id: number;
-  status: "completed" | "running" | "failed" | "queued";
+  status: "completed" | "running" | "failed" | "queued" | "uploading";
   training_file_path: string;
   error_message: string | null;
   created_at: string; // ISO 8601 string
   finished_at: string | null; // ISO 8601 string or null
+  training_file_hash?: string | null; // 訓練データの SHA-256
+  cache_hit?: boolean; // 学習済み成果物を再利用したか
+  reused_from_job_id?: number | null; // 再利用元ジョブ
 };
 
 // ★★★ 修正箇所: FinetuningJobListItem を FinetuningJob のエイリアスとしてエクスポート ★★★
@@ -58,6 +61,16 @@ export type TrainingLink = {
   file_size: string | null;
 };
 
+// ======================================
+// ヒートマップの色範囲 (画像には目盛りを描かないため、画像の横に表示する)
+// ======================================
+export type ColorRange = {
+  vmin: number;
+  vmax: number;
+  cmap: string;
+  legend_url: string; // カラーマップの凡例画像 (無ければ空文字列)
+};
+
 // ======================================
 // 重み可視化データの重み部分の型定義
 // ======================================
@@ -66,6 +79,7 @@ export type WeightVisualizationDetail = {
   before_url: string;
   after_url: string;
   delta_url: string;
+  color_ranges?: Partial<Record<"before" | "after" | "delta", ColorRange>>; // 記録されていないジョブでは空
 };
 
 // ======================================
@@ -0,0 +1,113 @@
+"""
+モデル成果物の転送方式を比較するベンチマーク。
+
+実際のジョブ出力 (train_and_export.py の --output_dir、例: /tmp/job_<ID>/model) を
+以下の方式で VPS にアップロードし、所要時間と転送量を計測する。
+  files        : upload_directory (ファイルごとに並行転送)
+  archive      : upload_directory_archive (zstd 圧縮 tar を1本で転送し、リモートで展開)
+  compress     : 圧縮のみ (転送なし。圧縮レベルごとの CPU コストと圧縮率の目安)
+
+実行例 (worker ディレクトリで、VPS_* の環境変数を設定した状態で):
+    python -m benchmarks.bench_artifact_transfer --model-dir /tmp/job_42/model --runs 3
+archive はリモートでコマンド (zstd, tar) を実行できる必要がある (SFTP 専用アカウントでは失敗する)。
+アップロード先は <VPS_MODEL_DIR>/_bench_transfer 配下で、計測後に削除する。
+"""
+import argparse
+import os
+import stat
+import statistics
+import time
+import uuid
+
+from tasks.finetuning.artifact_archive import write_directory_archive
+from tasks.finetuning.sftp_service import create_sftp_service_from_env
+
+
+class _NullWriter:
+    def write(self, data) -> int:
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def _remove_remote_tree(sftp, path: str) -> None:
+    try:
+        entries = sftp.listdir_attr(path)
+    except IOError:
+        return
+    for entry in entries:
+        child = f"{path}/{entry.filename}"
+        if stat.S_ISDIR(entry.st_mode):
+            _remove_remote_tree(sftp, child)
+        else:
+            sftp.remove(child)
+    sftp.rmdir(path)
+
+
+def _directory_size(path: str) -> int:
+    return sum(
+        os.path.getsize(os.path.join(root, name))
+        for root, _, names in os.walk(path)
+        for name in names
+    )
+
+
+def _summary(label: str, seconds: list, wire_bytes: int) -> None:
+    median = statistics.median(seconds)
+    print(
+        f"{label:<14} median={median:7.2f}s  min={min(seconds):7.2f}s  max={max(seconds):7.2f}s  "
+        f"wire={wire_bytes / (1024 * 1024):8.1f}MB  ({wire_bytes / median / (1024 * 1024):6.1f} MB/s)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Model artifact transfer benchmark")
+    parser.add_argument("--model-dir", required=True, help="Local model output directory of a finished job.")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--levels", default="1,3,9", help="zstd levels for the compress-only pass.")
+    parser.add_argument("--level", type=int, default=3, help="zstd level for the archive upload.")
+    args = parser.parse_args()
+
+    raw_bytes = _directory_size(args.model_dir)
+    file_count = sum(len(names) for _, _, names in os.walk(args.model_dir))
+    print(f"model dir: {args.model_dir} ({file_count} files, {raw_bytes / (1024 * 1024):.1f}MB)")
+
+    for level in [int(v) for v in args.levels.split(",") if v]:
+        started = time.monotonic()
+        report = write_directory_archive(args.model_dir, _NullWriter(), level=level)
+        elapsed = time.monotonic() - started
+        print(
+            f"compress l={level:<3} {elapsed:7.2f}s  ratio=x{report['raw_bytes'] / report['compressed_bytes']:.2f}  "
+            f"({report['compressed_bytes'] / (1024 * 1024):.1f}MB)"
+        )
+
+    service = create_sftp_service_from_env()
+    bench_root = f"{service.remote_model_base_dir.rstrip('/')}/_bench_transfer"
+    results = {"files": [], "archive": []}
+    archive_bytes = 0
+    try:
+        for _ in range(args.runs):
+            # 方式ごとの順序による偏り (接続の暖まり方) を避けるため交互に実行する
+            target = f"{bench_root}/files_{uuid.uuid4().hex[:8]}"
+            started = time.monotonic()
+            service.upload_directory(args.model_dir, target)
+            results["files"].append(time.monotonic() - started)
+
+            target = f"{bench_root}/archive_{uuid.uuid4().hex[:8]}"
+            started = time.monotonic()
+            report = service.upload_directory_archive(args.model_dir, target, level=args.level)
+            results["archive"].append(time.monotonic() - started)
+            archive_bytes = report["compressed_bytes"]
+    finally:
+        with service.connect() as sftp:
+            _remove_remote_tree(sftp, bench_root)
+
+    print()
+    _summary("files", results["files"], raw_bytes)
+    _summary(f"archive l={args.level}", results["archive"], archive_bytes)
+    print(f"pool: {service.pool_stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+重みヒートマップの描画方式を比較するベンチマーク。
+
+visualize_finetuning_diff.py の2つの描画方式で同じ行列を描画し、1枚あたりの時間と出力サイズを計測する。
+  matplotlib : save_heatmap (pyplot の figure・imshow・colorbar・savefig dpi=200)
+  numpy      : save_heatmap_fast (heatmap_renderer の LUT による色付けと PNG の直接書き出し)
+
+既定では BERT-base と同じ形の乱数行列 (Q/K/V/output 768x768, intermediate 3072x768, output 768x3072) を使う。
+--model に pytorch_model.bin を渡すと、実際の重み (encoder の dense.weight) を使う。
+
+実行例 (worker ディレクトリで):
+    python -m benchmarks.bench_heatmap_render --runs 3
+    python -m benchmarks.bench_heatmap_render --model tasks/finetuning/models/bert-tiny/pytorch_model.bin
+"""
+import argparse
+import os
+import re
+import statistics
+import tempfile
+import time
+from typing import Dict
+
+import numpy as np
+
+from tasks.finetuning.visualize_finetuning_diff import _load_state_dict, save_heatmap, save_heatmap_fast
+
+
+def _synthetic_weights(seed: int = 0) -> Dict[str, np.ndarray]:
+    rng = np.random.default_rng(seed)
+    shapes = {
+        "query.dense.weight": (768, 768),
+        "intermediate.dense.weight": (3072, 768),
+        "output.dense.weight": (768, 3072),
+    }
+    weights = {}
+    for name, shape in shapes.items():
+        weights[name + "_before"] = rng.normal(0.0, 0.02, size=shape).astype(np.float32)
+        weights[name + "_delta"] = rng.normal(0.0, 1e-4, size=shape).astype(np.float32)
+    return weights
+
+
+def _model_weights(path: str, limit: int) -> Dict[str, np.ndarray]:
+    weights = {}
+    for name, tensor in _load_state_dict(path).items():
+        if re.search(r"encoder\.layer\.\d+\..*(query|key|value|intermediate|output)\.dense\.weight", name):
+            weights[name.replace(".", "_") + "_before"] = tensor.detach().cpu().numpy()
+            if len(weights) >= limit:
+                break
+    return weights
+
+
+def _measure(render, weights: Dict[str, np.ndarray], outdir: str, runs: int):
+    seconds = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        paths = [render(name, arr, outdir) for name, arr in weights.items()]
+        seconds.append(time.perf_counter() - started)
+    size = sum(os.path.getsize(path) for path in paths)
+    return statistics.median(seconds) / len(weights), size
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Weight heatmap rendering benchmark")
+    parser.add_argument("--model", help="pytorch_model.bin to take real encoder weights from.")
+    parser.add_argument("--limit", type=int, default=6, help="Number of weights to render from --model.")
+    parser.add_argument("--runs", type=int, default=3)
+    args = parser.parse_args()
+
+    weights = _model_weights(args.model, args.limit) if args.model else _synthetic_weights()
+    print(f"{len(weights)} heatmaps: " + ", ".join(f"{'x'.join(map(str, a.shape))}" for a in weights.values()))
+
+    with tempfile.TemporaryDirectory() as outdir:
+        # 初回の import・フォントキャッシュ等を計測から除く
+        first_name, first_arr = next(iter(weights.items()))
+        save_heatmap(first_name, first_arr, os.path.join(outdir, "warmup"))
+        save_heatmap_fast(first_name, first_arr, os.path.join(outdir, "warmup"))
+
+        results = {
+            "matplotlib": _measure(save_heatmap, weights, os.path.join(outdir, "matplotlib"), args.runs),
+            "numpy": _measure(save_heatmap_fast, weights, os.path.join(outdir, "numpy"), args.runs),
+        }
+
+    print()
+    for label, (per_image, size) in results.items():
+        print(f"{label:<11} {per_image * 1000:8.1f} ms/image  output={size / len(weights) / 1024:8.1f} KB/image")
+    speedup = results["matplotlib"][0] / results["numpy"][0]
+    print(f"speedup: x{speedup:.1f}")
+
+
+if __name__ == "__main__":
+    main()
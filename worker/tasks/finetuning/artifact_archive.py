@@ -0,0 +1,67 @@
+import os
+import tarfile
+from typing import BinaryIO, Dict
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+# モデルディレクトリを1つの zstd 圧縮 tar にまとめて転送するためのヘルパー。
+# ファイルごとの open/close 往復が無くなり、ONNX (fp32) や pytorch_model.bin などは圧縮も効く。
+# アーカイブは転送先 (VPS) のシェルで展開する (sftp_service.upload_directory_archive)。
+# アーカイブのまま読む側 (backend・推論エンジン) は無いため、展開できない場合はファイルごとの転送に切り替える。
+
+ARCHIVE_FILENAME = "model.tar.zst"
+ARCHIVE_WRITE_SIZE = 1024 * 1024
+
+
+class _CountingWriter:
+    """書き込まれたバイト数を数える (圧縮後サイズの計測用)"""
+
+    def __init__(self, raw: BinaryIO):
+        self._raw = raw
+        self.bytes_written = 0
+
+    def write(self, data) -> int:
+        self._raw.write(data)
+        self.bytes_written += len(data)
+        return len(data)
+
+    def flush(self) -> None:
+        pass
+
+
+def archive_available() -> bool:
+    """zstandard パッケージがインストールされているか"""
+    return zstandard is not None
+
+
+def write_directory_archive(local_dir: str, dst: BinaryIO, level: int = 3) -> Dict[str, int]:
+    """
+    local_dir の内容を tar (ストリーム形式) にして zstd で圧縮しながら dst に書き込む。
+    ディスク上に中間ファイルは作らない。圧縮はマルチスレッド (全コア) で行う。
+    戻り値はファイル数・圧縮前後のバイト数。
+    """
+    if zstandard is None:
+        raise RuntimeError("zstandard package is not installed.")
+    counter = _CountingWriter(dst)
+    compressor = zstandard.ZstdCompressor(level=level, threads=-1)
+    raw_bytes = 0
+    files = 0
+    with compressor.stream_writer(counter, write_size=ARCHIVE_WRITE_SIZE, closefd=False) as compressed:
+        with tarfile.open(fileobj=compressed, mode="w|") as tar:
+            for root, dirs, filenames in os.walk(local_dir):
+                dirs.sort()
+                # 空のディレクトリもファイルごとの転送と同じく再現する
+                for dirname in dirs:
+                    path = os.path.join(root, dirname)
+                    tar.add(path, arcname=os.path.relpath(path, local_dir).replace("\\", "/"), recursive=False)
+                for filename in sorted(filenames):
+                    path = os.path.join(root, filename)
+                    arcname = os.path.relpath(path, local_dir).replace("\\", "/")
+                    tar.add(path, arcname=arcname, recursive=False)
+                    raw_bytes += os.path.getsize(path)
+                    files += 1
+    return {"files": files, "raw_bytes": raw_bytes, "compressed_bytes": counter.bytes_written}
+
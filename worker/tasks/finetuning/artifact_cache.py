@@ -0,0 +1,72 @@
+# worker/tasks/finetuning/artifact_cache.py
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Tuple
+
+# 学習済み成果物の再利用判定に使うキーの計算。
+# 同じ (訓練データの内容, ベースモデル, ハイパーパラメータ, パイプラインの版) からは
+# 同じ成果物が得られるとみなし、完了済みジョブの成果物をそのまま使う。
+
+# train_and_export.py の出力形式 (ファイル構成・量子化方式など) を変えたら上げる
+ARTIFACT_PIPELINE_VERSION = "1"
+
+_CHUNK_SIZE = 1024 * 1024
+
+# ベースモデルのフィンガープリント (パス -> (更新時刻の合計, ハッシュ))
+_model_fingerprints: Dict[str, Tuple[float, str]] = {}
+
+
+def compute_file_sha256(path: str) -> str:
+    """ファイル内容の SHA-256 (backend がアップロード時に計算する値と同じ)"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def fingerprint_model_dir(model_dir: str) -> str:
+    """
+    ベースモデルディレクトリ全体の内容ハッシュ。
+    モデルを差し替えた場合に古い成果物が再利用されないようにする。
+    ファイルの更新時刻が変わらない限りプロセス内でキャッシュする。
+    """
+    files = []
+    for root, _, names in os.walk(model_dir):
+        for name in names:
+            path = os.path.join(root, name)
+            files.append((os.path.relpath(path, model_dir).replace("\\", "/"), path))
+    files.sort()
+
+    mtime_sum = sum(os.path.getmtime(path) for _, path in files)
+    cached = _model_fingerprints.get(model_dir)
+    if cached is not None and cached[0] == mtime_sum:
+        return cached[1]
+
+    digest = hashlib.sha256()
+    for rel_path, path in files:
+        digest.update(rel_path.encode("utf-8") + b"\0")
+        digest.update(compute_file_sha256(path).encode("ascii"))
+    fingerprint = digest.hexdigest()
+    _model_fingerprints[model_dir] = (mtime_sum, fingerprint)
+    return fingerprint
+
+
+def compute_artifact_key(
+    training_file_hash: str,
+    base_model_name: str,
+    base_model_fingerprint: str,
+    hyperparams: Dict[str, Any],
+) -> str:
+    """成果物キー (SHA-256)。入力を正規化した JSON のハッシュ"""
+    payload = {
+        "pipeline_version": ARTIFACT_PIPELINE_VERSION,
+        "training_file_sha256": training_file_hash,
+        "base_model": base_model_name,
+        "base_model_fingerprint": base_model_fingerprint,
+        "hyperparams": hyperparams,
+    }
+    raw = json.dumps(payload, sort_keys=True, separators=(",", ":")).encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
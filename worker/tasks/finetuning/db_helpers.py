@@ -30,6 +30,16 @@ class JobInfo:
     created_at: Optional[PythonDateTime] = None
     finished_at: Optional[PythonDateTime] = None
     error_message: Optional[str] = None
+    training_file_hash: Optional[str] = None
+
+@dataclass
+class TrainingStats:
+    """backend がアップロード時に集計した訓練データの統計 (training_links テーブル)"""
+    file_mode: str  # 'empty' / 'method_definition' / 'training'
+    record_count: int
+    invalid_record_count: int
+    # ユニークなメソッド名 (ソート済み)。多すぎて保存されていない場合は None
+    methods: Optional[List[str]]
 
 # === Database Connection Pool ===
 db_pool = None
@@ -75,7 +85,7 @@ def get_db_cursor(commit: bool = False):
 def find_job_by_id(job_id: int) -> Optional[JobInfo]:
     """ジョブIDでジョブ情報をDBから取得"""
     sql = """
-        SELECT id, agent_id, training_file_path, status, created_at, finished_at, error_message
+        SELECT id, agent_id, training_file_path, status, created_at, finished_at, error_message, training_file_hash
         FROM finetuning_jobs WHERE id = %s
     """
     try:
@@ -108,21 +118,97 @@ def update_job_status(job_id: int, status: str,
         print(f"ERROR: Job {job_id}: CRITICAL - Failed to update final DB status: {e}")
         raise # Re-raise by default
 
-def save_visualization(job_id: int, layers_data: List[Dict[str, Any]]):
-    """可視化データをDBに保存"""
+def save_visualization(job_id: int, layers_data: List[Dict[str, Any]],
+                       weight_stats: Optional[Dict[str, Any]] = None):
+    """可視化データ (と重み変化の統計) をDBに保存"""
     sql = """
-        INSERT INTO weight_visualizations (job_id, layers_data)
-        VALUES (%s, %s)
-        ON DUPLICATE KEY UPDATE layers_data = VALUES(layers_data)
+        INSERT INTO weight_visualizations (job_id, layers_data, weight_stats)
+        VALUES (%s, %s, %s)
+        ON DUPLICATE KEY UPDATE layers_data = VALUES(layers_data), weight_stats = VALUES(weight_stats)
     """
     try:
         layers_json = json.dumps(layers_data)
+        stats_json = json.dumps(weight_stats) if weight_stats is not None else None
         with get_db_cursor(commit=True) as cursor:
-            cursor.execute(sql, (job_id, layers_json))
+            cursor.execute(sql, (job_id, layers_json, stats_json))
         print(f"INFO: Job {job_id}: Visualization data saved to DB.")
     except Exception as e:
         print(f"WARN: Job {job_id}: Failed to save visualization data to DB: {e}")
 
+def set_job_artifact_key(job_id: int, artifact_key: str, training_file_hash: str):
+    """成果物キーと訓練データのハッシュを記録する (完了後に他のジョブから再利用できるようにする)"""
+    sql = """
+        UPDATE finetuning_jobs
+        SET artifact_key = %s, training_file_hash = COALESCE(training_file_hash, %s)
+        WHERE id = %s
+    """
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(sql, (artifact_key, training_file_hash, job_id))
+
+def find_completed_job_by_artifact_key(artifact_key: str, exclude_job_id: int) -> Optional[int]:
+    """同じ成果物キーで完了済みのジョブ (最新のもの) の ID を返す"""
+    sql = """
+        SELECT id FROM finetuning_jobs
+        WHERE artifact_key = %s AND status = 'completed' AND id <> %s
+        ORDER BY finished_at DESC
+        LIMIT 1
+    """
+    try:
+        with get_db_cursor() as cursor:
+            cursor.execute(sql, (artifact_key, exclude_job_id))
+            row = cursor.fetchone()
+        return row["id"] if row else None
+    except Exception as e:
+        print(f"WARN: Job {exclude_job_id}: Failed to look up reusable artifact: {e}")
+        return None
+
+def mark_job_reused(job_id: int, source_job_id: int):
+    """学習済み成果物を再利用したこと (キャッシュヒット) を記録する"""
+    sql = "UPDATE finetuning_jobs SET reused_from_job_id = %s WHERE id = %s"
+    with get_db_cursor(commit=True) as cursor:
+        cursor.execute(sql, (source_job_id, job_id))
+    print(f"INFO: Job {job_id}: Marked as reusing artifacts of job {source_job_id}.")
+
+def copy_visualization(source_job_id: int, job_id: int) -> bool:
+    """再利用元ジョブの可視化データを複製する (画像は再利用元のものを参照する)"""
+    sql = """
+        INSERT INTO weight_visualizations (job_id, layers_data, weight_stats)
+        SELECT %s, layers_data, weight_stats FROM weight_visualizations WHERE job_id = %s
+        ON DUPLICATE KEY UPDATE layers_data = VALUES(layers_data), weight_stats = VALUES(weight_stats)
+    """
+    try:
+        with get_db_cursor(commit=True) as cursor:
+            cursor.execute(sql, (job_id, source_job_id))
+            copied = cursor.rowcount > 0
+        print(f"INFO: Job {job_id}: Visualization data copied from job {source_job_id}.")
+        return copied
+    except Exception as e:
+        print(f"WARN: Job {job_id}: Failed to copy visualization data: {e}")
+        return False
+
+def find_training_stats(job_id: int) -> Optional[TrainingStats]:
+    """アップロード時に集計された訓練データの統計を取得 (無い場合・取得できない場合は None)"""
+    sql = """
+        SELECT file_mode, record_count, invalid_record_count, methods
+        FROM training_links WHERE job_id = %s
+    """
+    try:
+        with get_db_cursor() as cursor:
+            cursor.execute(sql, (job_id,))
+            row = cursor.fetchone()
+    except Exception as e:
+        print(f"WARN: Job {job_id}: Failed to load training file statistics: {e}")
+        return None
+    if not row or not row["file_mode"]:
+        return None
+    methods = row["methods"]
+    return TrainingStats(
+        file_mode=row["file_mode"],
+        record_count=row["record_count"] or 0,
+        invalid_record_count=row["invalid_record_count"] or 0,
+        methods=[m for m in methods.split("\n") if m] if methods is not None else None,
+    )
+
 def close_db_pool():
     """アプリケーション終了時にDBプールを閉じる（オプション）"""
     global db_pool
@@ -5,19 +5,127 @@ import time
 import subprocess
 import json
 import re
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Union
 
 # --- Import from sibling modules ---
 try:
-    from .sftp_service import create_sftp_service_from_env, SFTPFileStorageService, FileStorageError
-    from .db_helpers import find_job_by_id, update_job_status, save_visualization, JobInfo
+    from .sftp_service import SFTPFileStorageService, FileStorageError
+    from .local_storage_service import LocalFileStorageService, create_storage_service_from_env
+    from .db_helpers import (
+        find_job_by_id, update_job_status, save_visualization, JobInfo,
+        set_job_artifact_key, find_completed_job_by_artifact_key, mark_job_reused, copy_visualization,
+        find_training_stats,
+    )
+    from .artifact_archive import archive_available
+    from .artifact_cache import compute_file_sha256, fingerprint_model_dir, compute_artifact_key
     # 修正: utils から extract_methods_from_training_file をインポート
-    from .utils import parse_visualization_output, run_script, extract_methods_from_training_file
+    from .utils import (
+        parse_visualization_output, run_script, extract_methods_from_training_file, write_methods_file,
+        list_archived_heatmaps, load_color_ranges, load_weight_stats,
+    )
 except ImportError as e:
     print(f"FATAL: Failed to import sibling modules: {e}")
     raise
 
 
+# 学習のハイパーパラメータ (成果物キーに含めるため、学習スクリプトへ明示的に渡す)
+TRAINING_HYPERPARAMS: Dict[str, Any] = {
+    "epochs": int(os.environ.get("FINETUNE_EPOCHS", "3")),
+    "lr": float(os.environ.get("FINETUNE_LR", "2e-5")),
+    "max_length": int(os.environ.get("FINETUNE_MAX_LENGTH", "32")),
+    "batch_size": 16,  # train_and_export.py の BATCH_SIZE (引数では変更できない)
+}
+
+
+# これより有効な triplet 行が少ない場合は学習せずにベースモデルを書き出す
+MIN_TRAINING_RECORDS = 10
+
+
+# モデル成果物の転送方式 (files: ファイルごとに並行転送 / archive: zstd 圧縮 tar を1本で転送しリモートで展開)
+ARTIFACT_TRANSFER_MODE = os.environ.get("ARTIFACT_TRANSFER_MODE", "files").strip().lower()
+ARTIFACT_ARCHIVE_ZSTD_LEVEL = int(os.environ.get("ARTIFACT_ARCHIVE_ZSTD_LEVEL", "3"))
+
+
+def _upload_model_artifacts(
+    job_id: int,
+    storage_service: Union[SFTPFileStorageService, LocalFileStorageService],
+    local_model_dir: str,
+    remote_model_dir: str,
+) -> None:
+    """
+    モデル成果物をアップロードする。archive モードでは圧縮 tar で転送し、
+    リモートで展開できなかった場合はファイルごとの転送にフォールバックする (リモートの構成は同じ)。
+    """
+    if (
+        ARTIFACT_TRANSFER_MODE == "archive"
+        and isinstance(storage_service, SFTPFileStorageService)
+    ):
+        if not archive_available():
+            print(f"WARN: Job {job_id}: zstandard is not installed. Falling back to per-file upload.")
+        else:
+            try:
+                storage_service.upload_directory_archive(
+                    local_model_dir, remote_model_dir, level=ARTIFACT_ARCHIVE_ZSTD_LEVEL
+                )
+                return
+            except FileStorageError as e:
+                print(f"WARN: Job {job_id}: Archive upload failed ({e}). Falling back to per-file upload.")
+    storage_service.upload_directory(local_model_dir, remote_model_dir)
+
+
+def _try_reuse_artifacts(
+    job_id: int,
+    artifact_key: str,
+    storage_service: Union[SFTPFileStorageService, LocalFileStorageService],
+    remote_model_base_dir: str,
+    remote_visuals_base_dir: str,
+) -> bool:
+    """
+    同じ成果物キーで完了済みのジョブがあれば、その学習済みモデルと可視化を再利用する。
+    再利用できた場合は True を返す (学習・アップロードは不要)。
+    """
+    source_job_id = find_completed_job_by_artifact_key(artifact_key, exclude_job_id=job_id)
+    if source_job_id is None:
+        return False
+
+    source_model_dir = f"{storage_service.remote_model_base_dir.rstrip('/')}/job_{source_job_id}"
+    source_visuals_dir = f"{storage_service.remote_visuals_base_dir.rstrip('/')}/job_{source_job_id}"
+    if not storage_service.exists(source_model_dir):
+        print(f"WARN: Job {job_id}: Artifacts of job {source_job_id} are missing on VPS. Training from scratch.")
+        return False
+
+    print(f"INFO: Job {job_id}: Cache hit. Reusing artifacts of job {source_job_id}...")
+    storage_service.link_directory(source_model_dir, remote_model_base_dir)
+    if storage_service.exists(source_visuals_dir):
+        storage_service.link_directory(source_visuals_dir, remote_visuals_base_dir)
+    copy_visualization(source_job_id, job_id)
+    mark_job_reused(job_id, source_job_id)
+    return True
+
+
+def _detect_training_file_mode(job_id: int, local_training_file_path: str) -> tuple:
+    """
+    訓練データを読んでモードと有効な行数を判定する (backend の統計が無い古いジョブ用)。
+    'empty' / 'method_definition' / 'training' のいずれかと、タブを2つ以上含む行数を返す。
+    """
+    try:
+        with open(local_training_file_path, 'r', encoding='utf-8') as f:
+            content = f.read().strip()
+        # Case 1: Empty file
+        if not content:
+            return 'empty', 0
+        # Case 2: Method Definition Mode (no tabs)
+        if '\t' not in content:
+            return 'method_definition', 0
+        # Case 3: Training Mode (contains tabs) -> Count valid training lines
+        lines = [line.strip() for line in content.split('\n') if line.strip()]
+        valid_lines = [line for line in lines if line.count('\t') >= 2]
+        return 'training', len(valid_lines)
+    except Exception as e:
+        print(f"WARN: Job {job_id}: Failed to analyze training file: {e}")
+        return 'empty', 0
+
+
 def execute_finetuning_pipeline(
     job_id: int,
     training_file_path_on_vps: str,
@@ -32,7 +140,7 @@ def execute_finetuning_pipeline(
     base_model_name_short = 'bert-tiny'
     print(f"INFO: Job {job_id}: Pipeline starting for fixed model '{base_model_name_short}'...")
     final_error_message: Optional[str] = None
-    sftp_service: Optional[SFTPFileStorageService] = None
+    storage_service: Optional[Union[SFTPFileStorageService, LocalFileStorageService]] = None
 
     # Paths
     base_model_local_path = os.path.join(worker_base_dir, "tasks", "finetuning", "models", base_model_name_short)
@@ -69,10 +177,10 @@ def execute_finetuning_pipeline(
         return
 
     try:
-        # --- Instantiate SFTP Service ---
-        sftp_service = create_sftp_service_from_env()
-        remote_model_base_dir = os.path.join(sftp_service.remote_model_base_dir, f"job_{job_id}").replace("\\", "/")
-        remote_visuals_base_dir = os.path.join(sftp_service.remote_visuals_base_dir, f"job_{job_id}").replace("\\", "/")
+        # --- Instantiate Storage Service (SFTP or local volume) ---
+        storage_service = create_storage_service_from_env()
+        remote_model_base_dir = os.path.join(storage_service.remote_model_base_dir, f"job_{job_id}").replace("\\", "/")
+        remote_visuals_base_dir = os.path.join(storage_service.remote_visuals_base_dir, f"job_{job_id}").replace("\\", "/")
 
         # --- Base Model Check ---
         if not os.path.isdir(base_model_local_path):
@@ -86,49 +194,67 @@ def execute_finetuning_pipeline(
         update_job_status(job_id, 'running', error_message=None, finished_at=None)
         print(f"INFO: Job {job_id}: Status set to 'running'.")
 
-        # --- 2. Download Training File ---
-        print(f"INFO: Job {job_id}: Downloading training file...")
-        sftp_service.download_file(training_file_path_on_vps, local_training_file_path)
-        print(f"INFO: Job {job_id}: Training file downloaded.")
+        # --- 1.5. Reuse Trained Artifacts (content-addressed) ---
+        # backend がアップロード時に計算したハッシュがあれば、訓練データをダウンロードせずに判定できる
+        training_file_downloaded = False
+        training_file_hash = job_info.training_file_hash
+        if not training_file_hash:
+            storage_service.download_file(training_file_path_on_vps, local_training_file_path)
+            training_file_downloaded = True
+            training_file_hash = compute_file_sha256(local_training_file_path)
 
-        # --- 2.5. Auto-detect Mode: Empty / Method Definition / Training ---
-        is_skip_training = False
-        file_mode = None  # 'empty', 'method_definition', 'training'
-        
-        try:
-            with open(local_training_file_path, 'r', encoding='utf-8') as f:
-                content = f.read().strip()
-                
-                # Case 1: Empty file
-                if not content:
-                    file_mode = 'empty'
-                    is_skip_training = True
-                    print(f"INFO: Job {job_id}: File is empty. Skipping training and using base model.")
-                
-                # Case 2: Method Definition Mode (no tabs)
-                elif '\t' not in content:
-                    file_mode = 'method_definition'
-                    is_skip_training = True
-                    print(f"INFO: Job {job_id}: Method Definition Mode detected (no tabs). Skipping training.")
-                
-                # Case 3: Training Mode (contains tabs)
-                else:
-                    file_mode = 'training'
-                    # Count valid training lines
-                    lines = [line.strip() for line in content.split('\n') if line.strip()]
-                    valid_lines = [line for line in lines if line.count('\t') >= 2]
-                    
-                    if len(valid_lines) < 10:
-                        is_skip_training = True
-                        print(f"INFO: Job {job_id}: Training Mode detected but only {len(valid_lines)} valid lines (< 10). Skipping training.")
-                    else:
-                        is_skip_training = False
-                        print(f"INFO: Job {job_id}: Training Mode detected with {len(valid_lines)} valid lines. Proceeding with training.")
-                        
-        except Exception as e:
-            print(f"WARN: Job {job_id}: Failed to analyze training file: {e}")
-            file_mode = 'empty'
-            is_skip_training = True
+        artifact_key = compute_artifact_key(
+            training_file_hash,
+            base_model_name_short,
+            fingerprint_model_dir(base_model_local_path),
+            TRAINING_HYPERPARAMS,
+        )
+        set_job_artifact_key(job_id, artifact_key, training_file_hash)
+        print(f"INFO: Job {job_id}: Artifact key {artifact_key}.")
+
+        if _try_reuse_artifacts(job_id, artifact_key, storage_service, remote_model_base_dir, remote_visuals_base_dir):
+            print(f"INFO: Job {job_id}: Training skipped (artifacts reused).")
+            return
+
+        # --- 2. Training File Statistics (computed by the backend at upload time) ---
+        # 統計があればファイルを再走査せずにモードを決め、学習しない場合はダウンロード自体を省略する
+        training_stats = find_training_stats(job_id)
+        if training_stats is not None:
+            file_mode = training_stats.file_mode
+            record_count = training_stats.record_count
+            print(
+                f"INFO: Job {job_id}: Using upload-time statistics (mode={file_mode}, records={record_count}, "
+                f"invalid={training_stats.invalid_record_count})."
+            )
+        else:
+            file_mode = None
+            record_count = 0
+
+        needs_training_file = (
+            training_stats is None
+            or file_mode == 'method_definition'
+            or (file_mode == 'training' and (record_count >= MIN_TRAINING_RECORDS or training_stats.methods is None))
+        )
+        if needs_training_file and not training_file_downloaded:
+            print(f"INFO: Job {job_id}: Downloading training file...")
+            storage_service.download_file(training_file_path_on_vps, local_training_file_path)
+            training_file_downloaded = True
+            print(f"INFO: Job {job_id}: Training file downloaded.")
+
+        # --- 2.5. Auto-detect Mode: Empty / Method Definition / Training (統計が無い場合のみ) ---
+        if training_stats is None:
+            file_mode, record_count = _detect_training_file_mode(job_id, local_training_file_path)
+
+        is_skip_training = True
+        if file_mode == 'empty':
+            print(f"INFO: Job {job_id}: File is empty. Skipping training and using base model.")
+        elif file_mode == 'method_definition':
+            print(f"INFO: Job {job_id}: Method Definition Mode detected (no tabs). Skipping training.")
+        elif record_count < MIN_TRAINING_RECORDS:
+            print(f"INFO: Job {job_id}: Training Mode detected but only {record_count} valid lines (< {MIN_TRAINING_RECORDS}). Skipping training.")
+        else:
+            is_skip_training = False
+            print(f"INFO: Job {job_id}: Training Mode detected with {record_count} valid lines. Proceeding with training.")
 
         # --- 2.6. Generate methods.txt based on detected mode ---
         if file_mode == 'empty':
@@ -145,7 +271,12 @@ def execute_finetuning_pipeline(
                 dst.write(methods_content)
             print(f"INFO: Job {job_id}: Copied method definitions to methods.txt.")
             
-        elif file_mode == 'training':
+        elif training_stats is not None and training_stats.methods is not None:
+            # Training Mode: アップロード時に集計したメソッド一覧をそのまま書き出す
+            write_methods_file(training_stats.methods, local_methods_file_path)
+            print(f"INFO: Job {job_id}: Wrote {len(training_stats.methods)} methods from upload-time statistics.")
+
+        else:
             # Training Mode: Extract methods from training data
             print(f"INFO: Job {job_id}: Extracting methods from training data...")
             extract_methods_from_training_file(local_training_file_path, local_methods_file_path)
@@ -156,7 +287,10 @@ def execute_finetuning_pipeline(
         train_args = [
             "--base_model_path", base_model_local_path,
             "--training_file", local_training_file_path,
-            "--output_dir", temp_model_dir
+            "--output_dir", temp_model_dir,
+            "--epochs", str(TRAINING_HYPERPARAMS["epochs"]),
+            "--lr", str(TRAINING_HYPERPARAMS["lr"]),
+            "--max_length", str(TRAINING_HYPERPARAMS["max_length"]),
         ]
         if is_skip_training:
             train_args.append("--skip_training")
@@ -170,7 +304,7 @@ def execute_finetuning_pipeline(
 
         # 4a. Upload Model (methods.txtもtemp_model_dirにあるため、一緒にアップロードされる)
         print(f"INFO: Job {job_id}: Uploading model artifacts (including methods.txt)...")
-        sftp_service.upload_directory(temp_model_dir, remote_model_base_dir)
+        _upload_model_artifacts(job_id, storage_service, temp_model_dir, remote_model_base_dir)
         print(f"INFO: Job {job_id}: Model artifacts uploaded.")
 
         # 4b. Run Visualization
@@ -178,21 +312,31 @@ def execute_finetuning_pipeline(
         vis_args = [
             "--base_model_path", base_model_local_path,
             "--finetuned_model_path", temp_model_dir,
-            "--output_dir", temp_visuals_dir
+            "--output_dir", temp_visuals_dir,
+            # 画面で値の範囲の横に表示するカラーバー (カラーマップごとに1枚)
+            "--colorbar",
         ]
         try:
             vis_successful = run_script(job_id, visualize_script_path, vis_args, worker_base_dir)
             if vis_successful:
                 print(f"INFO: Job {job_id}: Uploading visualization images...")
-                uploaded_image_paths = sftp_service.upload_directory(
+                uploaded_image_paths = storage_service.upload_directory(
                     temp_visuals_dir, remote_visuals_base_dir, return_remote_paths=True
                 )
                 print(f"INFO: Job {job_id}: Vis images uploaded ({len(uploaded_image_paths)} files).")
+                # 量子化した重みだけを保存した場合、画像は backend が初回の表示時に描画する (パスだけ登録する)
+                for local_rel_path, remote_path in list_archived_heatmaps(temp_visuals_dir, remote_visuals_base_dir).items():
+                    uploaded_image_paths.setdefault(local_rel_path, remote_path)
 
                 # Save visualization data
-                layers_data = parse_visualization_output(uploaded_image_paths, job_id)
-                if layers_data:
-                    save_visualization(job_id, layers_data)
+                # 画像の色範囲 (画像に描かないため、画面で値の範囲として表示する)
+                layers_data = parse_visualization_output(
+                    uploaded_image_paths, job_id, color_ranges=load_color_ranges(temp_visuals_dir)
+                )
+                # 重み変化の統計 (画像を開かずに一覧できるよう、可視化データと同じ行に保存する)
+                weight_stats = load_weight_stats(temp_visuals_dir)
+                if layers_data or weight_stats:
+                    save_visualization(job_id, layers_data, weight_stats)
                 else:
                     print(f"WARN: Job {job_id}: No vis data formatted for DB.")
             else:
@@ -221,6 +365,10 @@ def execute_finetuning_pipeline(
         except Exception as db_update_e:
             print(f"ERROR: Job {job_id}: CRITICAL - Failed to update final DB status: {db_update_e}")
 
+        if storage_service is not None:
+            print(f"INFO: Job {job_id}: Storage pool stats: {storage_service.pool_stats()}")
+            print(f"INFO: Job {job_id}: Storage upload throughput: {storage_service.upload_stats()}")
+
         print(f"INFO: Job {job_id}: Cleaning up temp dir {temp_job_dir}...")
         try:
             if os.path.exists(temp_job_dir):
@@ -0,0 +1,127 @@
+import os
+import shutil
+import time
+import uuid
+from typing import Dict, Union
+
+from .sftp_service import FileStorageError, SFTPFileStorageService, create_sftp_service_from_env
+
+
+# 既定のストレージルート (docker-compose.yml の agenthub_storage ボリュームのマウント先。backend と同じ)
+DEFAULT_LOCAL_STORAGE_ROOT = "/data/agenthub"
+
+
+class LocalFileStorageService:
+    """
+    ローカルディスク (backend と共有するマウント済みボリューム) 上でファイル操作を行うサービス。
+    SFTPFileStorageService と同じインターフェースを持ち、STORAGE_BACKEND=local の場合に使う。
+    パスは backend と同じ絶対パスなので、DB に保存したパスをそのまま共有できる。
+    """
+
+    def __init__(self, training_dir: str, model_dir: str, visuals_dir: str):
+        self.remote_training_base_dir = training_dir
+        self.remote_model_base_dir = model_dir
+        self.remote_visuals_base_dir = visuals_dir
+        self._upload_totals = {"files": 0, "bytes": 0, "seconds": 0.0}
+        print(f"INFO: Local Storage Service initialized (models: {model_dir}, visuals: {visuals_dir})")
+
+    def pool_stats(self) -> Dict[str, int]:
+        """接続プールは使わない (SFTPFileStorageService との互換用)"""
+        return {}
+
+    def upload_stats(self) -> Dict[str, float]:
+        """このサービスで行ったコピーの累計 (ファイル数・バイト数・所要時間・スループット)"""
+        totals = dict(self._upload_totals)
+        seconds = totals["seconds"]
+        totals["seconds"] = round(seconds, 3)
+        totals["mb_per_second"] = round(totals["bytes"] / seconds / (1024 * 1024), 2) if seconds > 0 else 0.0
+        return totals
+
+    def exists(self, remote_path: str) -> bool:
+        return os.path.exists(remote_path)
+
+    def link_directory(self, source_dir: str, target_dir: str):
+        """既存のディレクトリを別名で参照できるようにする (学習済み成果物の再利用用)"""
+        try:
+            os.makedirs(os.path.dirname(target_dir.rstrip('/')), exist_ok=True)
+            if os.path.lexists(target_dir):
+                print(f"INFO: {target_dir} already exists. Skipping link.")
+                return
+            os.symlink(source_dir, target_dir, target_is_directory=True)
+            print(f"INFO: Linked {target_dir} -> {source_dir}.")
+        except OSError as e:
+            raise FileStorageError(f"Failed to link {target_dir} -> {source_dir}: {e}")
+
+    def download_file(self, remote_path: str, local_path: str):
+        """ストレージ上のファイルを作業ディレクトリへコピー"""
+        try:
+            os.makedirs(os.path.dirname(local_path), exist_ok=True)
+            print(f"INFO: Copying {remote_path} to {local_path}...")
+            shutil.copyfile(remote_path, local_path)
+            print(f"INFO: Copy successful.")
+        except FileNotFoundError:
+            raise
+        except OSError as e:
+            raise FileStorageError(f"Failed to copy {remote_path}: {e}")
+
+    def upload_directory(
+        self,
+        local_dir_path: str,
+        remote_base_dir: str,
+        return_remote_paths: bool = False
+    ) -> Dict[str, str]:
+        """
+        作業ディレクトリの内容をストレージへコピー。
+        ファイルは一時名でコピーしてからリネームする (backend から書き込み途中のファイルを配信しない)。
+        shutil.copyfile は Linux ではカーネル内コピー (copy_file_range/sendfile) になる。
+        """
+        uploaded_paths = {}
+        total_bytes = 0
+        file_count = 0
+        started = time.monotonic()
+        print(f"INFO: Copying dir {local_dir_path} to {remote_base_dir}...")
+        try:
+            for root, dirs, files in os.walk(local_dir_path):
+                relative_path = os.path.relpath(root, local_dir_path)
+                target_dir = remote_base_dir if relative_path == "." else os.path.join(remote_base_dir, relative_path)
+                os.makedirs(target_dir, exist_ok=True)
+                for filename in files:
+                    local_file = os.path.join(root, filename)
+                    target_file = os.path.join(target_dir, filename)
+                    temp_file = f"{target_file}.part-{uuid.uuid4().hex}"
+                    shutil.copyfile(local_file, temp_file)
+                    os.replace(temp_file, target_file)
+                    total_bytes += os.path.getsize(target_file)
+                    file_count += 1
+                    if return_remote_paths:
+                        local_relative = os.path.relpath(local_file, local_dir_path).replace("\\", "/")
+                        uploaded_paths[local_relative] = target_file
+        except OSError as e:
+            raise FileStorageError(f"Failed to copy directory to {remote_base_dir}: {e}")
+
+        elapsed = time.monotonic() - started
+        self._upload_totals["files"] += file_count
+        self._upload_totals["bytes"] += total_bytes
+        self._upload_totals["seconds"] += elapsed
+        print(f"INFO: Directory copy successful: {file_count} files, {total_bytes} bytes in {elapsed:.2f}s.")
+        return uploaded_paths
+
+
+def create_local_storage_service_from_env() -> LocalFileStorageService:
+    """環境変数 LOCAL_STORAGE_ROOT (既定: /data/agenthub) からローカルストレージサービスを生成"""
+    root = os.path.abspath(os.environ.get("LOCAL_STORAGE_ROOT") or DEFAULT_LOCAL_STORAGE_ROOT)
+    return LocalFileStorageService(
+        training_dir=os.path.join(root, "training_data"),
+        model_dir=os.path.join(root, "models"),
+        visuals_dir=os.path.join(root, "visualizations"),
+    )
+
+
+def create_storage_service_from_env() -> Union[SFTPFileStorageService, LocalFileStorageService]:
+    """環境変数 STORAGE_BACKEND ('sftp' または 'local'、既定は 'sftp') に応じたストレージサービスを生成"""
+    backend = os.environ.get("STORAGE_BACKEND", "sftp").strip().lower()
+    if backend == "local":
+        return create_local_storage_service_from_env()
+    if backend != "sftp":
+        raise EnvironmentError(f"Unsupported STORAGE_BACKEND: {backend!r} (expected 'sftp' or 'local').")
+    return create_sftp_service_from_env()
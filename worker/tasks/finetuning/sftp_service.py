@@ -1,16 +1,28 @@
 import os
 import paramiko
+import shlex
 import stat
-from typing import Dict
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Set, Tuple
 from contextlib import contextmanager
 from paramiko.ed25519key import Ed25519Key
 
+from .artifact_archive import ARCHIVE_FILENAME, write_directory_archive
+from .sftp_pool import SFTPConnectionPool, SFTPPoolConfig, get_shared_sftp_pool, create_sftp_pool_config_from_env
+
 
 class FileStorageError(Exception):
     """ファイルストレージ操作に関するカスタムエラー"""
     pass
 
 
+# 1回の write で送るサイズ。paramiko がパケット単位 (32KB) に分割し、応答を待たずに送り続ける
+UPLOAD_WRITE_CHUNK_SIZE = 1024 * 1024
+
+
 class SFTPFileStorageService:
     """Paramiko (SFTP) を使用して、リモートVPSとのファイル操作を行うサービス。"""
 
@@ -22,7 +34,9 @@ class SFTPFileStorageService:
         remote_training_dir: str,
         remote_model_dir: str,
         remote_visuals_dir: str,
-        vps_port: int = 22
+        vps_port: int = 22,
+        pool_config: Optional[SFTPPoolConfig] = None,
+        upload_concurrency: int = 4
     ):
         self.vps_ip = vps_ip
         self.vps_user = vps_user
@@ -31,54 +45,58 @@ class SFTPFileStorageService:
         self.remote_training_base_dir = remote_training_dir
         self.remote_model_base_dir = remote_model_dir
         self.remote_visuals_base_dir = remote_visuals_dir
+        self.upload_concurrency = max(1, upload_concurrency)
 
-        if not os.path.exists(self.key_file_path):
-            raise FileNotFoundError(f"SSH key file not found: {self.key_file_path}")
+        # 作成済み (存在確認済み) のリモートディレクトリ。同じパスへの stat を繰り返さない
+        self._ensured_dirs: Set[str] = set()
+        self._ensured_dirs_lock = threading.Lock()
+        # アップロードの累計 (ジョブ終了時にスループットとして出力する)
+        self._upload_totals = {"files": 0, "bytes": 0, "seconds": 0.0}
 
+        # SSH トランスポートはプロセス内で共有するプールから借りる (鍵の読み込みもプールが行う)
         try:
-            self.private_key = paramiko.Ed25519Key(filename=self.key_file_path)
+            self._pool: SFTPConnectionPool = get_shared_sftp_pool(
+                pool_config or SFTPPoolConfig(host=vps_ip, port=vps_port, user=vps_user, key_file_path=key_file_path)
+            )
+        except FileNotFoundError:
+            raise
         except Exception as e:
-            raise FileStorageError(f"Failed to load SSH private key (Ed25519): {e}")
+            raise FileStorageError(f"Failed to initialize SFTP pool: {e}")
 
         print(f"INFO: SFTP Storage Service initialized for {self.vps_user}@{self.vps_ip}")
 
     @contextmanager
     def connect(self) -> paramiko.SFTPClient:
-        """SFTP接続を管理するコンテキストマネージャ"""
-        client = None
-        sftp = None
+        """プールから SFTP チャネルを借りるコンテキストマネージャ (接続済みならハンドシェイクは発生しない)"""
         try:
-            client = paramiko.SSHClient()
-            client.set_missing_host_key_policy(paramiko.AutoAddPolicy())
-
-            client.connect(
-                self.vps_ip,
-                port=self.vps_port,
-                username=self.vps_user,
-                pkey=self.private_key
-            )
-
-            sftp = client.open_sftp()
-            yield sftp
+            with self._pool.session() as sftp:
+                yield sftp
+        except FileStorageError:
+            raise
         except Exception as e:
             print(f"ERROR: SFTP connection/operation failed: {e}")
             raise FileStorageError(f"SFTP operation failed: {e}")
-        finally:
-            if sftp:
-                try:
-                    sftp.close()
-                except Exception:
-                    pass
-            if client:
-                try:
-                    client.close()
-                except Exception:
-                    pass
+
+    def pool_stats(self) -> Dict[str, int]:
+        """SFTP 接続プールの状態 (トランスポート数・チャネル数・累計の接続/再利用回数)"""
+        return self._pool.stats()
+
+    def upload_stats(self) -> Dict[str, float]:
+        """このサービスで行ったアップロードの累計 (ファイル数・バイト数・所要時間・スループット)"""
+        totals = dict(self._upload_totals)
+        seconds = totals["seconds"]
+        totals["seconds"] = round(seconds, 3)
+        totals["mb_per_second"] = round(totals["bytes"] / seconds / (1024 * 1024), 2) if seconds > 0 else 0.0
+        return totals
 
     def _ensure_remote_dir_internal(self, sftp: paramiko.SFTPClient, remote_dir: str):
         """リモートディレクトリが存在することを確認し、なければ再帰的に作成"""
         if not remote_dir.startswith('/'):
             raise ValueError("Remote path must be absolute")
+        remote_dir = remote_dir.rstrip('/') or '/'
+        with self._ensured_dirs_lock:
+            if remote_dir in self._ensured_dirs:
+                return
 
         current_dir = ""
         parts = remote_dir.strip('/').split('/')
@@ -91,6 +109,9 @@ class SFTPFileStorageService:
             current_dir = "/" if current_dir == "" and part == "" else (current_dir + "/" + part).replace('//', '/')
             if current_dir == "/":
                 continue
+            with self._ensured_dirs_lock:
+                if current_dir in self._ensured_dirs:
+                    continue
             try:
                 sftp_attrs = sftp.stat(current_dir)
                 if not stat.S_ISDIR(sftp_attrs.st_mode):
@@ -103,8 +124,56 @@ class SFTPFileStorageService:
                         sftp.stat(current_dir)  # Check again for race condition
                     except FileNotFoundError:
                         raise FileStorageError(f"Failed to create dir {current_dir}: {mkdir_e}")
+            except FileStorageError:
+                raise
             except Exception as e:
                 raise FileStorageError(f"Error ensuring dir {current_dir}: {e}")
+            with self._ensured_dirs_lock:
+                self._ensured_dirs.add(current_dir)
+
+    def exists(self, remote_path: str) -> bool:
+        """リモートにファイル・ディレクトリが存在するか"""
+        with self.connect() as sftp:
+            try:
+                sftp.stat(remote_path)
+                return True
+            except FileNotFoundError:
+                return False
+
+    def link_directory(self, source_dir: str, target_dir: str):
+        """
+        既存のリモートディレクトリを別名で参照できるようにする (学習済み成果物の再利用用)。
+        シンボリックリンクを作成し、サーバーが対応していない場合はワーカー経由で複製する。
+        """
+        with self.connect() as sftp:
+            parent = os.path.dirname(target_dir.rstrip('/'))
+            self._ensure_remote_dir_internal(sftp, parent)
+            try:
+                sftp.stat(target_dir)
+                print(f"INFO: {target_dir} already exists. Skipping link.")
+                return
+            except FileNotFoundError:
+                pass
+            try:
+                sftp.symlink(source_dir, target_dir)
+                print(f"INFO: Linked {target_dir} -> {source_dir}.")
+                return
+            except IOError as e:
+                print(f"WARN: symlink not supported ({e}). Copying {source_dir} to {target_dir}...")
+            self._copy_remote_tree(sftp, source_dir, target_dir)
+            print(f"INFO: Copied {source_dir} to {target_dir}.")
+
+    def _copy_remote_tree(self, sftp: paramiko.SFTPClient, source_dir: str, target_dir: str):
+        self._ensure_remote_dir_internal(sftp, target_dir)
+        for entry in sftp.listdir_attr(source_dir):
+            source = f"{source_dir.rstrip('/')}/{entry.filename}"
+            target = f"{target_dir.rstrip('/')}/{entry.filename}"
+            if stat.S_ISDIR(entry.st_mode):
+                self._copy_remote_tree(sftp, source, target)
+            else:
+                with sftp.open(source, "rb") as src:
+                    src.prefetch()
+                    sftp.putfo(src, target)
 
     def download_file(self, remote_path: str, local_path: str):
         """リモートファイルをローカルにダウンロード"""
@@ -116,35 +185,183 @@ class SFTPFileStorageService:
             sftp.get(remote_path, local_path)
             print(f"INFO: Download successful.")
 
+    def _put_file(self, sftp: paramiko.SFTPClient, local_file: str, remote_file: str) -> int:
+        """
+        1ファイルをアップロードする。大きな単位で書き込み、応答を待たずに送り続ける (パイプライン)。
+        最後にサイズを照合する。
+        """
+        size = os.path.getsize(local_file)
+        with open(local_file, "rb") as src, sftp.open(remote_file, "wb") as dst:
+            dst.set_pipelined(True)
+            while True:
+                chunk = src.read(UPLOAD_WRITE_CHUNK_SIZE)
+                if not chunk:
+                    break
+                dst.write(chunk)
+        remote_size = sftp.stat(remote_file).st_size
+        if remote_size != size:
+            raise FileStorageError(f"Size mismatch after upload of {remote_file}: {remote_size} != {size}")
+        return size
+
     def upload_directory(
         self,
         local_dir_path: str,
         remote_base_dir: str,
         return_remote_paths: bool = False
     ) -> Dict[str, str]:
-        """ローカルディレクトリの内容をリモートにアップロード"""
+        """
+        ローカルディレクトリの内容をリモートにアップロード。
+        ディレクトリを先にまとめて作成し、ファイルは upload_concurrency 本の SFTP チャネル
+        (プールのトランスポートを共有) で並行して送る。大きいファイルから順に割り当てる。
+        """
         uploaded_paths = {}
+        remote_dirs: List[str] = [remote_base_dir]
+        files: List[Tuple[int, str, str, str]] = []  # (サイズ, ローカルパス, リモートパス, 相対パス)
+        for root, dirs, filenames in os.walk(local_dir_path):
+            relative_path = os.path.relpath(root, local_dir_path)
+            remote_current_dir = (
+                remote_base_dir if relative_path == "."
+                else os.path.join(remote_base_dir, relative_path).replace("\\", "/")
+            )
+            if relative_path != ".":
+                remote_dirs.append(remote_current_dir)
+            for filename in filenames:
+                local_file = os.path.join(root, filename)
+                remote_file = os.path.join(remote_current_dir, filename).replace("\\", "/")
+                local_relative = os.path.relpath(local_file, local_dir_path).replace("\\", "/")
+                files.append((os.path.getsize(local_file), local_file, remote_file, local_relative))
+        files.sort(key=lambda f: f[0], reverse=True)
+
+        print(f"INFO: Uploading dir {local_dir_path} to {remote_base_dir} ({len(files)} files)...")
+        started = time.monotonic()
         with self.connect() as sftp:
-            self._ensure_remote_dir_internal(sftp, remote_base_dir)
-            print(f"INFO: Uploading dir {local_dir_path} to {remote_base_dir}...")
-            for root, dirs, files in os.walk(local_dir_path):
-                relative_path = os.path.relpath(root, local_dir_path)
-                remote_current_dir = (
-                    remote_base_dir if relative_path == "."
-                    else os.path.join(remote_base_dir, relative_path).replace("\\", "/")
-                )
-                if relative_path != ".":
-                    self._ensure_remote_dir_internal(sftp, remote_current_dir)
-                for filename in files:
-                    local_file = os.path.join(root, filename)
-                    remote_file = os.path.join(remote_current_dir, filename).replace("\\", "/")
-                    sftp.put(local_file, remote_file)
-                    if return_remote_paths:
-                        local_relative = os.path.relpath(local_file, local_dir_path).replace("\\", "/")
-                        uploaded_paths[local_relative] = remote_file
-            print(f"INFO: Directory upload successful.")
+            for remote_dir in remote_dirs:
+                self._ensure_remote_dir_internal(sftp, remote_dir)
+
+        # 各ワーカーはチャネルを1本借り、キューが空になるまでファイルを送り続ける
+        lock = threading.Lock()
+        pending = list(reversed(files))
+        failed = threading.Event()
+
+        def next_file() -> Optional[Tuple[int, str, str, str]]:
+            with lock:
+                if failed.is_set() or not pending:
+                    return None
+                return pending.pop()
+
+        def worker() -> int:
+            sent = 0
+            item = next_file()
+            if item is None:
+                return sent
+            try:
+                with self.connect() as sftp:
+                    while item is not None:
+                        _, local_file, remote_file, _ = item
+                        sent += self._put_file(sftp, local_file, remote_file)
+                        item = next_file()
+            except Exception:
+                failed.set()
+                raise
+            return sent
+
+        concurrency = min(self.upload_concurrency, len(files)) or 1
+        with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="sftp-upload") as executor:
+            futures = [executor.submit(worker) for _ in range(concurrency)]
+        errors = [f.exception() for f in futures if f.exception() is not None]
+        if errors:
+            raise errors[0] if isinstance(errors[0], FileStorageError) else FileStorageError(f"Upload failed: {errors[0]}")
+        total_bytes = sum(f.result() for f in futures)
+
+        elapsed = time.monotonic() - started
+        self._upload_totals["files"] += len(files)
+        self._upload_totals["bytes"] += total_bytes
+        self._upload_totals["seconds"] += elapsed
+        throughput = total_bytes / elapsed / (1024 * 1024) if elapsed > 0 else 0.0
+        print(
+            f"INFO: Directory upload successful: {len(files)} files, {total_bytes} bytes "
+            f"in {elapsed:.2f}s ({throughput:.2f} MB/s, {concurrency} channels)."
+        )
+
+        if return_remote_paths:
+            for _, _, remote_file, local_relative in files:
+                uploaded_paths[local_relative] = remote_file
         return uploaded_paths
 
+    def _exec_remote(self, command: str, timeout: float = 600.0) -> int:
+        """
+        プールのトランスポート上でリモートコマンドを実行し、終了コードを返す。
+        SFTP 専用アカウント (ForceCommand internal-sftp など) の場合は失敗する。
+        """
+        with self.connect() as sftp:
+            channel = sftp.get_channel().get_transport().open_session(timeout=30)
+            try:
+                channel.settimeout(timeout)
+                channel.exec_command(command)
+                stderr = channel.makefile_stderr("rb").read().decode("utf-8", "replace").strip()
+                exit_code = channel.recv_exit_status()
+            finally:
+                channel.close()
+        if exit_code != 0:
+            print(f"WARN: Remote command failed (exit {exit_code}): {stderr[:500]}")
+        return exit_code
+
+    def upload_directory_archive(
+        self,
+        local_dir_path: str,
+        remote_base_dir: str,
+        level: int = 3
+    ) -> Dict[str, float]:
+        """
+        ローカルディレクトリを zstd 圧縮 tar として1回の SFTP 書き込みで転送し、リモートで展開する。
+        展開後のディレクトリ構成は upload_directory と同じ。
+        リモートで展開できない場合 (シェル・tar・zstd が使えない) はアーカイブを削除して FileStorageError を送出する
+        (呼び出し側はファイルごとの転送 upload_directory に切り替える)。
+        """
+        remote_archive = f"{remote_base_dir.rstrip('/')}/{ARCHIVE_FILENAME}"
+        temp_archive = f"{remote_archive}.part-{uuid.uuid4().hex}"
+        started = time.monotonic()
+        print(f"INFO: Uploading dir {local_dir_path} to {remote_base_dir} as {ARCHIVE_FILENAME}...")
+        with self.connect() as sftp:
+            self._ensure_remote_dir_internal(sftp, remote_base_dir)
+            with sftp.open(temp_archive, "wb") as dst:
+                dst.set_pipelined(True)
+                report = write_directory_archive(local_dir_path, dst, level=level)
+            try:
+                sftp.posix_rename(temp_archive, remote_archive)
+            except IOError:
+                sftp.rename(temp_archive, remote_archive)
+        uploaded = time.monotonic()
+
+        command = (
+            f"cd {shlex.quote(remote_base_dir)} && "
+            f"zstd -dc {shlex.quote(ARCHIVE_FILENAME)} | tar -xf - && "
+            f"rm -f {shlex.quote(ARCHIVE_FILENAME)}"
+        )
+        try:
+            exit_code = self._exec_remote(command)
+        except FileStorageError as e:
+            print(f"WARN: Remote command execution is not available: {e}")
+            exit_code = -1
+        if exit_code != 0:
+            with self.connect() as sftp:
+                try:
+                    sftp.remove(remote_archive)
+                except IOError:
+                    pass
+            raise FileStorageError(f"Failed to unpack {remote_archive} on the remote host.")
+
+        elapsed = time.monotonic() - started
+        self._upload_totals["files"] += report["files"]
+        self._upload_totals["bytes"] += report["compressed_bytes"]
+        self._upload_totals["seconds"] += elapsed
+        ratio = report["raw_bytes"] / report["compressed_bytes"] if report["compressed_bytes"] else 0.0
+        print(
+            f"INFO: Archive upload successful: {report['files']} files, {report['raw_bytes']} -> "
+            f"{report['compressed_bytes']} bytes (x{ratio:.2f}), upload {uploaded - started:.2f}s, "
+            f"unpack {elapsed - (uploaded - started):.2f}s."
+        )
+        return {**report, "seconds": round(elapsed, 3), "upload_seconds": round(uploaded - started, 3)}
 
 def create_sftp_service_from_env() -> SFTPFileStorageService:
     """環境変数からSFTPサービスインスタンスを生成"""
@@ -168,7 +385,9 @@ def create_sftp_service_from_env() -> SFTPFileStorageService:
             remote_training_dir=remote_training_dir,
             remote_model_dir=remote_model_dir,
             remote_visuals_dir=remote_visuals_dir,
-            vps_port=vps_port
+            vps_port=vps_port,
+            pool_config=create_sftp_pool_config_from_env(),
+            upload_concurrency=int(os.environ.get("VPS_SFTP_UPLOAD_CONCURRENCY", 4))
         )
 
     except KeyError as e:
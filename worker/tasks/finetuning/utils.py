@@ -7,6 +7,10 @@ import json
 import sys
 from typing import Optional, List, Dict, Any
 
+from .heatmap_renderer import read_png_text
+from .weight_archive import WEIGHT_ARCHIVE_NAME, read_weight_manifest
+from .weight_stats import STATS_FILE_NAME, read_weight_stats
+
 # =========================================================================
 # メソッド抽出関数 (修正済み)
 # =========================================================================
@@ -32,10 +36,7 @@ def extract_methods_from_training_file(training_file_path: str, output_txt_path:
                     unique_methods.add(parts[2].strip())
 
         # 抽出したメソッドをファイルに書き込む
-        with open(output_txt_path, 'w', encoding='utf-8') as out_f:
-            for method in sorted(list(unique_methods)):
-                out_f.write(method + '\n')
-                
+        write_methods_file(unique_methods, output_txt_path)
         print(f"INFO: Extracted {len(unique_methods)} unique methods to {output_txt_path}")
 
     except FileNotFoundError:
@@ -46,20 +47,37 @@ def extract_methods_from_training_file(training_file_path: str, output_txt_path:
         raise RuntimeError(f"Method extraction failed: {e}")
 
 
+def write_methods_file(methods, output_txt_path: str) -> None:
+    """メソッド名を1行1つ (ソート済み) で methods.txt に書き込む"""
+    with open(output_txt_path, 'w', encoding='utf-8') as out_f:
+        for method in sorted(methods):
+            out_f.write(method + '\n')
+
+
 # =========================================================================
 # 可視化パス解析関数 (既存)
 # =========================================================================
 
-def parse_visualization_output(uploaded_image_paths: Dict[str, str], job_id: int) -> List[Dict[str, Any]]:
+def parse_visualization_output(
+    uploaded_image_paths: Dict[str, str], job_id: int, color_ranges: Optional[Dict[str, Dict[str, Any]]] = None
+) -> List[Dict[str, Any]]:
     """
     アップロードされた可視化画像パスの辞書をDB保存用の形式に変換。
     キー: ローカル相対パス (例: 'layer0/bert..._delta.png')
     値:   リモート絶対パス/URL (例: '/visualizations/job_123/layer0/bert..._delta.png')
+    color_ranges (load_color_ranges の結果) がある場合は、重みごとに画像の種類 → 値の範囲
+    ({"vmin", "vmax", "cmap", "legend_url"}) を color_ranges に格納する (legend_url はカラーバーのリモートパス。無ければ空)。
     """
     layers_dict: Dict[str, Dict[str, Any]] = {}
+    color_ranges = color_ranges or {}
+    # カラーマップ名 → カラーバー (visualize_finetuning_diff.py --colorbar) のリモートパス
+    legend_urls: Dict[str, str] = {}
     print(f"DEBUG: Parsing visualization paths for Job {job_id}: {uploaded_image_paths}")
 
     for local_rel_path, remote_url in uploaded_image_paths.items():
+        # 量子化した重み (visualize_finetuning_diff.py --output_format tensors) と重み変化の統計は画像ではない
+        if local_rel_path in (WEIGHT_ARCHIVE_NAME, STATS_FILE_NAME):
+            continue
         parts = local_rel_path.split(os.sep)
         if len(parts) < 2:
             print(f"WARN: Job {job_id}: Skipping unexpected vis path: {local_rel_path}")
@@ -68,6 +86,13 @@ def parse_visualization_output(uploaded_image_paths: Dict[str, str], job_id: int
         layer_dir_name = parts[0] # e.g., 'layer0'
         file_name = parts[-1]     # e.g., 'bert...weight_delta.png'
 
+        # カラーバー (visualize_finetuning_diff.py --colorbar) は重みの画像ではない (値の範囲の凡例として使う)
+        if layer_dir_name == "legend":
+            legend_match = re.match(r"colorbar_(.+)\.png$", file_name)
+            if legend_match:
+                legend_urls[legend_match.group(1)] = remote_url
+            continue
+
         # ファイル名から重み名と種類を抽出
         match = re.match(r"(.*)_(before|after|delta)\.png", file_name)
         if not match:
@@ -87,6 +112,16 @@ def parse_visualization_output(uploaded_image_paths: Dict[str, str], job_id: int
         url_key = f"{image_type}_url" # 'before_url', 'after_url', 'delta_url'
         layers_dict[layer_dir_name]["weights"][weight_name_base][url_key] = remote_url
 
+        color = color_ranges.get(local_rel_path)
+        if color:
+            layers_dict[layer_dir_name]["weights"][weight_name_base].setdefault("color_ranges", {})[image_type] = dict(color)
+
+    # 凡例はジョブ内でカラーマップごとに1枚なので、全ての重みを読み終えてから付ける
+    for layer_data in layers_dict.values():
+        for weight in layer_data["weights"].values():
+            for color in weight.get("color_ranges", {}).values():
+                color["legend_url"] = legend_urls.get(color["cmap"], "")
+
     # 最終的なリスト構造に変換
     final_layers_data = []
     # Sort layers by name (e.g., layer0, layer1, ...)
@@ -107,6 +142,56 @@ def parse_visualization_output(uploaded_image_paths: Dict[str, str], job_id: int
     return final_layers_data
 
 
+def list_archived_heatmaps(local_visuals_dir: str, remote_visuals_base_dir: str) -> Dict[str, str]:
+    """
+    weights.npz の manifest から、backend が初回の表示時に描画する画像のパスを
+    parse_visualization_output と同じ形式 (ローカル相対パス → リモートパス) で返す。
+    アーカイブが無い場合 (--output_format images) は空。
+    """
+    manifest = read_weight_manifest(os.path.join(local_visuals_dir, WEIGHT_ARCHIVE_NAME))
+    if not manifest:
+        return {}
+    paths: Dict[str, str] = {}
+    for name, entry in manifest.get("weights", {}).items():
+        for image_type in entry.get("images", []):
+            local_rel_path = os.path.join(entry["layer"], f"{name}_{image_type}.png")
+            paths[local_rel_path] = f"{remote_visuals_base_dir}/{entry['layer']}/{name}_{image_type}.png"
+    return paths
+
+
+def load_color_ranges(local_visuals_dir: str) -> Dict[str, Dict[str, Any]]:
+    """
+    ヒートマップの色範囲を、ローカル相対パス (例: 'layer0/bert..._delta.png') → {"vmin", "vmax", "cmap"} で返す。
+    backend が描画する画像は weights.npz の manifest から、事前に描画した画像は PNG のテキストチャンクから読む
+    (どちらも量子化前の値から求めた範囲。matplotlib で描画した画像は画像内にカラーバーがあり、記録しない)。
+    """
+    ranges: Dict[str, Dict[str, Any]] = {}
+    manifest = read_weight_manifest(os.path.join(local_visuals_dir, WEIGHT_ARCHIVE_NAME))
+    for name, entry in (manifest or {}).get("weights", {}).items():
+        for image_type, (vmin, vmax, cmap) in entry.get("color_ranges", {}).items():
+            ranges[os.path.join(entry["layer"], f"{name}_{image_type}.png")] = {"vmin": vmin, "vmax": vmax, "cmap": cmap}
+
+    for root, _, files in os.walk(local_visuals_dir):
+        for file_name in files:
+            if not file_name.endswith(".png"):
+                continue
+            path = os.path.join(root, file_name)
+            try:
+                text = read_png_text(path)
+                if "vmin" in text and "vmax" in text and "cmap" in text:
+                    ranges[os.path.relpath(path, local_visuals_dir)] = {
+                        "vmin": float(text["vmin"]), "vmax": float(text["vmax"]), "cmap": text["cmap"],
+                    }
+            except (OSError, ValueError) as e:
+                print(f"WARN: Cannot read color range from {path}: {e}")
+    return ranges
+
+
+def load_weight_stats(local_visuals_dir: str) -> Optional[Dict[str, Any]]:
+    """visualize_finetuning_diff.py が書き出した重み変化の統計 (weight_stats.json) を読む。無い場合は None"""
+    return read_weight_stats(os.path.join(local_visuals_dir, STATS_FILE_NAME))
+
+
 # =========================================================================
 # スクリプト実行関数 (既存)
 # =========================================================================
@@ -4,27 +4,70 @@ visualize_finetuning_diff.py
 
 ファインチューニングによる重み変化を可視化するスクリプト。
 ワーカーの実行環境で非対話的に使用される。
+
+ヒートマップは既定で heatmap_renderer (NumPy の LUT で色付けし PNG を直接書き出す) で描画する。
+--renderer matplotlib で従来の pyplot による描画 (タイトル・カラーバー付き) に戻せる。
+
+重みごとの描画はプロセスプールで並列に行う (--workers / VISUALIZATION_WORKERS、既定は CPU 数)。
+重みは共有メモリで子プロセスへ渡す (pickle で複製しない)。並列数は空きメモリからも制限する。
+
+--output_format tensors (既定) の場合は画像を描画せず、量子化した重みを weights.npz (weight_archive) に保存する。
+画像は backend が初回の表示時にこのファイルから描画する。images で従来どおり PNG を出力、both で両方。
+
+出力形式によらず、重みを比較するループの中で全ての浮動小数点の重みについて変化の統計
+(差分の L2 ノルム・相対変化・コサイン類似度・パーセンタイル・スパース性) を集計し、weight_stats.json に書き出す。
 """
 
 from __future__ import annotations
 import argparse
+import multiprocessing
 import os
 import re
-import torch
 import numpy as np
-import matplotlib.pyplot as plt
-from typing import Dict, Optional # Optionalを追加
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Tuple # Optionalを追加
 import sys
 
-# matplotlibのバックエンド設定 (Docker環境でのエラー回避)
-plt.switch_backend('Agg')
+# torch / safetensors は重みの読み込み時にのみ読み込む
+# (描画用の子プロセスはこのスクリプトを読み込み直すため、トップレベルで import すると子プロセスごとに数秒かかる)
 
-# safetensorsのチェック
+# 同じディレクトリのレンダラー (スクリプトとして実行される場合とパッケージとして読み込まれる場合の両方に対応)
 try:
-    from safetensors.torch import load_file as safe_load_file
-    _HAVE_SAFETENSORS = True
-except Exception:
-    _HAVE_SAFETENSORS = False
+    from .heatmap_renderer import COLORMAPS, DEFAULT_WIDTH, DEFAULT_HEIGHT, write_heatmap, write_colorbar
+    from .weight_archive import WEIGHT_ARCHIVE_NAME, write_weight_archive
+    from .weight_stats import STATS_FILE_NAME, WeightStatsAccumulator, layer_group
+except ImportError:
+    from heatmap_renderer import COLORMAPS, DEFAULT_WIDTH, DEFAULT_HEIGHT, write_heatmap, write_colorbar
+    from weight_archive import WEIGHT_ARCHIVE_NAME, write_weight_archive
+    from weight_stats import STATS_FILE_NAME, WeightStatsAccumulator, layer_group
+
+# 描画方式 (numpy: heatmap_renderer [既定] / matplotlib: 従来の pyplot)
+RENDERER_NUMPY = "numpy"
+RENDERER_MATPLOTLIB = "matplotlib"
+
+# 出力形式 (tensors: weights.npz のみ [既定] / images: PNG のみ / both: 両方)
+OUTPUT_TENSORS = "tensors"
+OUTPUT_IMAGES = "images"
+OUTPUT_BOTH = "both"
+
+# カラーバー (--colorbar) の出力先。画像のディレクトリ (layerX) と区別し、parse_visualization_output は凡例として扱う
+LEGEND_DIR_NAME = "legend"
+
+# 並列描画のメモリ見積もり: 子プロセス1つあたりの固定分 (インタプリタ・NumPy・描画用バッファ) と、
+# 重み1つの要素数あたりの作業領域 (差分・float32 変換・パーセンタイル計算の複製) のバイト数
+WORKER_BASE_BYTES = 128 * 1024 * 1024
+WORKER_BYTES_PER_ELEMENT = 16
+# 空きメモリのうち描画に使ってよい割合
+WORKER_MEMORY_FRACTION = 0.75
+
+
+def _pyplot():
+    """matplotlib は従来の描画方式を使う場合のみ読み込む (import だけで数百ms かかるため)"""
+    import matplotlib.pyplot as plt
+    # matplotlibのバックエンド設定 (Docker環境でのエラー回避)
+    plt.switch_backend('Agg')
+    return plt
 
 
 # ===============================
@@ -32,6 +75,7 @@ except Exception:
 # ===============================
 def _load_state_dict(path: str) -> dict[str, torch.Tensor]:
     """PyTorchまたはSafeTensorsファイルから重みをロード"""
+    import torch
     if not os.path.exists(path):
         # 実行権限エラーではなくファイルが見つからないことを示す
         raise FileNotFoundError(f"❌ モデルファイルが見つかりません: {path}")
@@ -42,7 +86,10 @@ def _load_state_dict(path: str) -> dict[str, torch.Tensor]:
         sd = torch.load(path, map_location="cpu")
         return sd["state_dict"] if "state_dict" in sd else sd
     elif ext in (".safetensors", ".safe"):
-        if not _HAVE_SAFETENSORS:
+        # safetensorsのチェック
+        try:
+            from safetensors.torch import load_file as safe_load_file
+        except Exception:
             raise RuntimeError("safetensors not installed. pip install safetensors")
         return safe_load_file(path, device="cpu")
     else:
@@ -57,8 +104,42 @@ def _load_state_dict(path: str) -> dict[str, torch.Tensor]:
 # ===============================
 # 汎用描画関数（自動スケーリング対応）
 # ===============================
+def _heatmap_path(name: str, outdir: str) -> str:
+    # パスをサニタイズ
+    # 注意: nameはPyTorchの重み名 (例: bert.encoder.layer.0.attention.self.key.weight_delta)
+    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+    out = os.path.join(outdir, f"{safe_name}.png")
+
+    # 出力ディレクトリが存在しない場合は作成
+    os.makedirs(os.path.dirname(out), exist_ok=True)
+    return out
+
+
+def save_heatmap_fast(name: str, arr: np.ndarray, outdir: str,
+                      width: int = DEFAULT_WIDTH, height: int = DEFAULT_HEIGHT) -> str:
+    """
+    save_heatmap と同じ色範囲・ファイル名でヒートマップを保存する (matplotlib を使わない)。
+    タイトルとカラーバーは描かず、値の範囲は PNG のテキストチャンクに記録する。
+    """
+    out = _heatmap_path(name, outdir)
+    vmin, vmax, cmap = write_heatmap(out, name, arr, width=width, height=height)
+    print(f"[heatmap] Saved {name} -> {out} ({cmap} [{vmin:.4g}, {vmax:.4g}])")
+    return out
+
+
+def save_colorbars(outdir: str) -> None:
+    """カラーマップごとの凡例をジョブにつき1回だけ書き出す"""
+    legend_dir = os.path.join(outdir, LEGEND_DIR_NAME)
+    os.makedirs(legend_dir, exist_ok=True)
+    for cmap in COLORMAPS:
+        out = os.path.join(legend_dir, f"colorbar_{cmap}.png")
+        write_colorbar(out, cmap)
+        print(f"[legend] Saved {cmap} -> {out}")
+
+
 def save_heatmap(name: str, arr: np.ndarray, outdir: str, cmap="bwr"):
     """ヒートマップを生成し、指定ディレクトリにPNGとして保存"""
+    plt = _pyplot()
     plt.figure(figsize=(6, 4))
 
     # 差分ヒートマップの場合、色範囲を中央値（0）で対称にする
@@ -77,14 +158,7 @@ def save_heatmap(name: str, arr: np.ndarray, outdir: str, cmap="bwr"):
     plt.title(name, fontsize=8)
     plt.tight_layout()
 
-    # パスをサニタイズ
-    # 注意: nameはPyTorchの重み名 (例: bert.encoder.layer.0.attention.self.key.weight_delta)
-    safe_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
-    out = os.path.join(outdir, f"{safe_name}.png")
-    
-    # 出力ディレクトリが存在しない場合は作成
-    os.makedirs(os.path.dirname(out), exist_ok=True) 
-    
+    out = _heatmap_path(name, outdir)
     plt.savefig(out, dpi=200)
     plt.close()
     print(f"[heatmap] Saved {name} -> {out}")
@@ -92,7 +166,8 @@ def save_heatmap(name: str, arr: np.ndarray, outdir: str, cmap="bwr"):
 
 
 def plot_layer_deltas(deltas: list[float], outdir: str, title="Weight Change per Layer"):
-    """L2ノルム変化プロット (現在は未使用だが、コードは残す)"""
+    """L2ノルム変化プロット (現在は未使用。数値は weight_stats.json の layers[].l2_delta を使う)"""
+    plt = _pyplot()
     plt.figure(figsize=(6, 3))
     plt.plot(deltas, marker="o")
     plt.title(title)
@@ -105,6 +180,141 @@ def plot_layer_deltas(deltas: list[float], outdir: str, title="Weight Change per
     print(f"[plot] {title} -> {out}")
 
 
+# ===============================
+# 重みごとの描画 (並列)
+# ===============================
+# 描画対象の重み1つ分: (ファイル名の基になる重み名, 変化前, 変化後, 出力先 layerX ディレクトリ)
+RenderTarget = Tuple[str, np.ndarray, np.ndarray, str]
+
+
+def _render_weight(safe_name_base: str, np_pre: np.ndarray, np_post: np.ndarray, layer_dir: str,
+                   options: Dict[str, object]) -> float:
+    """重み1つの before / after / delta を描画し、差分の L2 ノルムを返す"""
+    delta = np_post - np_pre
+    if options["renderer"] == RENDERER_NUMPY:
+        width, height = options["width"], options["height"]
+        save_heatmap_fast(safe_name_base + "_before", np_pre, layer_dir, width=width, height=height)
+        save_heatmap_fast(safe_name_base + "_after", np_post, layer_dir, width=width, height=height)
+        save_heatmap_fast(safe_name_base + "_delta", delta, layer_dir, width=width, height=height)
+    else:
+        save_heatmap(safe_name_base + "_before", np_pre, layer_dir)
+        save_heatmap(safe_name_base + "_after", np_post, layer_dir)
+        save_heatmap(safe_name_base + "_delta", delta, layer_dir)
+    return float(np.linalg.norm(delta))
+
+
+def _render_shared_weight(shm_name: str, shape: Tuple[int, ...], dtype: str, safe_name_base: str,
+                          layer_dir: str, options: Dict[str, object]) -> float:
+    """子プロセス側: 共有メモリ上の (変化前, 変化後) を複製せずに参照して描画する"""
+    shm = shared_memory.SharedMemory(name=shm_name)
+    pair = None
+    try:
+        pair = np.ndarray((2,) + tuple(shape), dtype=np.dtype(dtype), buffer=shm.buf)
+        return _render_weight(safe_name_base, pair[0], pair[1], layer_dir, options)
+    finally:
+        # 共有メモリを参照する配列が残っていると close() できない
+        del pair
+        shm.close()
+
+
+def _available_memory_bytes() -> Optional[int]:
+    """空きメモリ (MemAvailable) のバイト数。取得できない場合は None"""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def _resolve_workers(requested: int, targets: List[RenderTarget]) -> int:
+    """
+    並列数を決める。requested が 0 以下なら CPU 数。重みの数と、空きメモリで賄える数を上限とする
+    (1プロセスあたり: 共有メモリ上の重み1組 + 作業領域 + 固定分)。
+    """
+    if not targets:
+        return 1
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    workers = min(requested if requested > 0 else cpus, len(targets))
+
+    available = _available_memory_bytes()
+    if available is not None:
+        largest = max(np_pre.nbytes + np_post.nbytes + np_pre.size * WORKER_BYTES_PER_ELEMENT
+                      for _, np_pre, np_post, _ in targets)
+        memory_cap = int(available * WORKER_MEMORY_FRACTION // (largest + WORKER_BASE_BYTES))
+        if memory_cap < workers:
+            print(f"[parallel] Limiting workers to {max(memory_cap, 1)} by available memory "
+                  f"({available / (1024 * 1024):.0f} MB)")
+            workers = memory_cap
+    return max(workers, 1)
+
+
+def _render_parallel(targets: List[RenderTarget], workers: int, options: Dict[str, object]) -> List[float]:
+    """
+    targets をプロセスプールで描画し、差分の L2 ノルムを targets の順で返す。
+    重みは1組ずつ共有メモリに置いて名前だけを渡す。同時に置くのは実行中の数 (= workers) までで、
+    描画が終わるたびに解放して次を投入する。
+    """
+    # 子プロセスが NumPy の BLAS スレッドを CPU 数だけ起動して奪い合わないようにする
+    for var in ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS"):
+        os.environ.setdefault(var, "1")
+
+    norms: List[float] = [0.0] * len(targets)
+    pending: Dict[object, Tuple[int, shared_memory.SharedMemory]] = {}
+    remaining = iter(enumerate(targets))
+
+    # fork は torch のスレッドを抱えた親プロセスの複製になるため、spawn で起動する
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+
+    def submit_next() -> bool:
+        for index, (safe_name_base, np_pre, np_post, layer_dir) in remaining:
+            dtype = np.result_type(np_pre.dtype, np_post.dtype)
+            shm = shared_memory.SharedMemory(create=True, size=max(2 * np_pre.size * dtype.itemsize, 1))
+            try:
+                pair = np.ndarray((2,) + np_pre.shape, dtype=dtype, buffer=shm.buf)
+                pair[0] = np_pre
+                pair[1] = np_post
+                del pair
+                future = executor.submit(
+                    _render_shared_weight, shm.name, np_pre.shape, dtype.str, safe_name_base, layer_dir, options
+                )
+            except BaseException:
+                shm.close()
+                shm.unlink()
+                raise
+            pending[future] = (index, shm)
+            return True
+        return False
+
+    try:
+        for _ in range(workers):
+            if not submit_next():
+                break
+        while pending:
+            done, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, shm = pending.pop(future)
+                shm.close()
+                shm.unlink()
+                norms[index] = future.result()
+                submit_next()
+    finally:
+        for future, (_, shm) in pending.items():
+            future.cancel()
+            shm.close()
+            shm.unlink()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return norms
+
+
 # ===============================
 # メイン処理 (非対話型)
 # ===============================
@@ -113,6 +323,24 @@ def main():
     parser.add_argument("--base_model_path", required=True, help="Path to the base model directory (containing pytorch_model.bin).")
     parser.add_argument("--finetuned_model_path", required=True, help="Path to the fine-tuned model directory (containing pytorch_model.bin).")
     parser.add_argument("--output_dir", required=True, help="Directory to save the visualization PNG files.")
+    parser.add_argument("--renderer", choices=[RENDERER_NUMPY, RENDERER_MATPLOTLIB],
+                        default=os.environ.get("VISUALIZATION_RENDERER", RENDERER_NUMPY),
+                        help="Heatmap renderer (numpy: LUT-based PNG writer, matplotlib: legacy pyplot figures).")
+    parser.add_argument("--image_width", type=int, default=DEFAULT_WIDTH,
+                        help="Heatmap width in pixels for the numpy renderer (0 = one pixel per column).")
+    parser.add_argument("--image_height", type=int, default=DEFAULT_HEIGHT,
+                        help="Heatmap height in pixels for the numpy renderer (0 = one pixel per row).")
+    parser.add_argument("--colorbar", action="store_true",
+                        help="Write one colorbar image per colormap under <output_dir>/legend (shown next to the value range in the UI).")
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("VISUALIZATION_WORKERS", "0")),
+                        help="Rendering processes (0 = number of CPUs; always capped by available memory).")
+    parser.add_argument("--output_format", choices=[OUTPUT_TENSORS, OUTPUT_IMAGES, OUTPUT_BOTH],
+                        default=os.environ.get("VISUALIZATION_OUTPUT") or OUTPUT_TENSORS,
+                        help=f"tensors: write quantized weights to {WEIGHT_ARCHIVE_NAME} for on-demand rendering, "
+                             "images: pre-render PNG heatmaps, both: do both.")
+    parser.add_argument("--delta_only", action="store_true",
+                        default=os.environ.get("VISUALIZATION_DELTA_ONLY", "").lower() in ("1", "true", "yes"),
+                        help=f"Store only the deltas in {WEIGHT_ARCHIVE_NAME} (no before/after images).")
 
     args = parser.parse_args()
 
@@ -129,27 +357,43 @@ def main():
 
     # --- 出力ディレクトリの作成 ---
     os.makedirs(args.output_dir, exist_ok=True)
-    
-    delta_per_layer = []
 
-    # --- 重み比較と可視化 ---
+    render_images = args.output_format in (OUTPUT_IMAGES, OUTPUT_BOTH)
+    # 凡例は出力形式によらず書き出す (backend が weights.npz から描画する画像も同じカラーマップを使う)
+    if args.colorbar:
+        save_colorbars(args.output_dir)
+    options: Dict[str, object] = {
+        "renderer": args.renderer, "width": args.image_width, "height": args.image_height,
+    }
+
+    import torch
+    targets: List[RenderTarget] = []
+    stats = WeightStatsAccumulator()
+
+    # --- 重み比較と可視化の対象を集める ---
     for name, t_pre in sd_pre.items():
         if not isinstance(t_pre, torch.Tensor):
             continue
-        # エンコーダーのレイヤー重みのみを対象とする
-        if not re.search(r"encoder\.layer\.\d+\.", name):
-            continue
         if name not in sd_post:
             continue
-        
         t_post = sd_post[name]
+        # 変化の統計は全ての浮動小数点の重み (埋め込み・LayerNorm・バイアスを含む) について集計する
+        if not t_pre.is_floating_point() or t_pre.shape != t_post.shape:
+            continue
+        if t_pre.dtype == torch.bfloat16:
+            # NumPy に bfloat16 が無いため float32 に変換する
+            t_pre, t_post = t_pre.float(), t_post.float()
         np_pre = t_pre.detach().cpu().numpy()
         np_post = t_post.detach().cpu().numpy()
-        delta = np_post - np_pre
+        stats.add(layer_group(name), name, np_pre, np_post)
 
-        # --- レイヤー別ディレクトリ作成 (サブディレクトリに保存) ---
+        # エンコーダーのレイヤー重みのみを可視化の対象とする
         m = re.search(r"encoder\.layer\.(\d+)\.", name)
-        layer_id = int(m.group(1)) if m else -1
+        if not m:
+            continue
+
+        # --- レイヤー別ディレクトリ作成 (サブディレクトリに保存) ---
+        layer_id = int(m.group(1))
         # 出力ディレクトリ/layerX/ に保存
         layer_dir = os.path.join(args.output_dir, f"layer{layer_id}")
         
@@ -159,16 +403,38 @@ def main():
         
         # Query/Key/Value および Feed Forward 層の重みのみを可視化
         if re.search(r"(query|key|value|intermediate|output)\.dense\.weight", name):
-            save_heatmap(safe_name_base + "_before", np_pre, layer_dir)
-            save_heatmap(safe_name_base + "_after", np_post, layer_dir)
-            save_heatmap(safe_name_base + "_delta", delta, layer_dir)
-            
-            # (L2ノルム変化の計算は残すが、プロットは行わない)
-            delta_per_layer.append(np.linalg.norm(delta))
-
-    # L2ノルム変化のプロットは、ワーカーの処理負荷軽減のため省略
-    # if delta_per_layer:
-    #     plot_layer_deltas(delta_per_layer, args.output_dir)
+            targets.append((safe_name_base, np_pre, np_post, layer_dir))
+
+    # --- 重み変化の統計の保存 (画像を開かずに変化の大きさを比較するため、出力形式によらず書き出す) ---
+    stats_path = os.path.join(args.output_dir, STATS_FILE_NAME)
+    summary = stats.write(stats_path)
+    print(f"[stats] Saved {sum(len(layer['tensors']) for layer in summary['layers'])} tensors "
+          f"in {len(summary['layers'])} layers -> {stats_path} "
+          f"(relative change {summary['model']['relative_change']})")
+
+    # --- 量子化した重みの保存 (画像は backend が表示時に描画する) ---
+    if args.output_format in (OUTPUT_TENSORS, OUTPUT_BOTH):
+        archive_path = os.path.join(args.output_dir, WEIGHT_ARCHIVE_NAME)
+        manifest = write_weight_archive(
+            archive_path,
+            ((name, np_pre, np_post, os.path.basename(layer_dir)) for name, np_pre, np_post, layer_dir in targets),
+            store_before=not args.delta_only,
+            image_size=(args.image_width, args.image_height),
+        )
+        print(f"[archive] Saved {len(manifest['weights'])} weights -> {archive_path} "
+              f"({os.path.getsize(archive_path) / (1024 * 1024):.1f} MB)")
+        if not render_images:
+            print("\n🎯 All visualization processes completed.")
+            return
+
+    # --- 可視化と保存 (重みごとに並列) ---
+    workers = _resolve_workers(args.workers, targets)
+    print(f"[parallel] Rendering {len(targets)} weights with {workers} process(es)")
+    if workers > 1:
+        _render_parallel(targets, workers, options)
+    else:
+        for target in targets:
+            _render_weight(*target, options)
 
     print("\n🎯 All visualization processes completed.")
 
@@ -0,0 +1,101 @@
+"""
+weight_archive.py
+
+可視化用の重みをジョブごとに1つの npz (zip) にまとめて保存する。
+画像を事前に描画する代わりにこのファイルだけをアップロードし、backend が初回の表示時にヒートマップを描画する。
+
+重み1つにつき以下のメンバーを持つ (名前は visualize_finetuning_diff.py の画像ファイル名の基と同じ):
+  <name>/delta.npy, <name>/delta_scale.npy    差分 (int8) と行ごとのスケール (float32)
+  <name>/before.npy, <name>/before_scale.npy  変化前の重み (同上。--delta_only の場合は保存しない)
+変化後の重みは before + delta で復元する (保存しない)。
+manifest.json に重みの一覧・レイヤー名・形状・描画できる画像の種類と、画像の大きさ (--image_width / --image_height) を記録する。
+画像の種類ごとの色範囲 (color_ranges: [vmin, vmax, カラーマップ名]) も量子化前の値から求めて記録する
+(backend はこの範囲で描画し、画面に表示する値の範囲と画像の色が一致する)。
+"""
+
+from __future__ import annotations
+
+import json
+import zipfile
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:
+    from .heatmap_renderer import color_range
+except ImportError:
+    from heatmap_renderer import color_range
+
+
+# ジョブの可視化ディレクトリ直下に置くファイル名 (backend はこの名前で探す)
+WEIGHT_ARCHIVE_NAME = "weights.npz"
+MANIFEST_MEMBER = "manifest.json"
+ARCHIVE_FORMAT_VERSION = 1
+
+# 行ごとに |値| の最大を 127 に対応させる
+# (外れ値で飽和させると、ヒートマップの縮小 [区間平均] で周りの画素の色が変わるため、クリップはしない。
+#  行ごとのスケールなので、外れ値で分解能が落ちるのはその行だけ。描画結果の差は各チャンネル最大 5/255 程度)
+_INT8_MAX = 127
+
+
+def quantize_rows(arr: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """2次元配列を行ごとのスケール付き int8 に量子化する (値 ≒ q * scale[行])"""
+    data = np.asarray(arr, dtype=np.float32)
+    data = data.reshape(data.shape[0], -1) if data.ndim >= 2 else data.reshape(1, -1)
+    if not data.size:
+        return np.zeros(data.shape, dtype=np.int8), np.zeros(data.shape[0], dtype=np.float32)
+    scale = np.abs(data).max(axis=1) / _INT8_MAX
+    # すべて 0 の行は 0 除算を避ける (量子化後も 0)
+    safe_scale = np.where(scale > 0, scale, 1.0).astype(np.float32)
+    q = np.rint(data / safe_scale[:, None])
+    return q.astype(np.int8), scale.astype(np.float32)
+
+
+def _write_member(archive: zipfile.ZipFile, name: str, arr: np.ndarray) -> None:
+    with archive.open(f"{name}.npy", "w", force_zip64=True) as f:
+        np.lib.format.write_array(f, np.ascontiguousarray(arr), allow_pickle=False)
+
+
+def write_weight_archive(
+    path: str,
+    weights: Iterable[Tuple[str, np.ndarray, np.ndarray, str]],
+    store_before: bool = True,
+    image_size: Optional[Tuple[int, int]] = None,
+    compress_level: int = 1,
+) -> Dict[str, object]:
+    """
+    (画像ファイル名の基, 変化前, 変化後, レイヤー名) の列をアーカイブに書き出し、manifest を返す。
+    重みは1つずつ量子化して書き込むので、全体を複製してメモリに持つことはない。
+    """
+    manifest: Dict[str, object] = {"format": ARCHIVE_FORMAT_VERSION, "weights": {}}
+    if image_size is not None:
+        manifest["image_size"] = list(image_size)
+    entries: Dict[str, object] = manifest["weights"]  # type: ignore[assignment]
+    with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_DEFLATED, compresslevel=compress_level) as archive:
+        for name, np_pre, np_post, layer_name in weights:
+            delta = np.asarray(np_post, dtype=np.float32) - np.asarray(np_pre, dtype=np.float32)
+            q, scale = quantize_rows(delta)
+            _write_member(archive, f"{name}/delta", q)
+            _write_member(archive, f"{name}/delta_scale", scale)
+            images: List[str] = ["delta"]
+            if store_before:
+                q, scale = quantize_rows(np_pre)
+                _write_member(archive, f"{name}/before", q)
+                _write_member(archive, f"{name}/before_scale", scale)
+                images = ["before", "after", "delta"]
+            values = {"before": np_pre, "after": np_post, "delta": delta}
+            color_ranges = {image_type: list(color_range(f"{name}_{image_type}", values[image_type])) for image_type in images}
+            entries[name] = {
+                "layer": layer_name, "shape": list(np.shape(np_pre)), "images": images, "color_ranges": color_ranges,
+            }
+        archive.writestr(MANIFEST_MEMBER, json.dumps(manifest))
+    return manifest
+
+
+def read_weight_manifest(path: str) -> Optional[Dict[str, object]]:
+    """アーカイブの manifest.json だけを読む。アーカイブが無い・壊れている場合は None"""
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return json.loads(archive.read(MANIFEST_MEMBER))
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile):
+        return None
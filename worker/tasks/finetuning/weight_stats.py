@@ -0,0 +1,197 @@
+"""
+weight_stats.py
+
+ファインチューニング前後の重みの変化を数値で集計する (画像を開かずに変化の大きさを比較できるようにする)。
+visualize_finetuning_diff.py が重みを比較するループの中でテンソルごとに add() を呼び、
+最後に summary() をジョブの可視化ディレクトリに weight_stats.json として書き出す。
+
+テンソル・レイヤー・モデル全体のそれぞれについて以下を求める:
+  numel              要素数
+  l2_delta           差分の L2 ノルム ||after - before||
+  l2_before          変化前の L2 ノルム
+  relative_change    l2_delta / l2_before
+  cosine_similarity  変化前と変化後のコサイン類似度
+  abs_delta_p50/p90/p99, max_abs_delta  |差分| のパーセンタイルと最大値
+  sparsity           ほとんど変化していない要素の割合 (|差分| <= SPARSITY_TOLERANCE * 変化前の RMS)
+テンソルのパーセンタイルは正確な値。レイヤー・モデル全体のパーセンタイルは、|差分| の log10 を
+1/20 桁刻みで数えた分布を合算して求める近似値 (誤差は相対で ±6% 程度。全要素を連結して並べ替えない)。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import re
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+STATS_FILE_NAME = "weight_stats.json"
+STATS_FORMAT_VERSION = 1
+
+PERCENTILES = (50, 90, 99)
+# 変化前の RMS に対してこの割合以下の変化は「変化なし」とみなす
+SPARSITY_TOLERANCE = 1e-3
+
+# 分布の刻み (1桁を 20 分割) と範囲 (1e-12 未満・1e4 以上は両端の区間に入れる)
+_BUCKETS_PER_DECADE = 20
+_MIN_EXPONENT = -12
+_MAX_EXPONENT = 4
+_BUCKET_COUNT = (_MAX_EXPONENT - _MIN_EXPONENT) * _BUCKETS_PER_DECADE
+
+
+def layer_group(name: str) -> str:
+    """重み名を集計するレイヤーに振り分ける (encoder.layer.N. -> layerN。可視化画像のディレクトリ名と同じ)"""
+    m = re.search(r"encoder\.layer\.(\d+)\.", name)
+    if m:
+        return f"layer{m.group(1)}"
+    if re.search(r"(^|\.)embeddings\.", name):
+        return "embeddings"
+    if re.search(r"(^|\.)pooler\.", name):
+        return "pooler"
+    return "other"
+
+
+def _round(value: Optional[float]) -> Optional[float]:
+    """JSON を小さく保つため有効数字 8 桁に丸める (NaN・無限大は None)"""
+    if value is None or not math.isfinite(value):
+        return None
+    return float(f"{value:.8g}")
+
+
+def _ratio(numerator: float, denominator: float) -> Optional[float]:
+    return numerator / denominator if denominator > 0 else None
+
+
+class _Totals:
+    """レイヤー (またはモデル全体) の集計途中の値。テンソルを足し込むだけで集約できる量だけを持つ"""
+
+    def __init__(self) -> None:
+        self.numel = 0
+        self.sum_sq_delta = 0.0
+        self.sum_sq_before = 0.0
+        self.sum_sq_after = 0.0
+        self.dot = 0.0
+        self.unchanged = 0
+        self.max_abs_delta = 0.0
+        self.buckets = np.zeros(_BUCKET_COUNT, dtype=np.int64)
+
+    def merge(self, other: "_Totals") -> None:
+        self.numel += other.numel
+        self.sum_sq_delta += other.sum_sq_delta
+        self.sum_sq_before += other.sum_sq_before
+        self.sum_sq_after += other.sum_sq_after
+        self.dot += other.dot
+        self.unchanged += other.unchanged
+        self.max_abs_delta = max(self.max_abs_delta, other.max_abs_delta)
+        self.buckets += other.buckets
+
+    def approximate_percentiles(self) -> List[Optional[float]]:
+        """
+        分布から |差分| のパーセンタイルを求める (該当する区間の対数中点。最大値を超えないようにする)。
+        最も小さい区間 (1e-12 未満) は変化なしとして 0 を返す。
+        """
+        if not self.numel:
+            return [None] * len(PERCENTILES)
+        cumulative = np.cumsum(self.buckets)
+        values: List[Optional[float]] = []
+        for percentile in PERCENTILES:
+            index = int(np.searchsorted(cumulative, percentile / 100.0 * self.numel))
+            index = min(index, _BUCKET_COUNT - 1)
+            if index == 0:
+                values.append(0.0)
+                continue
+            midpoint = 10.0 ** (_MIN_EXPONENT + (index + 0.5) / _BUCKETS_PER_DECADE)
+            values.append(min(midpoint, self.max_abs_delta))
+        return values
+
+    def to_dict(self, percentiles: Optional[List[Optional[float]]] = None) -> Dict[str, object]:
+        l2_delta = math.sqrt(self.sum_sq_delta)
+        l2_before = math.sqrt(self.sum_sq_before)
+        p50, p90, p99 = percentiles if percentiles is not None else self.approximate_percentiles()
+        return {
+            "numel": self.numel,
+            "l2_delta": _round(l2_delta),
+            "l2_before": _round(l2_before),
+            "relative_change": _round(_ratio(l2_delta, l2_before)),
+            "cosine_similarity": _round(_ratio(self.dot, l2_before * math.sqrt(self.sum_sq_after))),
+            "abs_delta_p50": _round(p50),
+            "abs_delta_p90": _round(p90),
+            "abs_delta_p99": _round(p99),
+            "max_abs_delta": _round(self.max_abs_delta),
+            "sparsity": _round(_ratio(self.unchanged, self.numel)),
+        }
+
+
+class WeightStatsAccumulator:
+    """テンソルごとの統計を求め、レイヤーごと・モデル全体に集約する"""
+
+    def __init__(self) -> None:
+        # レイヤー名 -> 集計途中の値 / テンソルごとの統計
+        self._layers: Dict[str, _Totals] = {}
+        self._tensors: Dict[str, List[Dict[str, object]]] = {}
+
+    def add(self, layer_name: str, name: str, np_pre: np.ndarray, np_post: np.ndarray) -> Dict[str, object]:
+        """
+        テンソル1つの統計を求めて記録し、その統計を返す。
+        内積・ノルムは桁落ちを避けるため float64 で計算する (1 - コサイン類似度は 1e-6 程度になりうる)。
+        |差分| の分布 (パーセンタイル・対数) は float32 で求める (一番重い並べ替えのメモリ転送量を半分にする)。
+        """
+        before = np.asarray(np_pre, dtype=np.float64).ravel()
+        after = np.asarray(np_post, dtype=np.float64).ravel()
+        delta = after - before
+        abs_delta = np.abs(delta).astype(np.float32)
+
+        totals = _Totals()
+        totals.numel = int(before.size)
+        totals.sum_sq_delta = float(np.dot(delta, delta))
+        totals.sum_sq_before = float(np.dot(before, before))
+        totals.sum_sq_after = float(np.dot(after, after))
+        totals.dot = float(np.dot(before, after))
+        if totals.numel:
+            tolerance = SPARSITY_TOLERANCE * math.sqrt(totals.sum_sq_before / totals.numel)
+            totals.unchanged = int(np.count_nonzero(abs_delta <= tolerance))
+            totals.max_abs_delta = float(abs_delta.max())
+            # log10(0) を避けるため最小値で下から抑え、範囲外は両端の区間に入れる
+            exponents = np.log10(np.maximum(abs_delta, np.float32(10.0 ** _MIN_EXPONENT)))
+            index = ((exponents - _MIN_EXPONENT) * _BUCKETS_PER_DECADE).astype(np.int64)
+            np.clip(index, 0, _BUCKET_COUNT - 1, out=index)
+            totals.buckets = np.bincount(index, minlength=_BUCKET_COUNT)
+            percentiles = [float(v) for v in np.percentile(abs_delta, PERCENTILES)]
+        else:
+            percentiles = [None] * len(PERCENTILES)
+
+        stats = {"name": name, **totals.to_dict(percentiles)}
+        self._layers.setdefault(layer_name, _Totals()).merge(totals)
+        self._tensors.setdefault(layer_name, []).append(stats)
+        return stats
+
+    def summary(self) -> Dict[str, object]:
+        """weight_stats.json の内容 (レイヤーは追加した順)"""
+        model = _Totals()
+        layers = []
+        for layer_name, totals in self._layers.items():
+            model.merge(totals)
+            layers.append({"layer_name": layer_name, **totals.to_dict(), "tensors": self._tensors[layer_name]})
+        return {
+            "format": STATS_FORMAT_VERSION,
+            "sparsity_tolerance": SPARSITY_TOLERANCE,
+            "model": model.to_dict(),
+            "layers": layers,
+        }
+
+    def write(self, path: str) -> Dict[str, object]:
+        summary = self.summary()
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(summary, f)
+        return summary
+
+
+def read_weight_stats(path: str) -> Optional[Dict[str, object]]:
+    """weight_stats.json を読む。無い・壊れている場合は None"""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None